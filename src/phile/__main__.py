@@ -7,11 +7,17 @@ import logging
 import sys
 
 # Internal packages.
+import phile.asyncio
 import phile.configuration
 import phile.launcher
 import phile.launcher.cmd
+import phile.launcher.profile
 import phile.main
 
+# TODO[mypy issue #1422]: __loader__ not defined
+_loader_name: str = __loader__.name  # type: ignore[name-defined]
+_logger = logging.getLogger(_loader_name)
+
 
 async def async_run(
     launcher_registry: phile.launcher.Registry,
@@ -22,11 +28,41 @@ async def async_run(
         phile.configuration.Entries
     ]
     event_view = launcher_registry.event_queue.__aiter__()
-    await asyncio.gather(
-        *(start(name) for name in configurations.main_autostart),
-        start(cmd_name := "phile.launcher.cmd"),
-        return_exceptions=True,
+    cmd_name = "phile.launcher.cmd"
+    entry_names = [*configurations.main_autostart, cmd_name]
+    profile_path = (
+        configurations.state_directory_path
+        / configurations.launcher_profile_path
+    )
+    launcher_registry.startup_profile = phile.launcher.profile.load(
+        profile_path
     )
+    imported_module_names = set(sys.modules)
+    try:
+        start_many = launcher_registry.start_many(entry_names)
+    except phile.launcher.CycleError as error:
+        _logger.error("Unable to start launchers: %s", error)
+        return 1
+    async with phile.asyncio.open_task(
+        launcher_registry.prefetch_imports(entry_names, worker_count=2),
+        suppress_cancelled_error_if_not_done=True,
+    ):
+        start_result = await start_many
+    # The profile is only an optimisation. Not worth failing over.
+    if not start_result.failed:
+        with contextlib.suppress(OSError):
+            phile.launcher.profile.save(
+                phile.launcher.profile.Profile.from_spans(
+                    launcher_registry.trace_recorder.spans,
+                    launcher_registry.planner.predecessors,
+                    module_names=(
+                        module_name
+                        for module_name in list(sys.modules)
+                        if module_name not in imported_module_names
+                    ),
+                ),
+                profile_path,
+            )
     if not launcher_registry.is_running(cmd_name):
         return 1
     expected_event = phile.launcher.Event(
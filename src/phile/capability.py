@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 
 # Standard libraries.
+import asyncio
 import builtins
+import collections.abc
 import contextlib
 import dataclasses
 import enum
@@ -31,6 +33,11 @@ class AlreadyEnabled(RuntimeError):
     pass
 
 
+def get_qualified_name(capability: type) -> str:
+    """Returns the name used to refer to ``capability`` by string."""
+    return capability.__module__ + "." + capability.__qualname__
+
+
 class _PopItemDefaultSentinel:
     pass
 
@@ -45,19 +52,39 @@ class Registry(dict[type, typing.Any]):
     def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
         super().__init__(*args, **kwargs)
         self.event_queue = phile.asyncio.pubsub.Queue[Event]()
+        self._capabilities_by_name: dict[str, type] = {
+            get_qualified_name(capability): capability
+            for capability in self
+        }
+        self._set_futures: dict[
+            typing.Union[type, str], asyncio.Future[typing.Any]
+        ] = {}
+        """Futures for :meth:`wait_for`, keyed by type or name."""
+        self._del_futures: dict[
+            typing.Union[type, str], asyncio.Future[None]
+        ] = {}
+        """Futures for :meth:`wait_for_removal`, keyed by type or name."""
+        self.demand_handlers: dict[
+            str, collections.abc.Callable[[], typing.Any]
+        ] = {}
+        """
+        Callbacks keyed by capability name, to provide the capability.
+
+        A callback is called by :meth:`wait_for`
+        whenever its capability is waited for but is not set.
+        So it may be called more than once before the capability is set.
+        """
 
     def __delitem__(self, capability: type[_T_co]) -> None:
         super().__delitem__(capability)
-        self.event_queue.put(
-            Event(type=EventType.DEL, capability=capability)
-        )
+        self._on_del(capability)
 
     def __getitem__(self, capability: type[_T_co]) -> _T_co:
         return typing.cast(_T_co, super().__getitem__(capability))
 
     def __setitem__(self, key: type[_T_co], value: _T_co) -> None:
         super().__setitem__(key, value)
-        self.event_queue.put(Event(type=EventType.SET, capability=key))
+        self._on_set(key, value)
 
     @typing.overload  # type: ignore[override]
     def pop(
@@ -88,9 +115,7 @@ class Registry(dict[type, typing.Any]):
                 raise
             assert not isinstance(default, _PopItemDefaultSentinel)
             return default
-        self.event_queue.put(
-            Event(type=EventType.DEL, capability=capability)
-        )
+        self._on_del(capability)
         return popped_value
 
     def set(self, value: _T_co) -> None:
@@ -106,10 +131,123 @@ class Registry(dict[type, typing.Any]):
         value_set = self.setdefault(capability, value)
         if value_set != value:
             raise AlreadyEnabled()
-        self.event_queue.put(
-            Event(type=EventType.SET, capability=capability)
-        )
+        self._on_set(capability, value)
         with contextlib.ExitStack() as stack:
             stack.callback(self.pop, capability, None)
             return stack.pop_all()
         assert False, "Unreachable"  # pragma: no cover
+
+    @typing.overload
+    async def wait_for(self, capability: type[_T_co]) -> _T_co:
+        ...
+
+    @typing.overload
+    async def wait_for(self, capability: str) -> typing.Any:
+        ...
+
+    async def wait_for(
+        self, capability: typing.Union[type[_T_co], str]
+    ) -> typing.Any:
+        """
+        Returns the value of ``capability`` once it is set.
+
+        The ``capability`` may be given as a type
+        or as its :func:`get_qualified_name`.
+        Returns immediately if it is already set.
+        """
+        if isinstance(capability, str):
+            capability_type = self._capabilities_by_name.get(capability)
+        else:
+            capability_type = capability
+        if capability_type is not None and capability_type in self:
+            return self[capability_type]
+        future = self._get_future(self._set_futures, capability)
+        demand_handler = self.demand_handlers.get(
+            capability
+            if isinstance(capability, str)
+            else get_qualified_name(capability)
+        )
+        if demand_handler is not None:
+            demand_handler()
+        return await asyncio.shield(future)
+
+    def set_exception(
+        self,
+        capability: typing.Union[type, str],
+        exception: BaseException,
+    ) -> None:
+        """
+        Raises ``exception`` in :meth:`wait_for` waiting on ``capability``.
+
+        The ``capability`` may be given as a type
+        or as its :func:`get_qualified_name`,
+        and waiters using either form are given the exception.
+        Later calls of :meth:`wait_for` wait as usual.
+        """
+        name = (
+            capability
+            if isinstance(capability, str)
+            else get_qualified_name(capability)
+        )
+        set_futures = self._set_futures
+        for key in list(set_futures):
+            key_name = (
+                key if isinstance(key, str) else get_qualified_name(key)
+            )
+            if key_name == name:
+                set_futures.pop(key).set_exception(exception)
+
+    async def wait_for_removal(
+        self, capability: typing.Union[type, str]
+    ) -> None:
+        """
+        Returns once ``capability`` is not set.
+
+        The ``capability`` may be given as a type
+        or as its :func:`get_qualified_name`.
+        Returns immediately if it is not set.
+        """
+        if isinstance(capability, str):
+            if capability not in self._capabilities_by_name:
+                return
+        elif capability not in self:
+            return
+        await asyncio.shield(
+            self._get_future(self._del_futures, capability)
+        )
+
+    def _get_future(
+        self,
+        futures: dict[typing.Union[type, str], asyncio.Future[_T]],
+        key: typing.Union[type, str],
+    ) -> asyncio.Future[_T]:
+        future = futures.get(key)
+        if future is None:
+            future = futures[
+                key
+            ] = asyncio.get_running_loop().create_future()
+        return future
+
+    def _on_set(self, capability: type[_T_co], value: _T_co) -> None:
+        name = get_qualified_name(capability)
+        self._capabilities_by_name[name] = capability
+        keys: tuple[typing.Union[type, str], ...] = (capability, name)
+        for key in keys:
+            future = self._set_futures.pop(key, None)
+            if future is not None:
+                future.set_result(value)
+        self.event_queue.put(
+            Event(type=EventType.SET, capability=capability)
+        )
+
+    def _on_del(self, capability: type[_T_co]) -> None:
+        name = get_qualified_name(capability)
+        self._capabilities_by_name.pop(name, None)
+        keys: tuple[typing.Union[type, str], ...] = (capability, name)
+        for key in keys:
+            future = self._del_futures.pop(key, None)
+            if future is not None:
+                future.set_result(None)
+        self.event_queue.put(
+            Event(type=EventType.DEL, capability=capability)
+        )
@@ -41,13 +41,22 @@ class Entries(pydantic.BaseSettings):
     hotkey_global_map: dict[str, str] = {}
     hotkey_map: dict[str, str] = {}
     imap: typing.Optional[ImapEntries] = None
+    launcher_profile_path = pathlib.Path("launcher_profile.json")
     log_file_level = 30
     log_file_path = pathlib.Path("phile.log")
     log_stderr_level = 30
     main_autostart = set[str]()
+    notify_backend = "watchdog"
     notify_directory = pathlib.Path("notify")
+    notify_log_path = pathlib.Path("notify.log")
+    notify_min_update_interval: typing.Optional[
+        datetime.timedelta
+    ] = None
     notify_suffix = ".notify"
+    notify_text_cache_size: typing.Optional[int] = None
     pid_path = pathlib.Path("pid")
+    save_atomically = False
+    save_fsync = False
     state_directory_path = _app_paths.user_state
     tray_icon_name = "phile-tray-empty"
     tray_directory = pathlib.Path("tray")
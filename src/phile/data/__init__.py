@@ -2,15 +2,13 @@
 
 # Standard library.
 import bisect
+import collections.abc
 import dataclasses
 import enum
 import logging
 import typing
 import warnings
 
-# Internal packages.
-import phile.asyncio.pubsub
-
 # TODO[mypy issue #1422]: __loader__ not defined
 _loader_name: str = __loader__.name  # type: ignore[name-defined]
 _logger = logging.getLogger(_loader_name)
@@ -52,6 +50,11 @@ class Registry(typing.Generic[_KeyT, _ValueT]):
         """Read-only for user."""
         self.current_values: list[_ValueT] = []
         """Read-only for user."""
+        # Imported only when used, as it imports `asyncio`,
+        # which is slow to import for command line tools.
+        # pylint: disable=import-outside-toplevel
+        import phile.asyncio.pubsub
+
         self.event_queue = phile.asyncio.pubsub.Queue[
             Event[_KeyT, _ValueT]
         ]()
@@ -97,6 +100,48 @@ class Registry(typing.Generic[_KeyT, _ValueT]):
             value=value,
         )
 
+    def update(
+        self, items: collections.abc.Mapping[_KeyT, _ValueT]
+    ) -> None:
+        """
+        Sets values of keys in ``items`` as a batch.
+
+        The registry is sorted once for the whole batch.
+        An event is emitted for each changed key in key order,
+        with its index being its position after the batch,
+        so that applying the events in order
+        gives the same sequence as :attr:`current_keys`.
+        The events share one snapshot of the registry after the batch.
+        """
+        values = dict(zip(self.current_keys, self.current_values))
+        changes: dict[_KeyT, EventType] = {}
+        for key, value in items.items():
+            try:
+                old_value = values[key]
+            except KeyError:
+                changes[key] = EventType.INSERT
+            else:
+                if old_value == value:
+                    continue
+                changes[key] = EventType.SET
+            values[key] = value
+        if not changes:
+            return
+        _logger.debug("Updating %d notifications", len(changes))
+        current_keys = sorted(values)
+        current_values = [values[key] for key in current_keys]
+        self.current_keys[:] = current_keys
+        self.current_values[:] = current_values
+        for key in sorted(changes):
+            self._put_event(
+                type=changes[key],
+                index=bisect.bisect_left(current_keys, key),
+                key=key,
+                value=values[key],
+                current_keys=current_keys,
+                current_values=current_values,
+            )
+
     def _insert(self, index: int, key: _KeyT, value: _ValueT) -> None:
         _logger.debug("Inserting notification %s", key)
         self.current_values.insert(index, value)
@@ -114,7 +159,19 @@ class Registry(typing.Generic[_KeyT, _ValueT]):
         index: int,
         key: _KeyT,
         value: _ValueT,
+        *,
+        current_keys: typing.Optional[list[_KeyT]] = None,
+        current_values: typing.Optional[list[_ValueT]] = None,
     ) -> None:
+        """Snapshots of the registry are copied if not given."""
+        # Already imported by the constructor.
+        # pylint: disable=import-outside-toplevel
+        import phile.asyncio.pubsub
+
+        if current_keys is None:
+            current_keys = self.current_keys.copy()
+        if current_values is None:
+            current_values = self.current_values.copy()
         try:
             self.event_queue.put(
                 Event[_KeyT, _ValueT](
@@ -122,8 +179,8 @@ class Registry(typing.Generic[_KeyT, _ValueT]):
                     index=index,
                     key=key,
                     value=value,
-                    current_keys=self.current_keys.copy(),
-                    current_values=self.current_values.copy(),
+                    current_keys=current_keys,
+                    current_values=current_values,
                 )
             )
         except phile.asyncio.pubsub.Node.AlreadySet:
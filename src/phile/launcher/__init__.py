@@ -2,6 +2,9 @@
 """
 .. automodule:: phile.launcher.cmd
 .. automodule:: phile.launcher.defaults
+.. automodule:: phile.launcher.metrics
+.. automodule:: phile.launcher.profile
+.. automodule:: phile.launcher.trace
 
 ----------------------------------
 For starting and stopping services
@@ -14,10 +17,15 @@ import collections
 import collections.abc
 import contextlib
 import dataclasses
+import datetime
 import enum
 import functools
+import importlib
 import itertools
 import logging
+import multiprocessing
+import multiprocessing.connection
+import sys
 import types
 import typing
 
@@ -27,6 +35,9 @@ import phile.asyncio
 import phile.asyncio.pubsub
 import phile.builtins
 import phile.capability
+import phile.launcher.metrics
+import phile.launcher.profile
+import phile.launcher.trace
 
 _KeyT = typing.TypeVar("_KeyT")
 _T = typing.TypeVar("_T")
@@ -38,6 +49,13 @@ NullaryCallable = collections.abc.Callable[[], typing.Any]
 Command = NullaryAsyncCallable
 CommandLines = list[Command]
 
+default_shutdown_deadline = datetime.timedelta(seconds=10)
+"""Default time limit for :meth:`Registry.shutdown`."""
+default_stop_grace_period = datetime.timedelta(seconds=3)
+"""Default time given to each launcher in :meth:`Registry.shutdown`."""
+planner_cache_size = 64
+"""Number of computed waves each :class:`Planner` keeps."""
+
 # TODO[mypy issue #1422]: __loader__ not defined
 _loader_name: str = __loader__.name  # type: ignore[name-defined]
 _logger = logging.getLogger(_loader_name)
@@ -98,6 +116,19 @@ class Type(enum.IntEnum):
     A capability :class:`Descriptor` starts
     when its `capability_name` is set in registry.
     """
+    PROCESS = enum.auto()
+    """
+    A process :class:`Descriptor` starts
+    when a child process running its :attr:`~Descriptor.exec_start`
+    has been started.
+
+    The commands are sent to the child process,
+    and so must be picklable, such as module level functions.
+    They are awaited in an event loop of the child process,
+    and the value returned by the last command
+    is sent back to be the result of the main subroutine.
+    The child process is terminated when the unit stops.
+    """
 
 
 class Descriptor(typing.TypedDict, total=False):
@@ -109,6 +140,30 @@ class Descriptor(typing.TypedDict, total=False):
     default_dependencies: bool
     exec_start: CommandLines
     exec_stop: CommandLines
+    idle_timeout: datetime.timedelta
+    """
+    How long an :attr:`on_demand` launcher may run idle before stopping.
+
+    A launcher is idle if no launcher that binds to it
+    is starting or running.
+    It does not stop when idle if not given.
+    """
+    imports: set[str]
+    """
+    Modules the launcher imports when starting.
+
+    They are only hints for :meth:`Registry.prefetch_imports`.
+    The launcher still has to import them itself.
+    """
+    on_demand: bool
+    """
+    Whether to start when its capability is waited for.
+
+    That is, the launcher is started by
+    :meth:`phile.capability.Registry.wait_for`
+    if its :attr:`capability_name` is not set.
+    It must provide a :attr:`capability_name`.
+    """
     type: Type
 
 
@@ -116,6 +171,14 @@ class CapabilityNotSet(RuntimeError):
     pass
 
 
+class CycleError(RuntimeError):
+    pass
+
+
+class ProcessExited(RuntimeError):
+    pass
+
+
 class MissingDescriptorData(KeyError):
     pass
 
@@ -174,6 +237,22 @@ class OneToManyTwoWayDict(dict[_KeyT, set[_ValueT]]):
         )
 
 
+@dataclasses.dataclass(frozen=True)
+class Relations:
+    """Relations of a launcher, merged from both directions."""
+
+    after: frozenset[str]
+    """Launchers to start before, and to stop after, the launcher."""
+    before: frozenset[str]
+    """Launchers to start after, and to stop before, the launcher."""
+    binds_to: frozenset[str]
+    """Launchers to start when the launcher starts."""
+    bound_by: frozenset[str]
+    """Launchers to stop when the launcher stops."""
+    conflicts: frozenset[str]
+    """Launchers to stop when the launcher starts."""
+
+
 class Database:
     def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
         # TODO[mypy issue 4001]: Remove type ignore.
@@ -207,10 +286,30 @@ class Database:
         """Coroutines to call to start a launcher."""
         self.exec_stop: dict[str, CommandLines] = {}
         """Coroutines to call to stop a launcher."""
+        self.idle_timeout: dict[
+            str, typing.Optional[datetime.timedelta]
+        ] = {}
+        """Idle time before stopping launchers started on demand."""
+        self.imports: dict[str, set[str]] = {}
+        """Modules expected to be imported by a launcher when starting."""
+        self.on_demand: dict[str, bool] = {}
+        """Whether launchers start when their capability is waited for."""
         self.remover: dict[str, NullaryCallable] = {}
         """Callback to call to remove launchers from the database."""
         self.type: dict[str, Type] = {}
         """Initialisation and termination conditions of launchers."""
+        self.version = 0
+        """
+        Incremented whenever cached data is invalidated.
+
+        That is, whenever launchers are added or removed.
+        Data derived from the database, such as waves of a :class:`Planner`,
+        are outdated when it changes.
+        """
+        self._relations: dict[str, Relations] = {}
+        """Cached :meth:`get_relations`."""
+        self._binds_to_closures: dict[str, frozenset[str]] = {}
+        """Cached :meth:`get_binds_to_closure`."""
 
     def add(self, entry_name: str, descriptor: Descriptor) -> None:
         """Not thread-safe."""
@@ -242,6 +341,9 @@ class Database:
             provide_option("default_dependencies", True)
             provide_option("exec_start", None)
             provide_option("exec_stop", [])
+            provide_option("idle_timeout", None)
+            provide_option("imports", set[str]())
+            provide_option("on_demand", False)
             default_type = Type.SIMPLE
             if self.capability_name[entry_name]:
                 default_type = Type.CAPABILITY
@@ -258,6 +360,7 @@ class Database:
             self.remover[entry_name] = functools.partial(
                 stack.pop_all().__exit__, None, None, None
             )
+        self._invalidate(entry_name)
 
     def _check_new_descriptor(
         self, entry_name: str, descriptor: Descriptor
@@ -275,16 +378,389 @@ class Database:
                 " It is missing from the unit named"
                 " {entry_name}".format(entry_name=entry_name)
             )
+        if descriptor.get("on_demand", False) and not descriptor.get(
+            "capability_name"
+        ):
+            raise MissingDescriptorData(
+                "A launcher.Descriptor must provide"
+                " a capability_name to be started on demand."
+                " It is missing from the unit named"
+                " {entry_name}".format(entry_name=entry_name)
+            )
 
     def remove(self, entry_name: str) -> None:
         entry_remover = self.remover.pop(entry_name, None)
         if entry_remover is not None:
+            self._invalidate(entry_name)
             entry_remover()
 
+    def get_relations(self, entry_name: str) -> Relations:
+        """
+        Returns relations of ``entry_name``.
+
+        They are cached until a related launcher is added or removed.
+        """
+        relations = self._relations.get(entry_name)
+        if relations is None:
+            empty_set = set[str]()
+            after = self.after
+            before = self.before
+            binds_to = self.binds_to
+            conflicts = self.conflicts
+            relations = self._relations[entry_name] = Relations(
+                after=frozenset(
+                    after.get(entry_name, empty_set).union(
+                        before.inverses.get(entry_name, empty_set)
+                    )
+                ),
+                before=frozenset(
+                    before.get(entry_name, empty_set).union(
+                        after.inverses.get(entry_name, empty_set)
+                    )
+                ),
+                binds_to=frozenset(binds_to.get(entry_name, empty_set)),
+                bound_by=frozenset(
+                    binds_to.inverses.get(entry_name, empty_set)
+                ),
+                conflicts=frozenset(
+                    conflicts.get(entry_name, empty_set).union(
+                        conflicts.inverses.get(entry_name, empty_set)
+                    )
+                ),
+            )
+        return relations
+
+    def get_binds_to_closure(self, entry_name: str) -> frozenset[str]:
+        """
+        Returns ``entry_name`` and what it binds to, recursively.
+
+        They are cached until a launcher in it is added or removed.
+        """
+        closure = self._binds_to_closures.get(entry_name)
+        if closure is None:
+            binds_to = self.binds_to
+            found = set[str]()
+            pending = [entry_name]
+            while pending:
+                name = pending.pop()
+                if name in found:
+                    continue
+                found.add(name)
+                pending.extend(binds_to.get(name, ()))
+            closure = self._binds_to_closures[entry_name] = frozenset(
+                found
+            )
+        return closure
+
+    def _invalidate(self, entry_name: str) -> None:
+        """
+        Drops cached data that ``entry_name`` changing would affect.
+
+        Launchers naming ``entry_name`` in their own descriptor
+        already have it in their relations.
+        So only ``entry_name`` and launchers named in its descriptor
+        have their relations affected.
+        Closures are affected if they contain ``entry_name``,
+        which are those of launchers binding to it, recursively.
+        Waves of launchers may be affected in any way,
+        and are dropped by increasing :attr:`version`.
+        """
+        self.version += 1
+        relations = self._relations
+        relations.pop(entry_name, None)
+        for relation in (
+            self.after,
+            self.before,
+            self.binds_to,
+            self.conflicts,
+        ):
+            for name in relation.get(entry_name, ()):
+                relations.pop(name, None)
+        closures = self._binds_to_closures
+        dependents = self.binds_to.inverses
+        pending = [entry_name]
+        visited = set[str]()
+        while pending:
+            name = pending.pop()
+            if name in visited:
+                continue
+            visited.add(name)
+            closures.pop(name, None)
+            pending.extend(dependents.get(name, ()))
+
     def contains(self, entry_name: str) -> bool:
         return entry_name in self.remover
 
 
+class Planner:
+    """
+    Orders starting of launchers using a cached dependency graph.
+
+    The graph is compiled from a :class:`Database` when first needed,
+    and is compiled again only after launchers are added or removed.
+    At most :data:`planner_cache_size` computed waves are kept,
+    dropping the least recently computed ones first.
+    """
+
+    def __init__(
+        self,
+        *,
+        database: Database,
+    ) -> None:
+        self._database = database
+        self._database_version = -1
+        self._predecessors: dict[str, frozenset[str]] = {}
+        """Launchers that must start before each launcher."""
+        self._waves: dict[
+            frozenset[str], tuple[tuple[str, ...], ...]
+        ] = {}
+        """Computed :meth:`get_waves` keyed by their argument."""
+        self._stop_waves: dict[
+            frozenset[str], tuple[tuple[str, ...], ...]
+        ] = {}
+        """Computed :meth:`get_stop_waves` keyed by their argument."""
+
+    @property
+    def predecessors(
+        self,
+    ) -> types.MappingProxyType[str, frozenset[str]]:
+        self._refresh()
+        return types.MappingProxyType(self._predecessors)
+
+    def get_closure(
+        self, entry_names: collections.abc.Iterable[str]
+    ) -> set[str]:
+        """Returns ``entry_names`` and what they bind to, recursively."""
+        get_binds_to_closure = self._database.get_binds_to_closure
+        closure = set[str]()
+        for entry_name in entry_names:
+            closure.update(get_binds_to_closure(entry_name))
+        return closure
+
+    def get_dependent_closure(
+        self, entry_names: collections.abc.Iterable[str]
+    ) -> set[str]:
+        """Returns ``entry_names`` and what binds to them, recursively."""
+        dependents = self._database.binds_to.inverses
+        closure = set[str]()
+        pending = list(entry_names)
+        while pending:
+            entry_name = pending.pop()
+            if entry_name in closure:
+                continue
+            closure.add(entry_name)
+            pending.extend(dependents.get(entry_name, ()))
+        return closure
+
+    def get_waves(
+        self, entry_names: collections.abc.Iterable[str]
+    ) -> tuple[tuple[str, ...], ...]:
+        """
+        Returns the launchers to start for ``entry_names`` in waves.
+
+        Launchers in a wave are ordered after launchers
+        only from earlier waves.
+        So they may start concurrently
+        after earlier waves have started.
+        Raises :exc:`CycleError`
+        if the ordering dependencies of the launchers have a cycle.
+        """
+        self._refresh()
+        key = frozenset(entry_names)
+        waves = self._waves.get(key)
+        if waves is None:
+            waves = self._compute_waves(self.get_closure(key))
+            _cache_put(self._waves, key, waves)
+        return waves
+
+    def get_stop_waves(
+        self, entry_names: collections.abc.Iterable[str]
+    ) -> tuple[tuple[str, ...], ...]:
+        """
+        Returns the launchers to stop for ``entry_names`` in waves.
+
+        It is the reverse of :meth:`get_waves`
+        for launchers binding to ``entry_names``, recursively,
+        since stopping them stops the launchers binding to them.
+        Raises :exc:`CycleError`
+        if the ordering dependencies of the launchers have a cycle.
+        """
+        self._refresh()
+        key = frozenset(entry_names)
+        waves = self._stop_waves.get(key)
+        if waves is None:
+            waves = tuple(
+                reversed(
+                    self._compute_waves(self.get_dependent_closure(key))
+                )
+            )
+            _cache_put(self._stop_waves, key, waves)
+        return waves
+
+    def _refresh(self) -> None:
+        database = self._database
+        if self._database_version == database.version:
+            return
+        get_relations = database.get_relations
+        self._predecessors = {
+            entry_name: get_relations(entry_name).after
+            for entry_name in database.remover
+        }
+        self._waves.clear()
+        self._stop_waves.clear()
+        self._database_version = database.version
+
+    def _compute_waves(
+        self, closure: set[str]
+    ) -> tuple[tuple[str, ...], ...]:
+        predecessors = self._predecessors
+        empty_set = frozenset[str]()
+        pending_counts: dict[str, int] = {}
+        successors = collections.defaultdict[str, list[str]](list)
+        for entry_name in closure:
+            entry_predecessors = (
+                predecessors.get(entry_name, empty_set) & closure
+            )
+            pending_counts[entry_name] = len(entry_predecessors)
+            for predecessor in entry_predecessors:
+                successors[predecessor].append(entry_name)
+        wave = sorted(
+            entry_name
+            for entry_name, count in pending_counts.items()
+            if not count
+        )
+        waves: list[tuple[str, ...]] = []
+        while wave:
+            waves.append(tuple(wave))
+            next_wave: list[str] = []
+            for entry_name in wave:
+                del pending_counts[entry_name]
+                for successor in successors[entry_name]:
+                    pending_counts[successor] -= 1
+                    if not pending_counts[successor]:
+                        next_wave.append(successor)
+            wave = sorted(next_wave)
+        if pending_counts:
+            raise CycleError(
+                "Launchers cannot be ordered"
+                " because of cyclic ordering dependencies."
+                " These launchers are in or after a cycle:"
+                " {}".format(", ".join(sorted(pending_counts)))
+            )
+        return tuple(waves)
+
+
+def _cache_put(
+    cache: dict[_KeyT, _ValueT], key: _KeyT, value: _ValueT
+) -> None:
+    """Adds to ``cache``, dropping its oldest item if it is full."""
+    if len(cache) >= planner_cache_size:
+        del cache[next(iter(cache))]
+    cache[key] = value
+
+
+def _import_modules(module_names: collections.abc.Iterable[str]) -> None:
+    for module_name in module_names:
+        try:
+            importlib.import_module(module_name)
+        # Failures could be anything raised by the imported module.
+        except Exception:  # pylint: disable=broad-except
+            _logger.debug(
+                "Unable to prefetch module %s.",
+                module_name,
+                exc_info=True,
+            )
+
+
+process_context = multiprocessing.get_context("spawn")
+"""
+Used to create processes for :attr:`Type.PROCESS` launchers.
+
+The parent process usually has threads running,
+so the child is spawned rather than forked.
+"""
+
+
+def send_command_lines_result(
+    command_lines: CommandLines,
+    connection: multiprocessing.connection.Connection,
+) -> None:
+    """Sends whether and what ``command_lines`` returns or raises."""
+
+    async def run() -> typing.Any:
+        return_value: typing.Any = None
+        for command in command_lines:
+            return_value = await command()
+        return return_value
+
+    with connection:
+        try:
+            result = (True, asyncio.run(run()))
+        # Forwarding anything the commands raise.
+        except Exception as error:  # pylint: disable=broad-except
+            result = (False, error)
+        try:
+            connection.send(result)
+        # Pickling could fail with anything, not just `PicklingError`.
+        except Exception as error:  # pylint: disable=broad-except
+            connection.send(
+                (
+                    False,
+                    ProcessExited(
+                        "Unable to send result: {!r}".format(error)
+                    ),
+                )
+            )
+
+
+async def run_command_lines_in_process(
+    entry_name: str, command_lines: CommandLines
+) -> typing.Any:
+    """Await the given command lines in a child process."""
+    receiver, sender = process_context.Pipe(duplex=False)
+    with receiver:
+        with sender:
+            process = process_context.Process(
+                target=send_command_lines_result,
+                args=(command_lines, sender),
+                name=entry_name,
+                daemon=True,
+            )
+            process.start()
+
+        def receive() -> typing.Optional[tuple[bool, typing.Any]]:
+            try:
+                result: tuple[bool, typing.Any] = receiver.recv()
+            except EOFError:
+                return None
+            return result
+
+        # Reading in a thread rather than with `loop.add_reader`
+        # as the proactor event loop on Windows does not support it.
+        receiving = asyncio.ensure_future(asyncio.to_thread(receive))
+        try:
+            result = await asyncio.shield(receiving)
+            if result is None:
+                await asyncio.to_thread(process.join)
+                raise ProcessExited(
+                    "Launcher {} process exited with code {}.".format(
+                        entry_name, process.exitcode
+                    )
+                )
+            succeeded, value = result
+            if not succeeded:
+                raise value
+            return value
+        finally:
+            if process.is_alive():
+                process.terminate()
+            await asyncio.to_thread(process.join)
+            process.close()
+            # Threads cannot be cancelled, but the read stops
+            # once the process ends, and must before the pipe closes.
+            await asyncio.wait([receiving])
+
+
 class EventType(enum.Enum):
     START = enum.auto()
     STOP = enum.auto()
@@ -298,16 +774,94 @@ class Event:
     entry_name: str
 
 
+@dataclasses.dataclass
+class BatchResult:
+    """Outcome of :meth:`Registry.start_many` or :meth:`~Registry.stop_many`."""
+
+    succeeded: list[str] = dataclasses.field(default_factory=list)
+    """Launchers started or stopped, in the order requested."""
+    failed: dict[str, BaseException] = dataclasses.field(
+        default_factory=dict
+    )
+    """Launchers that failed to start or stop, with their exception."""
+
+
+@dataclasses.dataclass
+class ShutdownReport(BatchResult):
+    """Outcome of :meth:`Registry.shutdown`."""
+
+    forced: list[str] = dataclasses.field(default_factory=list)
+    """
+    Launchers cancelled after overrunning their grace period.
+
+    They are also reported as having succeeded or failed to stop.
+    """
+    abandoned: list[str] = dataclasses.field(default_factory=list)
+    """Launchers still stopping when the deadline was reached."""
+
+    @property
+    def slow(self) -> list[str]:
+        """Launchers that did not stop within their grace period."""
+        return self.forced + self.abandoned
+
+
+async def _gather_batch(
+    entry_names: list[str], tasks: list[asyncio.Task[typing.Any]]
+) -> BatchResult:
+    # Not using `asyncio.gather` because it cancels the tasks
+    # when cancelled, and the tasks may be awaited elsewhere.
+    if tasks:
+        await asyncio.wait(tasks)
+    result = BatchResult()
+    for entry_name, task in zip(entry_names, tasks):
+        if task.cancelled():
+            result.failed[entry_name] = asyncio.CancelledError()
+            continue
+        error = task.exception()
+        if error is None:
+            result.succeeded.append(entry_name)
+        else:
+            result.failed[entry_name] = error
+    return result
+
+
+async def _wait_until(
+    tasks: collections.abc.Iterable[asyncio.Task[typing.Any]],
+    ends_at: float,
+) -> None:
+    """Waits for ``tasks`` until the loop time ``ends_at``."""
+    pending_tasks = set(tasks)
+    if pending_tasks:
+        timeout = max(0.0, ends_at - asyncio.get_running_loop().time())
+        await asyncio.wait(pending_tasks, timeout=timeout)
+
+
 class Registry:
     def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
         # TODO[mypy issue 4001]: Remove type ignore.
         super().__init__(*args, **kwargs)  # type: ignore[call-arg]
         self._capability_registry = phile.capability.Registry()
         self._database = Database()
+        self._planner = Planner(database=self._database)
         self._running_tasks: dict[str, asyncio.Future[typing.Any]] = {}
         self._start_tasks: dict[str, asyncio.Task[typing.Any]] = {}
         self._stop_tasks: dict[str, asyncio.Task[typing.Any]] = {}
+        self._unordered_stops = set[str]()
+        """Launchers stopping without waiting on ordering dependencies."""
         self.event_queue = phile.asyncio.pubsub.Queue[Event]()
+        self.trace_recorder = phile.launcher.trace.Recorder()
+        """Timings of launchers starting and stopping."""
+        self.metrics_recorder = phile.launcher.metrics.Recorder()
+        """Latencies, restarts and exceptions of launchers."""
+        self.startup_profile: typing.Optional[
+            phile.launcher.profile.Profile
+        ] = None
+        """
+        Profile of a previous startup, to request slow launchers first.
+
+        It only changes the order launchers are requested to start in,
+        and so the order of imports in :meth:`prefetch_imports`.
+        """
         self.add_default_launchers()
 
     @property
@@ -318,6 +872,10 @@ class Registry:
     def database(self) -> Database:
         return self._database
 
+    @property
+    def planner(self) -> Planner:
+        return self._planner
+
     @property
     def state_machine(self) -> "Registry":
         return self
@@ -329,7 +887,12 @@ class Registry:
     def add_nowait(
         self, entry_name: str, descriptor: Descriptor
     ) -> None:
-        self._database.add(entry_name=entry_name, descriptor=descriptor)
+        database = self._database
+        database.add(entry_name=entry_name, descriptor=descriptor)
+        if database.on_demand[entry_name]:
+            self.capability_registry.demand_handlers[
+                database.capability_name[entry_name]
+            ] = functools.partial(self._start_on_demand, entry_name)
         self.event_queue.put(
             Event(type=EventType.ADD, entry_name=entry_name)
         )
@@ -343,7 +906,12 @@ class Registry:
             return
         if self.is_running(entry_name=entry_name):
             raise RuntimeError("Cannot remove a running launcher.")
-        self._database.remove(entry_name=entry_name)
+        database = self._database
+        if database.on_demand[entry_name]:
+            self.capability_registry.demand_handlers.pop(
+                database.capability_name[entry_name], None
+            )
+        database.remove(entry_name=entry_name)
         self.event_queue.put(
             Event(type=EventType.REMOVE, entry_name=entry_name)
         )
@@ -365,8 +933,252 @@ class Registry:
             entry_start_task.add_done_callback(
                 functools.partial(start_tasks.pop, entry_name)
             )
+            entry_start_task.add_done_callback(
+                functools.partial(self._record_exception, entry_name)
+            )
         return entry_start_task
 
+    def _start_on_demand(self, entry_name: str) -> None:
+        """Starts ``entry_name`` for waiters of its capability."""
+        self.start(entry_name).add_done_callback(
+            functools.partial(
+                self._fail_capability_waiters,
+                self._database.capability_name[entry_name],
+            )
+        )
+
+    def _fail_capability_waiters(
+        self, capability_name: str, task: asyncio.Task[typing.Any]
+    ) -> None:
+        """Passes on failures in starting a launcher to its waiters."""
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self.capability_registry.set_exception(
+                capability_name, error
+            )
+
+    async def start_planned(
+        self, entry_names: collections.abc.Iterable[str]
+    ) -> BatchResult:
+        """
+        Starts ``entry_names`` and launchers they bind to.
+
+        Every launcher is requested to start at once,
+        in the order given by :attr:`planner`,
+        or by :meth:`~phile.launcher.profile.Profile.get_start_order`
+        of :attr:`startup_profile` if any.
+        Each launcher then waits only on the launchers
+        it is ordered after, so a slow or failing launcher
+        does not delay launchers that do not depend on it.
+        Returns the outcome of every launcher started.
+        Raises :exc:`CycleError` without starting any launchers
+        if their ordering dependencies have a cycle.
+        """
+        return await self.start_many(entry_names)
+
+    def _get_start_order(
+        self, entry_names: collections.abc.Iterable[str]
+    ) -> list[str]:
+        planner = self._planner
+        start_order = [
+            entry_name
+            for wave in planner.get_waves(entry_names)
+            for entry_name in wave
+        ]
+        startup_profile = self.startup_profile
+        if startup_profile is None:
+            return start_order
+        return startup_profile.get_start_order(
+            start_order, planner.predecessors
+        )
+
+    def start_many(
+        self, entry_names: collections.abc.Iterable[str]
+    ) -> asyncio.Task[BatchResult]:
+        """
+        Starts ``entry_names`` and launchers they bind to.
+
+        The launchers are requested as in :meth:`start_planned`,
+        so that the dependency graph is only traversed once.
+        Requesting them in order means every launcher has a start task
+        before any of them checks what it is ordered after.
+        The returned task reports the outcome of every launcher started.
+        Cancelling it does not cancel starting of the launchers.
+        Raises :exc:`CycleError` without starting any launchers
+        if their ordering dependencies have a cycle.
+        """
+        entry_names = self._get_start_order(entry_names)
+        start = self.start
+        return asyncio.create_task(
+            _gather_batch(
+                entry_names,
+                [start(entry_name) for entry_name in entry_names],
+            )
+        )
+
+    def stop_many(
+        self, entry_names: collections.abc.Iterable[str]
+    ) -> asyncio.Task[BatchResult]:
+        """
+        Stops ``entry_names`` and launchers binding to them.
+
+        Stopping is requested in the order of
+        :meth:`Planner.get_stop_waves`.
+        The returned task reports the outcome of every launcher stopped.
+        Cancelling it does not cancel stopping of the launchers.
+        Raises :exc:`CycleError` without stopping any launchers
+        if their ordering dependencies have a cycle.
+        """
+        entry_names = [
+            entry_name
+            for wave in self._planner.get_stop_waves(entry_names)
+            for entry_name in wave
+        ]
+        stop = self.stop
+        return asyncio.create_task(
+            _gather_batch(
+                entry_names,
+                [stop(entry_name) for entry_name in entry_names],
+            )
+        )
+
+    async def shutdown(
+        self,
+        *,
+        deadline: datetime.timedelta = default_shutdown_deadline,
+        grace_period: datetime.timedelta = default_stop_grace_period,
+    ) -> ShutdownReport:
+        """
+        Stops all starting or running launchers within ``deadline``.
+
+        Launchers are stopped in the waves of
+        :meth:`Planner.get_stop_waves`,
+        with launchers in the same wave stopping concurrently.
+        Each wave is given ``grace_period`` to stop,
+        after which launchers still stopping are cancelled,
+        interrupting their :attr:`~Descriptor.exec_stop` if necessary.
+        Once ``deadline`` is reached,
+        launchers still stopping are left as they are
+        and the remaining waves are only cancelled.
+        If the launchers cannot be ordered because of a cycle,
+        the error is logged and they are stopped as a single wave.
+        """
+        loop = asyncio.get_running_loop()
+        ends_at = loop.time() + deadline.total_seconds()
+        start_tasks = self._start_tasks
+        running_tasks = self._running_tasks
+        active = set(start_tasks) | set(running_tasks)
+        report = ShutdownReport()
+        try:
+            waves = self._planner.get_stop_waves(active)
+        except CycleError as error:
+            # Stopping in any order is better than not stopping.
+            # Ordering is ignored, or launchers in the cycle
+            # would wait on each other forever.
+            _logger.error(
+                "Stopping launchers concurrently instead: %s", error
+            )
+            waves = (tuple(sorted(active)),)
+            self._unordered_stops.update(active)
+        for wave in waves:
+            stop_tasks = {
+                entry_name: self.stop(entry_name)
+                for entry_name in wave
+                if entry_name in active
+            }
+            if not stop_tasks:
+                continue
+            await _wait_until(
+                stop_tasks.values(),
+                min(loop.time() + grace_period.total_seconds(), ends_at),
+            )
+            overrunning = [
+                entry_name
+                for entry_name, stop_task in stop_tasks.items()
+                if not stop_task.done()
+            ]
+            for entry_name in overrunning:
+                _logger.warning(
+                    "Launcher %s did not stop in time. Cancelling.",
+                    entry_name,
+                )
+                for task in (
+                    start_tasks.get(entry_name),
+                    running_tasks.get(entry_name),
+                ):
+                    if task is not None:
+                        task.cancel()
+            await _wait_until(
+                (stop_tasks[entry_name] for entry_name in overrunning),
+                ends_at,
+            )
+            for entry_name in overrunning:
+                if stop_tasks[entry_name].done():
+                    report.forced.append(entry_name)
+                else:
+                    del stop_tasks[entry_name]
+                    report.abandoned.append(entry_name)
+            result = await _gather_batch(
+                list(stop_tasks), list(stop_tasks.values())
+            )
+            report.succeeded.extend(result.succeeded)
+            report.failed.update(result.failed)
+        # In case some were already stopping before the shutdown.
+        self._unordered_stops.difference_update(active)
+        if report.abandoned:
+            _logger.warning(
+                "Launchers did not stop before the deadline: %s",
+                ", ".join(report.abandoned),
+            )
+        return report
+
+    async def prefetch_imports(
+        self,
+        entry_names: collections.abc.Iterable[str],
+        *,
+        worker_count: int = 1,
+    ) -> None:
+        """
+        Imports modules of launchers started by :meth:`start_planned`.
+
+        The :attr:`~Descriptor.imports` of the launchers are imported
+        in ``worker_count`` threads, in the order of :attr:`planner`,
+        so that importing overlaps with launchers starting
+        instead of blocking the event loop.
+        Failing imports are logged and ignored.
+        The launchers import the modules themselves anyway,
+        and would report the failure if it matters.
+        Importing a module being imported by another thread
+        waits for it, so this is safe to run while launchers start.
+        Modules imported in the :attr:`startup_profile`
+        are also imported, after the declared ones.
+        """
+        imports = self._database.imports
+        module_names: list[str] = []
+        for entry_name in self._get_start_order(entry_names):
+            module_names.extend(sorted(imports.get(entry_name, ())))
+        startup_profile = self.startup_profile
+        if startup_profile is not None:
+            module_names.extend(startup_profile.module_names)
+        module_names = [
+            module_name
+            for module_name in dict.fromkeys(module_names)
+            if module_name not in sys.modules
+        ]
+        if not module_names:
+            return
+        worker_count = max(1, min(worker_count, len(module_names)))
+        await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    _import_modules, module_names[index::worker_count]
+                )
+                for index in range(worker_count)
+            )
+        )
+
     def stop(
         self,
         entry_name: str,
@@ -394,16 +1206,40 @@ class Registry:
         if entry_name in running_tasks:
             return
         running_tasks = self._running_tasks
+        trace_recorder = self.trace_recorder
+        requested_at = trace_recorder.clock()
         await self._ensure_ready_to_start(entry_name)
+        dependencies_ready_at = trace_recorder.clock()
+        trace_recorder.add_span(
+            entry_name,
+            phile.launcher.trace.WAIT_DEPENDENCIES,
+            requested_at,
+            dependencies_ready_at,
+        )
         _logger.debug("Launcher %s is starting.", entry_name)
         main_task = await self._start_main_task(entry_name)
+        started_at = trace_recorder.clock()
+        trace_recorder.add_span(
+            entry_name,
+            phile.launcher.trace.START,
+            dependencies_ready_at,
+            started_at,
+        )
+        self.metrics_recorder.record_start(
+            entry_name, started_at - requested_at
+        )
         _logger.debug("Launcher %s has started.", entry_name)
         running_tasks[entry_name] = runner_task = asyncio.create_task(
-            self._clean_up_on_stop(entry_name, main_task)
+            self._clean_up_on_stop(
+                entry_name, main_task, started_at=started_at
+            )
         )
         runner_task.add_done_callback(
             functools.partial(running_tasks.pop, entry_name)
         )
+        runner_task.add_done_callback(
+            functools.partial(self._record_exception, entry_name)
+        )
         self.event_queue.put(
             Event(type=EventType.START, entry_name=entry_name)
         )
@@ -414,6 +1250,14 @@ class Registry:
                 )
             )
         )
+        idle_timeout = self._database.idle_timeout[entry_name]
+        if idle_timeout is not None:
+            idle_task = asyncio.create_task(
+                self._stop_when_idle(entry_name, idle_timeout)
+            )
+            runner_task.add_done_callback(
+                lambda _task: idle_task.cancel()
+            )
 
     async def _do_stop(self, entry_name: str) -> None:
         entry_start_task = self._start_tasks.get(entry_name)
@@ -424,56 +1268,130 @@ class Registry:
             await phile.asyncio.cancel_and_wait(entry_running_task)
 
     async def _clean_up_on_stop(
-        self, entry_name: str, main_task: asyncio.Future[typing.Any]
+        self,
+        entry_name: str,
+        main_task: asyncio.Future[typing.Any],
+        *,
+        started_at: float,
     ) -> None:
+        trace_recorder = self.trace_recorder
+        add_span = functools.partial(trace_recorder.add_span, entry_name)
         try:
             # A forced cancellation from this function
             # should not happen until dependents are processed
             # and a graceful shutdown is attempted.
             await asyncio.shield(main_task)
         finally:
+            stopping_at = trace_recorder.clock()
+            add_span(
+                phile.launcher.trace.RUNNING, started_at, stopping_at
+            )
             try:
                 await self._ensure_ready_to_stop(entry_name)
             finally:
+                dependents_stopped_at = trace_recorder.clock()
+                add_span(
+                    phile.launcher.trace.WAIT_DEPENDENTS,
+                    stopping_at,
+                    dependents_stopped_at,
+                )
                 try:
                     _logger.debug("Launcher %s is stopping.", entry_name)
                     await self._run_command_lines(
                         self._database.exec_stop[entry_name]
                     )
                 finally:
+                    exec_stopped_at = trace_recorder.clock()
+                    add_span(
+                        phile.launcher.trace.EXEC_STOP,
+                        dependents_stopped_at,
+                        exec_stopped_at,
+                    )
                     # TODO(BoniLindsley): What to do with exceptions?
                     await phile.asyncio.cancel_and_wait(main_task)
+                    add_span(
+                        phile.launcher.trace.CLEAN_UP, exec_stopped_at
+                    )
+                    self.metrics_recorder.record_stop(
+                        entry_name, trace_recorder.clock() - stopping_at
+                    )
                     _logger.debug("Launcher %s has stopped.", entry_name)
 
+    async def _stop_when_idle(
+        self, entry_name: str, idle_timeout: datetime.timedelta
+    ) -> None:
+        """Stops ``entry_name`` after it has been idle for a while."""
+        event_view = self.event_queue.__aiter__()
+        get_relations = self._database.get_relations
+        start_tasks = self._start_tasks
+        running_tasks = self._running_tasks
+
+        def is_idle() -> bool:
+            return not any(
+                dependent in start_tasks or dependent in running_tasks
+                for dependent in get_relations(entry_name).bound_by
+            )
+
+        async def wait_until(
+            predicate: collections.abc.Callable[[], bool]
+        ) -> None:
+            async for _event in event_view:  # pragma: no branch
+                if predicate():
+                    break
+
+        while True:
+            if not is_idle():
+                await wait_until(is_idle)
+                continue
+            try:
+                await phile.asyncio.wait_for(
+                    wait_until(lambda: not is_idle()), idle_timeout
+                )
+            except asyncio.TimeoutError:
+                # Dependents starting do not emit events.
+                # So check again to be sure.
+                if is_idle():
+                    break
+        _logger.debug(
+            "Launcher %s is stopping as it is idle.", entry_name
+        )
+        self.stop(entry_name)
+
     async def _ensure_ready_to_start(self, entry_name: str) -> None:
         database = self._database
+        if not database.contains(entry_name):
+            raise KeyError(entry_name)
+        relations = database.get_relations(entry_name)
         stop = self.stop
         _logger.debug("Launcher %s is stopping conflicts.", entry_name)
-        for conflict in database.conflicts.get(
-            entry_name, set()
-        ) | database.conflicts.inverses.get(entry_name, set()):
+        for conflict in relations.conflicts:
             stop(conflict)
         _logger.debug(
             "Launcher %s is starting dependencies.", entry_name
         )
         start = self.start
-        for dependency in database.binds_to[entry_name]:
+        running_tasks = self._running_tasks
+        start_tasks = self._start_tasks
+        stop_tasks = self._stop_tasks
+        for dependency in relations.binds_to:
+            # Dependencies already starting or started need no new task.
+            if dependency in start_tasks or (
+                dependency in running_tasks
+                and dependency not in stop_tasks
+            ):
+                continue
             start(dependency)
         _logger.debug(
             "Launcher %s is waiting on dependencies.", entry_name
         )
-        after = database.after.get(
-            entry_name, set()
-        ) | database.before.inverses.get(entry_name, set())
-        before = database.before.get(
-            entry_name, set()
-        ) | database.after.inverses.get(entry_name, set())
+        after = relations.after
         pending_tasks = set(
             filter(
                 None,
                 itertools.chain(
-                    map(self._stop_tasks.get, after | before),
-                    map(self._start_tasks.get, after),
+                    map(stop_tasks.get, after),
+                    map(stop_tasks.get, relations.before),
+                    map(start_tasks.get, after),
                 ),
             )
         )
@@ -481,17 +1399,16 @@ class Registry:
             await asyncio.wait(pending_tasks)
 
     async def _ensure_ready_to_stop(self, entry_name: str) -> None:
-        database = self._database
+        relations = self._database.get_relations(entry_name)
         _logger.debug("Launcher %s is stopping dependents.", entry_name)
-        for dependent in database.binds_to.inverses.get(
-            entry_name, set()
-        ):
+        for dependent in relations.bound_by:
             self.stop(dependent)
-        before = database.before.get(
-            entry_name, set()
-        ) | database.after.inverses.get(entry_name, set())
+        unordered_stops = self._unordered_stops
+        if entry_name in unordered_stops:
+            unordered_stops.discard(entry_name)
+            return
         pending_tasks = set(
-            filter(None, map(self._stop_tasks.get, before))
+            filter(None, map(self._stop_tasks.get, relations.before))
         )
         if pending_tasks:
             _logger.debug(
@@ -505,56 +1422,82 @@ class Registry:
         self, entry_name: str
     ) -> asyncio.Future[typing.Any]:
         database = self._database
+        unit_type = database.type[entry_name]
+        exec_start = database.exec_start[entry_name]
         main_task: asyncio.Future[typing.Any] = asyncio.create_task(
-            self._run_command_lines(database.exec_start[entry_name])
+            run_command_lines_in_process(entry_name, exec_start)
+            if unit_type is Type.PROCESS
+            else self._run_command_lines(exec_start)
+        )
+        trace_recorder = self.trace_recorder
+        exec_started_at = trace_recorder.clock()
+        main_task.add_done_callback(
+            lambda _task: trace_recorder.add_span(
+                entry_name,
+                phile.launcher.trace.EXEC_START,
+                exec_started_at,
+            )
         )
         try:
-            unit_type = database.type[entry_name]
-            if unit_type is Type.EXEC:
+            if unit_type is Type.EXEC or unit_type is Type.PROCESS:
                 await asyncio.sleep(0)
             elif unit_type is Type.FORKING:
                 main_task = await main_task
                 assert isinstance(main_task, asyncio.Future)
             elif unit_type is Type.CAPABILITY:
-                expected_capability_name = database.capability_name[
-                    entry_name
-                ]
-                # TODO(BoniLindsley): Stop on capability unregistering.
-                # Need to use the same event_view as here
-                # to not miss any events.
-                event_view = (
-                    self.capability_registry.event_queue.__aiter__()
-                )
-                capabilities_set: list[str] = []
-                async for event in event_view:  # pragma: no branch
-                    if event.type is not (
-                        phile.capability.EventType.SET
-                    ):
-                        continue
-                    capability_name = (
-                        event.capability.__module__
-                        + "."
-                        + event.capability.__qualname__
-                    )
-                    capabilities_set.append(capability_name)
-                    if capability_name == expected_capability_name:
-                        break
-                if not capabilities_set or (
-                    capabilities_set[-1] != expected_capability_name
-                ):
-                    raise CapabilityNotSet(
-                        "Launcher {} did not set capability {}.\n"
-                        "Only detected the following: {}".format(
-                            entry_name,
-                            expected_capability_name,
-                            capabilities_set,
-                        )
-                    )
+                await self._wait_for_capability(entry_name, main_task)
             return main_task
         except:
             await phile.asyncio.cancel_and_wait(main_task)
             raise
 
+    async def _wait_for_capability(
+        self, entry_name: str, main_task: asyncio.Future[typing.Any]
+    ) -> None:
+        """
+        Waits for capability of ``entry_name`` to be set.
+
+        Raises :exc:`CapabilityNotSet`
+        if ``main_task`` finishes before it is set.
+        Once set, the launcher is stopped if the capability is removed
+        while ``main_task`` is still running.
+        """
+        capability_name = self._database.capability_name[entry_name]
+        capability_registry = self.capability_registry
+        capability_set = asyncio.create_task(
+            capability_registry.wait_for(capability_name)
+        )
+        try:
+            await asyncio.wait(
+                (capability_set, main_task),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            capability_set.cancel()
+        if not capability_set.done():
+            raise CapabilityNotSet(
+                "Launcher {} did not set capability {}.".format(
+                    entry_name, capability_name
+                )
+            )
+        capability_removed = asyncio.create_task(
+            capability_registry.wait_for_removal(capability_name)
+        )
+
+        def stop_if_running(task: asyncio.Task[None]) -> None:
+            if not task.cancelled() and not main_task.done():
+                _logger.debug(
+                    "Launcher %s is stopping as capability %s is removed.",
+                    entry_name,
+                    capability_name,
+                )
+                self.stop(entry_name)
+
+        capability_removed.add_done_callback(stop_if_running)
+        main_task.add_done_callback(
+            lambda _task: capability_removed.cancel()
+        )
+
     async def _run_command_lines(
         self, command_lines: CommandLines
     ) -> typing.Any:
@@ -564,9 +1507,34 @@ class Registry:
             return_value = await command()
         return return_value
 
+    def _record_exception(
+        self, entry_name: str, task: asyncio.Task[typing.Any]
+    ) -> None:
+        if not task.cancelled():
+            exception = task.exception()
+            if exception is not None:
+                self.metrics_recorder.record_exception(
+                    entry_name, exception
+                )
+
     def is_running(self, entry_name: str) -> bool:
         return entry_name in self._running_tasks
 
+    def get_state_counts(self) -> dict[str, int]:
+        """Returns the number of launchers in each transitional state."""
+        return {
+            "starting": len(self._start_tasks),
+            "running": len(self._running_tasks),
+            "stopping": len(self._stop_tasks),
+        }
+
+    def get_metrics(self) -> dict[str, typing.Any]:
+        """Returns a JSON serialisable summary of launcher metrics."""
+        return {
+            "states": self.get_state_counts(),
+            "units": self.metrics_recorder.to_dict(),
+        }
+
     def add_default_launchers(self) -> None:
         self.add_nowait(
             "phile_shutdown.target",
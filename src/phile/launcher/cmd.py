@@ -5,6 +5,8 @@ import asyncio
 import cmd
 import contextlib
 import functools
+import json
+import pathlib
 import shlex
 import sys
 import typing
@@ -14,6 +16,7 @@ import phile
 import phile.capability
 import phile.cmd
 import phile.launcher
+import phile.launcher.trace
 import phile.main
 
 
@@ -62,9 +65,23 @@ class Cmd(cmd.Cmd):
                     )
                 )
                 return
-        for launcher_id in launcher_ids:
-            launcher_name = self.known_launchers[launcher_id]
-            self._launcher_registry.state_machine.start(launcher_name)
+        try:
+            start_many = (
+                self._launcher_registry.state_machine.start_many(
+                    self.known_launchers[launcher_id]
+                    for launcher_id in launcher_ids
+                )
+            )
+        except phile.launcher.CycleError as error:
+            self.stdout.write(
+                "Unable to start launchers: {error}\n".format(
+                    error=error
+                )
+            )
+            return
+        start_many.add_done_callback(
+            functools.partial(self._write_failures, "start")
+        )
         self.stdout.write(
             "Started {count} launchers.\n".format(
                 count=len(launcher_ids)
@@ -94,15 +111,109 @@ class Cmd(cmd.Cmd):
                     )
                 )
                 return
-        for launcher_id in launcher_ids:
-            launcher_name = self.known_launchers[launcher_id]
-            self._launcher_registry.state_machine.stop(launcher_name)
+        try:
+            stop_many = self._launcher_registry.state_machine.stop_many(
+                self.known_launchers[launcher_id]
+                for launcher_id in launcher_ids
+            )
+        except phile.launcher.CycleError as error:
+            self.stdout.write(
+                "Unable to stop launchers: {error}\n".format(error=error)
+            )
+            return
+        stop_many.add_done_callback(
+            functools.partial(self._write_failures, "stop")
+        )
         self.stdout.write(
             "Stopped {count} launchers.\n".format(
                 count=len(launcher_ids)
             )
         )
 
+    def do_trace(self, arg: str) -> None:
+        """Write launcher timings to a Chrome trace event JSON file."""
+        argv = shlex.split(arg)
+        if len(argv) != 1:
+            self.stdout.write("Usage: trace FILE\n")
+            return
+        trace_recorder = self._launcher_registry.trace_recorder
+        try:
+            with pathlib.Path(argv[0]).open("w") as file:
+                trace_recorder.dump(file)
+        except OSError as error:
+            self.stdout.write(
+                "Unable to write trace: {error}\n".format(error=error)
+            )
+            return
+        self.stdout.write(
+            "Wrote {count} spans to {path}.\n".format(
+                count=len(trace_recorder.spans), path=argv[0]
+            )
+        )
+
+    def do_critical_path(self, arg: str) -> None:
+        """Show launchers that delayed the last one to start."""
+        del arg
+        critical_path = phile.launcher.trace.get_critical_path(
+            self._launcher_registry.trace_recorder.spans,
+            self._launcher_registry.planner.predecessors,
+        )
+        if not critical_path:
+            self.stdout.write("No launchers have started.\n")
+            return
+        self.stdout.write(
+            "Critical path of {count} launchers"
+            " took {duration:.3f} s.\n".format(
+                count=len(critical_path),
+                duration=critical_path[-1].end - critical_path[0].start,
+            )
+        )
+        for span in critical_path:
+            self.stdout.write(
+                "[{duration:.3f} s] {name}\n".format(
+                    duration=span.duration, name=span.entry_name
+                )
+            )
+
+    def do_metrics(self, arg: str) -> None:
+        """Show launcher metrics. Use ``metrics json`` for JSON."""
+        argv = shlex.split(arg)
+        if argv not in ([], ["json"]):
+            self.stdout.write("Usage: metrics [json]\n")
+            return
+        metrics = self._launcher_registry.get_metrics()
+        write = self.stdout.write
+        if argv:
+            write(json.dumps(metrics, sort_keys=True))
+            write("\n")
+            return
+        write(
+            "{starting} starting, {running} running,"
+            " {stopping} stopping.\n".format(**metrics["states"])
+        )
+        for name, unit in metrics["units"].items():
+            start_latency = unit["start_latency"]
+            stop_latency = unit["stop_latency"]
+            write(
+                "{name}: {start_count} starts ({restart_count} restarts),"
+                " {mean_start:.3f} s mean start,"
+                " {mean_stop:.3f} s mean stop,"
+                " {exception_count} exceptions\n".format(
+                    name=name,
+                    mean_start=(
+                        start_latency["sum"] / start_latency["count"]
+                        if start_latency["count"]
+                        else 0.0
+                    ),
+                    mean_stop=(
+                        stop_latency["sum"] / stop_latency["count"]
+                        if stop_latency["count"]
+                        else 0.0
+                    ),
+                    **unit,
+                )
+            )
+
     def do_list(self, arg: str) -> None:
         del arg
         current_launchers = set(self._launcher_registry.database.type)
@@ -133,6 +244,21 @@ class Cmd(cmd.Cmd):
                         )
                     )
 
+    def _write_failures(
+        self,
+        action: str,
+        task: asyncio.Task[phile.launcher.BatchResult],
+    ) -> None:
+        """Writes launchers that failed to ``action`` in a batch."""
+        if task.cancelled():
+            return
+        for name, error in task.result().failed.items():
+            self.stdout.write(
+                "Unable to {action} {name}: {error!r}\n".format(
+                    action=action, name=name, error=error
+                )
+            )
+
     def _assign_id(self, launcher: str) -> None:
         new_id = len(self.known_launchers)
         launcher_id = self.launcher_ids.setdefault(launcher, new_id)
@@ -8,12 +8,57 @@
 # in a certain platform, and not import it.
 # Standard library.
 import asyncio
+import collections.abc
 import functools
 import typing
 
 # Internal packages.
+import phile.asyncio
+import phile.capability
 import phile.launcher
 
+if typing.TYPE_CHECKING:  # pragma: no cover
+    import phile.configuration
+
+
+async def _run_until_removed(
+    capability_registry: phile.capability.Registry,
+    capability: type,
+    awaitable: collections.abc.Awaitable[typing.Any],
+) -> None:
+    """
+    Awaits ``awaitable``, cancelling it if ``capability`` is removed.
+
+    Launchers using capabilities of on-demand launchers
+    do not bind to them, so that the capabilities start when waited for.
+    This stops them with the capability instead.
+    """
+    async with phile.asyncio.open_task(
+        awaitable, suppress_cancelled_error_if_not_done=True
+    ) as task:
+        removed = asyncio.create_task(
+            capability_registry.wait_for_removal(capability)
+        )
+        try:
+            await asyncio.wait(
+                (task, removed), return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            await phile.asyncio.cancel_and_wait(removed)
+
+
+def _get_notify_target_type(
+    configuration: "phile.configuration.Entries",
+) -> type:
+    """Returns the target type of the configured notify backend."""
+    if configuration.notify_backend == "log":
+        import phile.notify.log
+
+        return phile.notify.log.Target
+    import phile.notify.watchdog
+
+    return phile.notify.watchdog.Target
+
 
 def add_configuration(
     launcher_registry: phile.launcher.Registry,
@@ -31,6 +76,7 @@ def add_configuration(
         phile.launcher.Descriptor(
             capability_name="phile.configuration.Entries",
             exec_start=[run],
+            imports={"phile.configuration"},
             type=phile.launcher.Type.CAPABILITY,
         ),
     )
@@ -79,6 +125,11 @@ def add_hotkey_pynput(
                 "phile.trigger.launcher",
             },
             exec_start=[run_pynput],
+            imports={
+                "phile.configuration",
+                "phile.hotkey.pynput",
+                "phile.trigger",
+            },
         ),
     )
 
@@ -120,6 +171,12 @@ def add_hotkey_pyside2(
                 "pyside2",
             },
             exec_start=[run],
+            imports={
+                "phile.PySide2.QtCore",
+                "phile.configuration",
+                "phile.hotkey.pyside2",
+                "phile.trigger",
+            },
         ),
     )
 
@@ -139,6 +196,10 @@ def add_launcher_cmd(launcher_registry: phile.launcher.Registry) -> None:
         "phile.launcher.cmd",
         phile.launcher.Descriptor(
             exec_start=[run],
+            imports={
+                "phile.cmd",
+                "phile.launcher.cmd",
+            },
         ),
     )
 
@@ -191,6 +252,7 @@ def add_log_file(launcher_registry: phile.launcher.Registry) -> None:
             after={"phile.configuration"},
             binds_to={"phile.configuration"},
             exec_start=[start],
+            imports={"phile.configuration"},
             type=phile.launcher.Type.FORKING,
         ),
     )
@@ -241,6 +303,7 @@ def add_log_stderr(launcher_registry: phile.launcher.Registry) -> None:
             after={"phile.configuration"},
             binds_to={"phile.configuration"},
             exec_start=[start],
+            imports={"phile.configuration"},
             type=phile.launcher.Type.FORKING,
         ),
     )
@@ -261,6 +324,8 @@ def add_keyring(launcher_registry: phile.launcher.Registry) -> None:
         phile.launcher.Descriptor(
             capability_name="keyring.backend.KeyringBackend",
             exec_start=[run],
+            imports={"keyring"},
+            on_demand=True,
             type=phile.launcher.Type.CAPABILITY,
         ),
     )
@@ -268,12 +333,23 @@ def add_keyring(launcher_registry: phile.launcher.Registry) -> None:
 
 def add_notify(launcher_registry: phile.launcher.Registry) -> None:
     async def run() -> None:
+        import phile.configuration
         import phile.notify
 
-        notify_registry = phile.notify.Registry()
+        configuration = launcher_registry.capability_registry[
+            phile.configuration.Entries
+        ]
+        min_update_interval = configuration.notify_min_update_interval
+        notify_registry = (
+            phile.notify.Registry()
+            if min_update_interval is None
+            else phile.notify.ThrottledRegistry(
+                min_interval=min_update_interval
+            )
+        )
         try:
             with launcher_registry.capability_registry.provide(
-                notify_registry
+                notify_registry, phile.notify.Registry
             ):
                 await asyncio.get_running_loop().create_future()
         finally:
@@ -282,8 +358,99 @@ def add_notify(launcher_registry: phile.launcher.Registry) -> None:
     launcher_registry.add_nowait(
         "phile.notify",
         phile.launcher.Descriptor(
+            after={"phile.configuration"},
+            binds_to={"phile.configuration"},
             capability_name="phile.notify.Registry",
             exec_start=[run],
+            imports={"phile.configuration", "phile.notify"},
+            type=phile.launcher.Type.CAPABILITY,
+        ),
+    )
+
+
+def add_notify_expiry(
+    launcher_registry: phile.launcher.Registry,
+) -> None:
+    async def run() -> None:
+        import phile.configuration
+        import phile.notify
+        import phile.notify.expiry
+
+        capability_registry = launcher_registry.capability_registry
+        configuration = capability_registry[phile.configuration.Entries]
+        target_type = _get_notify_target_type(configuration)
+        await launcher_registry.start(
+            "phile.notify." + configuration.notify_backend
+        )
+        await _run_until_removed(
+            capability_registry,
+            target_type,
+            phile.notify.expiry.run(
+                notify_registry=capability_registry[
+                    phile.notify.Registry
+                ],
+                target=capability_registry[target_type],
+            ),
+        )
+
+    launcher_registry.add_nowait(
+        "phile.notify.expiry",
+        phile.launcher.Descriptor(
+            after={"phile.configuration", "phile.notify"},
+            binds_to={"phile.configuration", "phile.notify"},
+            exec_start=[run],
+            imports={
+                "phile.configuration",
+                "phile.notify",
+                "phile.notify.expiry",
+            },
+        ),
+    )
+
+
+def add_notify_log(
+    launcher_registry: phile.launcher.Registry,
+) -> None:
+    async def run() -> None:
+        import phile.configuration
+        import phile.notify
+        import phile.notify.log
+        import phile.watchdog.asyncio
+
+        capability_registry = launcher_registry.capability_registry
+        async with phile.notify.log.async_open(
+            configuration=capability_registry[
+                phile.configuration.Entries
+            ],
+            observer=(
+                capability_registry[phile.watchdog.asyncio.BaseObserver]
+            ),
+            notify_registry=capability_registry[phile.notify.Registry],
+        ) as notify_target:
+            with capability_registry.provide(notify_target):
+                await asyncio.get_running_loop().create_future()
+
+    launcher_registry.add_nowait(
+        "phile.notify.log",
+        phile.launcher.Descriptor(
+            after={
+                "phile.configuration",
+                "phile.notify",
+                "watchdog.asyncio.observer",
+            },
+            binds_to={
+                "phile.configuration",
+                "phile.notify",
+                "watchdog.asyncio.observer",
+            },
+            capability_name="phile.notify.log.Target",
+            exec_start=[run],
+            imports={
+                "phile.configuration",
+                "phile.notify",
+                "phile.notify.log",
+                "phile.watchdog.asyncio",
+            },
             type=phile.launcher.Type.CAPABILITY,
         ),
     )
@@ -321,6 +488,42 @@ def add_notify_pyside2(
                 "pyside2",
             },
             exec_start=[run],
+            imports={
+                "phile.PySide2.QtCore",
+                "phile.notify",
+                "phile.notify.pyside2",
+                "phile.trigger",
+            },
+        ),
+    )
+
+
+def add_notify_search(
+    launcher_registry: phile.launcher.Registry,
+) -> None:
+    async def run() -> None:
+        import phile.notify
+        import phile.notify.search
+
+        capability_registry = launcher_registry.capability_registry
+        index = phile.notify.search.Index()
+        with capability_registry.provide(index):
+            await phile.notify.search.run(
+                notify_registry=capability_registry[
+                    phile.notify.Registry
+                ],
+                index=index,
+            )
+
+    launcher_registry.add_nowait(
+        "phile.notify.search",
+        phile.launcher.Descriptor(
+            after={"phile.notify"},
+            binds_to={"phile.notify"},
+            capability_name="phile.notify.search.Index",
+            exec_start=[run],
+            imports={"phile.notify", "phile.notify.search"},
+            type=phile.launcher.Type.CAPABILITY,
         ),
     )
 
@@ -330,18 +533,24 @@ def add_notify_watchdog(
 ) -> None:
     async def run() -> None:
         import phile.configuration
+        import phile.notify
         import phile.notify.watchdog
         import phile.watchdog.asyncio
 
         capability_registry = launcher_registry.capability_registry
+        configuration = capability_registry[phile.configuration.Entries]
+        text_cache_size = configuration.notify_text_cache_size
         async with phile.notify.watchdog.async_open(
-            configuration=(
-                capability_registry[phile.configuration.Entries]
-            ),
+            configuration=configuration,
             observer=(
                 capability_registry[phile.watchdog.asyncio.BaseObserver]
             ),
             notify_registry=capability_registry[phile.notify.Registry],
+            text_cache=(
+                None
+                if text_cache_size is None
+                else phile.notify.TextCache(max_size=text_cache_size)
+            ),
         ) as notify_target:
             with capability_registry.provide(notify_target):
                 await asyncio.get_running_loop().create_future()
@@ -361,6 +570,12 @@ def add_notify_watchdog(
             },
             capability_name="phile.notify.watchdog.Target",
             exec_start=[run],
+            imports={
+                "phile.configuration",
+                "phile.notify",
+                "phile.notify.watchdog",
+                "phile.watchdog.asyncio",
+            },
             type=phile.launcher.Type.CAPABILITY,
         ),
     )
@@ -383,6 +598,8 @@ def add_tmux(launcher_registry: phile.launcher.Registry) -> None:
         phile.launcher.Descriptor(
             capability_name="phile.tmux.control_mode.Client",
             exec_start=[run],
+            imports={"phile.tmux.control_mode"},
+            on_demand=True,
             type=phile.launcher.Type.CAPABILITY,
         ),
     )
@@ -406,6 +623,7 @@ def add_tray(launcher_registry: phile.launcher.Registry) -> None:
         phile.launcher.Descriptor(
             capability_name="phile.tray.Registry",
             exec_start=[run],
+            imports={"phile.tray"},
             type=phile.launcher.Type.CAPABILITY,
         ),
     )
@@ -430,6 +648,10 @@ def add_tray_datetime(
             after={"phile.tray.watchdog"},
             binds_to={"phile.tray.watchdog"},
             exec_start=[run],
+            imports={
+                "phile.tray.datetime",
+                "phile.tray.watchdog",
+            },
         ),
     )
 
@@ -441,22 +663,33 @@ def add_tray_imap(launcher_registry: phile.launcher.Registry) -> None:
         import phile.tray.imapclient
 
         capability_registry = launcher_registry.capability_registry
-        await phile.tray.imapclient.run(
-            configuration=(
-                capability_registry[phile.configuration.Entries]
+        # Started on demand by waiting for it.
+        keyring_backend = await capability_registry.wait_for(
+            # Use of abstract type as key is intended.
+            keyring.backend.KeyringBackend  # type: ignore[misc]
+        )
+        await _run_until_removed(
+            capability_registry,
+            keyring.backend.KeyringBackend,
+            phile.tray.imapclient.run(
+                configuration=(
+                    capability_registry[phile.configuration.Entries]
+                ),
+                keyring_backend=keyring_backend,
             ),
-            keyring_backend=capability_registry[
-                # Use of abstract type as key is intended.
-                keyring.backend.KeyringBackend  # type: ignore[misc]
-            ],
         )
 
     launcher_registry.add_nowait(
         "phile.tray.imapclient",
         phile.launcher.Descriptor(
-            after={"phile.configuration", "keyring"},
-            binds_to={"phile.configuration", "keyring"},
+            after={"phile.configuration"},
+            binds_to={"phile.configuration"},
             exec_start=[run],
+            imports={
+                "keyring",
+                "phile.configuration",
+                "phile.tray.imapclient",
+            },
         ),
     )
 
@@ -479,6 +712,11 @@ def add_tray_notify(launcher_registry: phile.launcher.Registry) -> None:
             after={"phile.notify", "phile.tray.watchdog"},
             binds_to={"phile.notify", "phile.tray.watchdog"},
             exec_start=[run],
+            imports={
+                "phile.notify",
+                "phile.tray.notify",
+                "phile.tray.watchdog",
+            },
         ),
     )
 
@@ -499,6 +737,10 @@ def add_tray_psutil(launcher_registry: phile.launcher.Registry) -> None:
             after={"phile.tray.watchdog"},
             binds_to={"phile.tray.watchdog"},
             exec_start=[run],
+            imports={
+                "phile.tray.psutil",
+                "phile.tray.watchdog",
+            },
         ),
     )
 
@@ -527,6 +769,11 @@ def add_tray_pyside2_window(
             after={"phile.tray.text", "pyside2"},
             binds_to={"phile.tray.text", "pyside2"},
             exec_start=[run],
+            imports={
+                "phile.PySide2.QtCore",
+                "phile.tray",
+                "phile.tray.pyside2_window",
+            },
         ),
     )
 
@@ -551,6 +798,7 @@ def add_tray_text(launcher_registry: phile.launcher.Registry) -> None:
             binds_to={"phile.tray"},
             capability_name="phile.tray.TextIcons",
             exec_start=[run],
+            imports={"phile.tray"},
             type=phile.launcher.Type.CAPABILITY,
         ),
     )
@@ -563,27 +811,31 @@ def add_tray_tmux(launcher_registry: phile.launcher.Registry) -> None:
         import phile.tray.tmux
 
         capability_registry = launcher_registry.capability_registry
-        control_mode = capability_registry[
+        # Started on demand by waiting for it.
+        control_mode = await capability_registry.wait_for(
             phile.tmux.control_mode.Client
-        ]
+        )
         text_icons = capability_registry[phile.tray.TextIcons]
-        await phile.tray.tmux.run(
-            control_mode=control_mode,
-            text_icons=text_icons,
+        await _run_until_removed(
+            capability_registry,
+            phile.tmux.control_mode.Client,
+            phile.tray.tmux.run(
+                control_mode=control_mode,
+                text_icons=text_icons,
+            ),
         )
 
     launcher_registry.add_nowait(
         "phile.tray.tmux",
         phile.launcher.Descriptor(
-            after={
-                "phile.tmux.control_mode",
-                "phile.tray.text",
-            },
-            binds_to={
+            after={"phile.tray.text"},
+            binds_to={"phile.tray.text"},
+            exec_start=[run],
+            imports={
                 "phile.tmux.control_mode",
-                "phile.tray.text",
+                "phile.tray",
+                "phile.tray.tmux",
             },
-            exec_start=[run],
         ),
     )
 
@@ -630,6 +882,11 @@ def add_tray_watchdog(
             },
             capability_name="phile.tray.watchdog.Target",
             exec_start=[run],
+            imports={
+                "phile.configuration",
+                "phile.tray.watchdog",
+                "phile.watchdog.asyncio",
+            },
             type=phile.launcher.Type.CAPABILITY,
         ),
     )
@@ -648,6 +905,7 @@ def add_trigger(launcher_registry: phile.launcher.Registry) -> None:
         phile.launcher.Descriptor(
             capability_name="phile.trigger.Registry",
             exec_start=[run],
+            imports={"phile.trigger"},
             type=phile.launcher.Type.CAPABILITY,
         ),
     )
@@ -677,6 +935,10 @@ def add_trigger_launcher(
             binds_to={"phile.trigger"},
             capability_name="phile.trigger.launcher.Producer",
             exec_start=[run],
+            imports={
+                "phile.trigger",
+                "phile.trigger.launcher",
+            },
             type=phile.launcher.Type.CAPABILITY,
         ),
     )
@@ -722,6 +984,12 @@ def add_trigger_watchdog(
                 "watchdog.asyncio.observer",
             },
             exec_start=[start],
+            imports={
+                "phile.configuration",
+                "phile.trigger",
+                "phile.trigger.watchdog",
+                "phile.watchdog.asyncio",
+            },
             type=phile.launcher.Type.FORKING,
         ),
     )
@@ -764,6 +1032,12 @@ def add_pyside2(launcher_registry: phile.launcher.Registry) -> None:
         phile.launcher.Descriptor(
             capability_name="phile.PySide2.QtCore.Executor",
             exec_start=[run],
+            imports={
+                "PySide2.QtCore",
+                "PySide2.QtGui",
+                "PySide2.QtWidgets",
+                "phile.PySide2.QtCore",
+            },
             type=phile.launcher.Type.CAPABILITY,
         ),
     )
@@ -786,6 +1060,7 @@ def add_watchdog_asyncio_observer(
         phile.launcher.Descriptor(
             capability_name="phile.watchdog.asyncio.BaseObserver",
             exec_start=[run],
+            imports={"phile.watchdog.asyncio"},
             type=phile.launcher.Type.CAPABILITY,
         ),
     )
@@ -801,7 +1076,10 @@ def add(launcher_registry: phile.launcher.Registry) -> None:
     add_keyring(launcher_registry=launcher_registry)
     add_launcher_cmd(launcher_registry=launcher_registry)
     add_notify(launcher_registry=launcher_registry)
+    add_notify_expiry(launcher_registry=launcher_registry)
+    add_notify_log(launcher_registry=launcher_registry)
     add_notify_pyside2(launcher_registry=launcher_registry)
+    add_notify_search(launcher_registry=launcher_registry)
     add_notify_watchdog(launcher_registry=launcher_registry)
     add_pyside2(launcher_registry=launcher_registry)
     add_tmux(launcher_registry=launcher_registry)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+--------------------------
+Metrics of launcher events
+--------------------------
+
+A :class:`Recorder` keeps counters and latency :class:`Histogram`-s
+of each launcher.
+Recording only updates a few numbers,
+so it is cheap enough to always be enabled,
+and :meth:`Recorder.to_dict` gives a JSON serialisable summary.
+"""
+
+# Standard library.
+import bisect
+import collections.abc
+import dataclasses
+import typing
+
+default_bucket_bounds = (
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+)
+"""Upper bounds, in seconds, of buckets of latency histograms."""
+
+
+class Histogram:
+    def __init__(
+        self,
+        *,
+        bucket_bounds: collections.abc.Sequence[
+            float
+        ] = default_bucket_bounds,
+    ) -> None:
+        self.bucket_bounds = tuple(bucket_bounds)
+        """Sorted upper bounds of buckets, inclusive."""
+        self.bucket_counts = [0] * (len(self.bucket_bounds) + 1)
+        """
+        Number of values in each bucket.
+
+        The last bucket counts values larger than every bound.
+        """
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[
+            bisect.bisect_left(self.bucket_bounds, value)
+        ] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        return {
+            "bucket_bounds": list(self.bucket_bounds),
+            "bucket_counts": list(self.bucket_counts),
+            "count": self.count,
+            "sum": self.sum,
+        }
+
+
+@dataclasses.dataclass
+class UnitMetrics:
+    start_latency: Histogram = dataclasses.field(
+        default_factory=Histogram
+    )
+    """Time from start being requested to the launcher being ready."""
+    stop_latency: Histogram = dataclasses.field(
+        default_factory=Histogram
+    )
+    """Time from stop being requested to the launcher having stopped."""
+    start_count: int = 0
+    restart_count: int = 0
+    """Number of starts after the first one."""
+    exception_count: int = 0
+    last_exception: str = ""
+    """Representation of the last exception, or empty if none."""
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        return {
+            "start_latency": self.start_latency.to_dict(),
+            "stop_latency": self.stop_latency.to_dict(),
+            "start_count": self.start_count,
+            "restart_count": self.restart_count,
+            "exception_count": self.exception_count,
+            "last_exception": self.last_exception,
+        }
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.units: dict[str, UnitMetrics] = {}
+
+    def get_unit(self, entry_name: str) -> UnitMetrics:
+        unit = self.units.get(entry_name)
+        if unit is None:
+            unit = self.units[entry_name] = UnitMetrics()
+        return unit
+
+    def record_start(self, entry_name: str, latency: float) -> None:
+        unit = self.get_unit(entry_name)
+        if unit.start_count:
+            unit.restart_count += 1
+        unit.start_count += 1
+        unit.start_latency.observe(latency)
+
+    def record_stop(self, entry_name: str, latency: float) -> None:
+        self.get_unit(entry_name).stop_latency.observe(latency)
+
+    def record_exception(
+        self, entry_name: str, exception: BaseException
+    ) -> None:
+        unit = self.get_unit(entry_name)
+        unit.exception_count += 1
+        unit.last_exception = repr(exception)
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        return {
+            entry_name: unit.to_dict()
+            for entry_name, unit in sorted(self.units.items())
+        }
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+-------------------------------
+Startup profile of the launcher
+-------------------------------
+
+A :class:`Profile` summarises how launchers started in a previous run,
+so that the next run can request launchers delaying the startup
+and their imports before the others.
+"""
+
+# Standard library.
+import collections.abc
+import dataclasses
+import heapq
+import json
+import logging
+import pathlib
+import typing
+
+# Internal modules.
+import phile.launcher.trace
+import phile.os
+
+# TODO[mypy issue #1422]: __loader__ not defined
+_loader_name: str = __loader__.name  # type: ignore[name-defined]
+_logger = logging.getLogger(_loader_name)
+
+
+@dataclasses.dataclass
+class Profile:
+    durations: dict[str, float] = dataclasses.field(default_factory=dict)
+    """Time taken by launchers to start, in seconds."""
+    ready_order: list[str] = dataclasses.field(default_factory=list)
+    """Launchers in the order they became ready."""
+    critical_path: list[str] = dataclasses.field(default_factory=list)
+    """Launchers that delayed the last launcher to start."""
+    module_names: list[str] = dataclasses.field(default_factory=list)
+    """Modules imported while starting, in the order imported."""
+
+    @classmethod
+    def from_spans(
+        cls,
+        # Quoted as `phile.launcher` is not fully imported at this point.
+        spans: "collections.abc.Iterable[phile.launcher.trace.Span]",
+        predecessors: collections.abc.Mapping[
+            str, collections.abc.Set[str]
+        ],
+        module_names: collections.abc.Iterable[str] = (),
+    ) -> "Profile":
+        """Uses the latest start of each launcher in ``spans``."""
+        start_spans: dict[str, phile.launcher.trace.Span] = {}
+        for span in spans:
+            if span.name == phile.launcher.trace.START:
+                start_spans[span.entry_name] = span
+        return cls(
+            durations={
+                entry_name: span.duration
+                for entry_name, span in start_spans.items()
+            },
+            ready_order=sorted(
+                start_spans,
+                key=lambda entry_name: start_spans[entry_name].end,
+            ),
+            critical_path=[
+                span.entry_name
+                for span in phile.launcher.trace.get_critical_path(
+                    start_spans.values(), predecessors
+                )
+            ],
+            module_names=list(module_names),
+        )
+
+    @classmethod
+    def from_dict(cls, source: dict[str, typing.Any]) -> "Profile":
+        """Raises :exc:`ValueError` if ``source`` is malformed."""
+        try:
+            return cls(
+                durations={
+                    str(entry_name): float(duration)
+                    for entry_name, duration in source[
+                        "durations"
+                    ].items()
+                },
+                ready_order=list(map(str, source["ready_order"])),
+                critical_path=list(map(str, source["critical_path"])),
+                module_names=list(map(str, source["module_names"])),
+            )
+        except (AttributeError, KeyError, TypeError) as error:
+            raise ValueError(
+                "Malformed launcher profile: {}".format(error)
+            ) from error
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        return dataclasses.asdict(self)
+
+    def get_start_order(
+        self,
+        entry_names: collections.abc.Iterable[str],
+        predecessors: collections.abc.Mapping[
+            str, collections.abc.Set[str]
+        ],
+    ) -> list[str]:
+        """
+        Returns ``entry_names`` with launchers on long paths first.
+
+        The ``entry_names`` must be ordered after their ``predecessors``,
+        and they are kept so.
+        The path of a launcher is its duration
+        plus the longest path of launchers ordered after it,
+        so that launchers delaying slow launchers are also requested
+        before others, even if they are fast themselves.
+        Launchers on the :attr:`critical_path` come first
+        among launchers of equal paths.
+        The order is otherwise kept.
+        """
+        entry_names = list(entry_names)
+        indices = {
+            entry_name: index
+            for index, entry_name in enumerate(entry_names)
+        }
+        successors: dict[str, list[str]] = {
+            entry_name: [] for entry_name in entry_names
+        }
+        pending_counts: dict[str, int] = {}
+        for entry_name in entry_names:
+            entry_predecessors = [
+                predecessor
+                for predecessor in predecessors.get(entry_name, ())
+                if predecessor in indices
+            ]
+            pending_counts[entry_name] = len(entry_predecessors)
+            for predecessor in entry_predecessors:
+                successors[predecessor].append(entry_name)
+        durations = self.durations
+        path_lengths: dict[str, float] = {}
+        for entry_name in reversed(entry_names):
+            path_lengths[entry_name] = durations.get(
+                entry_name, 0.0
+            ) + max(
+                (
+                    path_lengths[successor]
+                    for successor in successors[entry_name]
+                ),
+                default=0.0,
+            )
+        critical_indices = {
+            entry_name: index
+            for index, entry_name in enumerate(self.critical_path)
+        }
+        critical_path_length = len(critical_indices)
+
+        def get_key(entry_name: str) -> tuple[float, int, int]:
+            return (
+                -path_lengths[entry_name],
+                critical_indices.get(entry_name, critical_path_length),
+                indices[entry_name],
+            )
+
+        ready = [
+            (get_key(entry_name), entry_name)
+            for entry_name, count in pending_counts.items()
+            if not count
+        ]
+        heapq.heapify(ready)
+        start_order: list[str] = []
+        while ready:
+            entry_name = heapq.heappop(ready)[1]
+            start_order.append(entry_name)
+            for successor in successors[entry_name]:
+                pending_counts[successor] -= 1
+                if not pending_counts[successor]:
+                    heapq.heappush(
+                        ready, (get_key(successor), successor)
+                    )
+        return start_order
+
+
+def load(path: pathlib.Path) -> typing.Optional[Profile]:
+    """Returns ``None`` if there is no usable profile at ``path``."""
+    try:
+        with path.open() as file:
+            return Profile.from_dict(json.load(file))
+    except FileNotFoundError:
+        return None
+    # JSON decoding errors are also `ValueError`.
+    except (OSError, ValueError) as error:
+        _logger.warning(
+            "Unable to load launcher profile %s: %s", path, error
+        )
+        return None
+
+
+def save(profile: Profile, path: pathlib.Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Other instances may be loading or saving the profile.
+    phile.os.write_text(path, json.dumps(profile.to_dict()), atomic=True)
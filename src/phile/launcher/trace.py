@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+-------------------------------
+Tracing of launcher transitions
+-------------------------------
+
+A :class:`Recorder` keeps a bounded history of :class:`Span`-s,
+each a phase of starting or stopping a launcher.
+The spans can be exported as a Chrome trace event JSON object,
+which can be viewed in ``chrome://tracing`` or Perfetto.
+"""
+
+# Standard library.
+import collections
+import collections.abc
+import dataclasses
+import json
+import time
+import typing
+
+Clock = collections.abc.Callable[[], float]
+
+default_max_span_count = 10000
+
+WAIT_DEPENDENCIES = "wait_dependencies"
+"""From start being requested to dependencies having started."""
+START = "start"
+"""From dependencies having started to the launcher being ready."""
+EXEC_START = "exec_start"
+"""Running time of the ``exec_start`` commands."""
+RUNNING = "running"
+"""From being ready to stop being requested."""
+WAIT_DEPENDENTS = "wait_dependents"
+"""From stop being requested to dependents having stopped."""
+EXEC_STOP = "exec_stop"
+"""Running time of the ``exec_stop`` commands."""
+CLEAN_UP = "clean_up"
+"""Time taken to cancel the main subroutine after ``exec_stop``."""
+
+
+@dataclasses.dataclass(frozen=True)
+class Span:
+    entry_name: str
+    name: str
+    start: float
+    """Clock time in seconds."""
+    end: float
+    """Clock time in seconds."""
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class Recorder:
+    def __init__(
+        self,
+        *,
+        clock: Clock = time.perf_counter,
+        max_span_count: int = default_max_span_count,
+    ) -> None:
+        self.clock = clock
+        self.spans = collections.deque[Span](maxlen=max_span_count)
+        """Recorded spans, dropping the oldest ones when full."""
+
+    def add_span(
+        self,
+        entry_name: str,
+        name: str,
+        start: float,
+        end: typing.Optional[float] = None,
+    ) -> None:
+        """Records a span ending at ``end``, or now if not given."""
+        if end is None:
+            end = self.clock()
+        self.spans.append(
+            Span(entry_name=entry_name, name=name, start=start, end=end)
+        )
+
+    def to_trace_events(self) -> dict[str, typing.Any]:
+        """
+        Returns spans in Chrome trace event format.
+
+        Each launcher is given its own thread ID in the order they
+        first appear, with their names given as thread name metadata.
+        """
+        thread_ids: dict[str, int] = {}
+        trace_events: list[dict[str, typing.Any]] = []
+        for span in self.spans:
+            thread_id = thread_ids.setdefault(
+                span.entry_name, len(thread_ids) + 1
+            )
+            trace_events.append(
+                {
+                    "name": span.name,
+                    "cat": "launcher",
+                    "ph": "X",
+                    "ts": span.start * 1e6,
+                    "dur": span.duration * 1e6,
+                    "pid": 1,
+                    "tid": thread_id,
+                }
+            )
+        for entry_name, thread_id in thread_ids.items():
+            trace_events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": 1,
+                    "tid": thread_id,
+                    "args": {"name": entry_name},
+                }
+            )
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def dump(self, stream: typing.TextIO) -> None:
+        json.dump(self.to_trace_events(), stream)
+
+
+def get_critical_path(
+    spans: collections.abc.Iterable[Span],
+    predecessors: collections.abc.Mapping[str, collections.abc.Set[str]],
+) -> list[Span]:
+    """
+    Returns the chain of :data:`START` spans
+    that determined when the last launcher became ready.
+
+    Starting from the launcher ready last,
+    the predecessor that became ready last before it is followed,
+    until reaching a launcher that was not waiting on any others.
+    Only the latest start of each launcher is considered.
+    """
+    start_spans: dict[str, Span] = {}
+    for span in spans:
+        if span.name == START:
+            start_spans[span.entry_name] = span
+    if not start_spans:
+        return []
+    span = max(start_spans.values(), key=lambda span: span.end)
+    critical_path = [span]
+    while True:
+        candidates = [
+            start_spans[predecessor]
+            for predecessor in predecessors.get(span.entry_name, ())
+            if predecessor in start_spans
+            and start_spans[predecessor].end <= span.start
+        ]
+        if not candidates:
+            break
+        span = max(candidates, key=lambda span: span.end)
+        critical_path.append(span)
+    critical_path.reverse()
+    return critical_path
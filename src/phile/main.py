@@ -40,7 +40,7 @@ async def _async_run(data: _InverseDependencyData[_T]) -> _T:
         finally:
             _logger.debug("Target of asyncio loop has stopped.")
     finally:
-        await launcher_registry.start("phile_shutdown.target")
+        await launcher_registry.shutdown()
 
 
 def run(async_target: AsyncTarget[_T]) -> _T:
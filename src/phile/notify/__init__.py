@@ -1,26 +1,196 @@
 #!/usr/bin/env python3
 """
+.. automodule:: phile.notify.benchmark
 .. automodule:: phile.notify.cli
+.. automodule:: phile.notify.expiry
+.. automodule:: phile.notify.expiry_storage
+.. automodule:: phile.notify.log
 .. automodule:: phile.notify.pyside2
+.. automodule:: phile.notify.search
 .. automodule:: phile.notify.watchdog
 """
 
 # Standard library.
+import collections
+import collections.abc
 import dataclasses
 import datetime
+import threading
+import time
 import typing
 
 # Internal packages.
 import phile.data
 
+if typing.TYPE_CHECKING:  # pragma: no cover
+    import asyncio
+
+default_min_update_interval = datetime.timedelta(milliseconds=500)
+"""Time between updates of an entry in :class:`ThrottledRegistry`."""
+default_text_cache_size = 1 << 20
+"""Number of characters a :class:`TextCache` keeps by default."""
+
 
 @dataclasses.dataclass
 class Entry:
     name: str
     text: str = ""
     modified_at: typing.Optional[datetime.datetime] = None
+    expires_at: typing.Optional[datetime.datetime] = None
+    """Local time after which the entry is removed. See :mod:`.expiry`."""
 
 
 class Registry(phile.data.Registry[str, Entry]):
     def add_entry(self, entry: Entry) -> None:
-        super().set(entry.name, entry)
+        self.set(entry.name, entry)
+
+    def add_entries(
+        self, entries: collections.abc.Iterable[Entry]
+    ) -> None:
+        """Adds ``entries`` as a batch. See :meth:`update`."""
+        self.update({entry.name: entry for entry in entries})
+
+
+class ThrottledRegistry(Registry):
+    """
+    Registry updating each entry at most once every interval.
+
+    An entry not in the registry is inserted immediately.
+    Changes to an entry within :attr:`min_interval`
+    of its last update are collapsed,
+    and only the latest of them is set when the interval expires.
+    Discarding an entry drops its collapsed change.
+    Closing the registry sets collapsed changes before closing.
+    So the final state of each entry is never lost.
+
+    Delayed changes are set using the running event loop.
+    """
+
+    def __init__(
+        self,
+        *args: typing.Any,
+        min_interval: datetime.timedelta = default_min_update_interval,
+        **kwargs: typing.Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.min_interval = min_interval
+        self._pending_entries: dict[str, Entry] = {}
+        self._timer_handles: dict[str, "asyncio.TimerHandle"] = {}
+        self._updated_at: dict[str, float] = {}
+
+    def close(self) -> None:
+        for timer_handle in self._timer_handles.values():
+            timer_handle.cancel()
+        self._timer_handles.clear()
+        pending_entries = self._pending_entries
+        self._pending_entries = {}
+        for key, value in pending_entries.items():
+            self._update(key, value)
+        super().close()
+
+    def discard(self, key: str) -> None:
+        timer_handle = self._timer_handles.pop(key, None)
+        if timer_handle is not None:
+            timer_handle.cancel()
+        self._pending_entries.pop(key, None)
+        self._updated_at.pop(key, None)
+        super().discard(key)
+
+    def set(self, key: str, value: Entry) -> None:
+        if not self._defer(key, value):
+            self._update(key, value)
+
+    def update(self, items: collections.abc.Mapping[str, Entry]) -> None:
+        """Changes not collapsed are set as a batch."""
+        due_items = {
+            key: value
+            for key, value in items.items()
+            if not self._defer(key, value)
+        }
+        updated_at = time.monotonic()
+        for key in due_items:
+            self._updated_at[key] = updated_at
+        super().update(due_items)
+
+    def _defer(self, key: str, value: Entry) -> bool:
+        """Returns whether the change is collapsed and set later."""
+        updated_at = self._updated_at.get(key)
+        if updated_at is None:
+            return False
+        due_at = updated_at + self.min_interval.total_seconds()
+        if key not in self._timer_handles and time.monotonic() >= due_at:
+            return False
+        self._pending_entries[key] = value
+        if key not in self._timer_handles:
+            # Not imported at module level,
+            # as the command line interface does not need it.
+            # pylint: disable=import-outside-toplevel
+            import asyncio
+
+            self._timer_handles[
+                key
+            ] = asyncio.get_running_loop().call_later(
+                due_at - time.monotonic(), self._update_pending, key
+            )
+        return True
+
+    def _update(self, key: str, value: Entry) -> None:
+        self._updated_at[key] = time.monotonic()
+        super().set(key, value)
+
+    def _update_pending(self, key: str) -> None:
+        del self._timer_handles[key]
+        self._update(key, self._pending_entries.pop(key))
+
+
+class TextCache:
+    """
+    Texts of entries kept by the order they were last used.
+
+    The least recently used texts are dropped
+    when their total length exceeds :attr:`max_size` characters.
+    It may be used from multiple threads,
+    such as GUI threads and threads reading texts of entries.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int = default_text_cache_size,
+    ) -> None:
+        self.max_size = max_size
+        self.size = 0
+        """Total length of texts kept. Read-only for user."""
+        self._texts = collections.OrderedDict[
+            collections.abc.Hashable, str
+        ]()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def get(
+        self,
+        key: collections.abc.Hashable,
+        load: collections.abc.Callable[[], str],
+    ) -> str:
+        """Returns text of ``key``, using ``load`` if not kept."""
+        texts = self._texts
+        with self._lock:
+            try:
+                text = texts[key]
+            except KeyError:
+                pass
+            else:
+                texts.move_to_end(key)
+                return text
+        # Not holding the lock, so that other texts can be used
+        # while this one is loading.
+        text = load()
+        with self._lock:
+            if key not in texts:
+                texts[key] = text
+                self.size += len(text)
+            while self.size > self.max_size:
+                self.size -= len(texts.popitem(last=False)[1])
+        return text
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+-----------------------------------
+Time taken by notification commands
+-----------------------------------
+
+Commands of :mod:`phile.notify.cli` are run in new interpreters,
+as they would be from hooks,
+to measure the time taken from start to exit.
+An extra run with ``python -X importtime``
+shows which modules took the longest to import.
+The runs use a temporary state directory and configuration cache,
+so user notifications are not changed.
+
+Usage::
+
+    python -m phile.notify.benchmark --repeat 20 write name content
+"""
+
+# Standard library.
+import argparse
+import dataclasses
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+
+default_command = ("write", "benchmark", "content")
+default_import_count = 10
+default_repeat = 10
+
+
+@dataclasses.dataclass(frozen=True)
+class ImportTime:
+    name: str
+    self_time: float
+    """Seconds taken by the module itself."""
+    cumulative_time: float
+    """Seconds taken by the module and modules it imported."""
+
+
+@dataclasses.dataclass
+class Report:
+    durations: list[float]
+    """Seconds taken by each run."""
+    import_times: list[ImportTime]
+    """Imports of a run, slowest cumulative time first."""
+
+    @property
+    def module_names(self) -> set[str]:
+        return {import_time.name for import_time in self.import_times}
+
+    def to_text(self, import_count: int = default_import_count) -> str:
+        durations = self.durations
+        lines = [
+            "runs: {}".format(len(durations)),
+            "min: {:.6f} s".format(min(durations)),
+            "median: {:.6f} s".format(statistics.median(durations)),
+            "mean: {:.6f} s".format(statistics.mean(durations)),
+            "max: {:.6f} s".format(max(durations)),
+            "slowest imports (cumulative, self):",
+        ]
+        for import_time in self.import_times[:import_count]:
+            lines.append(
+                "  {}: {:.6f} s, {:.6f} s".format(
+                    import_time.name,
+                    import_time.cumulative_time,
+                    import_time.self_time,
+                )
+            )
+        return "\n".join(lines)
+
+
+def parse_import_times(source: str) -> list[ImportTime]:
+    """
+    Returns imports reported by ``python -X importtime``.
+
+    Lines of ``source`` not reporting import times are ignored.
+    """
+    import_times: list[ImportTime] = []
+    for line in source.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_time, cumulative_time, name = line.removeprefix(
+            "import time:"
+        ).split("|", 2)
+        try:
+            import_times.append(
+                ImportTime(
+                    name=name.strip(),
+                    self_time=int(self_time) / 1e6,
+                    cumulative_time=int(cumulative_time) / 1e6,
+                )
+            )
+        except ValueError:
+            # The header line naming the columns.
+            continue
+    import_times.sort(
+        key=lambda import_time: import_time.cumulative_time,
+        reverse=True,
+    )
+    return import_times
+
+
+def run(
+    command: typing.Sequence[str],
+    *,
+    environ: dict[str, str],
+    python_options: typing.Sequence[str] = (),
+) -> tuple[float, str]:
+    """Returns seconds taken by ``command`` and its standard error."""
+    start = time.perf_counter()
+    process = subprocess.run(
+        [
+            sys.executable,
+            *python_options,
+            "-m",
+            "phile.notify",
+            *command,
+        ],
+        check=True,
+        env=environ,
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        text=True,
+    )
+    return time.perf_counter() - start, process.stderr
+
+
+def benchmark(
+    command: typing.Sequence[str] = default_command,
+    *,
+    repeat: int = default_repeat,
+) -> Report:
+    """
+    Runs ``command`` ``repeat`` times, and once more to time imports.
+
+    A run is made beforehand to fill the configuration cache,
+    and is not included in the results.
+    """
+    with tempfile.TemporaryDirectory() as directory_name:
+        environ = os.environ.copy()
+        environ.update(
+            PHILE_CONFIGURATION_PATH=os.path.join(
+                directory_name, "config.json"
+            ),
+            PHILE_STATE_DIRECTORY_PATH=os.path.join(
+                directory_name, "state"
+            ),
+            XDG_CACHE_HOME=os.path.join(directory_name, "cache"),
+        )
+        run(command, environ=environ)
+        durations = [
+            run(command, environ=environ)[0] for _ in range(repeat)
+        ]
+        _, import_output = run(
+            command, environ=environ, python_options=("-X", "importtime")
+        )
+    return Report(
+        durations=durations,
+        import_times=parse_import_times(import_output),
+    )
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="phile.notify.benchmark")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=default_repeat,
+        help="Runs to time.",
+    )
+    parser.add_argument(
+        "--import-count",
+        type=int,
+        default=default_import_count,
+        help="Slowest imports to show.",
+    )
+    parser.add_argument(
+        "command",
+        nargs=argparse.REMAINDER,
+        help="Command to run. Default: {}".format(
+            " ".join(default_command)
+        ),
+    )
+    return parser
+
+
+def process_arguments(
+    argument_namespace: argparse.Namespace,
+    output_stream: typing.TextIO = sys.stdout,
+) -> int:
+    report = benchmark(
+        argument_namespace.command or default_command,
+        repeat=argument_namespace.repeat,
+    )
+    print(
+        report.to_text(import_count=argument_namespace.import_count),
+        file=output_stream,
+    )
+    return 0
+
+
+def main(
+    argv: typing.Optional[list[str]] = None,
+) -> int:  # pragma: no cover
+    if argv is None:
+        argv = sys.argv
+    argument_parser = create_argument_parser()
+    argument_namespace = argument_parser.parse_args(argv[1:])
+    return process_arguments(argument_namespace)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -1,19 +1,249 @@
 #!/usr/bin/env python3
+"""
+---------------------------------------
+Command line interface of notifications
+---------------------------------------
+
+Commands are often run from hooks many times a day,
+so the time taken to start is kept small.
+Only file paths are needed to process commands.
+Instead of importing :mod:`phile.configuration`,
+the paths are read from a cache updated
+when the configuration file, ``PHILE_`` environment variables
+or default directories change.
+See :func:`load_configuration`.
+Use :mod:`phile.notify.benchmark` to measure the time taken.
+"""
 
 # Standard library.
 import argparse
+import collections.abc
+import datetime
+import io
+import json
+import os
+import pathlib
 import sys
 import typing
 
+# External dependencies.
+import appdirs
+
 # Internal packages.
-import phile.configuration
-import phile.notify
-import phile.notify.watchdog
+import phile.notify.expiry_storage
+import phile.os
+
+configuration_cache_name = "notify_cli_configuration.json"
+search_cache_name = "notify_search_index.json"
+"""Terms of notify files in the state directory used by ``search``."""
+
+
+class Configuration(typing.Protocol):
+    """Entries of :class:`phile.configuration.Entries` used by commands."""
+
+    @property
+    def notify_directory(self) -> pathlib.Path:
+        ...  # pragma: no cover
+
+    @property
+    def notify_suffix(self) -> str:
+        ...  # pragma: no cover
+
+    @property
+    def save_atomically(self) -> bool:
+        ...  # pragma: no cover
+
+    @property
+    def save_fsync(self) -> bool:
+        ...  # pragma: no cover
+
+    @property
+    def state_directory_path(self) -> pathlib.Path:
+        ...  # pragma: no cover
+
+
+class CachedConfiguration(typing.NamedTuple):
+    notify_directory: pathlib.Path
+    notify_suffix: str
+    save_atomically: bool
+    save_fsync: bool
+    state_directory_path: pathlib.Path
+
+
+def get_app_name() -> str:
+    # Same as the distribution name used by `phile.configuration`
+    # without reading the distribution metadata.
+    return __name__.partition(".")[0]
+
+
+def get_configuration_cache_path() -> pathlib.Path:
+    return pathlib.Path(
+        appdirs.user_cache_dir(get_app_name()), configuration_cache_name
+    )
+
+
+def get_configuration_key() -> dict[str, typing.Any]:
+    """
+    Returns what the configuration depends on.
+
+    They are the ``PHILE_`` environment variables,
+    the modification time of the configuration file,
+    and the default state directory,
+    which changes with variables such as ``XDG_STATE_HOME``.
+    """
+    environ = {
+        key.upper(): value
+        for key, value in os.environ.items()
+        if key.upper().startswith("PHILE_")
+    }
+    configuration_path = environ.get("PHILE_CONFIGURATION_PATH")
+    if configuration_path is None:
+        configuration_path = os.path.join(
+            appdirs.user_config_dir(get_app_name()), "config.json"
+        )
+    try:
+        modified_at: typing.Optional[int] = os.stat(
+            configuration_path
+        ).st_mtime_ns
+    except OSError:
+        modified_at = None
+    return {
+        "environ": environ,
+        "configuration_path": configuration_path,
+        "configuration_modified_at": modified_at,
+        "default_state_directory": appdirs.user_state_dir(
+            get_app_name()
+        ),
+    }
+
+
+def load_configuration(cache_path: pathlib.Path) -> Configuration:
+    """
+    Returns configuration from ``cache_path`` if up to date.
+
+    Otherwise, :func:`phile.configuration.load` is used,
+    and the entries needed are saved to ``cache_path``.
+    """
+    key = get_configuration_key()
+    try:
+        cache = json.loads(cache_path.read_text())
+        if cache["key"] == key:
+            return CachedConfiguration(
+                notify_directory=pathlib.Path(cache["notify_directory"]),
+                notify_suffix=str(cache["notify_suffix"]),
+                save_atomically=bool(cache["save_atomically"]),
+                save_fsync=bool(cache["save_fsync"]),
+                state_directory_path=pathlib.Path(
+                    cache["state_directory_path"]
+                ),
+            )
+    # JSON decoding errors are also `ValueError`.
+    except (OSError, KeyError, TypeError, ValueError):
+        pass
+    # Importing it is slow. So only do so if the cache is unusable.
+    # pylint: disable=import-outside-toplevel
+    import phile.configuration
+
+    configuration = phile.configuration.load()
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(
+            json.dumps(
+                {
+                    "key": key,
+                    "notify_directory": str(
+                        configuration.notify_directory
+                    ),
+                    "notify_suffix": configuration.notify_suffix,
+                    "save_atomically": configuration.save_atomically,
+                    "save_fsync": configuration.save_fsync,
+                    "state_directory_path": str(
+                        configuration.state_directory_path
+                    ),
+                }
+            )
+        )
+    except OSError:
+        pass
+    return configuration
+
+
+def get_directory(configuration: Configuration) -> pathlib.Path:
+    return (
+        configuration.state_directory_path
+        / configuration.notify_directory
+    )
+
+
+def get_path(name: str, configuration: Configuration) -> pathlib.Path:
+    return get_directory(configuration=configuration) / (
+        name + configuration.notify_suffix
+    )
+
+
+def search(query: str, configuration: Configuration) -> list[str]:
+    """Returns sorted names of notify files matching ``query``."""
+    # Not needed by other commands, so imported only when searching.
+    # pylint: disable=import-outside-toplevel
+    import phile.notify.search
+
+    index = phile.notify.search.load_directory(
+        cache_path=configuration.state_directory_path
+        / search_cache_name,
+        directory=get_directory(configuration=configuration),
+        suffix=configuration.notify_suffix,
+    )
+    return index.search(query)
+
+
+def write_text(
+    path: pathlib.Path,
+    text: str,
+    configuration: Configuration,
+    *,
+    set_expiry: bool = False,
+    expires_at: typing.Optional[datetime.datetime] = None,
+) -> None:
+    """
+    Writes as :func:`phile.notify.watchdog.save` does.
+
+    That is, using :func:`phile.os.write_text`
+    with the ``save_atomically`` and ``save_fsync`` configurations.
+    It is not used directly as importing it is slow.
+
+    The expiry time of ``path`` is changed to ``expires_at``
+    only if ``set_expiry`` is set, with ``None`` removing it.
+    Otherwise, it is kept, and is only read if writing atomically,
+    since the file with the expiry time is then replaced.
+    See :mod:`phile.notify.expiry_storage`.
+    """
+    atomic = configuration.save_atomically
+    if not set_expiry:
+        expires_at = (
+            phile.notify.expiry_storage.load(path) if atomic else None
+        )
+    prepare_file: typing.Optional[
+        collections.abc.Callable[[pathlib.Path], None]
+    ] = None
+    if set_expiry or expires_at is not None:
+        prepare_file = (
+            lambda written_path: phile.notify.expiry_storage.save(
+                path, expires_at, attribute_path=written_path
+            )
+        )
+    phile.os.write_text(
+        path,
+        text,
+        atomic=atomic,
+        fsync=configuration.save_fsync,
+        prepare_file=prepare_file,
+    )
 
 
 def create_argument_parser() -> argparse.ArgumentParser:
     argument_parser = argparse.ArgumentParser()
     subparsers = argument_parser.add_subparsers(dest="command")
+    subparser = subparsers.add_parser("batch")
     subparser = subparsers.add_parser("append")
     subparser.add_argument("name")
     subparser.add_argument("content")
@@ -22,37 +252,131 @@ def create_argument_parser() -> argparse.ArgumentParser:
     subparser = subparsers.add_parser("remove")
     subparser.add_argument("name")
     subparser = subparsers.add_parser("list")
+    subparser = subparsers.add_parser("search")
+    subparser.add_argument(
+        "query",
+        help="Words to match. Words ending with * match prefixes.",
+    )
     subparser = subparsers.add_parser("write")
+    expiry_group = subparser.add_mutually_exclusive_group()
+    expiry_group.add_argument(
+        "--expires-in",
+        type=float,
+        help=(
+            "Seconds until the notification is removed."
+            " The current expiry is kept if not given."
+        ),
+    )
+    expiry_group.add_argument(
+        "--no-expiry",
+        action="store_true",
+        help="Removes the current expiry of the notification.",
+    )
     subparser.add_argument("name")
     subparser.add_argument("content")
     return argument_parser
 
 
+batch_commands = {
+    "append": ("name", "content"),
+    "list": (),
+    "read": ("name",),
+    "remove": ("name",),
+    "search": ("query",),
+    "write": ("name", "content"),
+}
+"""Commands usable in a batch, and the arguments they require."""
+
+
+def parse_batch_line(line: str) -> argparse.Namespace:
+    """Raises :exc:`ValueError` if ``line`` is not a usable command."""
+    try:
+        operation = json.loads(line)
+        command = operation["command"]
+        argument_names = batch_commands[command]
+        arguments = {
+            argument_name: operation[argument_name]
+            for argument_name in argument_names
+        }
+    except (KeyError, TypeError) as error:
+        raise ValueError(
+            "Unknown or incomplete command: {}".format(error)
+        ) from error
+    for argument_name, argument in arguments.items():
+        if not isinstance(argument, str):
+            raise ValueError(
+                "Argument {} is not a string.".format(argument_name)
+            )
+    return argparse.Namespace(command=command, **arguments)
+
+
+def _process_batch_line(
+    configuration: Configuration, line: str
+) -> dict[str, typing.Any]:
+    # Any failure is reported so that later lines are still processed.
+    # pylint: disable=broad-except
+    try:
+        argument_namespace = parse_batch_line(line)
+        command_output = io.StringIO()
+        status = process_arguments(
+            argument_namespace,
+            configuration=configuration,
+            output_stream=command_output,
+        )
+    except Exception as error:
+        return {"status": 1, "error": str(error)}
+    return {"status": status, "output": command_output.getvalue()}
+
+
+def process_batch(
+    configuration: Configuration,
+    input_stream: typing.TextIO,
+    output_stream: typing.TextIO,
+) -> int:
+    """
+    Processes JSON-lines commands from ``input_stream``.
+
+    Each non-empty line is an object with a ``command``
+    and its arguments as in the command line,
+    such as ``{"command": "write", "name": "n", "content": "c"}``.
+    For each of them, a JSON object is written as a line
+    with the ``status`` of the command,
+    and its ``output`` or the ``error`` that stopped it.
+    All commands are processed even if some of them fail.
+    """
+    return_code = 0
+    for line in input_stream:
+        if not line.strip():
+            continue
+        result = _process_batch_line(configuration, line)
+        if result["status"]:
+            return_code = 1
+        print(json.dumps(result), file=output_stream, flush=True)
+    return return_code
+
+
 # TODO(BoniLindsley): Make async and use notify.Registry for consistency.
 def process_arguments(
     argument_namespace: argparse.Namespace,
-    configuration: phile.configuration.Entries,
+    configuration: Configuration,
     output_stream: typing.TextIO = sys.stdout,
+    input_stream: typing.TextIO = sys.stdin,
 ) -> int:
     command = argument_namespace.command
-    notify_directory = (
-        configuration.state_directory_path
-        / configuration.notify_directory
-    )
+    notify_directory = get_directory(configuration=configuration)
     notify_directory.mkdir(parents=True, exist_ok=True)
     if command == "append":
+        path = get_path(
+            name=argument_namespace.name, configuration=configuration
+        )
         try:
-            notify_entry = phile.notify.watchdog.load(
-                name=argument_namespace.name,
-                configuration=configuration,
-            )
+            text = path.read_text()
         except FileNotFoundError:
-            notify_entry = phile.notify.Entry(
-                name=argument_namespace.name
-            )
-        notify_entry.text += argument_namespace.content + "\n"
-        phile.notify.watchdog.save(
-            entry=notify_entry, configuration=configuration
+            text = ""
+        write_text(
+            path,
+            text + argument_namespace.content + "\n",
+            configuration=configuration,
         )
         # notification = phile.notify.File.from_path_stem(
         #    argument_namespace.name, configuration=configuration
@@ -60,10 +384,13 @@ def process_arguments(
         # notification.load()
         # notification.text += argument_namespace.content + '\n'
         # notification.save()
-    elif command == "list":
-        notify_directory = phile.notify.watchdog.get_directory(
-            configuration=configuration
+    elif command == "batch":
+        return process_batch(
+            configuration=configuration,
+            input_stream=input_stream,
+            output_stream=output_stream,
         )
+    elif command == "list":
         notify_suffix = configuration.notify_suffix
         for path in notify_directory.glob("*" + notify_suffix):
             print(
@@ -75,14 +402,14 @@ def process_arguments(
         #    if notificaton_file.suffix == notify_suffix:
         #        print(notificaton_file.stem, file=output_stream)
     elif command == "read":
+        path = get_path(
+            name=argument_namespace.name, configuration=configuration
+        )
         try:
-            notify_entry = phile.notify.watchdog.load(
-                name=argument_namespace.name,
-                configuration=configuration,
-            )
+            text = path.read_text()
         except FileNotFoundError:
             return 1
-        print(notify_entry.text, end="", file=output_stream)
+        print(text, end="", file=output_stream)
         # notification = phile.notify.File.from_path_stem(
         #    argument_namespace.name, configuration=configuration
         # )
@@ -90,21 +417,43 @@ def process_arguments(
         #    return 1
         # print(notification.text, end='', file=output_stream)
     elif command == "remove":
-        path = phile.notify.watchdog.get_path(
+        path = get_path(
             name=argument_namespace.name, configuration=configuration
         )
         path.unlink(missing_ok=True)
+        phile.notify.expiry_storage.get_sidecar_path(path).unlink(
+            missing_ok=True
+        )
         # notification = phile.notify.File.from_path_stem(
         #    argument_namespace.name, configuration=configuration
         # )
         # notification.path.unlink(missing_ok=True)
+    elif command == "search":
+        for name in search(
+            argument_namespace.query, configuration=configuration
+        ):
+            print(name, file=output_stream)
     elif command == "write":
-        notify_entry = phile.notify.Entry(
-            name=argument_namespace.name,
-            text=argument_namespace.content + "\n",
+        path = get_path(
+            name=argument_namespace.name, configuration=configuration
+        )
+        # Not given in batches.
+        expires_in = getattr(argument_namespace, "expires_in", None)
+        expires_at = (
+            None
+            if expires_in is None
+            else datetime.datetime.now()
+            + datetime.timedelta(seconds=expires_in)
         )
-        phile.notify.watchdog.save(
-            entry=notify_entry, configuration=configuration
+        write_text(
+            path,
+            argument_namespace.content + "\n",
+            configuration=configuration,
+            set_expiry=(
+                expires_at is not None
+                or getattr(argument_namespace, "no_expiry", False)
+            ),
+            expires_at=expires_at,
         )
         # notification = phile.notify.File.from_path_stem(
         #    argument_namespace.name, configuration=configuration
@@ -132,7 +481,9 @@ def main(
     if argument_namespace.command is None:
         argument_parser.print_usage()
         return 1
-    configuration = phile.configuration.load()
+    configuration = load_configuration(
+        cache_path=get_configuration_cache_path()
+    )
     return process_arguments(
         argument_namespace, configuration=configuration
     )
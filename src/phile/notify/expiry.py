@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+------------------------------
+Expiry of notification entries
+------------------------------
+
+Entries with :attr:`~phile.notify.Entry.expires_at` set
+are removed once that time has passed.
+A single :func:`run` task waits for the earliest expiry
+kept at the top of the min-heap of a :class:`Schedule`,
+so that each change costs logarithmic time
+regardless of how many entries are waiting to expire.
+
+See :mod:`phile.notify.expiry_storage`
+for how expiry times of notify files are kept.
+"""
+
+# Standard library.
+import asyncio
+import datetime
+import heapq
+import logging
+import typing
+
+# Internal packages.
+import phile.data
+import phile.notify
+
+# TODO[mypy issue #1422]: __loader__ not defined
+_loader_name: str = __loader__.name  # type: ignore[name-defined]
+_logger = logging.getLogger(_loader_name)
+
+
+class Target(typing.Protocol):
+    """Where expired entries are removed from, besides the registry."""
+
+    def pop(self, name: str) -> None:
+        ...  # pragma: no cover
+
+
+class Schedule:
+    """
+    Expiry times of entries by their names.
+
+    Times replaced or discarded are left in the heap
+    and skipped when they reach the top.
+    The heap is rebuilt when they outnumber the current times.
+    """
+
+    def __init__(self) -> None:
+        self._expiries: dict[str, datetime.datetime] = {}
+        self._heap: list[tuple[datetime.datetime, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._expiries)
+
+    def discard(self, name: str) -> None:
+        self._expiries.pop(name, None)
+        self._compact_if_needed()
+
+    def set(
+        self, name: str, expires_at: typing.Optional[datetime.datetime]
+    ) -> None:
+        """Discards the expiry of ``name`` if ``expires_at`` is ``None``."""
+        if expires_at is None:
+            self.discard(name)
+            return
+        if self._expiries.get(name) == expires_at:
+            return
+        self._expiries[name] = expires_at
+        heapq.heappush(self._heap, (expires_at, name))
+        self._compact_if_needed()
+
+    def next_expiry(self) -> typing.Optional[datetime.datetime]:
+        """Returns the earliest expiry time, or ``None`` if there is none."""
+        expiries = self._expiries
+        heap = self._heap
+        while heap:
+            expires_at, name = heap[0]
+            if expiries.get(name) == expires_at:
+                return expires_at
+            heapq.heappop(heap)
+        return None
+
+    def pop_expired(self, now: datetime.datetime) -> list[str]:
+        """Removes and returns names expiring at or before ``now``."""
+        expiries = self._expiries
+        heap = self._heap
+        names: list[str] = []
+        while heap and heap[0][0] <= now:
+            expires_at, name = heapq.heappop(heap)
+            if expiries.get(name) == expires_at:
+                del expiries[name]
+                names.append(name)
+        return names
+
+    def _compact_if_needed(self) -> None:
+        if len(self._heap) > 2 * len(self._expiries):
+            self._heap = [
+                (expires_at, name)
+                for name, expires_at in self._expiries.items()
+            ]
+            heapq.heapify(self._heap)
+
+
+async def run(
+    *,
+    notify_registry: phile.notify.Registry,
+    target: typing.Optional[Target] = None,
+) -> None:
+    """
+    Removes entries of ``notify_registry`` when they expire.
+
+    Expired entries are popped from ``target`` too, if given,
+    so that they are removed from where they are kept.
+    Returns when ``notify_registry`` is closed.
+    """
+    notify_view = notify_registry.event_queue.__aiter__()
+    schedule = Schedule()
+    for entry in notify_registry.current_values:
+        schedule.set(entry.name, entry.expires_at)
+    while True:
+        now = datetime.datetime.now()
+        for name in schedule.pop_expired(now):
+            _logger.debug("Notification %s expired", name)
+            if target is not None:
+                target.pop(name)
+            notify_registry.discard(name)
+        next_expiry = schedule.next_expiry()
+        timeout = (
+            None
+            if next_expiry is None
+            else (next_expiry - now).total_seconds()
+        )
+        try:
+            notify_event = await asyncio.wait_for(
+                notify_view.__anext__(), timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            continue
+        except StopAsyncIteration:
+            break
+        if notify_event.type == phile.data.EventType.DISCARD:
+            schedule.discard(notify_event.key)
+        else:
+            schedule.set(notify_event.key, notify_event.value.expires_at)
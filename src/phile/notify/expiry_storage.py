@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+-----------------------------------
+Expiry times kept with notify files
+-----------------------------------
+
+Expiry times of notify files are kept
+in the extended attribute :data:`attribute_name` of the files.
+Where extended attributes are not supported,
+they are kept in a file next to each notify file instead.
+See :func:`get_sidecar_path`.
+
+Only the standard library is imported,
+so that it can be used by :mod:`phile.notify.cli`
+without slowing down its start.
+"""
+
+# Standard library.
+import contextlib
+import datetime
+import logging
+import os
+import pathlib
+import typing
+
+# TODO[mypy issue #1422]: __loader__ not defined
+_loader_name: str = __loader__.name  # type: ignore[name-defined]
+_logger = logging.getLogger(_loader_name)
+
+attribute_name = "user.phile.notify.expires_at"
+"""Extended attribute of notify files keeping their expiry times."""
+
+
+def get_sidecar_path(path: pathlib.Path) -> pathlib.Path:
+    """
+    Returns the file keeping the expiry time of ``path``
+    if extended attributes are not supported.
+
+    The name starts with a dot and does not end with the suffix of
+    ``path``, so it is ignored by watchers filtering by suffix.
+    """
+    return path.with_name(".{}.expires_at".format(path.name))
+
+
+def load(path: pathlib.Path) -> typing.Optional[datetime.datetime]:
+    """
+    Returns ``None`` if ``path`` has no usable expiry time.
+
+    Times with offsets are converted to naive local times.
+    """
+    try:
+        # Not available on some platforms, raising `AttributeError`.
+        value = os.getxattr(path, attribute_name)
+    except (AttributeError, OSError):
+        try:
+            value = get_sidecar_path(path).read_bytes()
+        except OSError:
+            return None
+    try:
+        expires_at = datetime.datetime.fromisoformat(value.decode())
+    # Decoding errors are also `ValueError`.
+    except ValueError as error:
+        _logger.warning("Ignoring expiry of %s: %s", path, error)
+        return None
+    # Expiry times are compared with naive local times.
+    # Times with offsets may be written by other programs.
+    if expires_at.tzinfo is not None:
+        expires_at = expires_at.astimezone().replace(tzinfo=None)
+    return expires_at
+
+
+def save(
+    path: pathlib.Path,
+    expires_at: typing.Optional[datetime.datetime],
+    *,
+    attribute_path: typing.Optional[pathlib.Path] = None,
+) -> None:
+    """
+    Keeps ``expires_at`` as the expiry time of ``path``.
+
+    The attribute is set on ``attribute_path`` if given,
+    such as a temporary file to be renamed to ``path``,
+    so that the file never appears without its expiry time.
+    The expiry time is removed if ``expires_at`` is ``None``.
+    """
+    if attribute_path is None:
+        attribute_path = path
+    sidecar_path = get_sidecar_path(path)
+    if expires_at is None:
+        with contextlib.suppress(AttributeError, OSError):
+            os.removexattr(attribute_path, attribute_name)
+        sidecar_path.unlink(missing_ok=True)
+        return
+    value = expires_at.isoformat()
+    try:
+        os.setxattr(attribute_path, attribute_name, value.encode())
+    except (AttributeError, OSError) as error:
+        _logger.debug("Keeping expiry of %s in file: %s", path, error)
+        try:
+            sidecar_path.write_text(value)
+        except OSError as sidecar_error:
+            _logger.warning(
+                "Unable to keep expiry of %s: %s", path, sidecar_error
+            )
+        return
+    sidecar_path.unlink(missing_ok=True)
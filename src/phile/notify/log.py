@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+-----------------------------------
+Notifications in an append-only log
+-----------------------------------
+
+Instead of a file for each notification as in :mod:`phile.notify.watchdog`,
+every change is appended as a JSON line to a single log file.
+Readers need only one watch,
+and remember the offset they have read up to,
+so that a change is read once
+regardless of how many notifications there are.
+The log is compacted, rewriting only the current entries,
+when superseded records outnumber them.
+
+Writers and compaction lock the log file with :func:`fcntl.flock`
+so that no record is appended to a log file being replaced.
+The module is imported only when locking,
+so that the rest of :mod:`phile.notify` works on platforms without it.
+"""
+
+# Standard library.
+import asyncio
+import collections.abc
+import contextlib
+import datetime
+import json
+import logging
+import os
+import pathlib
+import stat
+import tempfile
+import typing
+
+# External dependencies.
+import watchdog.events
+
+# Internal packages.
+import phile.asyncio
+import phile.configuration
+import phile.notify
+import phile.watchdog.asyncio
+
+# TODO[mypy issue #1422]: __loader__ not defined
+_loader_name: str = __loader__.name  # type: ignore[name-defined]
+_logger = logging.getLogger(_loader_name)
+
+default_compaction_threshold = 1024
+"""Number of records a log must have before it is compacted."""
+
+Changes = dict[str, typing.Optional[phile.notify.Entry]]
+"""Entries changed by name, with ``None`` for removed ones."""
+
+
+def get_path(configuration: phile.configuration.Entries) -> pathlib.Path:
+    return (
+        configuration.state_directory_path
+        / configuration.notify_log_path
+    )
+
+
+def dump_record(
+    name: str, entry: typing.Optional[phile.notify.Entry]
+) -> bytes:
+    """Returns a log line setting ``name`` to ``entry``."""
+    record: dict[str, typing.Any] = {"name": name}
+    if entry is not None:
+        record["text"] = entry.text
+        modified_at = entry.modified_at
+        if modified_at is not None:
+            record["modified_at"] = modified_at.isoformat()
+        expires_at = entry.expires_at
+        if expires_at is not None:
+            record["expires_at"] = expires_at.isoformat()
+    return json.dumps(record).encode() + b"\n"
+
+
+def parse_record(
+    line: bytes,
+) -> tuple[str, typing.Optional[phile.notify.Entry]]:
+    """Raises :exc:`ValueError` if ``line`` is malformed."""
+    try:
+        record = json.loads(line)
+        name = record["name"]
+        if not isinstance(name, str):
+            raise TypeError("Name is not a string.")
+        if "text" not in record:
+            return name, None
+        modified_at = record.get("modified_at")
+        expires_at = record.get("expires_at")
+        return name, phile.notify.Entry(
+            name=name,
+            text=str(record["text"]),
+            modified_at=(
+                None
+                if modified_at is None
+                else datetime.datetime.fromisoformat(modified_at)
+            ),
+            expires_at=(
+                None
+                if expires_at is None
+                else datetime.datetime.fromisoformat(expires_at)
+            ),
+        )
+    except (KeyError, TypeError) as error:
+        raise ValueError(
+            "Malformed notify record: {}".format(error)
+        ) from error
+
+
+@contextlib.contextmanager
+def open_locked(
+    path: pathlib.Path, mode: str
+) -> collections.abc.Iterator[typing.BinaryIO]:
+    """
+    Opens ``path`` with an exclusive lock.
+
+    The file is opened again if it was replaced
+    while waiting for the lock,
+    so that the lock is always on the file currently at ``path``.
+    """
+    import fcntl  # pylint: disable=import-outside-toplevel
+
+    while True:
+        file = typing.cast(typing.BinaryIO, path.open(mode))
+        with file:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            try:
+                is_current = (
+                    os.fstat(file.fileno()).st_ino == path.stat().st_ino
+                )
+            except FileNotFoundError:
+                is_current = False
+            if is_current:
+                yield file
+                return
+
+
+def append(
+    path: pathlib.Path,
+    records: collections.abc.Iterable[
+        tuple[str, typing.Optional[phile.notify.Entry]]
+    ],
+) -> None:
+    """Appends ``records`` of names and entries to the log at ``path``."""
+    data = b"".join(dump_record(name, entry) for name, entry in records)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open_locked(path, "ab") as file:
+        file.write(data)
+
+
+class Log:
+    """Entries in a log file, read incrementally."""
+
+    def __init__(
+        self,
+        *,
+        path: pathlib.Path,
+        compaction_threshold: int = default_compaction_threshold,
+    ) -> None:
+        self.path = path
+        self.compaction_threshold = compaction_threshold
+        self.entries: dict[str, phile.notify.Entry] = {}
+        """Current entries in the log. Read-only for user."""
+        self.record_count = 0
+        """Number of records read from the current log file."""
+        self._inode: typing.Optional[int] = None
+        self._offset = 0
+
+    def needs_compaction(self) -> bool:
+        record_count = self.record_count
+        return (
+            record_count >= self.compaction_threshold
+            and record_count > 2 * len(self.entries)
+        )
+
+    def read(self) -> Changes:
+        """
+        Returns changes from records appended since the last read.
+
+        If the log file was replaced or truncated,
+        it is read again from the start.
+        An incomplete last line is left for the next read.
+        """
+        try:
+            file = self.path.open("rb")
+        except FileNotFoundError:
+            return self._reset(inode=None)
+        with file:
+            return self._read_from(file)
+
+    def compact(self) -> Changes:
+        """
+        Rewrites the log file to contain only the current entries.
+
+        Returns changes from records read before rewriting.
+        """
+        path = self.path
+        try:
+            with open_locked(path, "rb") as file:
+                changes = self._read_from(file)
+                with tempfile.NamedTemporaryFile(
+                    dir=path.parent,
+                    prefix=path.name,
+                    suffix=".tmp",
+                    delete=False,
+                ) as temporary_file:
+                    try:
+                        temporary_file.write(
+                            b"".join(
+                                dump_record(name, entry)
+                                for name, entry in self.entries.items()
+                            )
+                        )
+                        temporary_file.flush()
+                        # Temporary files are only readable by the owner.
+                        os.chmod(
+                            temporary_file.name,
+                            stat.S_IMODE(
+                                os.fstat(file.fileno()).st_mode
+                            ),
+                        )
+                        status = os.fstat(temporary_file.fileno())
+                        os.replace(temporary_file.name, path)
+                    except BaseException:
+                        os.unlink(temporary_file.name)
+                        raise
+        except FileNotFoundError:
+            return self._reset(inode=None)
+        _logger.debug(
+            "Compacted %s from %d to %d records.",
+            path,
+            self.record_count,
+            len(self.entries),
+        )
+        self._inode = status.st_ino
+        self._offset = status.st_size
+        self.record_count = len(self.entries)
+        return changes
+
+    def _read_from(self, file: typing.BinaryIO) -> Changes:
+        status = os.fstat(file.fileno())
+        changes: Changes = {}
+        if status.st_ino != self._inode or status.st_size < self._offset:
+            changes = self._reset(inode=status.st_ino)
+        file.seek(self._offset)
+        data = file.read()
+        end = data.rfind(b"\n") + 1
+        entries = self.entries
+        for line in data[:end].splitlines():
+            try:
+                name, entry = parse_record(line)
+            except ValueError as error:
+                _logger.warning(
+                    "Ignoring record in %s: %s", self.path, error
+                )
+                continue
+            self.record_count += 1
+            if entry is None:
+                entries.pop(name, None)
+            else:
+                entries[name] = entry
+            changes[name] = entry
+        self._offset += end
+        return changes
+
+    def _reset(self, inode: typing.Optional[int]) -> Changes:
+        changes: Changes = dict.fromkeys(self.entries)
+        self.entries = {}
+        self.record_count = 0
+        self._inode = inode
+        self._offset = 0
+        return changes
+
+
+class Target:
+    def __init__(
+        self,
+        *,
+        configuration: phile.configuration.Entries,
+    ) -> None:
+        self._current_names = set[str]()
+        self._path = get_path(configuration=configuration)
+
+    def close(self) -> None:
+        if self._current_names:
+            append(
+                self._path,
+                ((name, None) for name in sorted(self._current_names)),
+            )
+            self._current_names.clear()
+
+    def pop(self, name: str) -> None:
+        append(self._path, [(name, None)])
+        self._current_names.discard(name)
+
+    def set(self, entry: phile.notify.Entry) -> None:
+        append(self._path, [(entry.name, entry)])
+        self._current_names.add(entry.name)
+
+
+async def process_watchdog_view(
+    *,
+    log: Log,
+    notify_registry: phile.notify.Registry,
+    ready: asyncio.Event,
+    watchdog_view: collections.abc.AsyncIterable[
+        watchdog.events.FileSystemEvent,
+    ],
+) -> None:
+    current_names = set[str]()
+
+    def apply(changes: Changes) -> None:
+        for name, entry in changes.items():
+            if entry is None:
+                notify_registry.discard(name)
+                current_names.discard(name)
+            else:
+                notify_registry.add_entry(entry)
+                current_names.add(name)
+
+    try:
+        apply(await asyncio.to_thread(log.read))
+        ready.set()
+        # Branch exiting into finally.
+        # Covered in test_gracefully_stop_if_watchdog_queue_done
+        async for event in watchdog_view:  # pragma: no branch
+            del event
+            changes = await asyncio.to_thread(log.read)
+            if log.needs_compaction():
+                changes.update(await asyncio.to_thread(log.compact))
+            apply(changes)
+    finally:
+        for entry_name in current_names:
+            notify_registry.discard(entry_name)
+
+
+@contextlib.asynccontextmanager
+async def async_open(
+    *,
+    configuration: phile.configuration.Entries,
+    notify_registry: phile.notify.Registry,
+    observer: phile.watchdog.asyncio.BaseObserver,
+) -> collections.abc.AsyncIterator[Target]:
+    log_path = get_path(configuration=configuration)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    watchdog_view = await observer.schedule(
+        log_path.parent,
+        event_filter=phile.watchdog.asyncio.EventFilter(
+            suffix=log_path.name
+        ),
+    )
+    try:
+        ready = asyncio.Event()
+        worker_task = asyncio.create_task(
+            process_watchdog_view(
+                log=Log(path=log_path),
+                notify_registry=notify_registry,
+                ready=ready,
+                watchdog_view=watchdog_view,
+            )
+        )
+        try:
+            await ready.wait()
+            yield Target(configuration=configuration)
+        finally:
+            await phile.asyncio.cancel_and_wait(worker_task)
+    finally:
+        await watchdog_view.aclose()
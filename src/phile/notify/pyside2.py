@@ -19,6 +19,7 @@ import PySide2.QtWidgets
 # Internal packages.
 import phile.PySide2.QtCore
 import phile.PySide2.QtNetwork
+import phile.configuration
 import phile.data
 import phile.main
 import phile.notify
@@ -399,7 +400,13 @@ async def async_run(
     launcher_registry: phile.launcher.Registry,
 ) -> int:  # pragma: no cover
     event_view = launcher_registry.event_queue.__aiter__()
-    await launcher_registry.start(gui_name := "phile.notify.watchdog")
+    await launcher_registry.start("phile.configuration")
+    configuration = launcher_registry.capability_registry[
+        phile.configuration.Entries
+    ]
+    await launcher_registry.start(
+        "phile.notify." + configuration.notify_backend
+    )
     await launcher_registry.start(gui_name := "phile.notify.pyside2")
     if not launcher_registry.is_running(gui_name):
         return 1
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+---------------------------
+Full-text search of entries
+---------------------------
+
+An :class:`Index` maps words in names and texts of entries
+to the names of entries containing them.
+Changing an entry only updates the words of that entry,
+and queries look up their words instead of reading every entry.
+A word in a query ending with ``*`` matches words with that prefix,
+and entries must match every word of a query.
+
+:func:`run` keeps an index updated from a :class:`phile.notify.Registry`.
+Texts of entries not of the base :class:`phile.notify.Entry` type,
+such as entries reading their text from files,
+are read in a thread so as to not block the event loop.
+:func:`load_directory` keeps words of notify files in a cache file,
+so that only files changed since the last search are read.
+"""
+
+# Standard library.
+import asyncio
+import bisect
+import collections.abc
+import contextlib
+import json
+import logging
+import os
+import pathlib
+import re
+import stat
+import typing
+
+# Internal packages.
+import phile.data
+import phile.notify
+import phile.os
+
+# TODO[mypy issue #1422]: __loader__ not defined
+_loader_name: str = __loader__.name  # type: ignore[name-defined]
+_logger = logging.getLogger(_loader_name)
+
+_word_pattern = re.compile(r"\w+")
+_query_word_pattern = re.compile(r"\w+\*?")
+
+
+def get_terms(text: str) -> frozenset[str]:
+    """Returns lowercase words in ``text``."""
+    return frozenset(_word_pattern.findall(text.lower()))
+
+
+class Index:
+    def __init__(self) -> None:
+        self._entry_terms: dict[str, frozenset[str]] = {}
+        self._postings: dict[str, set[str]] = {}
+        self._sorted_terms: typing.Optional[list[str]] = None
+        """Terms sorted for prefix queries, or ``None`` if outdated."""
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entry_terms
+
+    def __len__(self) -> int:
+        return len(self._entry_terms)
+
+    def get_entry_terms(self, name: str) -> frozenset[str]:
+        """Returns terms of entry ``name``, or none if not indexed."""
+        return self._entry_terms.get(name, frozenset())
+
+    def set(self, name: str, text: str) -> None:
+        """Indexes entry ``name`` by terms in ``name`` and ``text``."""
+        self.set_terms(name, get_terms(name) | get_terms(text))
+
+    def set_terms(
+        self, name: str, terms: collections.abc.Iterable[str]
+    ) -> None:
+        new_terms = frozenset(terms)
+        old_terms = self._entry_terms.get(name, frozenset())
+        postings = self._postings
+        for term in old_terms - new_terms:
+            names = postings[term]
+            names.discard(name)
+            if not names:
+                del postings[term]
+                self._sorted_terms = None
+        for term in new_terms - old_terms:
+            names = postings.setdefault(term, set())
+            if not names:
+                self._sorted_terms = None
+            names.add(name)
+        self._entry_terms[name] = new_terms
+
+    def discard(self, name: str) -> None:
+        if name in self._entry_terms:
+            self.set_terms(name, ())
+            del self._entry_terms[name]
+
+    def match_term(self, term: str) -> frozenset[str]:
+        return frozenset(self._postings.get(term, ()))
+
+    def match_prefix(self, prefix: str) -> frozenset[str]:
+        sorted_terms = self._sorted_terms
+        if sorted_terms is None:
+            sorted_terms = self._sorted_terms = sorted(self._postings)
+        postings = self._postings
+        names = set[str]()
+        index = bisect.bisect_left(sorted_terms, prefix)
+        for term in sorted_terms[index:]:
+            if not term.startswith(prefix):
+                break
+            names.update(postings[term])
+        return frozenset(names)
+
+    def search(self, query: str) -> list[str]:
+        """Returns sorted names of entries matching ``query``."""
+        matches: typing.Optional[frozenset[str]] = None
+        for word in _query_word_pattern.findall(query.lower()):
+            if word.endswith("*"):
+                names = self.match_prefix(word.removesuffix("*"))
+            else:
+                names = self.match_term(word)
+            matches = names if matches is None else matches & names
+            if not matches:
+                break
+        return sorted(matches or ())
+
+
+async def _get_text(entry: phile.notify.Entry) -> str:
+    if (
+        type(entry) is phile.notify.Entry
+    ):  # pylint: disable=unidiomatic-typecheck
+        return entry.text
+    return await asyncio.to_thread(getattr, entry, "text")
+
+
+async def run(
+    *,
+    notify_registry: phile.notify.Registry,
+    index: Index,
+) -> None:
+    """Updates ``index`` with entries of ``notify_registry`` until closed."""
+    notify_view = notify_registry.event_queue.__aiter__()
+    for entry in notify_registry.current_values.copy():
+        index.set(entry.name, await _get_text(entry))
+    # Branch of not iterating.
+    # Covered in test_returns_if_registry_closes.
+    async for notify_event in notify_view:  # pragma: no branch
+        if notify_event.type == phile.data.EventType.DISCARD:
+            index.discard(notify_event.key)
+        else:
+            index.set(
+                notify_event.key, await _get_text(notify_event.value)
+            )
+
+
+def _load_cache(path: pathlib.Path) -> dict[str, typing.Any]:
+    try:
+        cache = json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+    # JSON decoding errors are also `ValueError`.
+    except (OSError, ValueError) as error:
+        _logger.warning("Ignoring search cache %s: %s", path, error)
+        return {}
+    if not isinstance(cache, dict):
+        _logger.warning("Ignoring search cache %s: not an object", path)
+        return {}
+    return cache
+
+
+def _get_cached_terms(
+    cached: typing.Any, signature: list[int]
+) -> typing.Optional[list[str]]:
+    """Returns ``None`` if ``cached`` is not of a file with ``signature``."""
+    if not isinstance(cached, dict):
+        return None
+    terms = cached.get("terms")
+    if cached.get("signature") != signature or not isinstance(
+        terms, list
+    ):
+        return None
+    return [str(term) for term in terms]
+
+
+def _read_text(path: str) -> typing.Optional[str]:
+    """Returns ``None`` if ``path`` was removed."""
+    try:
+        return pathlib.Path(path).read_text()
+    except FileNotFoundError:
+        return None
+
+
+def load_directory(
+    *,
+    cache_path: pathlib.Path,
+    directory: pathlib.Path,
+    suffix: str,
+) -> Index:
+    """
+    Returns an index of files in ``directory`` ending in ``suffix``.
+
+    Terms of each file are kept in ``cache_path``
+    with the modification time and size of the file,
+    so that only files changed since the last call are read.
+    """
+    cache = _load_cache(cache_path)
+    new_cache: dict[str, typing.Any] = {}
+    index = Index()
+    file_stats: dict[str, os.stat_result] = {}
+    try:
+        with os.scandir(directory) as dir_entries:
+            for dir_entry in dir_entries:
+                if not dir_entry.name.endswith(suffix):
+                    continue
+                with contextlib.suppress(FileNotFoundError):
+                    file_stats[dir_entry.path] = dir_entry.stat()
+    except FileNotFoundError:
+        pass
+    for path, path_stat in file_stats.items():
+        if not stat.S_ISREG(path_stat.st_mode):
+            continue
+        name = os.path.basename(path).removesuffix(suffix)
+        signature = [path_stat.st_mtime_ns, path_stat.st_size]
+        terms = _get_cached_terms(cache.get(name), signature)
+        if terms is not None:
+            index.set_terms(name, terms)
+        else:
+            text = _read_text(path)
+            if text is None:
+                continue
+            index.set(name, text)
+        new_cache[name] = {
+            "signature": signature,
+            "terms": sorted(index.get_entry_terms(name)),
+        }
+    if new_cache != cache:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Searches may run concurrently and read the cache.
+        phile.os.write_text(
+            cache_path, json.dumps(new_cache), atomic=True
+        )
+    return index
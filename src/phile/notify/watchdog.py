@@ -5,10 +5,13 @@
 # Standard library.
 import asyncio
 import collections.abc
+import concurrent.futures
 import contextlib
 import datetime
 import logging
+import os
 import pathlib
+import stat
 import typing
 
 # External dependencies.
@@ -18,12 +21,17 @@ import watchdog.events
 import phile.asyncio.pubsub
 import phile.configuration
 import phile.notify
+import phile.notify.expiry_storage
+import phile.os
 import phile.watchdog.asyncio
 
 # TODO[mypy issue #1422]: __loader__ not defined
 _loader_name: str = __loader__.name  # type: ignore[name-defined]
 _logger = logging.getLogger(_loader_name)
 
+default_load_worker_count = 8
+"""Number of files :func:`load_existing` reads at the same time."""
+
 
 def get_directory(
     configuration: phile.configuration.Entries,
@@ -53,9 +61,214 @@ def load_from_path(
         modified_at=datetime.datetime.fromtimestamp(
             path.stat().st_mtime
         ),
+        expires_at=phile.notify.expiry_storage.load(path),
+    )
+
+
+class LazyEntry(phile.notify.Entry):
+    """
+    An entry that reads its text from :attr:`path` only when used.
+
+    Texts read are kept in :attr:`text_cache`
+    keyed on the path, inode, modification time and size of the file,
+    so that only texts in use are kept in memory.
+    The inode changes when the file is replaced, as in atomic saves,
+    even if the modification time and size do not.
+    A text assigned to the entry is kept by the entry instead.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        modified_at: typing.Optional[datetime.datetime] = None,
+        expires_at: typing.Optional[datetime.datetime] = None,
+        path: pathlib.Path,
+        size: int,
+        inode: int,
+        modified_at_ns: int,
+        text_cache: phile.notify.TextCache,
+    ) -> None:
+        super().__init__(
+            name=name, modified_at=modified_at, expires_at=expires_at
+        )
+        # Discard the default text assigned by the dataclass.
+        self._text: typing.Optional[str] = None
+        self.path = path
+        self.size = size
+        """Size of the file in bytes."""
+        self.inode = inode
+        """Inode number of the file."""
+        self.modified_at_ns = modified_at_ns
+        """Modification time of the file in nanoseconds."""
+        self.text_cache = text_cache
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LazyEntry):
+            return NotImplemented
+        return (
+            self.name,
+            self.path,
+            self.size,
+            self.inode,
+            self.modified_at_ns,
+            self.modified_at,
+            self.expires_at,
+            self._text,
+        ) == (
+            other.name,
+            other.path,
+            other.size,
+            other.inode,
+            other.modified_at_ns,
+            other.modified_at,
+            other.expires_at,
+            other._text,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            "{}(name={!r}, path={!r}, size={!r},"
+            " modified_at={!r}, expires_at={!r})".format(
+                type(self).__name__,
+                self.name,
+                self.path,
+                self.size,
+                self.modified_at,
+                self.expires_at,
+            )
+        )
+
+    # Overriding a dataclass field with a property is not understood.
+    # It is reported on both the decorator and the function.
+    @property  # type: ignore[override]
+    def text(self) -> str:  # type: ignore[override]
+        """Empty if the file was removed before being read."""
+        text = self._text
+        if text is not None:
+            return text
+        path = self.path
+        try:
+            return self.text_cache.get(
+                (path, self.inode, self.modified_at_ns, self.size),
+                path.read_text,
+            )
+        except FileNotFoundError:
+            return ""
+
+    @text.setter
+    def text(self, text: str) -> None:
+        self._text = text
+
+
+def load_metadata_from_path(
+    path: pathlib.Path,
+    configuration: phile.configuration.Entries,
+    text_cache: phile.notify.TextCache,
+) -> LazyEntry:
+    """Returns an entry that reads its text only when used."""
+    path_stat = path.stat()
+    if stat.S_ISDIR(path_stat.st_mode):
+        raise IsADirectoryError(path)
+    return LazyEntry(
+        name=path.name.removesuffix(configuration.notify_suffix),
+        modified_at=datetime.datetime.fromtimestamp(path_stat.st_mtime),
+        expires_at=phile.notify.expiry_storage.load(path),
+        path=path,
+        size=path_stat.st_size,
+        inode=path_stat.st_ino,
+        modified_at_ns=path_stat.st_mtime_ns,
+        text_cache=text_cache,
     )
 
 
+def _stat_file(
+    dir_entry: os.DirEntry[str],
+) -> typing.Optional[os.stat_result]:
+    """Returns ``None`` if ``dir_entry`` is not an existing file."""
+    try:
+        dir_entry_stat = dir_entry.stat()
+    except FileNotFoundError:
+        return None
+    if not stat.S_ISREG(dir_entry_stat.st_mode):
+        return None
+    return dir_entry_stat
+
+
+def _read_content(
+    path: pathlib.Path,
+) -> typing.Optional[tuple[str, typing.Optional[datetime.datetime]]]:
+    """Returns text and expiry, or ``None`` if ``path`` was removed."""
+    try:
+        return path.read_text(), phile.notify.expiry_storage.load(path)
+    except FileNotFoundError:
+        return None
+
+
+def load_existing(
+    configuration: phile.configuration.Entries,
+    text_cache: typing.Optional[phile.notify.TextCache] = None,
+    max_workers: int = default_load_worker_count,
+) -> dict[pathlib.Path, phile.notify.Entry]:
+    """
+    Returns entries of files in the notify directory by their paths.
+
+    The directory is listed once,
+    using the status of each file found by the listing,
+    and texts are read by up to ``max_workers`` threads.
+    Only metadata of the files are read if ``text_cache`` is given.
+    See :class:`LazyEntry`.
+    Files removed while loading are left out.
+    """
+    notify_directory = get_directory(configuration=configuration)
+    notify_suffix = configuration.notify_suffix
+    file_stats: dict[pathlib.Path, os.stat_result] = {}
+    try:
+        with os.scandir(notify_directory) as dir_entries:
+            for dir_entry in dir_entries:
+                if not dir_entry.name.endswith(notify_suffix):
+                    continue
+                dir_entry_stat = _stat_file(dir_entry)
+                if dir_entry_stat is not None:
+                    file_stats[
+                        notify_directory / dir_entry.name
+                    ] = dir_entry_stat
+    except FileNotFoundError:
+        return {}
+    entries: dict[pathlib.Path, phile.notify.Entry] = {}
+    if text_cache is not None:
+        for path, path_stat in file_stats.items():
+            entries[path] = LazyEntry(
+                name=path.name.removesuffix(notify_suffix),
+                modified_at=datetime.datetime.fromtimestamp(
+                    path_stat.st_mtime
+                ),
+                expires_at=phile.notify.expiry_storage.load(path),
+                path=path,
+                size=path_stat.st_size,
+                inode=path_stat.st_ino,
+                modified_at_ns=path_stat.st_mtime_ns,
+                text_cache=text_cache,
+            )
+        return entries
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_workers
+    ) as executor:
+        contents = executor.map(_read_content, file_stats)
+    for (path, path_stat), content in zip(file_stats.items(), contents):
+        if content is not None:
+            text, expires_at = content
+            entries[path] = phile.notify.Entry(
+                name=path.name.removesuffix(notify_suffix),
+                text=text,
+                modified_at=datetime.datetime.fromtimestamp(
+                    path_stat.st_mtime
+                ),
+                expires_at=expires_at,
+            )
+    return entries
+
+
 def load(
     name: str,
     configuration: phile.configuration.Entries,
@@ -69,14 +282,31 @@ def load(
 def save(
     entry: phile.notify.Entry,
     configuration: phile.configuration.Entries,
+    *,
+    atomic: bool = False,
+    fsync: bool = False,
 ) -> None:
+    """
+    See :func:`phile.os.write_text` for ``atomic`` and ``fsync``.
+
+    The expiry time is kept as described in :mod:`phile.notify.expiry_storage`,
+    and set before the file is renamed into place if ``atomic`` is set.
+    """
     # Does not save modified at times.
     entry_path = get_path(
         name=entry.name,
         configuration=configuration,
     )
     entry_path.parent.mkdir(parents=True, exist_ok=True)
-    entry_path.write_text(entry.text)
+    phile.os.write_text(
+        entry_path,
+        entry.text,
+        atomic=atomic,
+        fsync=fsync,
+        prepare_file=lambda written_path: phile.notify.expiry_storage.save(
+            entry_path, entry.expires_at, attribute_path=written_path
+        ),
+    )
 
 
 # TODO(BoniLindsley): Refactor common writing functionality?
@@ -93,7 +323,9 @@ class Target:
         # TODO[mypy issue 4001]: Remove type ignore.
         super().__init__(*args, **kwargs)  # type: ignore[call-arg]
         self._current_names = set[str]()
+        self._atomic = configuration.save_atomically
         self._configuration = configuration
+        self._fsync = configuration.save_fsync
 
     def close(self) -> None:
         for name in self._current_names.copy():
@@ -104,10 +336,18 @@ class Target:
             name=name, configuration=self._configuration
         )
         entry_path.unlink(missing_ok=True)
+        phile.notify.expiry_storage.get_sidecar_path(entry_path).unlink(
+            missing_ok=True
+        )
         self._current_names.discard(name)
 
     def set(self, entry: phile.notify.Entry) -> None:
-        save(entry=entry, configuration=self._configuration)
+        save(
+            entry=entry,
+            configuration=self._configuration,
+            atomic=self._atomic,
+            fsync=self._fsync,
+        )
         self._current_names.add(entry.name)
 
 
@@ -116,12 +356,26 @@ async def update_path(
     configuration: phile.configuration.Entries,
     notify_registry: phile.notify.Registry,
     path: pathlib.Path,
+    text_cache: typing.Optional[phile.notify.TextCache] = None,
 ) -> bool:
+    """
+    Only metadata of the entry is read if ``text_cache`` is given.
+
+    See :class:`LazyEntry`.
+    """
     notify_entry: typing.Optional[phile.notify.Entry] = None
     try:
-        notify_entry = await asyncio.to_thread(
-            load_from_path, path=path, configuration=configuration
-        )
+        if text_cache is None:
+            notify_entry = await asyncio.to_thread(
+                load_from_path, path=path, configuration=configuration
+            )
+        else:
+            notify_entry = await asyncio.to_thread(
+                load_metadata_from_path,
+                path=path,
+                configuration=configuration,
+                text_cache=text_cache,
+            )
     except FileNotFoundError:
         pass
     entry_name = path.name.removesuffix(configuration.notify_suffix)
@@ -137,21 +391,15 @@ async def update_path(
 async def update_existing_paths(
     configuration: phile.configuration.Entries,
     notify_registry: phile.notify.Registry,
+    text_cache: typing.Optional[phile.notify.TextCache] = None,
 ) -> set[pathlib.Path]:
-    paths_found = set[pathlib.Path]()
-    notify_directory = get_directory(configuration=configuration)
-    notify_suffix = configuration.notify_suffix
-    for path in notify_directory.glob("*" + notify_suffix):
-        try:
-            added = await update_path(
-                configuration=configuration,
-                notify_registry=notify_registry,
-                path=path,
-            )
-        except IsADirectoryError:
-            continue
-        paths_found.add(path)
-    return paths_found
+    """Adds entries from :func:`load_existing` as a batch."""
+    entries = await asyncio.to_thread(
+        load_existing, configuration=configuration, text_cache=text_cache
+    )
+    _logger.debug("Found %d existing notifications", len(entries))
+    notify_registry.add_entries(entries.values())
+    return set(entries)
 
 
 async def process_watchdog_view(
@@ -162,13 +410,16 @@ async def process_watchdog_view(
     watchdog_view: collections.abc.AsyncIterable[
         watchdog.events.FileSystemEvent,
     ],
+    text_cache: typing.Optional[phile.notify.TextCache] = None,
 ) -> None:
     notify_directory = get_directory(configuration=configuration)
     notify_suffix = configuration.notify_suffix
     current_names = set[str]()
     try:
         added_paths = await update_existing_paths(
-            configuration=configuration, notify_registry=notify_registry
+            configuration=configuration,
+            notify_registry=notify_registry,
+            text_cache=text_cache,
         )
         for path in added_paths:
             entry_name = path.name.removesuffix(notify_suffix)
@@ -189,6 +440,7 @@ async def process_watchdog_view(
                 configuration=configuration,
                 notify_registry=notify_registry,
                 path=path,
+                text_cache=text_cache,
             )
             entry_name = path.name.removesuffix(notify_suffix)
             if added:
@@ -206,9 +458,18 @@ async def async_open(
     configuration: phile.configuration.Entries,
     notify_registry: phile.notify.Registry,
     observer: phile.watchdog.asyncio.BaseObserver,
+    text_cache: typing.Optional[phile.notify.TextCache] = None,
 ) -> collections.abc.AsyncIterator[Target]:
+    """
+    Only metadata of entries are kept if ``text_cache`` is given.
+
+    See :class:`LazyEntry`.
+    """
     watchdog_view = await observer.schedule(
-        get_directory(configuration=configuration)
+        get_directory(configuration=configuration),
+        event_filter=phile.watchdog.asyncio.EventFilter(
+            suffix=configuration.notify_suffix
+        ),
     )
     try:
         ready = asyncio.Event()
@@ -218,6 +479,7 @@ async def async_open(
                 notify_registry=notify_registry,
                 ready=ready,
                 watchdog_view=watchdog_view,
+                text_cache=text_cache,
             )
         )
         try:
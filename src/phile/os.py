@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 
 # Standard libraries.
+import collections.abc
 import os
+import pathlib
 import typing
 
 
@@ -31,3 +33,73 @@ class Environ:
                 source_dict.pop(key, None)
             else:
                 source_dict[key] = value
+
+
+def write_text(
+    path: pathlib.Path,
+    text: str,
+    *,
+    atomic: bool = False,
+    fsync: bool = False,
+    prepare_file: typing.Optional[
+        collections.abc.Callable[[pathlib.Path], None]
+    ] = None,
+) -> None:
+    """
+    Writes ``text`` to ``path``, replacing its content.
+
+    If ``atomic`` is set, ``text`` is written to a temporary file
+    in the same directory that is then renamed to ``path``,
+    so that readers see either the old or the new content in full,
+    and watchers see one move instead of a truncation and modifications.
+    The temporary file name starts with a dot and ends with ``.tmp``,
+    so it is ignored by watchers filtering by suffix.
+
+    If ``fsync`` is set, the content is flushed to disk before returning,
+    as is the rename into the directory if ``atomic`` is set.
+
+    If ``prepare_file`` is given, it is called with the file written to
+    after writing ``text``, and before renaming it if ``atomic`` is set,
+    such as for setting attributes readers should see with the content.
+    """
+    if not atomic:
+        with path.open("w") as file:
+            file.write(text)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        if prepare_file is not None:
+            prepare_file(path)
+        return
+    while True:
+        temporary_path = path.with_name(
+            ".{}.{}.tmp".format(path.name, os.urandom(4).hex())
+        )
+        try:
+            # Using `os.open` so that the mode respects umask.
+            descriptor = os.open(
+                temporary_path,
+                os.O_WRONLY | os.O_CREAT | os.O_EXCL,
+                0o666,
+            )
+            break
+        except FileExistsError:
+            pass
+    try:
+        with os.fdopen(descriptor, "w") as file:
+            file.write(text)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        if prepare_file is not None:
+            prepare_file(temporary_path)
+        os.replace(temporary_path, path)
+    except BaseException:
+        temporary_path.unlink(missing_ok=True)
+        raise
+    if fsync:
+        directory_descriptor = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(directory_descriptor)
+        finally:
+            os.close(directory_descriptor)
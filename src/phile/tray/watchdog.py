@@ -8,7 +8,6 @@ import io
 import json
 import logging
 import pathlib
-import shutil
 import typing
 import warnings
 
@@ -18,6 +17,7 @@ import watchdog.events
 # Internal packages.
 import phile.asyncio.pubsub
 import phile.configuration
+import phile.os
 import phile.tray
 import phile.watchdog.asyncio
 
@@ -66,7 +66,11 @@ def save(
     entry: phile.tray.Entry,
     tray_directory: pathlib.Path,
     tray_suffix: str,
+    *,
+    atomic: bool = False,
+    fsync: bool = False,
 ) -> None:
+    """See :func:`phile.os.write_text` for ``atomic`` and ``fsync``."""
     # Buffer for data to be written.
     content_stream = io.StringIO()
     # First line is the text icon.
@@ -83,12 +87,11 @@ def save(
     if json_content:
         content_stream.write("\n")
         json.dump(json_content, content_stream)
-    # Copy over the buffer.
     entry_path = get_path(entry.name, tray_directory, tray_suffix)
     entry_path.parent.mkdir(parents=True, exist_ok=True)
-    with entry_path.open("w+") as file_stream:
-        content_stream.seek(0)
-        shutil.copyfileobj(content_stream, file_stream)
+    phile.os.write_text(
+        entry_path, content_stream.getvalue(), atomic=atomic, fsync=fsync
+    )
 
 
 class Target:
@@ -101,6 +104,8 @@ class Target:
         # TODO[mypy issue 4001]: Remove type ignore.
         super().__init__(*args, **kwargs)  # type: ignore[call-arg]
         self._current_names = set[str]()
+        self._atomic = configuration.save_atomically
+        self._fsync = configuration.save_fsync
         self._tray_directory = (
             configuration.state_directory_path
             / configuration.tray_directory
@@ -123,6 +128,8 @@ class Target:
             entry=entry,
             tray_directory=self._tray_directory,
             tray_suffix=self._tray_suffix,
+            atomic=self._atomic,
+            fsync=self._fsync,
         )
         self._current_names.add(entry.name)
 
@@ -188,7 +195,12 @@ async def async_open(
         tray_suffix=configuration.tray_suffix,
         tray_registry=tray_registry,
     )
-    watchdog_event_view = await observer.schedule(tray_directory)
+    watchdog_event_view = await observer.schedule(
+        tray_directory,
+        event_filter=phile.watchdog.asyncio.EventFilter(
+            suffix=configuration.tray_suffix
+        ),
+    )
     try:
         worker_task = asyncio.create_task(
             tray_source.process_watchdog_event_view(
@@ -53,7 +53,10 @@ class Producer:
             self._trigger_directory.mkdir, parents=True, exist_ok=True
         )
         async with await self._observer.schedule(
-            self._trigger_directory
+            self._trigger_directory,
+            event_filter=phile.watchdog.asyncio.EventFilter(
+                suffix=self._trigger_suffix
+            ),
         ) as watchdog_view:
             await asyncio.to_thread(self._bind_existing_triggers)
             try:
@@ -175,7 +178,12 @@ class View:
         pid_lock = phile.trigger.PidLock(self._trigger_directory / "pid")
         await asyncio.to_thread(pid_lock.acquire)
         try:
-            yield await self._observer.schedule(self._trigger_directory)
+            yield await self._observer.schedule(
+                self._trigger_directory,
+                event_filter=phile.watchdog.asyncio.EventFilter(
+                    suffix=self._trigger_suffix
+                ),
+            )
         finally:
             try:
 
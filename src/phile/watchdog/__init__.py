@@ -6,9 +6,13 @@ Convenience module for using :mod:`~watchdog`
 
 .. automodule:: phile.watchdog.asyncio
 .. automodule:: phile.watchdog.observers
+.. automodule:: phile.watchdog.polling
+.. automodule:: phile.watchdog.replay
 """
 
 # Standard library.
+import dataclasses
+import os.path
 import pathlib
 import types
 import typing
@@ -201,3 +205,163 @@ class Scheduler(watchdog.events.FileSystemEventHandler):
         path = pathlib.Path(event.dest_path)
         if self.path_filter(path):
             self.path_handler(path)
+
+
+@dataclasses.dataclass(frozen=True)
+class _Route:
+    path_handlers: dict[str, tuple[PathHandler, ...]]
+    """Handlers keyed by the suffix their paths must end with."""
+    suffix_lengths: tuple[int, ...]
+    watch: watchdog.observers.api.ObservedWatch
+
+
+def _create_route(
+    path_handlers: dict[str, tuple[PathHandler, ...]],
+    *,
+    watch: watchdog.observers.api.ObservedWatch,
+) -> _Route:
+    return _Route(
+        path_handlers=path_handlers,
+        suffix_lengths=tuple(sorted(set(map(len, path_handlers)))),
+        watch=watch,
+    )
+
+
+class Router(watchdog.events.FileSystemEventHandler):
+    """
+    Dispatches paths of file events
+    to :data:`PathHandler`-s indexed by directory and name suffix.
+
+    Unlike having a :class:`Scheduler` for each handler,
+    each directory is scheduled in :attr:`watching_observer` once,
+    and only handlers with a matching suffix are visited.
+    Event paths are matched as strings,
+    and a :class:`~pathlib.Path` is created
+    only if there is a handler to receive it.
+    So the cost of dispatching an event
+    does not grow with the number of handlers that ignore it.
+
+    Directories are watched non-recursively,
+    and events of the directories themselves are ignored.
+    Handlers may be added and removed
+    while the observer thread is dispatching.
+    """
+
+    def __init__(
+        self,
+        *args: typing.Any,
+        watching_observer: watchdog.observers.api.BaseObserver,
+        **kwargs: typing.Any,
+    ) -> None:
+        # See: https://github.com/python/mypy/issues/4001
+        super().__init__(*args, **kwargs)  # type: ignore[call-arg]
+        self.watching_observer = watching_observer
+        self._routes: dict[str, _Route] = {}
+        """
+        Routes keyed by directory string.
+
+        Routes are replaced rather than modified
+        so that the observer thread sees a consistent route.
+        """
+
+    def add_handler(
+        self,
+        *,
+        directory: pathlib.Path,
+        path_handler: PathHandler,
+        suffix: str = "",
+    ) -> None:
+        """
+        Calls ``path_handler`` with paths of changed files
+        in ``directory`` with a name ending in ``suffix``.
+
+        The ``directory`` is created if it does not exist.
+        """
+        directory_string = str(directory)
+        route = self._routes.get(directory_string)
+        if route is None:
+            directory.mkdir(exist_ok=True, parents=True)
+            path_handlers = {}
+            watch = phile.watchdog.observers.add_handler(
+                observer=self.watching_observer,
+                event_handler=self,
+                path=directory,
+            )
+        else:
+            path_handlers = route.path_handlers.copy()
+            watch = route.watch
+        path_handlers[suffix] = path_handlers.get(suffix, ()) + (
+            path_handler,
+        )
+        self._routes[directory_string] = _create_route(
+            path_handlers, watch=watch
+        )
+
+    def remove_handler(
+        self,
+        *,
+        directory: pathlib.Path,
+        path_handler: PathHandler,
+        suffix: str = "",
+    ) -> None:
+        """
+        Undoes :meth:`add_handler` with the same arguments.
+
+        Raises :exc:`KeyError` if there is no such handler.
+        The ``directory`` is unscheduled
+        when its last handler is removed.
+        """
+        directory_string = str(directory)
+        route = self._routes[directory_string]
+        suffix_handlers = list(route.path_handlers[suffix])
+        try:
+            suffix_handlers.remove(path_handler)
+        except ValueError as error:
+            raise KeyError(path_handler) from error
+        path_handlers = route.path_handlers.copy()
+        if suffix_handlers:
+            path_handlers[suffix] = tuple(suffix_handlers)
+        else:
+            del path_handlers[suffix]
+        if path_handlers:
+            self._routes[directory_string] = _create_route(
+                path_handlers, watch=route.watch
+            )
+            return
+        del self._routes[directory_string]
+        phile.watchdog.observers.remove_handler(
+            observer=self.watching_observer,
+            event_handler=self,
+            watch=route.watch,
+        )
+
+    def dispatch(self, event: watchdog.events.FileSystemEvent) -> None:
+        """Internal. Calls handlers matching paths in ``event``."""
+        if event.is_directory:
+            return
+        self.dispatch_path(event.src_path)
+        if event.event_type != watchdog.events.EVENT_TYPE_MOVED:
+            return
+        assert isinstance(event, watchdog.events.FileMovedEvent)
+        self.dispatch_path(event.dest_path)
+
+    def dispatch_path(self, path: str) -> None:
+        """Calls handlers matching the file ``path``."""
+        directory, name = os.path.split(path)
+        route = self._routes.get(directory)
+        if route is None:
+            return
+        name_length = len(name)
+        path_object: typing.Optional[pathlib.Path] = None
+        for suffix_length in route.suffix_lengths:
+            if suffix_length > name_length:
+                break
+            path_handlers = route.path_handlers.get(
+                name[name_length - suffix_length :]
+            )
+            if path_handlers is None:
+                continue
+            if path_object is None:
+                path_object = pathlib.Path(path)
+            for path_handler in path_handlers:
+                path_handler(path_object)
@@ -22,7 +22,11 @@ Mixing :mod:`watchdog` with :mod:`asyncio`
 import asyncio
 import collections
 import collections.abc
+import contextlib
+import dataclasses
+import fnmatch
 import functools
+import os.path
 import pathlib
 import platform
 import types
@@ -76,12 +80,101 @@ class EventView(
         self.aclose_callback = phile.asyncio.noop
 
 
+@dataclasses.dataclass(frozen=True)
+class EventFilter:
+    """
+    Selects file system events using their raw string paths.
+
+    It is evaluated in the emitter thread by :meth:`EventQueue.put`
+    so that rejected events never cross into the :mod:`asyncio` loop.
+    A move event is accepted if either of its paths is accepted.
+    """
+
+    suffix: str = ""
+    """Accepted file names must end with this suffix."""
+    glob: str = ""
+    """If not empty, accepted file names must match this pattern."""
+    predicate: typing.Optional[
+        collections.abc.Callable[[str], bool]
+    ] = None
+    """If given, it must return :data:`True` for accepted paths."""
+    ignore_directories: bool = True
+    """Whether to reject directory events."""
+
+    def match_path(self, path: str) -> bool:
+        name = os.path.basename(path)
+        if not name.endswith(self.suffix):
+            return False
+        if self.glob and not fnmatch.fnmatchcase(name, self.glob):
+            return False
+        predicate = self.predicate
+        return predicate is None or predicate(path)
+
+    def match_event(
+        self, event: watchdog.events.FileSystemEvent
+    ) -> bool:
+        if event.is_directory and self.ignore_directories:
+            return False
+        if self.match_path(event.src_path):
+            return True
+        if event.event_type != watchdog.events.EVENT_TYPE_MOVED:
+            return False
+        assert isinstance(event, watchdog.events.FileSystemMovedEvent)
+        return self.match_path(event.dest_path)
+
+
+def is_in_watch(
+    path: str, watch: watchdog.observers.api.ObservedWatch
+) -> bool:
+    """
+    Returns whether ``watch`` would report changes to ``path``.
+
+    Only string operations are used, so ``path`` and ``watch.path``
+    are expected to be normalised in the same way.
+    """
+    watch_path = watch.path
+    if path == watch_path:
+        return True
+    if not watch.is_recursive:
+        return os.path.dirname(path) == watch_path
+    return path.startswith(os.path.join(watch_path, ""))
+
+
+def is_event_in_watch(
+    event: watchdog.events.FileSystemEvent,
+    watch: watchdog.observers.api.ObservedWatch,
+) -> bool:
+    """A move event is in ``watch`` if either of its paths is."""
+    if is_in_watch(event.src_path, watch):
+        return True
+    if event.event_type != watchdog.events.EVENT_TYPE_MOVED:
+        return False
+    assert isinstance(event, watchdog.events.FileSystemMovedEvent)
+    return is_in_watch(event.dest_path, watch)
+
+
 class EventQueue(
     phile.asyncio.pubsub.Queue[watchdog.events.FileSystemEvent]
 ):
-    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+    def __init__(
+        self,
+        *args: typing.Any,
+        event_filter: typing.Optional[EventFilter] = None,
+        watch_scope: typing.Optional[
+            watchdog.observers.api.ObservedWatch
+        ] = None,
+        **kwargs: typing.Any,
+    ) -> None:
         super().__init__(*args, **kwargs)
         self._loop = asyncio.get_event_loop()
+        self.event_filter = event_filter
+        """Events not matching it are dropped in the emitter thread."""
+        self.watch_scope = watch_scope
+        """
+        Events outside of it are dropped in the emitter thread.
+
+        Used when the emitter is watching a larger tree than requested.
+        """
 
     def __aiter__(self) -> EventView:
         return EventView(next_node=self._next_node)
@@ -95,7 +188,67 @@ class EventQueue(
         ],
     ) -> None:
         """Thread-safe push. Named so to satisfy EventEmitter usage."""
-        self._loop.call_soon_threadsafe(super().put, event_data[0])
+        event = event_data[0]
+        watch_scope = self.watch_scope
+        if watch_scope is not None and not is_event_in_watch(
+            event, watch_scope
+        ):
+            return
+        event_filter = self.event_filter
+        if event_filter is not None and not event_filter.match_event(
+            event
+        ):
+            return
+        self._loop.call_soon_threadsafe(self._put_unless_done, event)
+
+    def _put_unless_done(
+        self, event: watchdog.events.FileSystemEvent
+    ) -> None:
+        # An emitter shared with other queues may still be running
+        # after this queue is detached from it and marked as done.
+        with contextlib.suppress(phile.asyncio.pubsub.Node.AlreadySet):
+            super().put(event)
+
+
+class EventQueueGroup:
+    """
+    Forwards events from one emitter to several :class:`EventQueue`-s.
+
+    Membership changes replace the stored tuple of queues
+    so that the emitter thread always iterates a consistent snapshot.
+    """
+
+    def __init__(self) -> None:
+        self._event_queues: tuple[EventQueue, ...] = tuple()
+
+    def __len__(self) -> int:
+        return len(self._event_queues)
+
+    def add(self, event_queue: EventQueue) -> None:
+        self._event_queues += (event_queue,)
+
+    def remove(self, event_queue: EventQueue) -> None:
+        self._event_queues = tuple(
+            member
+            for member in self._event_queues
+            if member is not event_queue
+        )
+
+    def put(
+        self,
+        event_data: tuple[
+            watchdog.events.FileSystemEvent,
+            watchdog.observers.api.ObservedWatch,
+        ],
+    ) -> None:
+        """Thread-safe push. Named so to satisfy EventEmitter usage."""
+        for event_queue in self._event_queues:
+            event_queue.put(event_data)
+
+
+_EventQueueKey = tuple[
+    watchdog.observers.api.ObservedWatch, typing.Optional[EventFilter]
+]
 
 
 class EventEmitter(
@@ -127,35 +280,82 @@ class BaseObserver:
         self._emitters: (
             dict[watchdog.observers.api.ObservedWatch, EventEmitter]
         ) = {}
-        self._event_queues = collections.defaultdict[
-            watchdog.observers.api.ObservedWatch,
-            EventQueue,
-        ](EventQueue)
-        self._watch_count = collections.defaultdict[
-            watchdog.observers.api.ObservedWatch, int
-        ](int)
+        self._event_queue_groups: (
+            dict[watchdog.observers.api.ObservedWatch, EventQueueGroup]
+        ) = {}
+        self._event_queues: dict[_EventQueueKey, EventQueue] = {}
+        self._event_queue_hosts: (
+            dict[_EventQueueKey, watchdog.observers.api.ObservedWatch]
+        ) = {}
+        """The watch of the emitter each queue is receiving from."""
+        self._recursive_watches: (
+            dict[str, watchdog.observers.api.ObservedWatch]
+        ) = {}
+        """Recursive watches with an emitter, keyed by their path."""
+        self._watch_count = collections.defaultdict[_EventQueueKey, int](
+            int
+        )
 
     async def schedule(
         self,
         path: pathlib.Path,
         recursive: bool = False,
+        *,
+        event_filter: typing.Optional[EventFilter] = None,
     ) -> EventView:
-        cleanup = functools.partial(self.unschedule, path, recursive)
+        """
+        Returns a view of events in ``path``.
+
+        Schedules of the same ``path`` and ``recursive``
+        share the same emitter,
+        and they also share the same queue
+        if their ``event_filter`` compare equal.
+        Events rejected by ``event_filter`` are dropped
+        before they are handed to the :mod:`asyncio` loop.
+
+        If there is no emitter for ``path`` and ``recursive`` yet,
+        but a recursive emitter is watching a parent of ``path``,
+        that emitter is shared instead of creating a new one,
+        with events outside of ``path`` dropped by the queue.
+        This saves kernel resources such as inotify watches.
+        An emitter is stopped only when no queues receive from it.
+        So a shared recursive emitter may outlive its own schedule.
+        Emitters that already exist are not merged
+        when a recursive parent is scheduled later.
+        """
+        cleanup = functools.partial(
+            self.unschedule, path, recursive, event_filter=event_filter
+        )
         watch = watchdog.observers.api.ObservedWatch(
             str(path), recursive
         )
-        self._watch_count[watch] += 1
+        queue_key = (watch, event_filter)
+        self._watch_count[queue_key] += 1
         try:
-            event_queue = self._event_queues[watch]
-            if self._emitters.get(watch) is None:
-                emitter = self._emitters[watch] = self._emitter_class(
-                    typing.cast(
-                        watchdog.observers.api.EventQueue, event_queue
-                    ),
-                    watch,
-                    self.timeout,
+            event_queue = self._event_queues.get(queue_key)
+            if event_queue is None:
+                host = self._find_host(watch)
+                event_queue = EventQueue(
+                    event_filter=event_filter,
+                    watch_scope=(None if host == watch else watch),
                 )
-                emitter.start()
+                self._event_queues[queue_key] = event_queue
+                self._event_queue_hosts[queue_key] = host
+                self._event_queue_groups.setdefault(
+                    host, EventQueueGroup()
+                ).add(event_queue)
+                if self._emitters.get(host) is None:
+                    emitter = self._emitters[host] = self._emitter_class(
+                        typing.cast(
+                            watchdog.observers.api.EventQueue,
+                            self._event_queue_groups[host],
+                        ),
+                        host,
+                        self.timeout,
+                    )
+                    if host.is_recursive:
+                        self._recursive_watches[host.path] = host
+                    emitter.start()
             event_view = event_queue.__aiter__()
             event_view.aclose_callback = cleanup
             return event_view
@@ -167,17 +367,30 @@ class BaseObserver:
         self,
         path: pathlib.Path,
         recursive: bool = False,
+        *,
+        event_filter: typing.Optional[EventFilter] = None,
     ) -> None:
         watch = watchdog.observers.api.ObservedWatch(
             str(path), recursive
         )
-        self._watch_count[watch] -= 1
-        if self._watch_count[watch]:
+        queue_key = (watch, event_filter)
+        self._watch_count[queue_key] -= 1
+        if self._watch_count[queue_key]:
             return
         # Pop all data referencing `watch` before switching context.
-        self._watch_count.pop(watch, None)
-        emitter = self._emitters.pop(watch, None)
-        event_queue = self._event_queues.pop(watch, None)
+        self._watch_count.pop(queue_key, None)
+        emitter: typing.Optional[EventEmitter] = None
+        event_queue = self._event_queues.pop(queue_key, None)
+        if event_queue is not None:
+            host = self._event_queue_hosts.pop(queue_key)
+            event_queue_group = self._event_queue_groups[host]
+            event_queue_group.remove(event_queue)
+            if not event_queue_group:
+                del self._event_queue_groups[host]
+                emitter = self._emitters.pop(host, None)
+                if host.is_recursive:
+                    # There is at most one recursive emitter per path.
+                    self._recursive_watches.pop(host.path, None)
         try:
             if emitter is not None and emitter.is_alive():
                 emitter.stop()
@@ -188,6 +401,32 @@ class BaseObserver:
             if event_queue is not None:
                 event_queue.put_done()
 
+    def _find_host(
+        self, watch: watchdog.observers.api.ObservedWatch
+    ) -> watchdog.observers.api.ObservedWatch:
+        """
+        Returns the watch whose emitter should report ``watch`` events.
+
+        It is ``watch`` itself unless it has no emitter
+        and a recursive emitter exists for ``watch.path``
+        or one of its parents.
+        The parents are found by walking up ``watch.path``,
+        so the cost depends on the depth of the path
+        and not on the number of emitters.
+        """
+        if watch in self._emitters:
+            return watch
+        recursive_watches = self._recursive_watches
+        current_path = watch.path
+        while True:
+            host = recursive_watches.get(current_path)
+            if host is not None:
+                return host
+            parent_path = os.path.dirname(current_path)
+            if parent_path == current_path:
+                return watch
+            current_path = parent_path
+
 
 def _get_InotifyFullEmitter() -> type[EventEmitter]:  # pragma: no cover
     import watchdog.observers.inotify
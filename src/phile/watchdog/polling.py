@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+
+# Side effect is shadowing of module scope names.
+# pylint: disable=redefined-outer-name
+
+# Mimicking arguments of watchdog observer but allowing for subclassing.
+# pylint: disable=keyword-arg-before-vararg
+"""
+--------------------------------------------
+Polling directories with adaptive intervals
+--------------------------------------------
+
+The polling observers from :mod:`watchdog` rescan every watched tree
+at a fixed interval.
+The observers here keep an index of directory entries instead,
+and each directory has its own polling interval.
+A directory is polled often after it changes,
+and its interval grows exponentially while it stays idle.
+"""
+
+# Standard library.
+import collections.abc
+import dataclasses
+import functools
+import heapq
+import os
+import stat
+import threading
+import time
+import typing
+
+# External dependencies.
+import watchdog.events
+import watchdog.observers.api
+
+# Internal modules.
+import phile.watchdog.asyncio
+
+StatKey = tuple[int, int, int, int, float]
+"""Mode, inode, device, size and modification time of an entry."""
+
+ScanResult = dict[str, StatKey]
+"""Directory entry names mapped to their :data:`StatKey`."""
+
+Scanner = collections.abc.Callable[[str], ScanResult]
+"""Signature of callables listing a directory."""
+
+default_max_interval: float = 32
+"""Default longest time in seconds between polls of a directory."""
+
+
+def to_stat_key(stat_result: typing.Any) -> StatKey:
+    return (
+        stat_result.st_mode,
+        stat_result.st_ino,
+        stat_result.st_dev,
+        stat_result.st_size,
+        stat_result.st_mtime,
+    )
+
+
+def scan_directory(path: str) -> ScanResult:
+    """
+    Returns entries in ``path`` using :func:`os.scandir`.
+
+    Symbolic links are not followed.
+    A directory that cannot be listed is treated as being empty,
+    and entries that disappear while scanning are skipped.
+    """
+    entries: ScanResult = {}
+    try:
+        with os.scandir(path) as entry_iterator:
+            for entry in entry_iterator:
+                try:
+                    entry_stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                entries[entry.name] = to_stat_key(entry_stat)
+    except OSError:
+        pass
+    return entries
+
+
+def create_vfs_scanner(
+    stat_callback: collections.abc.Callable[[str], typing.Any],
+    listdir: collections.abc.Callable[[str], typing.Any],
+) -> Scanner:
+    """
+    Returns a :data:`Scanner` using the given callbacks.
+
+    They follow the conventions
+    of :class:`~watchdog.observers.polling.PollingObserverVFS`.
+    That is, ``listdir`` returns names or objects with a ``name``,
+    and ``stat_callback`` is called with full paths.
+    """
+
+    def scan(path: str) -> ScanResult:
+        entries: ScanResult = {}
+        try:
+            listed_entries = list(listdir(path))
+        except OSError:
+            return entries
+        for entry in listed_entries:
+            name = entry if isinstance(entry, str) else entry.name
+            try:
+                entry_stat = stat_callback(os.path.join(path, name))
+            except OSError:
+                continue
+            entries[name] = to_stat_key(entry_stat)
+        return entries
+
+    return scan
+
+
+@dataclasses.dataclass
+class _DirectoryState:
+    entries: ScanResult
+    interval: float
+    due_at: float
+
+
+class AdaptivePoller:
+    """
+    Index of a directory tree that reports changes when polled.
+
+    Only directories that are due are rescanned in each :meth:`poll`.
+    The interval of a directory is reset to ``min_interval``
+    when changes are found in it,
+    and is multiplied by ``backoff_factor`` otherwise,
+    up to ``max_interval``.
+    Directories whose modification time changed,
+    as seen from their parent, are made due immediately.
+
+    Moves are detected within a single directory by matching inodes.
+    Moves across directories are reported as deletion and creation.
+    """
+
+    def __init__(
+        self,
+        *,
+        backoff_factor: float = 2,
+        clock: collections.abc.Callable[[], float] = time.monotonic,
+        max_interval: float = default_max_interval,
+        min_interval: float = 1,
+        recursive: bool = False,
+        root_path: str,
+        scan: Scanner = scan_directory,
+    ) -> None:
+        self.backoff_factor = backoff_factor
+        self.clock = clock
+        self.max_interval = max(max_interval, min_interval)
+        self.min_interval = min_interval
+        self.recursive = recursive
+        self.root_path = root_path
+        self._directories: dict[str, _DirectoryState] = {}
+        self._schedule: list[tuple[float, str]] = []
+        self._scan = scan
+
+    @property
+    def directory_paths(self) -> collections.abc.KeysView[str]:
+        """Paths of directories being polled."""
+        return self._directories.keys()
+
+    @property
+    def next_due_at(self) -> float:
+        """Clock time of the next scheduled poll."""
+        while self._schedule:
+            due_at, path = self._schedule[0]
+            state = self._directories.get(path)
+            if state is not None and state.due_at == due_at:
+                return due_at
+            heapq.heappop(self._schedule)
+        return float("inf")
+
+    def get_interval(self, path: str) -> float:
+        return self._directories[path].interval
+
+    def index(self) -> None:
+        """Records the current state of the tree without reporting."""
+        self._directories.clear()
+        self._schedule.clear()
+        self._add_directory(self.root_path, self.clock(), None)
+
+    def poll(
+        self, *, force: bool = False
+    ) -> list[watchdog.events.FileSystemEvent]:
+        """
+        Rescans directories that are due and returns changes found.
+
+        If ``force`` is :data:`True`, all directories are rescanned.
+        """
+        now = self.clock()
+        due_paths: list[str] = []
+        if force:
+            due_paths.extend(self._directories)
+            self._schedule.clear()
+        else:
+            while self.next_due_at <= now:
+                due_paths.append(heapq.heappop(self._schedule)[1])
+        events: list[watchdog.events.FileSystemEvent] = []
+        # A directory made due early may be scheduled twice.
+        # Parents sort before their children,
+        # so removed children are not rescanned.
+        for path in sorted(set(due_paths)):
+            state = self._directories.get(path)
+            if state is not None:
+                self._poll_directory(path, state, now, events)
+        return events
+
+    def _poll_directory(
+        self,
+        path: str,
+        state: _DirectoryState,
+        now: float,
+        events: list[watchdog.events.FileSystemEvent],
+    ) -> None:
+        new_entries = self._scan(path)
+        changed = self._compare(
+            path, state.entries, new_entries, now, events
+        )
+        state.entries = new_entries
+        if changed:
+            state.interval = self.min_interval
+        else:
+            state.interval = min(
+                state.interval * self.backoff_factor, self.max_interval
+            )
+        self._push(path, state, now + state.interval)
+
+    def _push(
+        self, path: str, state: _DirectoryState, due_at: float
+    ) -> None:
+        state.due_at = due_at
+        heapq.heappush(self._schedule, (due_at, path))
+
+    def _compare(
+        self,
+        path: str,
+        old_entries: ScanResult,
+        new_entries: ScanResult,
+        now: float,
+        events: list[watchdog.events.FileSystemEvent],
+    ) -> bool:
+        deleted_names = sorted(old_entries.keys() - new_entries.keys())
+        created_names = sorted(new_entries.keys() - old_entries.keys())
+        entries_changed = bool(deleted_names or created_names)
+        changed = entries_changed
+        if deleted_names and created_names:
+            self._compare_moves(
+                path,
+                deleted_names,
+                created_names,
+                old_entries,
+                new_entries,
+                now,
+                events,
+            )
+        for name in deleted_names:
+            entry_path = os.path.join(path, name)
+            if stat.S_ISDIR(old_entries[name][0]):
+                self._remove_directory(entry_path, events)
+                events.append(
+                    watchdog.events.DirDeletedEvent(entry_path)
+                )
+            else:
+                events.append(
+                    watchdog.events.FileDeletedEvent(entry_path)
+                )
+        for name in created_names:
+            entry_path = os.path.join(path, name)
+            self._report_created(
+                entry_path, new_entries[name], now, events
+            )
+        for name in sorted(new_entries.keys() & old_entries.keys()):
+            new_key = new_entries[name]
+            if old_entries[name] == new_key:
+                continue
+            entry_path = os.path.join(path, name)
+            child_state = self._directories.get(entry_path)
+            if child_state is not None:
+                # It reports its own changes when polled.
+                self._push(entry_path, child_state, now)
+                continue
+            changed = True
+            if stat.S_ISDIR(new_key[0]):
+                events.append(
+                    watchdog.events.DirModifiedEvent(entry_path)
+                )
+            else:
+                events.append(
+                    watchdog.events.FileModifiedEvent(entry_path)
+                )
+        if entries_changed:
+            events.append(watchdog.events.DirModifiedEvent(path))
+        return changed
+
+    def _compare_moves(
+        self,
+        path: str,
+        deleted_names: list[str],
+        created_names: list[str],
+        old_entries: ScanResult,
+        new_entries: ScanResult,
+        now: float,
+        events: list[watchdog.events.FileSystemEvent],
+    ) -> None:
+        """Removes matched names from the given lists."""
+        created_by_inode = {
+            new_entries[name][1:3]: name for name in created_names
+        }
+        for name in deleted_names.copy():
+            old_key = old_entries[name]
+            dest_name = created_by_inode.pop(old_key[1:3], None)
+            if dest_name is None:
+                continue
+            deleted_names.remove(name)
+            created_names.remove(dest_name)
+            src_path = os.path.join(path, name)
+            dest_path = os.path.join(path, dest_name)
+            if stat.S_ISDIR(old_key[0]):
+                self._move_directory(src_path, dest_path, now)
+                events.append(
+                    watchdog.events.DirMovedEvent(src_path, dest_path)
+                )
+            else:
+                events.append(
+                    watchdog.events.FileMovedEvent(src_path, dest_path)
+                )
+
+    def _report_created(
+        self,
+        path: str,
+        stat_key: StatKey,
+        now: float,
+        events: list[watchdog.events.FileSystemEvent],
+    ) -> None:
+        if not stat.S_ISDIR(stat_key[0]):
+            events.append(watchdog.events.FileCreatedEvent(path))
+            return
+        events.append(watchdog.events.DirCreatedEvent(path))
+        if self.recursive:
+            self._add_directory(path, now, events)
+
+    def _add_directory(
+        self,
+        path: str,
+        now: float,
+        events: typing.Optional[list[watchdog.events.FileSystemEvent]],
+    ) -> None:
+        """Reports content of ``path`` as created if given ``events``."""
+        entries = self._scan(path)
+        state = _DirectoryState(
+            entries=entries, interval=self.min_interval, due_at=now
+        )
+        self._directories[path] = state
+        self._push(path, state, now + state.interval)
+        for name, stat_key in sorted(entries.items()):
+            entry_path = os.path.join(path, name)
+            if events is not None:
+                self._report_created(entry_path, stat_key, now, events)
+            elif self.recursive and stat.S_ISDIR(stat_key[0]):
+                self._add_directory(entry_path, now, None)
+
+    def _remove_directory(
+        self,
+        path: str,
+        events: list[watchdog.events.FileSystemEvent],
+    ) -> None:
+        """Reports content of ``path`` as deleted."""
+        state = self._directories.pop(path, None)
+        if state is None:
+            return
+        for name, stat_key in sorted(state.entries.items()):
+            entry_path = os.path.join(path, name)
+            if stat.S_ISDIR(stat_key[0]):
+                self._remove_directory(entry_path, events)
+                events.append(
+                    watchdog.events.DirDeletedEvent(entry_path)
+                )
+            else:
+                events.append(
+                    watchdog.events.FileDeletedEvent(entry_path)
+                )
+
+    def _move_directory(
+        self, src_path: str, dest_path: str, now: float
+    ) -> None:
+        src_prefix = os.path.join(src_path, "")
+        moved_paths = [
+            path
+            for path in self._directories
+            if path == src_path or path.startswith(src_prefix)
+        ]
+        for path in moved_paths:
+            state = self._directories.pop(path)
+            new_path = dest_path + path[len(src_path) :]
+            self._directories[new_path] = state
+            self._push(new_path, state, now)
+
+
+class AdaptivePollingEmitter(phile.watchdog.asyncio.EventEmitter):
+    """
+    Emitter polling using an :class:`AdaptivePoller`.
+
+    The ``timeout`` given is used as the shortest polling interval.
+    """
+
+    def __init__(
+        self,
+        event_queue: watchdog.observers.api.EventQueue,
+        watch: watchdog.observers.api.ObservedWatch,
+        timeout: float = watchdog.observers.api.DEFAULT_EMITTER_TIMEOUT,
+        *args: typing.Any,
+        max_interval: float = default_max_interval,
+        scan: Scanner = scan_directory,
+        **kwargs: typing.Any,
+    ) -> None:
+        super().__init__(event_queue, watch, timeout, *args, **kwargs)
+        self._poll_requested = threading.Event()
+        self.poller = AdaptivePoller(
+            max_interval=max_interval,
+            min_interval=timeout,
+            recursive=watch.is_recursive,
+            root_path=watch.path,
+            scan=scan,
+        )
+
+    def on_thread_start(self) -> None:
+        self.poller.index()
+        super().on_thread_start()
+
+    def on_thread_stop(self) -> None:
+        super().on_thread_stop()
+        # Wake up the polling thread so that it can stop.
+        self._poll_requested.set()
+
+    def request_poll(self) -> None:
+        """Thread-safe. Rescan every directory as soon as possible."""
+        self._poll_requested.set()
+
+    def queue_events(self, timeout: float) -> None:
+        del timeout
+        poller = self.poller
+        delay = max(0.0, poller.next_due_at - poller.clock())
+        forced = self._poll_requested.wait(delay)
+        if not self.should_keep_running():
+            return
+        self._poll_requested.clear()
+        for event in poller.poll(force=forced):
+            self.queue_event(event)
+
+
+class AdaptivePollingObserver(phile.watchdog.asyncio.BaseObserver):
+    def __init__(
+        self,
+        timeout: float = watchdog.observers.api.DEFAULT_OBSERVER_TIMEOUT,
+        *args: typing.Any,
+        max_interval: float = default_max_interval,
+        scan: Scanner = scan_directory,
+        **kwargs: typing.Any,
+    ) -> None:
+        emitter_class = functools.partial(
+            AdaptivePollingEmitter, max_interval=max_interval, scan=scan
+        )
+        super().__init__(emitter_class, timeout, *args, **kwargs)
+
+    def request_poll(self) -> None:
+        """Rescan every watched directory as soon as possible."""
+        for emitter in self._emitters.values():
+            assert isinstance(emitter, AdaptivePollingEmitter)
+            emitter.request_poll()
+
+
+class AdaptivePollingObserverVFS(AdaptivePollingObserver):
+    def __init__(
+        self,
+        stat: collections.abc.Callable[[str], typing.Any],
+        listdir: collections.abc.Callable[[str], typing.Any],
+        polling_interval: float = 1,
+        *args: typing.Any,
+        max_interval: float = default_max_interval,
+        **kwargs: typing.Any,
+    ) -> None:
+        super().__init__(
+            polling_interval,
+            *args,
+            max_interval=max_interval,
+            scan=create_vfs_scanner(stat_callback=stat, listdir=listdir),
+            **kwargs,
+        )
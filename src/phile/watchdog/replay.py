@@ -0,0 +1,553 @@
+#!/usr/bin/env python3
+
+# Mimicking arguments of watchdog emitter but allowing for subclassing.
+# pylint: disable=keyword-arg-before-vararg
+"""
+------------------------------------------
+Recording and replaying file system events
+------------------------------------------
+
+Event storms, such as from unpacking an archive into a watched directory,
+are hard to reproduce reliably.
+This module records events from a real observer into a file,
+with the time each event arrived,
+and replays them through :class:`~phile.watchdog.asyncio.BaseObserver`
+to measure how fast consumers keep up.
+
+Usage::
+
+    python -m phile.watchdog.replay record DIRECTORY OUTPUT
+    python -m phile.watchdog.replay benchmark INPUT --consumer notify
+"""
+
+# Standard library.
+import argparse
+import asyncio
+import collections.abc
+import dataclasses
+import json
+import math
+import os.path
+import pathlib
+import sys
+import time
+import tracemalloc
+import typing
+
+# External dependencies.
+import watchdog.events
+import watchdog.observers.api
+
+# Internal modules.
+import phile.asyncio
+import phile.watchdog.asyncio
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    # Internal modules.
+    import phile.configuration
+
+Clock = collections.abc.Callable[[], float]
+Consumer = collections.abc.Callable[
+    [collections.abc.AsyncIterable[watchdog.events.FileSystemEvent]],
+    collections.abc.Awaitable[typing.Any],
+]
+
+_event_classes: dict[
+    tuple[str, bool], type[watchdog.events.FileSystemEvent]
+] = {
+    (watchdog.events.EVENT_TYPE_CLOSED, False): (
+        watchdog.events.FileClosedEvent
+    ),
+    (watchdog.events.EVENT_TYPE_CREATED, False): (
+        watchdog.events.FileCreatedEvent
+    ),
+    (watchdog.events.EVENT_TYPE_CREATED, True): (
+        watchdog.events.DirCreatedEvent
+    ),
+    (watchdog.events.EVENT_TYPE_DELETED, False): (
+        watchdog.events.FileDeletedEvent
+    ),
+    (watchdog.events.EVENT_TYPE_DELETED, True): (
+        watchdog.events.DirDeletedEvent
+    ),
+    (watchdog.events.EVENT_TYPE_MODIFIED, False): (
+        watchdog.events.FileModifiedEvent
+    ),
+    (watchdog.events.EVENT_TYPE_MODIFIED, True): (
+        watchdog.events.DirModifiedEvent
+    ),
+    (watchdog.events.EVENT_TYPE_MOVED, False): (
+        watchdog.events.FileMovedEvent
+    ),
+    (watchdog.events.EVENT_TYPE_MOVED, True): (
+        watchdog.events.DirMovedEvent
+    ),
+}
+
+
+@dataclasses.dataclass
+class Record:
+    """
+    A recorded event.
+
+    Paths are relative to the watched directory
+    so that a recording can be replayed in a different directory.
+    """
+
+    offset: float
+    """Seconds since the recording started."""
+    event_type: str
+    src_path: str
+    is_directory: bool = False
+    dest_path: str = ""
+
+
+def to_record(
+    event: watchdog.events.FileSystemEvent,
+    *,
+    offset: float,
+    root_path: str,
+) -> Record:
+    dest_path = ""
+    if event.event_type == watchdog.events.EVENT_TYPE_MOVED:
+        assert isinstance(event, watchdog.events.FileSystemMovedEvent)
+        dest_path = os.path.relpath(event.dest_path, root_path)
+    return Record(
+        offset=offset,
+        event_type=event.event_type,
+        src_path=os.path.relpath(event.src_path, root_path),
+        is_directory=event.is_directory,
+        dest_path=dest_path,
+    )
+
+
+def to_event(
+    record: Record, *, root_path: str
+) -> watchdog.events.FileSystemEvent:
+    """Raises :exc:`KeyError` if the event type is not known."""
+    event_class = _event_classes[
+        (record.event_type, record.is_directory)
+    ]
+    src_path = os.path.join(root_path, record.src_path)
+    if record.event_type == watchdog.events.EVENT_TYPE_MOVED:
+        # Constructor arguments depends on the event type.
+        # But the type checker cannot tell from the mapping.
+        return event_class(  # type: ignore[call-arg]
+            src_path, os.path.join(root_path, record.dest_path)
+        )
+    return event_class(src_path)
+
+
+def dump_record(record: Record, stream: typing.TextIO) -> None:
+    """Writes ``record`` to ``stream`` as a line of JSON."""
+    stream.write(json.dumps(dataclasses.asdict(record)))
+    stream.write("\n")
+
+
+def load_records(stream: typing.TextIO) -> list[Record]:
+    """Returns records from ``stream`` written by :func:`dump_record`."""
+    return [
+        Record(**json.loads(line)) for line in stream if line.strip()
+    ]
+
+
+async def record(
+    event_view: collections.abc.AsyncIterable[
+        watchdog.events.FileSystemEvent
+    ],
+    *,
+    clock: Clock = time.perf_counter,
+    root_path: pathlib.Path,
+    stream: typing.TextIO,
+) -> int:
+    """
+    Writes events from ``event_view`` to ``stream`` until it ends.
+
+    Returns the number of events written.
+    """
+    root_path_string = str(root_path)
+    event_count = 0
+    start = clock()
+    # Branch exiting the loop is covered in tests.
+    # Not sure why it was not detected.
+    async for event in event_view:  # pragma: no branch
+        dump_record(
+            to_record(
+                event, offset=clock() - start, root_path=root_path_string
+            ),
+            stream,
+        )
+        event_count += 1
+    return event_count
+
+
+class ReplayEmitter(phile.watchdog.asyncio.EventEmitter):
+    """
+    Emitter queuing recorded events instead of watching.
+
+    Events are queued once, keeping the recorded offsets
+    divided by ``speed``.
+    If ``speed`` is not positive, events are queued without any delay.
+    """
+
+    def __init__(
+        self,
+        event_queue: watchdog.observers.api.EventQueue,
+        watch: watchdog.observers.api.ObservedWatch,
+        timeout: float = watchdog.observers.api.DEFAULT_EMITTER_TIMEOUT,
+        *args: typing.Any,
+        clock: Clock = time.perf_counter,
+        records: collections.abc.Iterable[Record],
+        speed: float = 0,
+        **kwargs: typing.Any,
+    ) -> None:
+        super().__init__(event_queue, watch, timeout, *args, **kwargs)
+        self._clock = clock
+        self._loop = asyncio.get_running_loop()
+        self._replayed = False
+        self.events: list[watchdog.events.FileSystemEvent] = []
+        self.offsets: list[float] = []
+        for record_entry in records:
+            self.events.append(
+                to_event(record_entry, root_path=watch.path)
+            )
+            self.offsets.append(
+                record_entry.offset / speed if speed > 0 else 0
+            )
+        self.emitted_at: dict[int, float] = {}
+        """Clock time each event was queued, keyed by their ``id``."""
+        self.replay_done = asyncio.Event()
+        """Set when all events are queued or if the emitter stopped."""
+
+    def queue_events(self, timeout: float) -> None:
+        if self._replayed:
+            self.stopped_event.wait(timeout)
+            return
+        self._replayed = True
+        try:
+            start = self._clock()
+            for event, offset in zip(self.events, self.offsets):
+                delay = start + offset - self._clock()
+                if delay > 0 and self.stopped_event.wait(delay):
+                    return
+                self.emitted_at[id(event)] = self._clock()
+                self.queue_event(event)
+        finally:
+            self._loop.call_soon_threadsafe(self.replay_done.set)
+
+
+@dataclasses.dataclass
+class Report:
+    event_count: int
+    duration: float
+    """Seconds from scheduling until the consumer returns."""
+    latencies: list[float]
+    """
+    Sorted seconds between queueing an event and the consumer reading it.
+    """
+    peak_memory: typing.Optional[int] = None
+    """Peak bytes allocated, if traced by :mod:`tracemalloc`."""
+
+    @property
+    def events_per_second(self) -> float:
+        if self.duration <= 0:
+            return math.inf
+        return self.event_count / self.duration
+
+    def get_latency_percentile(self, percent: float) -> float:
+        """Uses nearest rank. Returns ``nan`` if there are no events."""
+        if not self.latencies:
+            return math.nan
+        rank = math.ceil(percent / 100 * len(self.latencies))
+        return self.latencies[max(rank, 1) - 1]
+
+    def to_text(self) -> str:
+        lines = [
+            "events: {}".format(self.event_count),
+            "duration: {:.6f} s".format(self.duration),
+            "events per second: {:.1f}".format(self.events_per_second),
+        ]
+        for percent in (50, 90, 99, 100):
+            lines.append(
+                "latency p{}: {:.6f} s".format(
+                    percent, self.get_latency_percentile(percent)
+                )
+            )
+        if self.peak_memory is not None:
+            lines.append("peak memory: {} B".format(self.peak_memory))
+        return "\n".join(lines)
+
+
+async def drain(
+    event_view: collections.abc.AsyncIterable[
+        watchdog.events.FileSystemEvent
+    ],
+) -> None:
+    """Consumer reading events and discarding them."""
+    async for _ in event_view:
+        pass
+
+
+def create_notify_consumer(
+    configuration: "phile.configuration.Entries",
+) -> Consumer:
+    """Returns a consumer updating a new :class:`phile.notify.Registry`."""
+    # Only needed for benchmarking notify.
+    # pylint: disable=import-outside-toplevel
+    import phile.notify
+    import phile.notify.watchdog
+
+    async def consume(
+        event_view: collections.abc.AsyncIterable[
+            watchdog.events.FileSystemEvent
+        ],
+    ) -> None:
+        await phile.notify.watchdog.process_watchdog_view(
+            configuration=configuration,
+            notify_registry=phile.notify.Registry(),
+            ready=asyncio.Event(),
+            watchdog_view=event_view,
+        )
+
+    return consume
+
+
+def create_tray_consumer(tray_suffix: str) -> Consumer:
+    """Returns a consumer updating a new :class:`phile.tray.Registry`."""
+    # Only needed for benchmarking tray.
+    # pylint: disable=import-outside-toplevel
+    import phile.tray
+    import phile.tray.watchdog
+
+    async def consume(
+        event_view: collections.abc.AsyncIterable[
+            watchdog.events.FileSystemEvent
+        ],
+    ) -> None:
+        source = phile.tray.watchdog.Source(
+            tray_registry=phile.tray.Registry(), tray_suffix=tray_suffix
+        )
+        async for event in event_view:
+            source.process_watchdog_event(event)
+
+    return consume
+
+
+async def benchmark(
+    records: collections.abc.Sequence[Record],
+    *,
+    clock: Clock = time.perf_counter,
+    consumer: Consumer = drain,
+    event_filter: typing.Optional[phile.watchdog.asyncio.EventFilter] = (
+        None
+    ),
+    root_path: pathlib.Path,
+    speed: float = 0,
+    trace_memory: bool = True,
+) -> Report:
+    """
+    Replays ``records`` in ``root_path`` into ``consumer``.
+
+    Latency of an event is measured
+    from when the emitter queues it
+    to when the consumer reads it from the observer.
+    Tracing memory slows down allocations,
+    so the other numbers are more accurate without it.
+    """
+    emitters: list[ReplayEmitter] = []
+
+    def create_emitter(
+        event_queue: watchdog.observers.api.EventQueue,
+        watch: watchdog.observers.api.ObservedWatch,
+        timeout: float,
+    ) -> ReplayEmitter:
+        emitter = ReplayEmitter(
+            event_queue,
+            watch,
+            timeout,
+            clock=clock,
+            records=records,
+            speed=speed,
+        )
+        emitters.append(emitter)
+        return emitter
+
+    latencies: list[float] = []
+
+    async def timed_view(
+        event_view: phile.watchdog.asyncio.EventView,
+        emitted_at: dict[int, float],
+    ) -> collections.abc.AsyncIterator[watchdog.events.FileSystemEvent]:
+        async for event in event_view:
+            # Sorted once after the replay, to keep the consumer fast.
+            latencies.append(clock() - emitted_at[id(event)])
+            yield event
+
+    observer = phile.watchdog.asyncio.BaseObserver(
+        emitter_class=create_emitter
+    )
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    elif trace_memory:
+        tracemalloc.reset_peak()
+    try:
+        start = clock()
+        event_view = await observer.schedule(
+            root_path, event_filter=event_filter
+        )
+        emitter = emitters[0]
+        try:
+            async with phile.asyncio.open_task(
+                consumer(timed_view(event_view, emitter.emitted_at))
+            ) as consumer_task:
+                await emitter.replay_done.wait()
+                # Ends the view after the queued events.
+                await event_view.aclose()
+                await consumer_task
+        finally:
+            await event_view.aclose()
+        duration = clock() - start
+        peak_memory: typing.Optional[int] = None
+        if trace_memory:
+            peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    latencies.sort()
+    return Report(
+        event_count=len(latencies),
+        duration=duration,
+        latencies=latencies,
+        peak_memory=peak_memory,
+    )
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="phile.watchdog.replay")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparser = subparsers.add_parser(
+        "record", help="Write events in a directory to a file."
+    )
+    subparser.add_argument("directory", type=pathlib.Path)
+    subparser.add_argument("output", type=pathlib.Path)
+    subparser.add_argument(
+        "--duration",
+        type=float,
+        help="Seconds to record for. Default: until interrupted.",
+    )
+    subparser.add_argument("--recursive", action="store_true")
+    subparser = subparsers.add_parser(
+        "benchmark", help="Replay events from a file and report timings."
+    )
+    subparser.add_argument("input", type=pathlib.Path)
+    subparser.add_argument(
+        "--consumer",
+        choices=("drain", "notify", "tray"),
+        default="drain",
+    )
+    subparser.add_argument(
+        "--directory",
+        type=pathlib.Path,
+        default=pathlib.Path("."),
+        help="Directory to replay events in.",
+    )
+    subparser.add_argument(
+        "--speed",
+        type=float,
+        default=0,
+        help="Multiplier of recorded speed. Default: as fast as possible.",
+    )
+    subparser.add_argument(
+        "--trace-memory",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+    )
+    return parser
+
+
+def _create_consumer(
+    name: str, *, directory: pathlib.Path
+) -> tuple[
+    Consumer, typing.Optional[phile.watchdog.asyncio.EventFilter]
+]:
+    """Returns consumer ``name`` and the filter its service uses."""
+    if name == "drain":
+        return drain, None
+    # Only needed for notify and tray consumers.
+    # pylint: disable=import-outside-toplevel
+    import phile.configuration
+
+    configuration = phile.configuration.Entries(
+        notify_directory=directory, tray_directory=directory
+    )
+    if name == "notify":
+        return create_notify_consumer(
+            configuration
+        ), phile.watchdog.asyncio.EventFilter(
+            suffix=configuration.notify_suffix
+        )
+    assert name == "tray"
+    return create_tray_consumer(
+        configuration.tray_suffix
+    ), phile.watchdog.asyncio.EventFilter(
+        suffix=configuration.tray_suffix
+    )
+
+
+async def process_arguments(
+    argument_namespace: argparse.Namespace,
+    output_stream: typing.TextIO = sys.stdout,
+) -> int:
+    directory: pathlib.Path = argument_namespace.directory.resolve()
+    if argument_namespace.command == "record":
+        observer = phile.watchdog.asyncio.Observer()
+        with argument_namespace.output.open("w") as stream:
+            async with await observer.schedule(
+                directory, argument_namespace.recursive
+            ) as event_view:
+                try:
+                    await asyncio.wait_for(
+                        record(
+                            event_view,
+                            root_path=directory,
+                            stream=stream,
+                        ),
+                        timeout=argument_namespace.duration,
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        return 0
+    assert argument_namespace.command == "benchmark"
+    with argument_namespace.input.open() as stream:
+        records = load_records(stream)
+    consumer, event_filter = _create_consumer(
+        argument_namespace.consumer, directory=directory
+    )
+    report = await benchmark(
+        records,
+        consumer=consumer,
+        event_filter=event_filter,
+        root_path=directory,
+        speed=argument_namespace.speed,
+        trace_memory=argument_namespace.trace_memory,
+    )
+    print(report.to_text(), file=output_stream)
+    return 0
+
+
+def main(
+    argv: typing.Optional[list[str]] = None,
+) -> int:  # pragma: no cover
+    if argv is None:
+        argv = sys.argv
+    argument_parser = create_argument_parser()
+    argument_namespace = argument_parser.parse_args(argv[1:])
+    try:
+        return asyncio.run(process_arguments(argument_namespace))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -8,6 +8,7 @@ EVENT_TYPE_MOVED: str
 EVENT_TYPE_DELETED: str
 EVENT_TYPE_CREATED: str
 EVENT_TYPE_MODIFIED: str
+EVENT_TYPE_CLOSED: str
 
 
 class FileSystemEvent:
@@ -69,6 +70,10 @@ class FileMovedEvent(FileSystemMovedEvent):
     ...
 
 
+class FileClosedEvent(FileSystemEvent):
+    event_type: str = ...
+
+
 class DirDeletedEvent(FileSystemEvent):
     event_type: str = ...
     is_directory: bool = ...
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 # Standard libraries.
+import asyncio
 import unittest
 
 # Internal packages.
@@ -40,6 +41,17 @@ class TestAlreadyEnabled(unittest.TestCase):
         )
 
 
+class TestGetQualifiedName(unittest.TestCase):
+    def test_returns_module_and_qualified_name(self) -> None:
+        self.assertEqual(
+            phile.capability.get_qualified_name(int), "builtins.int"
+        )
+        self.assertEqual(
+            phile.capability.get_qualified_name(TestGetQualifiedName),
+            __name__ + ".TestGetQualifiedName",
+        )
+
+
 class TestRegistry(unittest.IsolatedAsyncioTestCase):
     def setUp(self) -> None:
         super().setUp()
@@ -172,3 +184,135 @@ class TestRegistry(unittest.IsolatedAsyncioTestCase):
                 capability=int,
             ),
         )
+
+    async def test_wait_for__returns_if_already_set(self) -> None:
+        self.capability_registry.set(1)
+        await phile.asyncio.wait_for(
+            self.capability_registry.wait_for(int)
+        )
+        await phile.asyncio.wait_for(
+            self.capability_registry.wait_for("builtins.int")
+        )
+
+    async def test_wait_for__type_waits_until_set(self) -> None:
+        waiter = asyncio.create_task(
+            self.capability_registry.wait_for(int)
+        )
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())
+        self.capability_registry.set(1)
+        await phile.asyncio.wait_for(waiter)
+
+    async def test_wait_for__name_waits_until_provided(self) -> None:
+        waiter = asyncio.create_task(
+            self.capability_registry.wait_for("builtins.int")
+        )
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())
+        with self.capability_registry.provide(1):
+            await phile.asyncio.wait_for(waiter)
+
+    async def test_wait_for__cancelling_one_waiter_keeps_others(
+        self,
+    ) -> None:
+        cancelled_waiter = asyncio.create_task(
+            self.capability_registry.wait_for(int)
+        )
+        waiter = asyncio.create_task(
+            self.capability_registry.wait_for(int)
+        )
+        await asyncio.sleep(0)
+        await phile.asyncio.cancel_and_wait(cancelled_waiter)
+        self.capability_registry[int] = 1
+        await phile.asyncio.wait_for(waiter)
+
+    async def test_wait_for_removal__returns_if_not_set(self) -> None:
+        await phile.asyncio.wait_for(
+            self.capability_registry.wait_for_removal(int)
+        )
+        await phile.asyncio.wait_for(
+            self.capability_registry.wait_for_removal("builtins.int")
+        )
+
+    async def test_wait_for_removal__waits_for_delitem(self) -> None:
+        self.capability_registry.set(1)
+        waiter = asyncio.create_task(
+            self.capability_registry.wait_for_removal(int)
+        )
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())
+        del self.capability_registry[int]
+        await phile.asyncio.wait_for(waiter)
+
+    async def test_wait_for_removal__waits_for_pop(self) -> None:
+        self.capability_registry.set(1)
+        waiter = asyncio.create_task(
+            self.capability_registry.wait_for_removal("builtins.int")
+        )
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())
+        self.capability_registry.pop(int)
+        await phile.asyncio.wait_for(waiter)
+
+    async def test_wait_for_removal__waits_for_provide_exit(
+        self,
+    ) -> None:
+        with self.capability_registry.provide(1):
+            waiter = asyncio.create_task(
+                self.capability_registry.wait_for_removal(int)
+            )
+            await asyncio.sleep(0)
+            self.assertFalse(waiter.done())
+        await phile.asyncio.wait_for(waiter)
+
+    async def test_set_exception__raises_in_waiters(self) -> None:
+        waiter = asyncio.create_task(
+            self.capability_registry.wait_for(int)
+        )
+        name_waiter = asyncio.create_task(
+            self.capability_registry.wait_for("builtins.int")
+        )
+        other_waiter = asyncio.create_task(
+            self.capability_registry.wait_for(str)
+        )
+        self.addAsyncCleanup(phile.asyncio.cancel_and_wait, other_waiter)
+        await asyncio.sleep(0)
+        self.capability_registry.set_exception(
+            int, ValueError("Failed.")
+        )
+        with self.assertRaises(ValueError):
+            await phile.asyncio.wait_for(waiter)
+        with self.assertRaises(ValueError):
+            await phile.asyncio.wait_for(name_waiter)
+        self.assertFalse(other_waiter.done())
+        waiter = asyncio.create_task(
+            self.capability_registry.wait_for(int)
+        )
+        await asyncio.sleep(0)
+        self.capability_registry.set(1)
+        self.assertEqual(await phile.asyncio.wait_for(waiter), 1)
+
+    async def test_wait_for__calls_demand_handler_if_not_set(
+        self,
+    ) -> None:
+        demands: list[str] = []
+        self.capability_registry.demand_handlers[
+            "builtins.int"
+        ] = lambda: demands.append("int")
+        waiter = asyncio.create_task(
+            self.capability_registry.wait_for(int)
+        )
+        await asyncio.sleep(0)
+        self.assertEqual(demands, ["int"])
+        name_waiter = asyncio.create_task(
+            self.capability_registry.wait_for("builtins.int")
+        )
+        await asyncio.sleep(0)
+        self.assertEqual(demands, ["int", "int"])
+        self.capability_registry.set(1)
+        await phile.asyncio.wait_for(waiter)
+        await phile.asyncio.wait_for(name_waiter)
+        await phile.asyncio.wait_for(
+            self.capability_registry.wait_for(int)
+        )
+        self.assertEqual(demands, ["int", "int"])
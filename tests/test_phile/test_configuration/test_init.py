@@ -106,7 +106,10 @@ class TestEntries(PreparesEntries, unittest.TestCase):
         self.assertIsInstance(entries.log_stderr_level, int)
         self.assertIsInstance(entries.main_autostart, set)
         self.assertIsInstance(entries.notify_directory, pathlib.Path)
+        self.assertIsInstance(entries.notify_log_path, pathlib.Path)
         self.assertIsInstance(entries.notify_suffix, str)
+        self.assertIsInstance(entries.save_atomically, bool)
+        self.assertIsInstance(entries.save_fsync, bool)
         self.assertIsInstance(entries.pid_path, pathlib.Path)
         self.assertIsInstance(entries.state_directory_path, pathlib.Path)
         self.assertIsInstance(entries.tray_icon_name, str)
@@ -132,10 +135,13 @@ class TestEntries(PreparesEntries, unittest.TestCase):
         )
         self.assertEqual(entries.log_stderr_level, 30)
         self.assertEqual(entries.main_autostart, set[str]())
+        self.assertEqual(entries.notify_backend, "watchdog")
         self.assertEqual(
             entries.notify_directory, pathlib.Path("notify")
         )
+        self.assertIsNone(entries.notify_min_update_interval)
         self.assertEqual(entries.notify_suffix, ".notify")
+        self.assertIsNone(entries.notify_text_cache_size)
         self.assertEqual(entries.pid_path, pathlib.Path("pid"))
         self.assertEqual(
             entries.state_directory_path, self.state_directory_path
@@ -222,6 +222,66 @@ class TestRegistry(unittest.IsolatedAsyncioTestCase):
             ),
         )
 
+    def test_update__inserts_and_replaces_values(self) -> None:
+        self.registry.set(2, "two")
+        self.registry.set(4, "four")
+        self.registry.update({3: "three", 4: "4", 1: "one"})
+        self.assertEqual(self.registry.current_keys, [1, 2, 3, 4])
+        self.assertEqual(
+            self.registry.current_values, ["one", "two", "three", "4"]
+        )
+        self.test_invariants()
+
+    async def test_update__emits_events_in_key_order(self) -> None:
+        self.registry.set(2, "two")
+        self.registry.set(4, "four")
+        event_view = self.registry.event_queue.__aiter__()
+        self.registry.update({4: "4", 3: "three", 2: "two", 1: "one"})
+        current_keys = [1, 2, 3, 4]
+        current_values = ["one", "two", "three", "4"]
+        for expected_event in [
+            phile.data.Event[int, str](
+                type=phile.data.EventType.INSERT,
+                index=0,
+                key=1,
+                value="one",
+                current_keys=current_keys,
+                current_values=current_values,
+            ),
+            phile.data.Event[int, str](
+                type=phile.data.EventType.INSERT,
+                index=2,
+                key=3,
+                value="three",
+                current_keys=current_keys,
+                current_values=current_values,
+            ),
+            phile.data.Event[int, str](
+                type=phile.data.EventType.SET,
+                index=3,
+                key=4,
+                value="4",
+                current_keys=current_keys,
+                current_values=current_values,
+            ),
+        ]:
+            event = await phile.asyncio.wait_for(event_view.__anext__())
+            self.assertEqual(event, expected_event)
+
+    async def test_update__without_changes_does_not_emit_event(
+        self,
+    ) -> None:
+        self.registry.set(5, "five")
+        event_view = self.registry.event_queue.__aiter__()
+        self.registry.update({5: "five"})
+        self.registry.update({})
+        # Test that no event was emitted by doing something
+        # that would emit another event.
+        self.registry.set(5, "5")
+        event = await phile.asyncio.wait_for(event_view.__anext__())
+        self.assertEqual(event.type, phile.data.EventType.SET)
+        self.assertEqual(event.value, "5")
+
     def test_discard__removes_value_with_known_key(self) -> None:
         self.registry.set(23, "twenty-three")
         self.registry.set(24, "twenty-four")
@@ -3,4 +3,7 @@
 .. automodule:: test_phile.test_launcher.test_init
 .. automodule:: test_phile.test_launcher.test_cmd
 .. automodule:: test_phile.test_launcher.test_defaults
+.. automodule:: test_phile.test_launcher.test_metrics
+.. automodule:: test_phile.test_launcher.test_profile
+.. automodule:: test_phile.test_launcher.test_trace
 """
@@ -8,14 +8,19 @@ Test :mod:`phile.launcher.cmd`
 # Standard libraries.
 import asyncio
 import io
+import json
+import pathlib
+import tempfile
 import typing
 import unittest
+import unittest.mock
 
 # Internal packages.
 import phile.asyncio
 import phile.asyncio.pubsub
 import phile.launcher
 import phile.launcher.cmd
+import phile.launcher.trace
 
 StrView = phile.asyncio.pubsub.View[str]
 
@@ -139,6 +144,62 @@ class TestCmd(unittest.IsolatedAsyncioTestCase):
             ),
         )
 
+    async def test_do_start_writes_failures(self) -> None:
+        async def fail() -> None:
+            raise ValueError("Failed.")
+
+        self.launcher_registry.add_nowait(
+            "failing",
+            phile.launcher.Descriptor(
+                exec_start=[fail], type=phile.launcher.Type.FORKING
+            ),
+        )
+        self.assertFalse(self.cmd.onecmd("list"))
+        self.stdout.truncate(0)
+        self.stdout.seek(0)
+        self.assertFalse(self.cmd.onecmd("start 0"))
+        await phile.asyncio.wait_for(self.wait_for_output_lines(2))
+        self.assertEqual(
+            self.stdout.getvalue(),
+            "Started 1 launchers.\n"
+            "Unable to start failing: ValueError('Failed.')\n",
+        )
+
+    async def wait_for_output_lines(self, count: int) -> None:
+        while self.stdout.getvalue().count("\n") < count:
+            await asyncio.sleep(0)
+
+    def add_cycle(self) -> None:
+        self.launcher_registry.add_nowait(
+            "cycle_a",
+            phile.launcher.Descriptor(
+                exec_start=[asyncio.get_event_loop().create_future],
+                after={"cycle_b"},
+                binds_to={"cycle_b"},
+            ),
+        )
+        self.launcher_registry.add_nowait(
+            "cycle_b",
+            phile.launcher.Descriptor(
+                exec_start=[asyncio.get_event_loop().create_future],
+                after={"cycle_a"},
+                binds_to={"cycle_a"},
+            ),
+        )
+        self.assertFalse(self.cmd.onecmd("list"))
+        self.stdout.truncate(0)
+        self.stdout.seek(0)
+
+    def test_do_start_informs_cycles(self) -> None:
+        self.add_cycle()
+        self.assertFalse(self.cmd.onecmd("start 0"))
+        self.assertTrue(
+            self.stdout.getvalue().startswith(
+                "Unable to start launchers: "
+            )
+        )
+        self.assertFalse(self.launcher_registry.is_running("cycle_a"))
+
     def test_do_start_warns_wrong_argument(self) -> None:
         self.assertFalse(self.cmd.onecmd("start a"))
         self.assertEqual(
@@ -190,6 +251,56 @@ class TestCmd(unittest.IsolatedAsyncioTestCase):
             ),
         )
 
+    async def test_do_stop_writes_failures(self) -> None:
+        async def fail() -> None:
+            raise ValueError("Failed.")
+
+        self.launcher_registry.add_nowait(
+            "failing",
+            phile.launcher.Descriptor(
+                exec_start=[asyncio.get_event_loop().create_future],
+                exec_stop=[fail],
+            ),
+        )
+        await phile.asyncio.wait_for(
+            self.launcher_registry.start("failing")
+        )
+        self.assertFalse(self.cmd.onecmd("list"))
+        self.stdout.truncate(0)
+        self.stdout.seek(0)
+        self.assertFalse(self.cmd.onecmd("stop 0"))
+        await phile.asyncio.wait_for(self.wait_for_output_lines(2))
+        self.assertEqual(
+            self.stdout.getvalue(),
+            "Stopped 1 launchers.\n"
+            "Unable to stop failing: ValueError('Failed.')\n",
+        )
+
+    async def test_do_stop_ignores_cancelled_batch(self) -> None:
+        self.assertFalse(self.cmd.onecmd("list"))
+        self.stdout.truncate(0)
+        self.stdout.seek(0)
+        with unittest.mock.patch.object(
+            self.launcher_registry, "stop_many"
+        ) as stop_many_mock:
+            stop_many = asyncio.get_running_loop().create_future()
+            stop_many_mock.return_value = stop_many
+            self.assertFalse(self.cmd.onecmd("stop 0"))
+        stop_many.cancel()
+        await asyncio.sleep(0)
+        self.assertEqual(
+            self.stdout.getvalue(), "Stopped 1 launchers.\n"
+        )
+
+    def test_do_stop_informs_cycles(self) -> None:
+        self.add_cycle()
+        self.assertFalse(self.cmd.onecmd("stop 0"))
+        self.assertTrue(
+            self.stdout.getvalue().startswith(
+                "Unable to stop launchers: "
+            )
+        )
+
     def test_do_stop_warns_wrong_argument(self) -> None:
         self.assertFalse(self.cmd.onecmd("stop a"))
         self.assertEqual(
@@ -248,3 +359,101 @@ class TestCmd(unittest.IsolatedAsyncioTestCase):
                 launcher_name_2=self.launcher_name_2,
             ),
         )
+
+    async def test_do_trace_writes_trace_file(self) -> None:
+        await phile.asyncio.wait_for(
+            self.launcher_registry.start(self.launcher_name_1)
+        )
+        with tempfile.TemporaryDirectory() as directory_name:
+            trace_path = pathlib.Path(directory_name) / "trace.json"
+            self.assertFalse(self.cmd.onecmd("trace " + str(trace_path)))
+            self.assertEqual(
+                json.loads(trace_path.read_text()),
+                self.launcher_registry.trace_recorder.to_trace_events(),
+            )
+        self.assertEqual(
+            self.stdout.getvalue(),
+            "Wrote 2 spans to {}.\n".format(trace_path),
+        )
+
+    def test_do_trace_requires_one_path(self) -> None:
+        self.assertFalse(self.cmd.onecmd("trace"))
+        self.assertEqual(self.stdout.getvalue(), "Usage: trace FILE\n")
+
+    def test_do_trace_reports_write_errors(self) -> None:
+        with tempfile.TemporaryDirectory() as directory_name:
+            self.assertFalse(self.cmd.onecmd("trace " + directory_name))
+        self.assertTrue(
+            self.stdout.getvalue().startswith("Unable to write trace: ")
+        )
+
+    def test_do_critical_path_writes_launchers(self) -> None:
+        add_span = self.launcher_registry.trace_recorder.add_span
+        add_span(
+            "phile_shutdown.target", phile.launcher.trace.START, 1, 2
+        )
+        add_span(
+            self.launcher_name_1, phile.launcher.trace.START, 0, 0.5
+        )
+        self.launcher_registry.remove_nowait("phile_shutdown.target")
+        self.launcher_registry.add_nowait(
+            "phile_shutdown.target",
+            phile.launcher.Descriptor(
+                after={self.launcher_name_1},
+                exec_start=[asyncio.get_event_loop().create_future],
+            ),
+        )
+        self.assertFalse(self.cmd.onecmd("critical_path"))
+        self.assertEqual(
+            self.stdout.getvalue(),
+            "Critical path of 2 launchers took 2.000 s.\n"
+            "[0.500 s] {}\n"
+            "[1.000 s] phile_shutdown.target\n".format(
+                self.launcher_name_1
+            ),
+        )
+
+    def test_do_critical_path_informs_if_nothing_started(self) -> None:
+        self.assertFalse(self.cmd.onecmd("critical_path"))
+        self.assertEqual(
+            self.stdout.getvalue(), "No launchers have started.\n"
+        )
+
+    def test_do_metrics_writes_summary(self) -> None:
+        metrics_recorder = self.launcher_registry.metrics_recorder
+        metrics_recorder.record_start(self.launcher_name_1, 0.5)
+        metrics_recorder.record_start(self.launcher_name_1, 1.5)
+        metrics_recorder.record_exception(
+            self.launcher_name_1, ValueError()
+        )
+        metrics_recorder.record_stop(self.launcher_name_1, 0.25)
+        metrics_recorder.record_exception(
+            self.launcher_name_2, KeyError()
+        )
+        self.assertFalse(self.cmd.onecmd("metrics"))
+        self.assertEqual(
+            self.stdout.getvalue(),
+            "0 starting, 0 running, 0 stopping.\n"
+            "{}: 2 starts (1 restarts), 1.000 s mean start,"
+            " 0.250 s mean stop, 1 exceptions\n"
+            "{}: 0 starts (0 restarts), 0.000 s mean start,"
+            " 0.000 s mean stop, 1 exceptions\n".format(
+                self.launcher_name_1, self.launcher_name_2
+            ),
+        )
+
+    def test_do_metrics_writes_json(self) -> None:
+        self.launcher_registry.metrics_recorder.record_start(
+            self.launcher_name_1, 0.5
+        )
+        self.assertFalse(self.cmd.onecmd("metrics json"))
+        self.assertEqual(
+            json.loads(self.stdout.getvalue()),
+            self.launcher_registry.get_metrics(),
+        )
+
+    def test_do_metrics_warns_wrong_argument(self) -> None:
+        self.assertFalse(self.cmd.onecmd("metrics xml"))
+        self.assertEqual(
+            self.stdout.getvalue(), "Usage: metrics [json]\n"
+        )
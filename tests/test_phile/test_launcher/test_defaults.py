@@ -2,6 +2,7 @@
 
 # Standard libraries.
 import asyncio
+import datetime
 import logging
 import json
 import typing
@@ -14,6 +15,11 @@ import watchdog.events
 import phile.asyncio
 import phile.configuration
 import phile.launcher.defaults
+import phile.notify
+import phile.notify.log
+import phile.notify.search
+import phile.notify.watchdog
+import phile.tmux.control_mode
 import phile.tray
 import phile.watchdog.asyncio
 from test_phile.test_configuration.test_init import (
@@ -145,6 +151,7 @@ class TestAddKeyring(
 
 
 class TestAddNotify(
+    PreparesConfiguration,
     UsesLauncherRegistry,
     unittest.IsolatedAsyncioTestCase,
 ):
@@ -166,6 +173,9 @@ class TestAddNotify(
 
     async def test_start_launcher(self) -> None:
         self.test_add_launcher()
+        phile.launcher.defaults.add_configuration(
+            launcher_registry=self.launcher_registry
+        )
         await phile.asyncio.wait_for(
             self.launcher_registry.state_machine.start(
                 self.launcher_name
@@ -181,12 +191,280 @@ class TestAddNotify(
     async def test_provides_notify_registry(self) -> None:
         await self.test_start_launcher()
         capability_type = phile.notify.Registry
+        notify_registry = self.capability_registry.get(capability_type)
+        self.assertIsInstance(notify_registry, capability_type)
+        self.assertNotIsInstance(
+            notify_registry, phile.notify.ThrottledRegistry
+        )
+
+    async def test_throttles_if_configured(self) -> None:
+        self.configuration_path.write_text(
+            json.dumps({"notify_min_update_interval": 2})
+        )
+        await self.test_start_launcher()
+        notify_registry = self.capability_registry[phile.notify.Registry]
+        assert isinstance(
+            notify_registry, phile.notify.ThrottledRegistry
+        )
+        self.assertEqual(
+            notify_registry.min_interval, datetime.timedelta(seconds=2)
+        )
+
+
+class TestAddNotifyExpiry(
+    PreparesConfiguration,
+    UsesLauncherRegistry,
+    unittest.IsolatedAsyncioTestCase,
+):
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.launcher_name: str
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.launcher_name = "phile.notify.expiry"
+
+    def test_add_launcher(self) -> None:
+        phile.launcher.defaults.add_notify_expiry(
+            launcher_registry=self.launcher_registry
+        )
+        self.assertTrue(
+            self.launcher_registry.contains(self.launcher_name)
+        )
+
+    async def test_start_launcher(self) -> None:
+        self.test_add_launcher()
+        phile.launcher.defaults.add_configuration(
+            launcher_registry=self.launcher_registry
+        )
+        phile.launcher.defaults.add_notify(
+            launcher_registry=self.launcher_registry
+        )
+        phile.launcher.defaults.add_notify_log(
+            launcher_registry=self.launcher_registry
+        )
+        phile.launcher.defaults.add_notify_watchdog(
+            launcher_registry=self.launcher_registry
+        )
+        phile.launcher.defaults.add_watchdog_asyncio_observer(
+            launcher_registry=self.launcher_registry
+        )
+        (self.state_directory_path / "notify").mkdir()
+        await phile.asyncio.wait_for(
+            self.launcher_registry.state_machine.start(
+                self.launcher_name
+            )
+        )
+
+    async def test_starts_watchdog_backend_by_default(self) -> None:
+        await self.test_start_launcher()
+        await phile.asyncio.wait_for(
+            self.capability_registry.wait_for(
+                phile.notify.watchdog.Target
+            )
+        )
+        self.assertFalse(
+            self.launcher_registry.is_running("phile.notify.log")
+        )
+
+    async def test_starts_log_backend_if_configured(self) -> None:
+        self.configuration_path.write_text(
+            json.dumps({"notify_backend": "log"})
+        )
+        await self.test_start_launcher()
+        await phile.asyncio.wait_for(
+            self.capability_registry.wait_for(phile.notify.log.Target)
+        )
+        self.assertFalse(
+            self.launcher_registry.is_running("phile.notify.watchdog")
+        )
+
+    async def test_stops_if_backend_stops(self) -> None:
+        event_view = self.launcher_registry.event_queue.__aiter__()
+        await self.test_start_launcher()
+        while not self.launcher_registry.is_running(
+            "phile.notify.watchdog"
+        ):
+            await phile.asyncio.wait_for(event_view.__anext__())
+        await phile.asyncio.wait_for(
+            self.launcher_registry.stop("phile.notify.watchdog")
+        )
+        while self.launcher_registry.is_running(self.launcher_name):
+            await phile.asyncio.wait_for(event_view.__anext__())
+
+
+class TestAddNotifyLog(
+    PreparesConfiguration,
+    UsesLauncherRegistry,
+    unittest.IsolatedAsyncioTestCase,
+):
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.launcher_name: str
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.launcher_name = "phile.notify.log"
+
+    def test_add_launcher(self) -> None:
+        phile.launcher.defaults.add_notify_log(
+            launcher_registry=self.launcher_registry
+        )
+        self.assertTrue(
+            self.launcher_registry.contains(self.launcher_name)
+        )
+
+    async def test_start_launcher(self) -> None:
+        self.test_add_launcher()
+        phile.launcher.defaults.add_configuration(
+            launcher_registry=self.launcher_registry
+        )
+        phile.launcher.defaults.add_notify(
+            launcher_registry=self.launcher_registry
+        )
+        phile.launcher.defaults.add_watchdog_asyncio_observer(
+            launcher_registry=self.launcher_registry
+        )
+        notify_entry = phile.notify.Entry(name="n", text="t")
+        phile.notify.log.append(
+            self.state_directory_path / "notify.log",
+            [("n", notify_entry)],
+        )
+        await phile.asyncio.wait_for(
+            self.launcher_registry.state_machine.start(
+                self.launcher_name
+            )
+        )
+        self.assertIsInstance(
+            self.capability_registry.get(phile.notify.log.Target),
+            phile.notify.log.Target,
+        )
+        self.assertEqual(
+            self.capability_registry[
+                phile.notify.Registry
+            ].current_values,
+            [notify_entry],
+        )
+
+
+class TestAddNotifySearch(
+    PreparesConfiguration,
+    UsesLauncherRegistry,
+    unittest.IsolatedAsyncioTestCase,
+):
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.launcher_name: str
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.launcher_name = "phile.notify.search"
+
+    def test_add_launcher(self) -> None:
+        phile.launcher.defaults.add_notify_search(
+            launcher_registry=self.launcher_registry
+        )
+        self.assertTrue(
+            self.launcher_registry.contains(self.launcher_name)
+        )
+
+    async def test_start_launcher(self) -> None:
+        self.test_add_launcher()
+        phile.launcher.defaults.add_configuration(
+            launcher_registry=self.launcher_registry
+        )
+        phile.launcher.defaults.add_notify(
+            launcher_registry=self.launcher_registry
+        )
+        await phile.asyncio.wait_for(
+            self.launcher_registry.state_machine.start(
+                self.launcher_name
+            )
+        )
+        self.addAsyncCleanup(
+            phile.asyncio.wait_for,
+            self.launcher_registry.state_machine.stop(
+                self.launcher_name
+            ),
+        )
+
+    async def test_provides_index(self) -> None:
+        await self.test_start_launcher()
+        capability_type = phile.notify.search.Index
         self.assertIsInstance(
             self.capability_registry.get(capability_type),
             capability_type,
         )
 
 
+class TestAddNotifyWatchdog(
+    PreparesConfiguration,
+    UsesLauncherRegistry,
+    unittest.IsolatedAsyncioTestCase,
+):
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.launcher_name: str
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.launcher_name = "phile.notify.watchdog"
+
+    def test_add_launcher(self) -> None:
+        phile.launcher.defaults.add_notify_watchdog(
+            launcher_registry=self.launcher_registry
+        )
+        self.assertTrue(
+            self.launcher_registry.contains(self.launcher_name)
+        )
+
+    async def start_launcher(self) -> list[phile.notify.Entry]:
+        """Returns entries loaded from an existing notify file."""
+        self.test_add_launcher()
+        phile.launcher.defaults.add_configuration(
+            launcher_registry=self.launcher_registry
+        )
+        phile.launcher.defaults.add_notify(
+            launcher_registry=self.launcher_registry
+        )
+        phile.launcher.defaults.add_watchdog_asyncio_observer(
+            launcher_registry=self.launcher_registry
+        )
+        notify_directory = self.state_directory_path / "notify"
+        notify_directory.mkdir()
+        (notify_directory / "n.notify").write_text("t")
+        await phile.asyncio.wait_for(
+            self.launcher_registry.state_machine.start(
+                self.launcher_name
+            )
+        )
+        entries = self.capability_registry[
+            phile.notify.Registry
+        ].current_values.copy()
+        await phile.asyncio.wait_for(
+            self.launcher_registry.state_machine.stop(self.launcher_name)
+        )
+        return entries
+
+    async def test_start_launcher(self) -> None:
+        entries = await self.start_launcher()
+        self.assertEqual(len(entries), 1)
+        self.assertNotIsInstance(
+            entries[0], phile.notify.watchdog.LazyEntry
+        )
+
+    async def test_uses_text_cache_if_configured(self) -> None:
+        self.configuration_path.write_text(
+            json.dumps({"notify_text_cache_size": 16})
+        )
+        entries = await self.start_launcher()
+        self.assertEqual(len(entries), 1)
+        self.assertIsInstance(
+            entries[0], phile.notify.watchdog.LazyEntry
+        )
+        self.assertEqual(entries[0].text, "t")
+
+
 class TestAddTray(
     UsesLauncherRegistry,
     unittest.IsolatedAsyncioTestCase,
@@ -540,6 +818,28 @@ class TestAddTrayTmux(
                 self.launcher_name
             ),
         )
+        await phile.asyncio.wait_for(
+            self.launcher_registry.capability_registry.wait_for(
+                phile.tmux.control_mode.Client
+            )
+        )
+
+        async def stop_tmux() -> None:
+            # Started on demand, so not stopped with its user.
+            await phile.asyncio.wait_for(
+                self.launcher_registry.stop("phile.tmux.control_mode")
+            )
+
+        self.addAsyncCleanup(stop_tmux)
+
+    async def test_stops_if_tmux_stops(self) -> None:
+        await self.test_start_launcher()
+        event_view = self.launcher_registry.event_queue.__aiter__()
+        await phile.asyncio.wait_for(
+            self.launcher_registry.stop("phile.tmux.control_mode")
+        )
+        while self.launcher_registry.is_running(self.launcher_name):
+            await phile.asyncio.wait_for(event_view.__anext__())
 
 
 class TestAddTriggerWatchdog(
@@ -647,7 +947,10 @@ class TestAdd(
                 "phile.log.file",
                 "phile.log.stderr",
                 "phile.notify",
+                "phile.notify.expiry",
+                "phile.notify.log",
                 "phile.notify.pyside2",
+                "phile.notify.search",
                 "phile.notify.watchdog",
                 "phile.tmux.control_mode",
                 "phile.tray",
@@ -4,6 +4,14 @@
 import asyncio
 import collections.abc
 import dataclasses
+import datetime
+import functools
+import multiprocessing
+import operator
+import os
+import pathlib
+import sys
+import tempfile
 import types
 import typing
 import unittest
@@ -14,6 +22,8 @@ import phile.asyncio
 import phile.asyncio.pubsub
 import phile.capability
 import phile.launcher
+import phile.launcher.profile
+import phile.launcher.trace
 
 _T = typing.TypeVar("_T")
 
@@ -29,8 +39,9 @@ class TestType(unittest.TestCase):
             phile.launcher.Type.EXEC,
             phile.launcher.Type.FORKING,
             phile.launcher.Type.CAPABILITY,
+            phile.launcher.Type.PROCESS,
         }
-        self.assertEqual(len(members), 4)
+        self.assertEqual(len(members), 5)
 
 
 class TestDescriptor(unittest.TestCase):
@@ -44,6 +55,9 @@ class TestDescriptor(unittest.TestCase):
             default_dependencies=True,
             exec_start=[noop],
             exec_stop=[noop],
+            idle_timeout=datetime.timedelta(seconds=1),
+            imports=set(),
+            on_demand=True,
             type=phile.launcher.Type.SIMPLE,
         )
 
@@ -56,6 +70,22 @@ class TestCapabilityNotSet(unittest.TestCase):
             raise phile.launcher.CapabilityNotSet()
 
 
+class TestCycleError(unittest.TestCase):
+    def test_is_exception(self) -> None:
+        with self.assertRaises(phile.launcher.CycleError):
+            raise phile.launcher.CycleError()
+        with self.assertRaises(RuntimeError):
+            raise phile.launcher.CycleError()
+
+
+class TestProcessExited(unittest.TestCase):
+    def test_is_exception(self) -> None:
+        with self.assertRaises(phile.launcher.ProcessExited):
+            raise phile.launcher.ProcessExited()
+        with self.assertRaises(RuntimeError):
+            raise phile.launcher.ProcessExited()
+
+
 class TestMissingDescriptorData(unittest.TestCase):
     def test_is_exception(self) -> None:
         with self.assertRaises(phile.launcher.MissingDescriptorData):
@@ -188,6 +218,15 @@ class TestDatabase(unittest.IsolatedAsyncioTestCase):
         with self.assertRaises(phile.launcher.MissingDescriptorData):
             self.launcher_database.add("no_exec_start", {})
 
+    def test_add_fails_if_on_demand_without_capability_name(
+        self,
+    ) -> None:
+        with self.assertRaises(phile.launcher.MissingDescriptorData):
+            self.launcher_database.add(
+                "no_capability",
+                {"exec_start": [noop], "on_demand": True},
+            )
+
     def test_add_updates_afters(self) -> None:
         self.launcher_database.add(
             "dependent",
@@ -346,6 +385,97 @@ class TestDatabase(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(database.conflicts["else"], set())
         self.assertEqual(database.before["else"], set())
 
+    def test_get_relations__merges_both_directions(self) -> None:
+        add = self.launcher_database.add
+        add("a", {"exec_start": [noop], "after": {"b"}, "before": {"c"}})
+        add(
+            "b",
+            {
+                "exec_start": [noop],
+                "binds_to": {"c"},
+                "conflicts": {"a"},
+                "default_dependencies": False,
+            },
+        )
+        add("c", {"exec_start": [noop], "before": {"a"}})
+        relations = self.launcher_database.get_relations("a")
+        self.assertEqual(
+            relations,
+            phile.launcher.Relations(
+                after=frozenset({"b", "c"}),
+                before=frozenset({"c", "phile_shutdown.target"}),
+                binds_to=frozenset(),
+                bound_by=frozenset(),
+                conflicts=frozenset({"b", "phile_shutdown.target"}),
+            ),
+        )
+        self.assertEqual(
+            self.launcher_database.get_relations("c").bound_by, {"b"}
+        )
+        self.assertEqual(
+            self.launcher_database.get_relations("unknown").after,
+            frozenset(),
+        )
+
+    def test_get_relations__is_cached_until_related_changes(
+        self,
+    ) -> None:
+        add = self.launcher_database.add
+        add("a", {"exec_start": [noop]})
+        add("unrelated", {"exec_start": [noop]})
+        relations = self.launcher_database.get_relations("a")
+        unrelated = self.launcher_database.get_relations("unrelated")
+        self.assertIs(
+            self.launcher_database.get_relations("a"), relations
+        )
+        add("b", {"exec_start": [noop], "after": {"a"}})
+        self.assertEqual(
+            self.launcher_database.get_relations("a").before,
+            {"b", "phile_shutdown.target"},
+        )
+        self.assertIs(
+            self.launcher_database.get_relations("unrelated"), unrelated
+        )
+        self.launcher_database.remove("b")
+        self.assertEqual(
+            self.launcher_database.get_relations("a").before,
+            {"phile_shutdown.target"},
+        )
+
+    def test_get_binds_to_closure__follows_binds_to(self) -> None:
+        add = self.launcher_database.add
+        add("a", {"exec_start": [noop], "binds_to": {"b"}})
+        add("b", {"exec_start": [noop], "binds_to": {"a", "c"}})
+        self.assertEqual(
+            self.launcher_database.get_binds_to_closure("a"),
+            {"a", "b", "c"},
+        )
+
+    def test_get_binds_to_closure__is_cached_until_closure_changes(
+        self,
+    ) -> None:
+        add = self.launcher_database.add
+        add("a", {"exec_start": [noop], "binds_to": {"b"}})
+        add("b", {"exec_start": [noop], "binds_to": {"a"}})
+        add("unrelated", {"exec_start": [noop]})
+        closure = self.launcher_database.get_binds_to_closure("a")
+        unrelated = self.launcher_database.get_binds_to_closure(
+            "unrelated"
+        )
+        self.assertIs(
+            self.launcher_database.get_binds_to_closure("a"), closure
+        )
+        self.launcher_database.remove("b")
+        add("b", {"exec_start": [noop], "binds_to": {"c"}})
+        self.assertEqual(
+            self.launcher_database.get_binds_to_closure("a"),
+            {"a", "b", "c"},
+        )
+        self.assertIs(
+            self.launcher_database.get_binds_to_closure("unrelated"),
+            unrelated,
+        )
+
     def test_remove__succeeds_after_add(self) -> None:
         name = "to_be_removed"
         self.launcher_database.add(name, {"exec_start": [noop]})
@@ -360,6 +490,16 @@ class TestDatabase(unittest.IsolatedAsyncioTestCase):
     def test_remove__ignores_if_not_added(self) -> None:
         self.launcher_database.remove("not_added_unit")
 
+    def test_version__changes_on_add_and_remove(self) -> None:
+        version = self.launcher_database.version
+        self.launcher_database.add("versioned", {"exec_start": [noop]})
+        self.assertNotEqual(self.launcher_database.version, version)
+        version = self.launcher_database.version
+        self.launcher_database.remove("not_added_unit")
+        self.assertEqual(self.launcher_database.version, version)
+        self.launcher_database.remove("versioned")
+        self.assertNotEqual(self.launcher_database.version, version)
+
     def test_remove__with_after_removes_from_inverses(self) -> None:
         self.launcher_database.add(
             "dependent_1",
@@ -451,6 +591,239 @@ class TestDatabase(unittest.IsolatedAsyncioTestCase):
         )
 
 
+class TestPlanner(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.launcher_database = phile.launcher.Database()
+        self.planner = phile.launcher.Planner(
+            database=self.launcher_database
+        )
+
+    def add(
+        self,
+        entry_name: str,
+        descriptor: typing.Optional[phile.launcher.Descriptor] = None,
+    ) -> None:
+        if descriptor is None:
+            descriptor = {}
+        descriptor["exec_start"] = [noop]
+        self.launcher_database.add(entry_name, descriptor)
+
+    def test_predecessors__merges_after_and_inverse_before(self) -> None:
+        self.add("a", {"before": {"c"}})
+        self.add("b")
+        self.add("c", {"after": {"b"}})
+        self.assertEqual(self.planner.predecessors["c"], {"a", "b"})
+        self.assertEqual(self.planner.predecessors["a"], set())
+
+    def test_get_closure__follows_binds_to(self) -> None:
+        self.add("a", {"binds_to": {"b"}})
+        self.add("b", {"binds_to": {"c", "a"}})
+        self.add("d")
+        self.assertEqual(
+            self.planner.get_closure(["a"]), {"a", "b", "c"}
+        )
+
+    def test_get_waves__groups_by_ordering(self) -> None:
+        self.add("a", {"binds_to": {"b", "c"}, "after": {"b", "c"}})
+        self.add("b", {"binds_to": {"d"}, "after": {"d"}})
+        self.add("c")
+        self.add("d")
+        self.add("unrelated", {"before": {"a"}})
+        self.assertEqual(
+            self.planner.get_waves(["a"]),
+            (("c", "d"), ("b",), ("a",)),
+        )
+
+    def test_get_waves__includes_unknown_launchers(self) -> None:
+        self.add("a", {"binds_to": {"unknown"}, "after": {"unknown"}})
+        self.assertEqual(
+            self.planner.get_waves(["a"]), (("unknown",), ("a",))
+        )
+
+    def test_get_waves__is_cached_until_database_changes(self) -> None:
+        self.add("a", {"after": {"b"}, "binds_to": {"b"}})
+        waves = self.planner.get_waves(["a"])
+        self.assertIs(self.planner.get_waves(["a"]), waves)
+        self.add("b", {"after": {"c"}, "binds_to": {"c"}})
+        new_waves = self.planner.get_waves(["a"])
+        self.assertEqual(new_waves, (("c",), ("b",), ("a",)))
+
+    def test_get_waves__keeps_limited_number_of_waves(self) -> None:
+        self.add("a")
+        with unittest.mock.patch.object(
+            phile.launcher, "planner_cache_size", 2
+        ):
+            waves = self.planner.get_waves(["a"])
+            self.planner.get_waves(["b"])
+            self.assertIs(self.planner.get_waves(["a"]), waves)
+            self.planner.get_waves(["c"])
+            self.assertIsNot(self.planner.get_waves(["a"]), waves)
+
+    def test_get_waves__is_dropped_on_invalidation(self) -> None:
+        self.add("a")
+        waves = self.planner.get_waves(["a"])
+        # pylint: disable=protected-access
+        self.launcher_database._invalidate("a")
+        self.assertIsNot(self.planner.get_waves(["a"]), waves)
+
+    def test_get_waves__raises_on_cycles(self) -> None:
+        self.add("a", {"after": {"b"}, "binds_to": {"b"}})
+        self.add("b", {"after": {"a"}, "binds_to": {"c"}})
+        self.add("c", {"after": {"b"}})
+        with self.assertRaisesRegex(
+            phile.launcher.CycleError, "a, b, c"
+        ):
+            self.planner.get_waves(["a"])
+
+    def test_get_dependent_closure__follows_binds_to_inverses(
+        self,
+    ) -> None:
+        self.add("a", {"binds_to": {"b"}})
+        self.add("b", {"binds_to": {"c", "a"}})
+        self.add("d", {"binds_to": {"a"}})
+        self.add("e")
+        self.assertEqual(
+            self.planner.get_dependent_closure(["c"]),
+            {"a", "b", "c", "d"},
+        )
+
+    def test_get_stop_waves__reverses_ordering_of_dependents(
+        self,
+    ) -> None:
+        self.add("a", {"binds_to": {"b", "c"}, "after": {"b", "c"}})
+        self.add("b", {"binds_to": {"d"}, "after": {"d"}})
+        self.add("c")
+        self.add("d")
+        self.assertEqual(
+            self.planner.get_stop_waves(["d"]), (("a",), ("b",), ("d",))
+        )
+
+    def test_get_stop_waves__is_cached_until_database_changes(
+        self,
+    ) -> None:
+        self.add("a", {"after": {"b"}, "binds_to": {"b"}})
+        waves = self.planner.get_stop_waves(["b"])
+        self.assertIs(self.planner.get_stop_waves(["b"]), waves)
+        self.add("c", {"after": {"a"}, "binds_to": {"a"}})
+        new_waves = self.planner.get_stop_waves(["b"])
+        self.assertEqual(new_waves, (("c",), ("a",), ("b",)))
+
+
+process_timeout = datetime.timedelta(seconds=10)
+"""Spawning a process can be slow, depending on system load."""
+
+
+class TestSendCommandLinesResult(unittest.TestCase):
+    def send(
+        self, command_lines: phile.launcher.CommandLines
+    ) -> typing.Any:
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        with receiver:
+            phile.launcher.send_command_lines_result(
+                command_lines, sender
+            )
+            self.assertTrue(sender.closed)
+            return receiver.recv()
+
+    def test_sends_last_return_value(self) -> None:
+        self.assertEqual(
+            self.send(
+                [
+                    functools.partial(asyncio.sleep, 0, result=1),
+                    functools.partial(asyncio.sleep, 0, result=2),
+                ]
+            ),
+            (True, 2),
+        )
+
+    def test_sends_raised_exception(self) -> None:
+        async def fail() -> None:
+            raise ValueError("Failed.")
+
+        succeeded, error = self.send([fail])
+        self.assertFalse(succeeded)
+        self.assertIsInstance(error, ValueError)
+
+    def test_sends_process_exited_if_result_is_not_picklable(
+        self,
+    ) -> None:
+        async def return_local() -> typing.Any:
+            return lambda: None
+
+        succeeded, error = self.send([return_local])
+        self.assertFalse(succeeded)
+        self.assertIsInstance(error, phile.launcher.ProcessExited)
+
+
+class TestRunCommandLinesInProcess(unittest.IsolatedAsyncioTestCase):
+    async def test_returns_last_return_value(self) -> None:
+        result = await phile.asyncio.wait_for(
+            phile.launcher.run_command_lines_in_process(
+                "process",
+                [functools.partial(asyncio.sleep, 0, result=2)],
+            ),
+            timeout=process_timeout,
+        )
+        self.assertEqual(result, 2)
+
+    async def test_raises_exception_raised_in_child(self) -> None:
+        with self.assertRaises(ZeroDivisionError):
+            await phile.asyncio.wait_for(
+                phile.launcher.run_command_lines_in_process(
+                    "process",
+                    [functools.partial(operator.truediv, 1, 0)],
+                ),
+                timeout=process_timeout,
+            )
+
+    async def test_raises_process_exited_if_no_result(self) -> None:
+        with self.assertRaisesRegex(
+            phile.launcher.ProcessExited, "exited with code 3"
+        ):
+            await phile.asyncio.wait_for(
+                phile.launcher.run_command_lines_in_process(
+                    "process", [functools.partial(os._exit, 3)]
+                ),
+                timeout=process_timeout,
+            )
+
+    async def test_cancel_terminates_child(self) -> None:
+        task = asyncio.create_task(
+            phile.launcher.run_command_lines_in_process(
+                "process", [functools.partial(asyncio.sleep, 3600)]
+            )
+        )
+        await asyncio.sleep(0)
+        self.assertEqual(len(multiprocessing.active_children()), 1)
+        await phile.asyncio.wait_for(
+            phile.asyncio.cancel_and_wait(task), timeout=process_timeout
+        )
+        self.assertEqual(multiprocessing.active_children(), [])
+
+
+class TestBatchResult(unittest.TestCase):
+    def test_default_is_empty(self) -> None:
+        result = phile.launcher.BatchResult()
+        self.assertEqual(result.succeeded, [])
+        self.assertEqual(result.failed, {})
+
+
+class TestShutdownReport(unittest.TestCase):
+    def test_default_is_empty(self) -> None:
+        report = phile.launcher.ShutdownReport()
+        self.assertEqual(report.succeeded, [])
+        self.assertEqual(report.failed, {})
+        self.assertEqual(report.forced, [])
+        self.assertEqual(report.abandoned, [])
+
+    def test_slow__includes_forced_and_abandoned(self) -> None:
+        report = phile.launcher.ShutdownReport(
+            forced=["a"], abandoned=["b"]
+        )
+        self.assertEqual(report.slow, ["a", "b"])
+
+
 class TestEventType(unittest.TestCase):
     def test_members_exist(self) -> None:
         EventType = phile.launcher.EventType
@@ -506,6 +879,129 @@ class TestRegistry(unittest.IsolatedAsyncioTestCase):
             phile.launcher.Database,
         )
 
+    def test_planner__uses_database(self) -> None:
+        self.launcher_registry.add_nowait(
+            "planned", {"exec_start": [noop], "after": {"other"}}
+        )
+        self.assertEqual(
+            self.launcher_registry.planner.predecessors["planned"],
+            {"other"},
+        )
+
+    async def test_prefetch_imports__imports_in_planned_order(
+        self,
+    ) -> None:
+        with tempfile.TemporaryDirectory() as directory_name:
+            directory = pathlib.Path(directory_name)
+            (directory / "phile_test_prefetch_a.py").write_text("")
+            (directory / "phile_test_prefetch_b.py").write_text("")
+            (directory / "phile_test_prefetch_c.py").write_text(
+                "raise RuntimeError()"
+            )
+            sys.path.insert(0, directory_name)
+            self.addCleanup(sys.path.remove, directory_name)
+            for module_name in (
+                "phile_test_prefetch_a",
+                "phile_test_prefetch_b",
+            ):
+                self.addCleanup(sys.modules.pop, module_name, None)
+            self.launcher_registry.add_nowait(
+                "dependent",
+                {
+                    "after": {"dependency"},
+                    "binds_to": {"dependency"},
+                    "exec_start": [noop],
+                    "imports": {
+                        "phile_test_prefetch_b",
+                        "phile_test_prefetch_c",
+                        "phile_test_prefetch_missing",
+                        "sys",
+                    },
+                },
+            )
+            self.launcher_registry.add_nowait(
+                "dependency",
+                {
+                    "exec_start": [noop],
+                    "imports": {"phile_test_prefetch_a"},
+                },
+            )
+            with self.assertLogs("phile.launcher", "DEBUG") as logs:
+                await phile.asyncio.wait_for(
+                    self.launcher_registry.prefetch_imports(
+                        ["dependent"], worker_count=8
+                    )
+                )
+        self.assertIn("phile_test_prefetch_a", sys.modules)
+        self.assertIn("phile_test_prefetch_b", sys.modules)
+        self.assertEqual(len(logs.records), 2)
+
+    async def test_start_planned__orders_by_startup_profile(
+        self,
+    ) -> None:
+        self.launcher_registry.add_nowait(
+            "quick", {"exec_start": [noop]}
+        )
+        self.launcher_registry.add_nowait(
+            "setup", {"exec_start": [noop]}
+        )
+        self.launcher_registry.add_nowait(
+            "slow",
+            {
+                "after": {"setup"},
+                "binds_to": {"setup"},
+                "exec_start": [noop],
+            },
+        )
+        self.launcher_registry.startup_profile = (
+            phile.launcher.profile.Profile(
+                durations={"quick": 1, "setup": 0.1, "slow": 5}
+            )
+        )
+        with unittest.mock.patch.object(
+            self.launcher_registry,
+            "start",
+            wraps=self.launcher_registry.start,
+        ) as start_mock:
+            await phile.asyncio.wait_for(
+                self.launcher_registry.start_planned(["quick", "slow"])
+            )
+        # The slow launcher is requested before one of an earlier wave.
+        self.assertEqual(
+            [call.args[0] for call in start_mock.call_args_list],
+            ["setup", "slow", "quick"],
+        )
+
+    async def test_prefetch_imports__includes_profiled_modules(
+        self,
+    ) -> None:
+        self.launcher_registry.add_nowait(
+            "profiled", {"exec_start": [noop], "imports": {"sys"}}
+        )
+        self.launcher_registry.startup_profile = (
+            phile.launcher.profile.Profile(
+                module_names=["sys", "phile_test_profiled_missing"]
+            )
+        )
+        with self.assertLogs("phile.launcher", "DEBUG") as logs:
+            await phile.asyncio.wait_for(
+                self.launcher_registry.prefetch_imports(["profiled"])
+            )
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("phile_test_profiled_missing", logs.output[0])
+
+    async def test_prefetch_imports__ignores_imported_modules(
+        self,
+    ) -> None:
+        self.launcher_registry.add_nowait(
+            "imported", {"exec_start": [noop], "imports": {"sys"}}
+        )
+        with unittest.mock.patch("asyncio.to_thread") as to_thread_mock:
+            await phile.asyncio.wait_for(
+                self.launcher_registry.prefetch_imports(["imported"])
+            )
+        to_thread_mock.assert_not_called()
+
     def test_init__adds_default_launchers(self) -> None:
         self.assertTrue(
             self.launcher_registry.contains("phile_shutdown.target")
@@ -639,75 +1135,351 @@ class TestRegistry(unittest.IsolatedAsyncioTestCase):
         # but the limit should be sufficiently high in most cases.
         self.assertGreaterEqual(counter.value, limit)
 
-    async def test_start__capability_waits_for_capability(self) -> None:
-        async def run() -> None:
-            # Test that irrelevant capability events are ignored.
-            self.launcher_registry.capability_registry.set("a")
-            del self.launcher_registry.capability_registry[str]
-            self.launcher_registry.capability_registry.set(1)
-            await asyncio.get_running_loop().create_future()
-
-        name = "exec_capability"
+    async def test_start__process_runs_in_child_until_stopped(
+        self,
+    ) -> None:
+        name = "exec_process"
         self.launcher_registry.add_nowait(
             name,
-            {"exec_start": [run], "capability_name": "builtins.int"},
+            {
+                "exec_start": [functools.partial(asyncio.sleep, 3600)],
+                "type": phile.launcher.Type.PROCESS,
+            },
         )
         await phile.asyncio.wait_for(self.launcher_registry.start(name))
+        self.assertTrue(self.launcher_registry.is_running(name))
+        self.assertEqual(
+            [
+                process.name
+                for process in multiprocessing.active_children()
+            ],
+            [name],
+        )
+        await phile.asyncio.wait_for(
+            self.launcher_registry.stop(name), timeout=process_timeout
+        )
+        self.assertFalse(self.launcher_registry.is_running(name))
+        self.assertEqual(multiprocessing.active_children(), [])
 
-    async def test_start__capability_warns_if_not_set(self) -> None:
+    def add_on_demand(
+        self,
+        entry_name: str,
+        idle_timeout: typing.Optional[datetime.timedelta] = None,
+    ) -> None:
         async def run() -> None:
-            capability_registry = (
-                self.launcher_registry.capability_registry
-            )
-            capability_registry.event_queue.put_done()
-            await asyncio.get_running_loop().create_future()
+            with self.launcher_registry.capability_registry.provide(1):
+                await asyncio.get_running_loop().create_future()
+
+        descriptor = phile.launcher.Descriptor(
+            exec_start=[run],
+            capability_name="builtins.int",
+            on_demand=True,
+        )
+        if idle_timeout is not None:
+            descriptor["idle_timeout"] = idle_timeout
+        self.launcher_registry.add_nowait(entry_name, descriptor)
+
+    async def wait_for_event(
+        self,
+        event_view: phile.asyncio.pubsub.View[phile.launcher.Event],
+        expected_event: phile.launcher.Event,
+    ) -> None:
+        async def wait() -> None:
+            async for event in event_view:  # pragma: no branch
+                if event == expected_event:
+                    break
+
+        await phile.asyncio.wait_for(wait())
+
+    async def test_start__on_demand_starts_when_capability_awaited(
+        self,
+    ) -> None:
+        name = "on_demand"
+        self.add_on_demand(name)
+        await asyncio.sleep(0)
+        self.assertFalse(self.launcher_registry.is_running(name))
+        value = await phile.asyncio.wait_for(
+            self.launcher_registry.capability_registry.wait_for(int)
+        )
+        self.assertEqual(value, 1)
+        await phile.asyncio.wait_for(self.launcher_registry.start(name))
+        self.assertTrue(self.launcher_registry.is_running(name))
+
+    async def test_start__on_demand_failure_is_raised_in_waiters(
+        self,
+    ) -> None:
+        async def fail() -> None:
+            raise ValueError("Failed.")
 
-        name = "exec_capability"
         self.launcher_registry.add_nowait(
-            name,
-            {"exec_start": [run], "capability_name": "builtins.int"},
+            "on_demand",
+            phile.launcher.Descriptor(
+                exec_start=[fail],
+                capability_name="builtins.int",
+                on_demand=True,
+            ),
         )
-        with self.assertRaises(phile.launcher.CapabilityNotSet):
+        with self.assertRaises(ValueError):
             await phile.asyncio.wait_for(
-                self.launcher_registry.start(name)
+                self.launcher_registry.capability_registry.wait_for(int)
             )
 
-    async def test_start__returns_if_running(self) -> None:
-        name = "starting_after_start"
-        stop_launcher = asyncio.Event()
+    async def test_start__on_demand_cancelled_is_not_raised_in_waiters(
+        self,
+    ) -> None:
+        name = "on_demand"
+        self.add_on_demand(name)
+        waiter = asyncio.create_task(
+            self.launcher_registry.capability_registry.wait_for(int)
+        )
+        self.addAsyncCleanup(phile.asyncio.cancel_and_wait, waiter)
+        await asyncio.sleep(0)
+        await phile.asyncio.cancel_and_wait(
+            self.launcher_registry.start(name)
+        )
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())
+
+    async def test_remove_nowait__on_demand_is_no_longer_started(
+        self,
+    ) -> None:
+        name = "on_demand"
+        self.add_on_demand(name)
+        self.launcher_registry.remove_nowait(name)
+        self.assertEqual(
+            self.launcher_registry.capability_registry.demand_handlers,
+            {},
+        )
+
+    async def test_start__on_demand_stops_when_idle(self) -> None:
+        name = "on_demand"
+        self.add_on_demand(name, idle_timeout=datetime.timedelta())
+        event_view = self.launcher_registry.event_queue.__aiter__()
+        await phile.asyncio.wait_for(self.launcher_registry.start(name))
+        await self.wait_for_event(
+            event_view,
+            phile.launcher.Event(
+                type=phile.launcher.EventType.STOP, entry_name=name
+            ),
+        )
+        self.assertFalse(self.launcher_registry.is_running(name))
+
+    async def test_start__on_demand_is_not_idle_with_dependents(
+        self,
+    ) -> None:
+        name = "on_demand"
+        self.add_on_demand(
+            name, idle_timeout=datetime.timedelta(seconds=0.2)
+        )
+        dependent = "dependent"
         self.launcher_registry.add_nowait(
-            name,
+            dependent,
             {
-                "exec_start": [stop_launcher.wait],
+                "exec_start": [asyncio.Event().wait],
+                "binds_to": {name},
+                "after": {name},
             },
         )
+        event_view = self.launcher_registry.event_queue.__aiter__()
         await phile.asyncio.wait_for(self.launcher_registry.start(name))
-        await phile.asyncio.wait_for(self.launcher_registry.start(name))
+        await asyncio.sleep(0)
+        await phile.asyncio.wait_for(
+            self.launcher_registry.start(dependent)
+        )
+        await asyncio.sleep(0.3)
+        self.assertTrue(self.launcher_registry.is_running(name))
+        await phile.asyncio.wait_for(
+            self.launcher_registry.stop(dependent)
+        )
+        await self.wait_for_event(
+            event_view,
+            phile.launcher.Event(
+                type=phile.launcher.EventType.STOP, entry_name=name
+            ),
+        )
+        self.assertFalse(self.launcher_registry.is_running(name))
 
-    async def test_start__awaits_if_already_starting(self) -> None:
-        name = "double_start"
+    async def test_start__on_demand_is_not_idle_with_starting_dependents(
+        self,
+    ) -> None:
+        name = "on_demand"
+        self.add_on_demand(
+            name, idle_timeout=datetime.timedelta(seconds=0.1)
+        )
         continue_forker = asyncio.Event()
 
-        async def forker() -> asyncio.Task[None]:
+        async def forker() -> asyncio.Future[typing.Any]:
             await continue_forker.wait()
-            return asyncio.create_task(asyncio.sleep(0))
+            return asyncio.get_running_loop().create_future()
 
+        dependent = "dependent"
         self.launcher_registry.add_nowait(
-            name,
+            dependent,
             {
                 "exec_start": [forker],
+                "binds_to": {name},
+                "after": {name},
                 "type": phile.launcher.Type.FORKING,
             },
         )
-        start_1 = self.launcher_registry.start(name)
-        await asyncio.sleep(0)
-        start_2 = self.launcher_registry.start(name)
+        event_view = self.launcher_registry.event_queue.__aiter__()
+        await phile.asyncio.wait_for(self.launcher_registry.start(name))
         await asyncio.sleep(0)
-        self.assertFalse(start_1.done())
-        self.assertFalse(start_2.done())
+        dependent_start = self.launcher_registry.start(dependent)
+        # Let the idle timeout expire while the dependent is starting.
+        await asyncio.sleep(0.3)
+        self.assertTrue(self.launcher_registry.is_running(name))
         continue_forker.set()
-        await phile.asyncio.wait_for(start_2)
-        await phile.asyncio.wait_for(start_1)
+        await phile.asyncio.wait_for(dependent_start)
+        await phile.asyncio.wait_for(
+            self.launcher_registry.stop(dependent)
+        )
+        await self.wait_for_event(
+            event_view,
+            phile.launcher.Event(
+                type=phile.launcher.EventType.STOP, entry_name=name
+            ),
+        )
+        self.assertFalse(self.launcher_registry.is_running(name))
+
+    async def test_start__capability_waits_for_capability(self) -> None:
+        async def run() -> None:
+            # Test that irrelevant capability events are ignored.
+            self.launcher_registry.capability_registry.set("a")
+            del self.launcher_registry.capability_registry[str]
+            self.launcher_registry.capability_registry.set(1)
+            await asyncio.get_running_loop().create_future()
+
+        name = "exec_capability"
+        self.launcher_registry.add_nowait(
+            name,
+            {"exec_start": [run], "capability_name": "builtins.int"},
+        )
+        await phile.asyncio.wait_for(self.launcher_registry.start(name))
+
+    async def test_start__capability_warns_if_not_set(self) -> None:
+        name = "exec_capability"
+        self.launcher_registry.add_nowait(
+            name,
+            {"exec_start": [noop], "capability_name": "builtins.int"},
+        )
+        with self.assertRaises(phile.launcher.CapabilityNotSet):
+            await phile.asyncio.wait_for(
+                self.launcher_registry.start(name)
+            )
+
+    async def test_start__capability_already_set_is_ready(self) -> None:
+        self.launcher_registry.capability_registry.set(1)
+        name = "exec_capability"
+        self.launcher_registry.add_nowait(
+            name,
+            {
+                "exec_start": [asyncio.Event().wait],
+                "capability_name": "builtins.int",
+            },
+        )
+        await phile.asyncio.wait_for(self.launcher_registry.start(name))
+        self.assertTrue(self.launcher_registry.is_running(name))
+
+    async def test_start__capability_removal_stops_launcher(
+        self,
+    ) -> None:
+        capability_registry = self.launcher_registry.capability_registry
+
+        async def run() -> None:
+            with capability_registry.provide(1):
+                await asyncio.get_running_loop().create_future()
+
+        name = "exec_capability"
+        self.launcher_registry.add_nowait(
+            name,
+            {"exec_start": [run], "capability_name": "builtins.int"},
+        )
+        event_view = self.launcher_registry.event_queue.__aiter__()
+        await phile.asyncio.wait_for(self.launcher_registry.start(name))
+        self.assertTrue(self.launcher_registry.is_running(name))
+        del capability_registry[int]
+        expected_event = phile.launcher.Event(
+            type=phile.launcher.EventType.STOP, entry_name=name
+        )
+
+        async def wait_for_stop() -> None:
+            async for event in event_view:  # pragma: no branch
+                if event == expected_event:
+                    break
+
+        await phile.asyncio.wait_for(wait_for_stop())
+        self.assertFalse(self.launcher_registry.is_running(name))
+
+    async def test_stop__capability_launcher_stops_once(self) -> None:
+        capability_registry = self.launcher_registry.capability_registry
+        stop_count = 0
+
+        async def run() -> None:
+            with capability_registry.provide(1):
+                await asyncio.get_running_loop().create_future()
+
+        async def exec_stop() -> None:
+            nonlocal stop_count
+            stop_count += 1
+
+        name = "exec_capability"
+        self.launcher_registry.add_nowait(
+            name,
+            {
+                "exec_start": [run],
+                "exec_stop": [exec_stop],
+                "capability_name": "builtins.int",
+            },
+        )
+        await phile.asyncio.wait_for(self.launcher_registry.start(name))
+        await phile.asyncio.wait_for(self.launcher_registry.stop(name))
+        await asyncio.sleep(0)
+        self.assertFalse(self.launcher_registry.is_running(name))
+        self.assertEqual(stop_count, 1)
+
+    async def test_start__returns_if_running(self) -> None:
+        name = "starting_after_start"
+        stop_launcher = asyncio.Event()
+        self.launcher_registry.add_nowait(
+            name,
+            {
+                "exec_start": [stop_launcher.wait],
+            },
+        )
+        await phile.asyncio.wait_for(self.launcher_registry.start(name))
+        await phile.asyncio.wait_for(self.launcher_registry.start(name))
+
+    async def test_start__awaits_if_already_starting(self) -> None:
+        name = "double_start"
+        continue_forker = asyncio.Event()
+
+        async def forker() -> asyncio.Task[None]:
+            await continue_forker.wait()
+            return asyncio.create_task(asyncio.sleep(0))
+
+        self.launcher_registry.add_nowait(
+            name,
+            {
+                "exec_start": [forker],
+                "type": phile.launcher.Type.FORKING,
+            },
+        )
+        start_1 = self.launcher_registry.start(name)
+        await asyncio.sleep(0)
+        start_2 = self.launcher_registry.start(name)
+        await asyncio.sleep(0)
+        self.assertFalse(start_1.done())
+        self.assertFalse(start_2.done())
+        continue_forker.set()
+        await phile.asyncio.wait_for(start_2)
+        await phile.asyncio.wait_for(start_1)
+
+    async def test_start__raises_if_not_added(self) -> None:
+        with self.assertRaises(KeyError):
+            await phile.asyncio.wait_for(
+                self.launcher_registry.start("unknown")
+            )
 
     async def test_is_running__is_true_after_start(self) -> None:
         name = "run_check"
@@ -740,6 +1512,463 @@ class TestRegistry(unittest.IsolatedAsyncioTestCase):
         )
         await phile.asyncio.wait_for(dependency_started)
 
+    async def test_start_planned__starts_in_order_concurrently(
+        self,
+    ) -> None:
+        started: list[str] = []
+        dependency_allowed = asyncio.Event()
+
+        async def dependency_exec_start() -> asyncio.Future[None]:
+            await dependency_allowed.wait()
+            started.append("dependency")
+            return asyncio.get_running_loop().create_future()
+
+        self.launcher_registry.add_nowait(
+            "dependent",
+            {
+                "after": {"dependency"},
+                "binds_to": {"dependency"},
+                "exec_start": [
+                    make_nullary_async(started.append, "dependent"),
+                ],
+            },
+        )
+        self.launcher_registry.add_nowait(
+            "dependency",
+            {
+                "exec_start": [dependency_exec_start],
+                "type": phile.launcher.Type.FORKING,
+            },
+        )
+        self.launcher_registry.add_nowait(
+            "independent",
+            {
+                "exec_start": [
+                    make_nullary_async(started.append, "independent"),
+                ]
+            },
+        )
+        start_planned = asyncio.create_task(
+            self.launcher_registry.start_planned(
+                ["dependent", "independent"]
+            )
+        )
+        self.addAsyncCleanup(
+            phile.asyncio.cancel_and_wait, start_planned
+        )
+        await phile.asyncio.wait_for(
+            self.launcher_registry.start("independent")
+        )
+        await asyncio.sleep(0)
+        self.assertEqual(started, ["independent"])
+        self.assertFalse(self.launcher_registry.is_running("dependent"))
+        dependency_allowed.set()
+        result = await phile.asyncio.wait_for(start_planned)
+        self.assertEqual(
+            result.succeeded, ["dependency", "independent", "dependent"]
+        )
+        self.assertEqual(
+            started, ["independent", "dependency", "dependent"]
+        )
+
+    async def test_start_planned__requests_dependencies_once(
+        self,
+    ) -> None:
+        self.launcher_registry.add_nowait(
+            "dependent",
+            {
+                "after": {"dependency"},
+                "binds_to": {"dependency"},
+                "exec_start": [noop],
+            },
+        )
+        self.launcher_registry.add_nowait(
+            "dependency", {"exec_start": [asyncio.Event().wait]}
+        )
+        start = self.launcher_registry.start
+        requested: list[str] = []
+
+        def record_start(entry_name: str) -> asyncio.Task[typing.Any]:
+            requested.append(entry_name)
+            return start(entry_name)
+
+        with unittest.mock.patch.object(
+            self.launcher_registry, "start", side_effect=record_start
+        ):
+            result = await phile.asyncio.wait_for(
+                self.launcher_registry.start_planned(["dependent"])
+            )
+        self.assertEqual(result.succeeded, ["dependency", "dependent"])
+        # Dependencies are not requested again by the dependent.
+        self.assertEqual(requested, ["dependency", "dependent"])
+
+    async def test_start_planned__does_not_wait_on_other_launchers(
+        self,
+    ) -> None:
+        # A launcher that never finishes starting,
+        # and one ordered after a launcher in the same wave as it.
+        self.launcher_registry.add_nowait(
+            "stuck",
+            {
+                "exec_start": [asyncio.Event().wait],
+                "type": phile.launcher.Type.FORKING,
+            },
+        )
+        self.launcher_registry.add_nowait(
+            "first", {"exec_start": [asyncio.Event().wait]}
+        )
+        self.launcher_registry.add_nowait(
+            "second",
+            {
+                "after": {"first"},
+                "binds_to": {"first"},
+                "exec_start": [asyncio.Event().wait],
+            },
+        )
+        start_planned = asyncio.create_task(
+            self.launcher_registry.start_planned(["stuck", "second"])
+        )
+        self.addAsyncCleanup(
+            phile.asyncio.cancel_and_wait, start_planned
+        )
+        await phile.asyncio.wait_for(
+            self.launcher_registry.start("second")
+        )
+        self.assertTrue(self.launcher_registry.is_running("first"))
+        self.assertTrue(self.launcher_registry.is_running("second"))
+        self.assertFalse(self.launcher_registry.is_running("stuck"))
+        self.assertFalse(start_planned.done())
+
+    async def test_start_planned__raises_before_starting_on_cycles(
+        self,
+    ) -> None:
+        self.launcher_registry.add_nowait(
+            "a",
+            {"exec_start": [noop], "after": {"b"}, "binds_to": {"b"}},
+        )
+        self.launcher_registry.add_nowait(
+            "b", {"exec_start": [noop], "after": {"a"}}
+        )
+        with self.assertRaises(phile.launcher.CycleError):
+            await self.launcher_registry.start_planned(["a"])
+        self.assertFalse(self.launcher_registry.is_running("a"))
+        self.assertFalse(self.launcher_registry.is_running("b"))
+
+    async def test_start_many__reports_outcome_of_closure(self) -> None:
+        async def fail() -> None:
+            raise ValueError("Failed.")
+
+        self.launcher_registry.add_nowait(
+            "dependent",
+            {
+                "after": {"dependency"},
+                "binds_to": {"dependency"},
+                "exec_start": [asyncio.Event().wait],
+            },
+        )
+        self.launcher_registry.add_nowait(
+            "dependency", {"exec_start": [asyncio.Event().wait]}
+        )
+        self.launcher_registry.add_nowait(
+            "failing",
+            {"exec_start": [fail], "type": phile.launcher.Type.FORKING},
+        )
+        result = await phile.asyncio.wait_for(
+            self.launcher_registry.start_many(["dependent", "failing"])
+        )
+        self.assertEqual(result.succeeded, ["dependency", "dependent"])
+        self.assertEqual(list(result.failed), ["failing"])
+        self.assertIsInstance(result.failed["failing"], ValueError)
+        self.assertTrue(self.launcher_registry.is_running("dependency"))
+        self.assertTrue(self.launcher_registry.is_running("dependent"))
+
+    async def test_start_many__reports_cancelled_starts(self) -> None:
+        self.launcher_registry.add_nowait(
+            "a", {"exec_start": [asyncio.Event().wait]}
+        )
+        start_many = self.launcher_registry.start_many(["a"])
+        self.launcher_registry.start("a").cancel()
+        result = await phile.asyncio.wait_for(start_many)
+        self.assertEqual(result.succeeded, [])
+        self.assertIsInstance(result.failed["a"], asyncio.CancelledError)
+
+    async def test_start_many__cancelling_does_not_cancel_starts(
+        self,
+    ) -> None:
+        self.launcher_registry.add_nowait(
+            "a", {"exec_start": [asyncio.Event().wait]}
+        )
+        start_many = self.launcher_registry.start_many(["a"])
+        await phile.asyncio.cancel_and_wait(start_many)
+        await phile.asyncio.wait_for(self.launcher_registry.start("a"))
+        self.assertTrue(self.launcher_registry.is_running("a"))
+
+    async def test_start_many__accepts_no_launchers(self) -> None:
+        result = await phile.asyncio.wait_for(
+            self.launcher_registry.start_many([])
+        )
+        self.assertEqual(result, phile.launcher.BatchResult())
+
+    async def test_stop_many__accepts_no_launchers(self) -> None:
+        result = await phile.asyncio.wait_for(
+            self.launcher_registry.stop_many([])
+        )
+        self.assertEqual(result, phile.launcher.BatchResult())
+
+    async def test_stop_many__stops_dependents(self) -> None:
+        self.launcher_registry.add_nowait(
+            "dependent",
+            {
+                "after": {"dependency"},
+                "binds_to": {"dependency"},
+                "exec_start": [asyncio.Event().wait],
+            },
+        )
+        self.launcher_registry.add_nowait(
+            "dependency", {"exec_start": [asyncio.Event().wait]}
+        )
+        await phile.asyncio.wait_for(
+            self.launcher_registry.start_many(["dependent"])
+        )
+        result = await phile.asyncio.wait_for(
+            self.launcher_registry.stop_many(["dependency"])
+        )
+        self.assertEqual(result.succeeded, ["dependent", "dependency"])
+        self.assertEqual(result.failed, {})
+        self.assertFalse(self.launcher_registry.is_running("dependency"))
+        self.assertFalse(self.launcher_registry.is_running("dependent"))
+
+    async def test_shutdown__orders_by_waves(self) -> None:
+        stopped: list[str] = []
+        self.launcher_registry.add_nowait(
+            "dependent",
+            {
+                "after": {"dependency"},
+                "binds_to": {"dependency"},
+                "exec_start": [asyncio.Event().wait],
+                "exec_stop": [
+                    make_nullary_async(stopped.append, "dependent")
+                ],
+            },
+        )
+        self.launcher_registry.add_nowait(
+            "dependency",
+            {
+                "exec_start": [asyncio.Event().wait],
+                "exec_stop": [
+                    make_nullary_async(stopped.append, "dependency")
+                ],
+            },
+        )
+        # Launchers not running are not stopped.
+        self.launcher_registry.add_nowait(
+            "inactive",
+            {
+                "after": {"dependency"},
+                "binds_to": {"dependency"},
+                "exec_start": [noop],
+            },
+        )
+        self.launcher_registry.add_nowait(
+            "inactive_dependent",
+            {
+                "after": {"inactive"},
+                "binds_to": {"inactive"},
+                "exec_start": [noop],
+            },
+        )
+        await phile.asyncio.wait_for(
+            self.launcher_registry.start_many(["dependent"])
+        )
+        report = await phile.asyncio.wait_for(
+            self.launcher_registry.shutdown()
+        )
+        self.assertEqual(report.succeeded, ["dependent", "dependency"])
+        self.assertEqual(stopped, ["dependent", "dependency"])
+
+    async def test_shutdown__reports_failures(self) -> None:
+        async def fail() -> None:
+            raise ValueError("Failed.")
+
+        self.launcher_registry.add_nowait(
+            "failing",
+            {"exec_start": [asyncio.Event().wait], "exec_stop": [fail]},
+        )
+        await phile.asyncio.wait_for(
+            self.launcher_registry.start("failing")
+        )
+        report = await phile.asyncio.wait_for(
+            self.launcher_registry.shutdown()
+        )
+        self.assertIsInstance(report.failed["failing"], ValueError)
+
+    async def test_shutdown__cancels_after_grace_period(self) -> None:
+        self.launcher_registry.add_nowait(
+            "hanging",
+            {
+                "exec_start": [asyncio.Event().wait],
+                "exec_stop": [asyncio.Event().wait],
+            },
+        )
+        await phile.asyncio.wait_for(
+            self.launcher_registry.start("hanging")
+        )
+        with self.assertLogs("phile.launcher", level="WARNING"):
+            report = await phile.asyncio.wait_for(
+                self.launcher_registry.shutdown(
+                    grace_period=datetime.timedelta(seconds=0.05)
+                )
+            )
+        self.assertEqual(report.forced, ["hanging"])
+        self.assertEqual(report.succeeded, ["hanging"])
+        self.assertFalse(self.launcher_registry.is_running("hanging"))
+
+    async def test_shutdown__abandons_after_deadline(self) -> None:
+        released = asyncio.Event()
+
+        async def ignore_cancellation() -> None:
+            try:
+                await released.wait()
+            except asyncio.CancelledError:
+                await released.wait()
+
+        self.launcher_registry.add_nowait(
+            "stubborn",
+            {
+                "exec_start": [asyncio.Event().wait],
+                "exec_stop": [ignore_cancellation],
+            },
+        )
+        self.launcher_registry.add_nowait(
+            "other", {"exec_start": [asyncio.Event().wait]}
+        )
+        await phile.asyncio.wait_for(
+            self.launcher_registry.start_many(["stubborn", "other"])
+        )
+        with self.assertLogs("phile.launcher", level="WARNING"):
+            report = await phile.asyncio.wait_for(
+                self.launcher_registry.shutdown(
+                    deadline=datetime.timedelta(seconds=0.1),
+                    grace_period=datetime.timedelta(seconds=0.05),
+                )
+            )
+        self.assertEqual(report.abandoned, ["stubborn"])
+        self.assertEqual(report.succeeded, ["other"])
+        self.assertTrue(self.launcher_registry.is_running("stubborn"))
+        released.set()
+        await phile.asyncio.wait_for(
+            self.launcher_registry.stop("stubborn")
+        )
+
+    async def test_shutdown__stops_concurrently_on_cycles(self) -> None:
+        self.launcher_registry.add_nowait(
+            "a", {"exec_start": [asyncio.Event().wait], "after": {"b"}}
+        )
+        self.launcher_registry.add_nowait(
+            "b", {"exec_start": [asyncio.Event().wait], "after": {"a"}}
+        )
+        await phile.asyncio.wait_for(self.launcher_registry.start("a"))
+        await phile.asyncio.wait_for(self.launcher_registry.start("b"))
+        with self.assertLogs("phile.launcher", level="ERROR"):
+            report = await phile.asyncio.wait_for(
+                self.launcher_registry.shutdown()
+            )
+        self.assertEqual(report.succeeded, ["a", "b"])
+        self.assertFalse(self.launcher_registry.is_running("a"))
+        self.assertFalse(self.launcher_registry.is_running("b"))
+
+    async def test_shutdown__does_nothing_if_nothing_running(
+        self,
+    ) -> None:
+        self.launcher_registry.add_nowait("idle", {"exec_start": [noop]})
+        report = await phile.asyncio.wait_for(
+            self.launcher_registry.shutdown()
+        )
+        self.assertEqual(report, phile.launcher.ShutdownReport())
+
+    async def test_get_state_counts(self) -> None:
+        self.launcher_registry.add_nowait(
+            "running", {"exec_start": [asyncio.Event().wait]}
+        )
+        continue_forker = asyncio.Event()
+
+        async def forker() -> asyncio.Future[typing.Any]:
+            await continue_forker.wait()
+            return asyncio.get_running_loop().create_future()
+
+        self.launcher_registry.add_nowait(
+            "starting",
+            {
+                "exec_start": [forker],
+                "type": phile.launcher.Type.FORKING,
+            },
+        )
+        await phile.asyncio.wait_for(
+            self.launcher_registry.start("running")
+        )
+        self.launcher_registry.start("starting")
+        stop_task = self.launcher_registry.stop("running")
+        self.assertEqual(
+            self.launcher_registry.get_state_counts(),
+            {"starting": 1, "running": 1, "stopping": 1},
+        )
+        await phile.asyncio.wait_for(stop_task)
+        continue_forker.set()
+
+    async def test_metrics__records_starts_and_stops(self) -> None:
+        name = "measured"
+        self.launcher_registry.add_nowait(
+            name, {"exec_start": [asyncio.Event().wait]}
+        )
+        for _ in range(2):
+            await phile.asyncio.wait_for(
+                self.launcher_registry.start(name)
+            )
+            await phile.asyncio.wait_for(
+                self.launcher_registry.stop(name)
+            )
+        unit = self.launcher_registry.metrics_recorder.get_unit(name)
+        self.assertEqual(unit.start_count, 2)
+        self.assertEqual(unit.restart_count, 1)
+        self.assertEqual(unit.start_latency.count, 2)
+        self.assertEqual(unit.stop_latency.count, 2)
+        self.assertEqual(unit.exception_count, 0)
+        metrics = self.launcher_registry.get_metrics()
+        self.assertEqual(
+            metrics["states"], self.launcher_registry.get_state_counts()
+        )
+        self.assertEqual(metrics["units"][name], unit.to_dict())
+
+    async def test_metrics__records_exceptions(self) -> None:
+        async def fail() -> None:
+            raise ValueError("Failed.")
+
+        self.launcher_registry.add_nowait(
+            "failing_start",
+            {"exec_start": [fail], "type": phile.launcher.Type.FORKING},
+        )
+        self.launcher_registry.add_nowait(
+            "failing_stop",
+            {"exec_start": [asyncio.Event().wait], "exec_stop": [fail]},
+        )
+        with self.assertRaises(ValueError):
+            await phile.asyncio.wait_for(
+                self.launcher_registry.start("failing_start")
+            )
+        await phile.asyncio.wait_for(
+            self.launcher_registry.start("failing_stop")
+        )
+        with self.assertRaises(ValueError):
+            await phile.asyncio.wait_for(
+                self.launcher_registry.stop("failing_stop")
+            )
+        get_unit = self.launcher_registry.metrics_recorder.get_unit
+        for name in ["failing_start", "failing_stop"]:
+            self.assertEqual(get_unit(name).exception_count, 1)
+            self.assertEqual(
+                get_unit(name).last_exception, "ValueError('Failed.')"
+            )
+
     async def test_start__stops_conflicts_first(self) -> None:
         loop = asyncio.get_running_loop()
         conflict_stopped = loop.create_future()
@@ -1137,6 +2366,38 @@ class TestRegistry(unittest.IsolatedAsyncioTestCase):
         await phile.asyncio.wait_for(dependency_stopped)
         self.assertFalse(dependent_stopped.done())
 
+    async def test_start_and_stop__record_trace_spans(self) -> None:
+        self.launcher_registry.add_nowait(
+            "traced", {"exec_start": [asyncio.Event().wait]}
+        )
+        await phile.asyncio.wait_for(
+            self.launcher_registry.start("traced")
+        )
+        await phile.asyncio.wait_for(
+            self.launcher_registry.stop("traced")
+        )
+        spans = [
+            span
+            for span in self.launcher_registry.trace_recorder.spans
+            if span.entry_name == "traced"
+        ]
+        self.assertEqual(
+            sorted(span.name for span in spans),
+            sorted(
+                [
+                    phile.launcher.trace.WAIT_DEPENDENCIES,
+                    phile.launcher.trace.START,
+                    phile.launcher.trace.EXEC_START,
+                    phile.launcher.trace.RUNNING,
+                    phile.launcher.trace.WAIT_DEPENDENTS,
+                    phile.launcher.trace.EXEC_STOP,
+                    phile.launcher.trace.CLEAN_UP,
+                ]
+            ),
+        )
+        for span in spans:
+            self.assertLessEqual(span.start, span.end)
+
     async def test_start__emits_events(self) -> None:
         entry_name = "start_emits_events"
         self.launcher_registry.add_nowait(
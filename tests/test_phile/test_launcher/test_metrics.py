@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+----------------------------------
+Test :mod:`phile.launcher.metrics`
+----------------------------------
+"""
+
+# Standard libraries.
+import json
+import unittest
+
+# Internal packages.
+import phile.launcher.metrics
+
+
+class TestHistogram(unittest.TestCase):
+    def test_observe__counts_values_in_inclusive_buckets(self) -> None:
+        histogram = phile.launcher.metrics.Histogram(
+            bucket_bounds=[1.0, 2.0]
+        )
+        for value in [0.5, 1.0, 1.5, 3.0]:
+            histogram.observe(value)
+        self.assertEqual(histogram.bucket_counts, [2, 1, 1])
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual(histogram.sum, 6.0)
+
+    def test_to_dict(self) -> None:
+        histogram = phile.launcher.metrics.Histogram(bucket_bounds=[1.0])
+        histogram.observe(2.0)
+        self.assertEqual(
+            histogram.to_dict(),
+            {
+                "bucket_bounds": [1.0],
+                "bucket_counts": [0, 1],
+                "count": 1,
+                "sum": 2.0,
+            },
+        )
+
+    def test_default_bucket_bounds(self) -> None:
+        histogram = phile.launcher.metrics.Histogram()
+        self.assertEqual(
+            histogram.bucket_bounds,
+            phile.launcher.metrics.default_bucket_bounds,
+        )
+        self.assertEqual(
+            len(histogram.bucket_counts),
+            len(phile.launcher.metrics.default_bucket_bounds) + 1,
+        )
+
+
+class TestUnitMetrics(unittest.TestCase):
+    def test_default(self) -> None:
+        unit = phile.launcher.metrics.UnitMetrics()
+        self.assertEqual(unit.start_count, 0)
+        self.assertEqual(unit.restart_count, 0)
+        self.assertEqual(unit.exception_count, 0)
+        self.assertEqual(unit.last_exception, "")
+        self.assertEqual(unit.start_latency.count, 0)
+        self.assertEqual(unit.stop_latency.count, 0)
+
+    def test_to_dict_is_json_serialisable(self) -> None:
+        unit_dict = phile.launcher.metrics.UnitMetrics().to_dict()
+        self.assertEqual(json.loads(json.dumps(unit_dict)), unit_dict)
+        self.assertEqual(
+            set(unit_dict),
+            {
+                "start_latency",
+                "stop_latency",
+                "start_count",
+                "restart_count",
+                "exception_count",
+                "last_exception",
+            },
+        )
+
+
+class TestRecorder(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.recorder = phile.launcher.metrics.Recorder()
+
+    def test_get_unit__creates_once(self) -> None:
+        unit = self.recorder.get_unit("a")
+        self.assertIs(self.recorder.get_unit("a"), unit)
+        self.assertEqual(self.recorder.units, {"a": unit})
+
+    def test_record_start__counts_restarts(self) -> None:
+        self.recorder.record_start("a", 1.0)
+        unit = self.recorder.get_unit("a")
+        self.assertEqual(unit.start_count, 1)
+        self.assertEqual(unit.restart_count, 0)
+        self.recorder.record_start("a", 2.0)
+        self.assertEqual(unit.start_count, 2)
+        self.assertEqual(unit.restart_count, 1)
+        self.assertEqual(unit.start_latency.sum, 3.0)
+
+    def test_record_stop(self) -> None:
+        self.recorder.record_stop("a", 1.0)
+        self.assertEqual(
+            self.recorder.get_unit("a").stop_latency.sum, 1.0
+        )
+
+    def test_record_exception(self) -> None:
+        self.recorder.record_exception("a", ValueError("first"))
+        self.recorder.record_exception("a", KeyError("second"))
+        unit = self.recorder.get_unit("a")
+        self.assertEqual(unit.exception_count, 2)
+        self.assertEqual(unit.last_exception, "KeyError('second')")
+
+    def test_to_dict__sorts_by_name(self) -> None:
+        self.recorder.record_stop("b", 1.0)
+        self.recorder.record_stop("a", 1.0)
+        self.assertEqual(list(self.recorder.to_dict()), ["a", "b"])
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+----------------------------------
+Test :mod:`phile.launcher.profile`
+----------------------------------
+"""
+
+# Standard libraries.
+import json
+import pathlib
+import tempfile
+import typing
+import unittest
+
+# Internal packages.
+import phile.launcher.profile
+import phile.launcher.trace
+
+Span = phile.launcher.trace.Span
+
+
+class TestProfile(unittest.TestCase):
+    def test_default_is_empty(self) -> None:
+        profile = phile.launcher.profile.Profile()
+        self.assertEqual(profile.durations, {})
+        self.assertEqual(profile.ready_order, [])
+        self.assertEqual(profile.critical_path, [])
+        self.assertEqual(profile.module_names, [])
+
+    def test_from_spans__uses_latest_start_spans(self) -> None:
+        start = phile.launcher.trace.START
+        profile = phile.launcher.profile.Profile.from_spans(
+            [
+                Span("a", start, 0, 9),
+                Span("b", start, 0, 1),
+                Span("a", start, 0, 2),
+                Span("c", start, 2, 5),
+                Span("c", phile.launcher.trace.RUNNING, 5, 10),
+                Span("d", start, 0, 3),
+            ],
+            {"c": {"a", "b"}},
+            module_names=iter(["x", "y"]),
+        )
+        self.assertEqual(
+            profile,
+            phile.launcher.profile.Profile(
+                durations={"a": 2, "b": 1, "c": 3, "d": 3},
+                ready_order=["b", "a", "d", "c"],
+                critical_path=["a", "c"],
+                module_names=["x", "y"],
+            ),
+        )
+
+    def test_to_dict_and_from_dict_round_trip(self) -> None:
+        profile = phile.launcher.profile.Profile(
+            durations={"a": 1.5},
+            ready_order=["a"],
+            critical_path=["a"],
+            module_names=["x"],
+        )
+        self.assertEqual(
+            phile.launcher.profile.Profile.from_dict(
+                json.loads(json.dumps(profile.to_dict()))
+            ),
+            profile,
+        )
+
+    def test_from_dict__raises_value_error_if_malformed(self) -> None:
+        sources: list[dict[str, typing.Any]] = [
+            {},
+            {"durations": []},
+            {"durations": {"a": None}},
+        ]
+        for source in sources:
+            with self.subTest(source=source):
+                with self.assertRaises(ValueError):
+                    phile.launcher.profile.Profile.from_dict(source)
+
+    def test_get_start_order__puts_long_paths_first(self) -> None:
+        profile = phile.launcher.profile.Profile(
+            durations={"a": 1, "b": 2, "c": 3, "d": 4, "e": 2},
+            critical_path=["b", "a"],
+        )
+        self.assertEqual(
+            profile.get_start_order(
+                ["a", "b", "c", "d", "e", "unknown"], {}
+            ),
+            ["d", "c", "b", "e", "a", "unknown"],
+        )
+
+    def test_get_start_order__puts_predecessors_of_slow_launchers_first(
+        self,
+    ) -> None:
+        profile = phile.launcher.profile.Profile(
+            durations={"setup": 0.1, "slow": 5, "quick": 1}
+        )
+        self.assertEqual(
+            profile.get_start_order(
+                ["quick", "setup", "slow", "last"],
+                {
+                    "last": {"quick", "slow"},
+                    "quick": {"unknown"},
+                    "slow": {"setup"},
+                },
+            ),
+            ["setup", "slow", "quick", "last"],
+        )
+
+    def test_get_start_order__uses_critical_path_for_ties(self) -> None:
+        profile = phile.launcher.profile.Profile(
+            critical_path=["b", "a"]
+        )
+        self.assertEqual(
+            profile.get_start_order(["a", "b", "c"], {}),
+            ["b", "a", "c"],
+        )
+
+
+class TestLoadAndSave(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = (
+            pathlib.Path(directory.name) / "state" / "profile.json"
+        )
+
+    def test_save_then_load(self) -> None:
+        profile = phile.launcher.profile.Profile(durations={"a": 1.0})
+        phile.launcher.profile.save(profile, self.path)
+        self.assertEqual(phile.launcher.profile.load(self.path), profile)
+
+    def test_save__replaces_atomically(self) -> None:
+        phile.launcher.profile.save(
+            phile.launcher.profile.Profile(), self.path
+        )
+        inode = self.path.stat().st_ino
+        self.test_save_then_load()
+        self.assertNotEqual(self.path.stat().st_ino, inode)
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+    def test_load__returns_none_if_missing(self) -> None:
+        self.assertIsNone(phile.launcher.profile.load(self.path))
+
+    def test_load__warns_and_returns_none_if_malformed(self) -> None:
+        self.path.parent.mkdir()
+        for content in ["not json", "{}"]:
+            with self.subTest(content=content):
+                self.path.write_text(content)
+                with self.assertLogs(
+                    "phile.launcher.profile", "WARNING"
+                ):
+                    self.assertIsNone(
+                        phile.launcher.profile.load(self.path)
+                    )
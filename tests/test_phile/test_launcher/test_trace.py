@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+--------------------------------
+Test :mod:`phile.launcher.trace`
+--------------------------------
+"""
+
+# Standard libraries.
+import io
+import json
+import unittest
+
+# Internal packages.
+import phile.launcher.trace
+
+
+class TestSpan(unittest.TestCase):
+    def test_duration(self) -> None:
+        span = phile.launcher.trace.Span(
+            entry_name="a", name="start", start=1.5, end=4
+        )
+        self.assertEqual(span.duration, 2.5)
+
+
+class TestRecorder(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.now = 0.0
+        self.recorder = phile.launcher.trace.Recorder(
+            clock=lambda: self.now, max_span_count=2
+        )
+
+    def test_add_span__ends_now_by_default(self) -> None:
+        self.now = 3
+        self.recorder.add_span("a", "start", 1)
+        self.recorder.add_span("a", "running", 3, 5)
+        self.assertEqual(
+            list(self.recorder.spans),
+            [
+                phile.launcher.trace.Span("a", "start", 1, 3),
+                phile.launcher.trace.Span("a", "running", 3, 5),
+            ],
+        )
+
+    def test_add_span__drops_oldest_if_full(self) -> None:
+        for index in range(3):
+            self.recorder.add_span(str(index), "start", 0, 1)
+        self.assertEqual(
+            [span.entry_name for span in self.recorder.spans], ["1", "2"]
+        )
+
+    def test_to_trace_events__uses_microseconds_and_threads(
+        self,
+    ) -> None:
+        self.recorder.add_span("a", "start", 1, 1.5)
+        self.recorder.add_span("b", "start", 2, 3)
+        trace_events = self.recorder.to_trace_events()["traceEvents"]
+        self.assertEqual(
+            trace_events[0],
+            {
+                "name": "start",
+                "cat": "launcher",
+                "ph": "X",
+                "ts": 1e6,
+                "dur": 0.5e6,
+                "pid": 1,
+                "tid": 1,
+            },
+        )
+        self.assertEqual(trace_events[1]["tid"], 2)
+        self.assertEqual(
+            trace_events[2:],
+            [
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": 1,
+                    "tid": 1,
+                    "args": {"name": "a"},
+                },
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": 1,
+                    "tid": 2,
+                    "args": {"name": "b"},
+                },
+            ],
+        )
+
+    def test_dump__writes_json(self) -> None:
+        self.recorder.add_span("a", "start", 1, 2)
+        stream = io.StringIO()
+        self.recorder.dump(stream)
+        self.assertEqual(
+            json.loads(stream.getvalue()),
+            self.recorder.to_trace_events(),
+        )
+
+
+class TestGetCriticalPath(unittest.TestCase):
+    def test_follows_latest_ready_predecessors(self) -> None:
+        Span = phile.launcher.trace.Span
+        spans = [
+            Span("config", "start", 0, 1),
+            Span("fast", "start", 1, 1.5),
+            Span("slow", "start", 1, 3),
+            Span("tray", "wait_dependencies", 0, 3),
+            Span("tray", "start", 3, 4),
+            Span("late", "start", 2, 3.5),
+        ]
+        critical_path = phile.launcher.trace.get_critical_path(
+            spans,
+            {
+                "fast": {"config"},
+                "slow": {"config"},
+                "tray": {"fast", "slow", "late"},
+            },
+        )
+        self.assertEqual(
+            [span.entry_name for span in critical_path],
+            ["config", "slow", "tray"],
+        )
+
+    def test_uses_latest_start_of_launchers(self) -> None:
+        Span = phile.launcher.trace.Span
+        critical_path = phile.launcher.trace.get_critical_path(
+            [Span("a", "start", 0, 1), Span("a", "start", 5, 6)], {}
+        )
+        self.assertEqual(critical_path, [Span("a", "start", 5, 6)])
+
+    def test_returns_empty_if_nothing_started(self) -> None:
+        self.assertEqual(
+            phile.launcher.trace.get_critical_path([], {}), []
+        )
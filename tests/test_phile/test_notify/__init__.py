@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 """
 .. automodule:: test_phile.test_notify.test_init
+.. automodule:: test_phile.test_notify.test_benchmark
 .. automodule:: test_phile.test_notify.test_cli
+.. automodule:: test_phile.test_notify.test_expiry
 .. automodule:: test_phile.test_notify.test_gui
+.. automodule:: test_phile.test_notify.test_log
+.. automodule:: test_phile.test_notify.test_search
 .. automodule:: test_phile.test_notify.test_watchdog
 """
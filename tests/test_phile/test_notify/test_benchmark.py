@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+# Standard library.
+import argparse
+import io
+import unittest
+
+# Internal packages.
+import phile.notify.benchmark
+
+import_time_output = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   a
+import time:       200 |        300 | b
+unrelated output
+"""
+
+
+class TestParseImportTimes(unittest.TestCase):
+    def test_returns_slowest_first(self) -> None:
+        self.assertEqual(
+            phile.notify.benchmark.parse_import_times(
+                import_time_output
+            ),
+            [
+                phile.notify.benchmark.ImportTime(
+                    name="b", self_time=0.0002, cumulative_time=0.0003
+                ),
+                phile.notify.benchmark.ImportTime(
+                    name="a", self_time=0.0001, cumulative_time=0.0001
+                ),
+            ],
+        )
+
+
+class TestReport(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.report = phile.notify.benchmark.Report(
+            durations=[0.1, 0.3],
+            import_times=phile.notify.benchmark.parse_import_times(
+                import_time_output
+            ),
+        )
+
+    def test_module_names(self) -> None:
+        self.assertEqual(self.report.module_names, {"a", "b"})
+
+    def test_to_text_shows_slowest_imports(self) -> None:
+        text = self.report.to_text(import_count=1)
+        self.assertIn("median: 0.200000 s", text)
+        self.assertIn("  b: 0.000300 s, 0.000200 s", text)
+        self.assertNotIn("  a:", text)
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_does_not_import_heavy_modules(self) -> None:
+        report = phile.notify.benchmark.benchmark(repeat=1)
+        self.assertEqual(len(report.durations), 1)
+        self.assertIn("phile.notify.cli", report.module_names)
+        for module_name in [
+            "asyncio",
+            "phile.asyncio.pubsub",
+            "phile.configuration",
+            "pydantic",
+            "watchdog",
+        ]:
+            with self.subTest(module_name=module_name):
+                self.assertNotIn(module_name, report.module_names)
+
+
+class TestProcessArguments(unittest.TestCase):
+    def test_prints_report(self) -> None:
+        argument_parser = phile.notify.benchmark.create_argument_parser()
+        argument_namespace = argument_parser.parse_args(
+            ["--repeat", "1", "list"]
+        )
+        self.assertEqual(argument_namespace.command, ["list"])
+        output_stream = io.StringIO()
+        self.assertEqual(
+            phile.notify.benchmark.process_arguments(
+                argument_namespace, output_stream=output_stream
+            ),
+            0,
+        )
+        self.assertIn("runs: 1", output_stream.getvalue())
@@ -2,16 +2,135 @@
 
 # Standard library.
 import argparse
+import datetime
 import io
+import json
+import os
+import pathlib
+import typing
 import unittest
+import unittest.mock
 
 # Internal packages.
+import phile.configuration
 import phile.notify
 import phile.notify.cli
+import phile.notify.expiry_storage
 import phile.notify.watchdog
+import phile.os
 from test_phile.test_configuration.test_init import UsesConfiguration
 
 
+class TestGetConfigurationCachePath(unittest.TestCase):
+    def test_returns_path(self) -> None:
+        self.assertIsInstance(
+            phile.notify.cli.get_configuration_cache_path(), pathlib.Path
+        )
+
+
+class TestGetConfigurationKey(UsesConfiguration, unittest.TestCase):
+    def test_has_phile_environment_variables(self) -> None:
+        key = phile.notify.cli.get_configuration_key()
+        self.assertEqual(
+            key["environ"]["PHILE_STATE_DIRECTORY_PATH"],
+            str(self.state_directory_path),
+        )
+
+    def test_changes_if_configuration_file_changes(self) -> None:
+        key = phile.notify.cli.get_configuration_key()
+        self.assertIsNone(key["configuration_modified_at"])
+        self.configuration_path.write_text("{}")
+        self.assertNotEqual(
+            phile.notify.cli.get_configuration_key(), key
+        )
+
+    def test_changes_if_default_state_directory_changes(self) -> None:
+        environ = phile.os.Environ()
+        self.addCleanup(environ.restore)
+        environ.set(XDG_STATE_HOME=str(self.state_directory_path / "a"))
+        key = phile.notify.cli.get_configuration_key()
+        environ.set(XDG_STATE_HOME=str(self.state_directory_path / "b"))
+        self.assertNotEqual(
+            phile.notify.cli.get_configuration_key(), key
+        )
+
+    def test_uses_default_configuration_path_if_not_set(self) -> None:
+        environ = phile.os.Environ()
+        self.addCleanup(environ.restore)
+        environ.set(PHILE_CONFIGURATION_PATH=None)
+        key = phile.notify.cli.get_configuration_key()
+        self.assertEqual(
+            os.path.basename(key["configuration_path"]), "config.json"
+        )
+
+
+class TestLoadConfiguration(UsesConfiguration, unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.cache_path = self.state_directory_path / "cache" / "c.json"
+
+    def load(self) -> phile.notify.cli.Configuration:
+        return phile.notify.cli.load_configuration(
+            cache_path=self.cache_path
+        )
+
+    def assert_same_paths(
+        self, configuration: phile.notify.cli.Configuration
+    ) -> None:
+        self.assertEqual(
+            phile.notify.cli.get_directory(configuration=configuration),
+            phile.notify.watchdog.get_directory(
+                configuration=self.configuration
+            ),
+        )
+        self.assertEqual(
+            configuration.notify_suffix,
+            self.configuration.notify_suffix,
+        )
+
+    def test_loads_configuration_and_saves_cache(self) -> None:
+        configuration = self.load()
+        self.assertIsInstance(configuration, phile.configuration.Entries)
+        self.assert_same_paths(configuration)
+        self.assertTrue(self.cache_path.is_file())
+
+    def test_uses_cache_if_up_to_date(self) -> None:
+        self.load()
+        configuration = self.load()
+        self.assertIsInstance(
+            configuration, phile.notify.cli.CachedConfiguration
+        )
+        self.assert_same_paths(configuration)
+        self.assertEqual(
+            configuration.save_atomically,
+            self.configuration.save_atomically,
+        )
+        self.assertEqual(
+            configuration.save_fsync, self.configuration.save_fsync
+        )
+
+    def test_ignores_cache_if_environment_changed(self) -> None:
+        self.load()
+        environ = phile.os.Environ()
+        self.addCleanup(environ.restore)
+        environ.set(PHILE_NOTIFY_SUFFIX=".n")
+        configuration = self.load()
+        self.assertIsInstance(configuration, phile.configuration.Entries)
+        self.assertEqual(configuration.notify_suffix, ".n")
+
+    def test_ignores_malformed_cache(self) -> None:
+        self.cache_path.parent.mkdir()
+        self.cache_path.write_text("[]")
+        configuration = self.load()
+        self.assertIsInstance(configuration, phile.configuration.Entries)
+
+    def test_ignores_unwritable_cache(self) -> None:
+        self.cache_path.parent.mkdir()
+        self.cache_path.mkdir()
+        configuration = self.load()
+        self.assertIsInstance(configuration, phile.configuration.Entries)
+
+
 class TestCreateArgumentParser(unittest.TestCase):
     def setUp(self) -> None:
         self.argument_parser = phile.notify.cli.create_argument_parser()
@@ -31,12 +150,24 @@ class TestCreateArgumentParser(unittest.TestCase):
         self.assertEqual(argument_namespace.name, name)
         self.assertEqual(argument_namespace.content, content)
 
+    def test_batch_command_succeeds(self) -> None:
+        command = "batch"
+        argument_namespace = self.argument_parser.parse_args([command])
+        self.assertEqual(argument_namespace.command, command)
+
     def test_list_command_succeeds(self) -> None:
         command = "list"
         arguments = [command]
         argument_namespace = self.argument_parser.parse_args(arguments)
         self.assertEqual(argument_namespace.command, command)
 
+    def test_search_command_succeeds(self) -> None:
+        argument_namespace = self.argument_parser.parse_args(
+            ["search", "kit*"]
+        )
+        self.assertEqual(argument_namespace.command, "search")
+        self.assertEqual(argument_namespace.query, "kit*")
+
     def test_read_command_succeeds(self) -> None:
         command = "read"
         name = "VeCat"
@@ -54,6 +185,21 @@ class TestCreateArgumentParser(unittest.TestCase):
         self.assertEqual(argument_namespace.command, command)
         self.assertEqual(argument_namespace.name, name)
         self.assertEqual(argument_namespace.content, content)
+        self.assertIsNone(argument_namespace.expires_in)
+
+    def test_write_command_takes_expiry(self) -> None:
+        argument_namespace = self.argument_parser.parse_args(
+            ["write", "--expires-in", "600", "VeCat", "Kitty."]
+        )
+        self.assertEqual(argument_namespace.expires_in, 600)
+        self.assertFalse(argument_namespace.no_expiry)
+
+    def test_write_command_takes_no_expiry(self) -> None:
+        argument_namespace = self.argument_parser.parse_args(
+            ["write", "--no-expiry", "VeCat", "Kitty."]
+        )
+        self.assertIsNone(argument_namespace.expires_in)
+        self.assertTrue(argument_namespace.no_expiry)
 
 
 class TestProcessArguments(UsesConfiguration, unittest.TestCase):
@@ -152,6 +298,33 @@ class TestProcessArguments(UsesConfiguration, unittest.TestCase):
             ],
         )
 
+    def test_process_search_request(self) -> None:
+        for name, text in [
+            ("VeCat", "There is a kitty."),
+            ("VeDog", "There is a puppy."),
+        ]:
+            phile.notify.watchdog.save(
+                entry=phile.notify.Entry(name=name, text=text),
+                configuration=self.configuration,
+            )
+        argument_namespace = argparse.Namespace(
+            command="search", query="there kit*"
+        )
+        output_stream = io.StringIO()
+        return_value = phile.notify.cli.process_arguments(
+            argument_namespace=argument_namespace,
+            configuration=self.configuration,
+            output_stream=output_stream,
+        )
+        self.assertEqual(return_value, 0)
+        self.assertEqual(output_stream.getvalue(), "VeCat\n")
+        self.assertTrue(
+            (
+                self.configuration.state_directory_path
+                / phile.notify.cli.search_cache_name
+            ).is_file()
+        )
+
     def test_process_list_request_even_if_directory_is_empty(
         self,
     ) -> None:
@@ -241,6 +414,149 @@ class TestProcessArguments(UsesConfiguration, unittest.TestCase):
             notify_entry.text, argument_namespace.content + "\n"
         )
 
+    def test_write_uses_save_configuration(self) -> None:
+        self.configuration.save_atomically = True
+        self.configuration.save_fsync = True
+        for command in ["write", "append"]:
+            with self.subTest(command=command):
+                argument_namespace = argparse.Namespace(
+                    command=command, name="VeCat", content="Kitty."
+                )
+                with unittest.mock.patch(
+                    "phile.os.write_text"
+                ) as write_text_mock:
+                    return_value = phile.notify.cli.process_arguments(
+                        argument_namespace=argument_namespace,
+                        configuration=self.configuration,
+                    )
+                self.assertEqual(return_value, 0)
+                write_text_mock.assert_called_once_with(
+                    phile.notify.watchdog.get_path(
+                        name="VeCat", configuration=self.configuration
+                    ),
+                    "Kitty.\n",
+                    atomic=True,
+                    fsync=True,
+                    prepare_file=unittest.mock.ANY,
+                )
+
+    def test_write_keeps_expiry(self) -> None:
+        argument_namespace = argparse.Namespace(
+            command="write",
+            name="VeCat",
+            content="There is a kitty.",
+            expires_in=600,
+        )
+        expected_expiry = datetime.datetime.now() + datetime.timedelta(
+            seconds=600
+        )
+        return_value = phile.notify.cli.process_arguments(
+            argument_namespace=argument_namespace,
+            configuration=self.configuration,
+        )
+        self.assertEqual(return_value, 0)
+        expires_at = phile.notify.watchdog.load(
+            name=argument_namespace.name,
+            configuration=self.configuration,
+        ).expires_at
+        assert expires_at is not None
+        self.assertGreaterEqual(expires_at, expected_expiry)
+
+    def test_write_with_no_expiry_removes_expiry(self) -> None:
+        self.test_write_keeps_expiry()
+        return_value = phile.notify.cli.process_arguments(
+            argument_namespace=argparse.Namespace(
+                command="write",
+                name="VeCat",
+                content="Kitty.",
+                expires_in=None,
+                no_expiry=True,
+            ),
+            configuration=self.configuration,
+        )
+        self.assertEqual(return_value, 0)
+        self.assertIsNone(
+            phile.notify.watchdog.load(
+                name="VeCat", configuration=self.configuration
+            ).expires_at
+        )
+
+    def test_write_without_expiry_keeps_expiry(self) -> None:
+        for atomic in [False, True]:
+            with self.subTest(atomic=atomic):
+                self.configuration.save_atomically = atomic
+                self.test_write_keeps_expiry()
+                path = phile.notify.watchdog.get_path(
+                    name="VeCat", configuration=self.configuration
+                )
+                expires_at = phile.notify.expiry_storage.load(path)
+                self.test_process_write_request()
+                self.assertEqual(
+                    phile.notify.expiry_storage.load(path), expires_at
+                )
+
+    def test_write_without_expiry_skips_expiry_if_none(self) -> None:
+        argument_namespace = argparse.Namespace(
+            command="write", name="VeCat", content="Kitty."
+        )
+        with unittest.mock.patch(
+            "phile.notify.expiry_storage.load", return_value=None
+        ) as load_mock, unittest.mock.patch(
+            "phile.notify.expiry_storage.save"
+        ) as save_mock:
+            for atomic, load_count in [(False, 0), (True, 1)]:
+                self.configuration.save_atomically = atomic
+                return_value = phile.notify.cli.process_arguments(
+                    argument_namespace=argument_namespace,
+                    configuration=self.configuration,
+                )
+                self.assertEqual(return_value, 0)
+                self.assertEqual(load_mock.call_count, load_count)
+        save_mock.assert_not_called()
+
+    def test_write_keeps_expiry_in_file_if_unsupported(self) -> None:
+        for error in [AttributeError, OSError]:
+            with self.subTest(error=error), unittest.mock.patch(
+                "os.getxattr", side_effect=error
+            ), unittest.mock.patch("os.setxattr", side_effect=error):
+                self.test_write_keeps_expiry()
+
+    def test_append_keeps_expiry(self) -> None:
+        self.configuration.save_atomically = True
+        self.test_write_keeps_expiry()
+        path = phile.notify.watchdog.get_path(
+            name="VeCat", configuration=self.configuration
+        )
+        expires_at = phile.notify.expiry_storage.load(path)
+        return_value = phile.notify.cli.process_arguments(
+            argument_namespace=argparse.Namespace(
+                command="append", name="VeCat", content="Meow."
+            ),
+            configuration=self.configuration,
+        )
+        self.assertEqual(return_value, 0)
+        self.assertEqual(path.read_text(), "There is a kitty.\nMeow.\n")
+        self.assertEqual(
+            phile.notify.expiry_storage.load(path), expires_at
+        )
+
+    def test_remove_removes_expiry_file(self) -> None:
+        with unittest.mock.patch("os.setxattr", side_effect=OSError):
+            self.test_write_keeps_expiry()
+        path = phile.notify.watchdog.get_path(
+            name="VeCat", configuration=self.configuration
+        )
+        sidecar_path = phile.notify.expiry_storage.get_sidecar_path(path)
+        self.assertTrue(sidecar_path.exists())
+        return_value = phile.notify.cli.process_arguments(
+            argument_namespace=argparse.Namespace(
+                command="remove", name="VeCat"
+            ),
+            configuration=self.configuration,
+        )
+        self.assertEqual(return_value, 0)
+        self.assertTrue(not sidecar_path.exists())
+
     def test_creates_notify_directory_if_missing(self) -> None:
         self.notify_directory_path.rmdir()
         argument_namespace = argparse.Namespace(command="list")
@@ -250,3 +566,117 @@ class TestProcessArguments(UsesConfiguration, unittest.TestCase):
         )
         self.assertEqual(return_value, 0)
         self.assertTrue(self.notify_directory_path.is_dir())
+
+
+class TestParseBatchLine(unittest.TestCase):
+    def test_returns_namespace_of_arguments(self) -> None:
+        argument_namespace = phile.notify.cli.parse_batch_line(
+            '{"command": "write", "name": "n", "content": "c"}'
+        )
+        self.assertEqual(
+            argument_namespace,
+            argparse.Namespace(command="write", name="n", content="c"),
+        )
+
+    def test_ignores_unused_arguments(self) -> None:
+        argument_namespace = phile.notify.cli.parse_batch_line(
+            '{"command": "list", "name": "n"}'
+        )
+        self.assertEqual(
+            argument_namespace, argparse.Namespace(command="list")
+        )
+
+    def test_raises_value_error_if_unusable(self) -> None:
+        for line in [
+            "{",
+            "[]",
+            "{}",
+            '{"command": "batch"}',
+            '{"command": "read"}',
+            '{"command": "read", "name": 1}',
+        ]:
+            with self.subTest(line=line):
+                with self.assertRaises(ValueError):
+                    phile.notify.cli.parse_batch_line(line)
+
+
+class TestProcessBatch(UsesConfiguration, unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.output_stream = io.StringIO()
+
+    def process(self, *lines: str) -> int:
+        return phile.notify.cli.process_arguments(
+            argument_namespace=argparse.Namespace(command="batch"),
+            configuration=self.configuration,
+            input_stream=io.StringIO(
+                "".join(line + "\n" for line in lines)
+            ),
+            output_stream=self.output_stream,
+        )
+
+    def get_results(self) -> list[dict[str, typing.Any]]:
+        return [
+            json.loads(line)
+            for line in self.output_stream.getvalue().splitlines()
+        ]
+
+    def test_processes_each_line(self) -> None:
+        return_value = self.process(
+            '{"command": "write", "name": "n", "content": "c"}',
+            '{"command": "append", "name": "n", "content": "d"}',
+            '{"command": "read", "name": "n"}',
+            '{"command": "list"}',
+            '{"command": "remove", "name": "n"}',
+        )
+        self.assertEqual(return_value, 0)
+        self.assertEqual(
+            self.get_results(),
+            [
+                {"status": 0, "output": ""},
+                {"status": 0, "output": ""},
+                {"status": 0, "output": "c\nd\n"},
+                {"status": 0, "output": "n\n"},
+                {"status": 0, "output": ""},
+            ],
+        )
+        self.assertTrue(
+            not phile.notify.watchdog.get_path(
+                name="n", configuration=self.configuration
+            ).exists()
+        )
+
+    def test_ignores_empty_lines(self) -> None:
+        self.assertEqual(self.process("", " "), 0)
+        self.assertEqual(self.get_results(), [])
+
+    def test_continues_after_failures(self) -> None:
+        return_value = self.process(
+            "{",
+            '{"command": "read", "name": "n"}',
+            '{"command": "write", "name": "n", "content": "c"}',
+        )
+        self.assertEqual(return_value, 1)
+        results = self.get_results()
+        self.assertEqual(results[0]["status"], 1)
+        self.assertIn("error", results[0])
+        self.assertEqual(results[1], {"status": 1, "output": ""})
+        self.assertEqual(results[2], {"status": 0, "output": ""})
+
+    def test_continues_after_exceptions(self) -> None:
+        return_value = self.process(
+            '{"command": "write", "name": "a", "content": "c"}',
+            '{"command": "write", "name": "no/such/dir", "content": "x"}',
+            '{"command": "write", "name": "b", "content": "c"}',
+        )
+        self.assertEqual(return_value, 1)
+        results = self.get_results()
+        self.assertEqual(results[0], {"status": 0, "output": ""})
+        self.assertEqual(results[1]["status"], 1)
+        self.assertIn("no/such/dir", results[1]["error"])
+        self.assertEqual(results[2], {"status": 0, "output": ""})
+        self.assertTrue(
+            phile.notify.watchdog.get_path(
+                name="b", configuration=self.configuration
+            ).exists()
+        )
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+# Standard library.
+import asyncio
+import datetime
+import typing
+import unittest
+import unittest.mock
+
+# Internal packages.
+import phile.asyncio
+import phile.notify
+import phile.notify.expiry
+
+
+class TestSchedule(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.schedule = phile.notify.expiry.Schedule()
+        self.now = datetime.datetime(2021, 2, 3, 4, 5, 6)
+
+    def test_next_expiry__is_none_if_empty(self) -> None:
+        self.assertEqual(len(self.schedule), 0)
+        self.assertIsNone(self.schedule.next_expiry())
+
+    def test_set__keeps_earliest_at_top(self) -> None:
+        later = self.now + datetime.timedelta(seconds=1)
+        self.schedule.set("b", later)
+        self.schedule.set("a", self.now)
+        self.assertEqual(len(self.schedule), 2)
+        self.assertEqual(self.schedule.next_expiry(), self.now)
+
+    def test_set__replaces_expiry(self) -> None:
+        later = self.now + datetime.timedelta(seconds=1)
+        self.schedule.set("a", self.now)
+        self.schedule.set("a", self.now)
+        self.schedule.set("a", later)
+        self.assertEqual(len(self.schedule), 1)
+        self.assertEqual(self.schedule.next_expiry(), later)
+
+    def test_set__with_none_discards(self) -> None:
+        self.schedule.set("a", self.now)
+        self.schedule.set("a", None)
+        self.assertEqual(len(self.schedule), 0)
+        self.assertIsNone(self.schedule.next_expiry())
+
+    def test_discard__ignores_unknown_name(self) -> None:
+        self.schedule.discard("a")
+        self.assertEqual(len(self.schedule), 0)
+
+    def test_pop_expired__returns_names_in_order(self) -> None:
+        later = self.now + datetime.timedelta(seconds=1)
+        self.schedule.set("c", later)
+        self.schedule.set("b", self.now)
+        self.schedule.set("a", self.now - datetime.timedelta(seconds=1))
+        self.assertEqual(self.schedule.pop_expired(self.now), ["a", "b"])
+        self.assertEqual(self.schedule.pop_expired(self.now), [])
+        self.assertEqual(self.schedule.next_expiry(), later)
+
+    def test_pop_expired__skips_replaced_expiry(self) -> None:
+        self.schedule.set("b", self.now + datetime.timedelta(seconds=2))
+        self.schedule.set("a", self.now)
+        self.schedule.set("a", self.now + datetime.timedelta(seconds=1))
+        self.assertEqual(self.schedule.pop_expired(self.now), [])
+        self.assertEqual(len(self.schedule), 2)
+
+    def test_heap_is_rebuilt_if_mostly_replaced(self) -> None:
+        for seconds in range(8):
+            self.schedule.set(
+                "a", self.now + datetime.timedelta(seconds=seconds)
+            )
+        self.assertEqual(
+            self.schedule.next_expiry(),
+            self.now + datetime.timedelta(seconds=7),
+        )
+
+
+class TestRun(unittest.IsolatedAsyncioTestCase):
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        self.notify_registry: phile.notify.Registry
+        self.target: unittest.mock.Mock
+        super().__init__(*args, **kwargs)
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.notify_registry = phile.notify.Registry()
+        self.addCleanup(self.notify_registry.close)
+        self.target = unittest.mock.Mock()
+
+    def start(self) -> asyncio.Task[None]:
+        task = asyncio.create_task(
+            phile.notify.expiry.run(
+                notify_registry=self.notify_registry, target=self.target
+            )
+        )
+        self.addAsyncCleanup(phile.asyncio.cancel_and_wait, task)
+        return task
+
+    async def wait_for_discard(self, name: str) -> None:
+        notify_view = self.notify_registry.event_queue.__aiter__()
+        while name in self.notify_registry.current_keys:
+            await phile.asyncio.wait_for(notify_view.__anext__())
+
+    async def test_returns_if_registry_closes(self) -> None:
+        task = self.start()
+        self.notify_registry.close()
+        await phile.asyncio.wait_for(task)
+
+    async def test_removes_existing_expired_entry(self) -> None:
+        self.notify_registry.add_entry(
+            phile.notify.Entry(
+                name="n", expires_at=datetime.datetime.now()
+            )
+        )
+        self.start()
+        await self.wait_for_discard("n")
+        self.target.pop.assert_called_once_with("n")
+
+    async def test_removes_entry_when_it_expires(self) -> None:
+        self.start()
+        await asyncio.sleep(0)
+        self.notify_registry.add_entry(
+            phile.notify.Entry(
+                name="n",
+                expires_at=(
+                    datetime.datetime.now()
+                    + datetime.timedelta(seconds=0.05)
+                ),
+            )
+        )
+        await self.wait_for_discard("n")
+        self.target.pop.assert_called_once_with("n")
+
+    async def test_removes_only_from_registry_without_target(
+        self,
+    ) -> None:
+        self.notify_registry.add_entry(
+            phile.notify.Entry(
+                name="n", expires_at=datetime.datetime.now()
+            )
+        )
+        self.addAsyncCleanup(
+            phile.asyncio.cancel_and_wait,
+            asyncio.create_task(
+                phile.notify.expiry.run(
+                    notify_registry=self.notify_registry
+                )
+            ),
+        )
+        await self.wait_for_discard("n")
+
+    async def test_keeps_entry_if_expiry_removed(self) -> None:
+        self.notify_registry.add_entry(
+            phile.notify.Entry(
+                name="n",
+                expires_at=(
+                    datetime.datetime.now()
+                    + datetime.timedelta(seconds=0.05)
+                ),
+            )
+        )
+        self.start()
+        await asyncio.sleep(0)
+        self.notify_registry.add_entry(phile.notify.Entry(name="n"))
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.notify_registry.current_keys, ["n"])
+        self.target.pop.assert_not_called()
+
+    async def test_ignores_discarded_entry(self) -> None:
+        self.notify_registry.add_entry(
+            phile.notify.Entry(
+                name="n",
+                expires_at=(
+                    datetime.datetime.now()
+                    + datetime.timedelta(seconds=0.05)
+                ),
+            )
+        )
+        self.start()
+        await asyncio.sleep(0)
+        self.notify_registry.discard("n")
+        await asyncio.sleep(0.1)
+        self.target.pop.assert_not_called()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+# Standard library.
+import datetime
+import logging
+import os
+import pathlib
+import tempfile
+import unittest
+import unittest.mock
+
+# Internal packages.
+import phile.notify.expiry_storage
+
+
+class TestExpiryStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory_path = pathlib.Path(directory.name)
+        self.path = self.directory_path / "n.notify"
+        self.path.write_text("t")
+        self.sidecar_path = phile.notify.expiry_storage.get_sidecar_path(
+            self.path
+        )
+        self.expires_at = datetime.datetime(2021, 2, 3, 4, 5, 6)
+
+    def test_get_sidecar_path__is_hidden_without_suffix(self) -> None:
+        self.assertEqual(
+            self.sidecar_path,
+            self.directory_path / ".n.notify.expires_at",
+        )
+
+    def test_load__returns_none_if_not_set(self) -> None:
+        self.assertIsNone(phile.notify.expiry_storage.load(self.path))
+
+    def test_save__round_trips(self) -> None:
+        phile.notify.expiry_storage.save(self.path, self.expires_at)
+        self.assertEqual(
+            os.getxattr(
+                self.path, phile.notify.expiry_storage.attribute_name
+            ),
+            self.expires_at.isoformat().encode(),
+        )
+        self.assertEqual(
+            phile.notify.expiry_storage.load(self.path), self.expires_at
+        )
+        self.assertTrue(not self.sidecar_path.exists())
+
+    def test_save__with_none_removes(self) -> None:
+        self.test_save__round_trips()
+        phile.notify.expiry_storage.save(self.path, None)
+        self.test_load__returns_none_if_not_set()
+        phile.notify.expiry_storage.save(self.path, None)
+        self.test_load__returns_none_if_not_set()
+
+    def test_save__sets_attribute_of_attribute_path(self) -> None:
+        attribute_path = self.directory_path / "temporary"
+        attribute_path.touch()
+        phile.notify.expiry_storage.save(
+            self.path, self.expires_at, attribute_path=attribute_path
+        )
+        self.assertEqual(
+            phile.notify.expiry_storage.load(attribute_path),
+            self.expires_at,
+        )
+        self.test_load__returns_none_if_not_set()
+
+    def test_save__uses_file_if_attributes_unsupported(self) -> None:
+        # Functions not defined on the platform raise `AttributeError`.
+        for error in [AttributeError, OSError]:
+            with self.subTest(error=error), unittest.mock.patch(
+                "os.getxattr", side_effect=error
+            ), unittest.mock.patch(
+                "os.removexattr", side_effect=error
+            ), unittest.mock.patch(
+                "os.setxattr", side_effect=error
+            ):
+                phile.notify.expiry_storage.save(
+                    self.path, self.expires_at
+                )
+                self.assertEqual(
+                    self.sidecar_path.read_text(),
+                    self.expires_at.isoformat(),
+                )
+                self.assertEqual(
+                    phile.notify.expiry_storage.load(self.path),
+                    self.expires_at,
+                )
+                phile.notify.expiry_storage.save(self.path, None)
+                self.assertTrue(not self.sidecar_path.exists())
+                self.test_load__returns_none_if_not_set()
+
+    def test_save__removes_file_if_attributes_supported(self) -> None:
+        with unittest.mock.patch("os.setxattr", side_effect=OSError):
+            phile.notify.expiry_storage.save(self.path, self.expires_at)
+        self.assertTrue(self.sidecar_path.exists())
+        self.test_save__round_trips()
+
+    def test_save__warns_if_unable_to_keep(self) -> None:
+        path = self.directory_path / "missing" / "n.notify"
+        with self.assertLogs(
+            logger="phile.notify.expiry_storage", level=logging.WARNING
+        ):
+            phile.notify.expiry_storage.save(path, self.expires_at)
+        self.assertIsNone(phile.notify.expiry_storage.load(path))
+
+    def test_load__converts_offsets_to_local_time(self) -> None:
+        expires_at = datetime.datetime(
+            2021, 2, 3, 4, 5, 6, tzinfo=datetime.timezone.utc
+        )
+        os.setxattr(
+            self.path,
+            phile.notify.expiry_storage.attribute_name,
+            expires_at.isoformat().encode(),
+        )
+        loaded_expires_at = phile.notify.expiry_storage.load(self.path)
+        assert loaded_expires_at is not None
+        self.assertIsNone(loaded_expires_at.tzinfo)
+        self.assertEqual(
+            loaded_expires_at,
+            expires_at.astimezone().replace(tzinfo=None),
+        )
+        # Usable with naive times, as in `phile.notify.expiry.run`.
+        self.assertLess(loaded_expires_at, datetime.datetime.max)
+
+    def test_load__warns_if_malformed(self) -> None:
+        for value in [b"never", b"\xff"]:
+            with self.subTest(value=value):
+                os.setxattr(
+                    self.path,
+                    phile.notify.expiry_storage.attribute_name,
+                    value,
+                )
+                with self.assertLogs(
+                    logger="phile.notify.expiry_storage",
+                    level=logging.WARNING,
+                ):
+                    self.test_load__returns_none_if_not_set()
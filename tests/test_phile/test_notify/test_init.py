@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 
 # Standard library.
+import asyncio
 import datetime
 import typing
 import unittest
+import unittest.mock
 
 # Internal packages.
+import phile.asyncio
+import phile.data
 import phile.notify
 
 
@@ -61,3 +65,184 @@ class TestRegistry(unittest.IsolatedAsyncioTestCase):
             self.notify_registry.current_values, [notify_entry]
         )
         self.test_invariants()
+
+    def test_add_entries__inserts_sorted(self) -> None:
+        entry_b = phile.notify.Entry(name="b", text="1")
+        entry_a = phile.notify.Entry(name="a", text="2")
+        self.notify_registry.add_entries([entry_b, entry_a])
+        self.assertEqual(
+            self.notify_registry.current_values, [entry_a, entry_b]
+        )
+        self.test_invariants()
+
+
+class TestThrottledRegistry(unittest.IsolatedAsyncioTestCase):
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        self.notify_registry: phile.notify.ThrottledRegistry
+        self.notify_view: phile.asyncio.pubsub.View[
+            phile.data.Event[str, phile.notify.Entry]
+        ]
+        super().__init__(*args, **kwargs)
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.notify_registry = phile.notify.ThrottledRegistry(
+            min_interval=datetime.timedelta(seconds=0.1)
+        )
+        self.notify_view = self.notify_registry.event_queue.__aiter__()
+
+    async def next_event(
+        self,
+    ) -> phile.data.Event[str, phile.notify.Entry]:
+        return await phile.asyncio.wait_for(self.notify_view.__anext__())
+
+    def test_default_min_interval(self) -> None:
+        self.assertEqual(
+            phile.notify.ThrottledRegistry().min_interval,
+            phile.notify.default_min_update_interval,
+        )
+
+    async def test_add_entry__inserts_new_entry_immediately(
+        self,
+    ) -> None:
+        notify_entry = phile.notify.Entry(name="n", text="a")
+        self.notify_registry.add_entry(notify_entry)
+        self.assertEqual(
+            self.notify_registry.current_values, [notify_entry]
+        )
+        notify_event = await self.next_event()
+        self.assertEqual(notify_event.type, phile.data.EventType.INSERT)
+
+    async def test_add_entry__sets_only_latest_change_after_interval(
+        self,
+    ) -> None:
+        await self.test_add_entry__inserts_new_entry_immediately()
+        self.notify_registry.add_entry(
+            phile.notify.Entry(name="n", text="b")
+        )
+        last_entry = phile.notify.Entry(name="n", text="c")
+        self.notify_registry.add_entry(last_entry)
+        self.assertEqual(
+            self.notify_registry.current_values[0].text, "a"
+        )
+        notify_event = await self.next_event()
+        self.assertEqual(notify_event.type, phile.data.EventType.SET)
+        self.assertEqual(notify_event.value, last_entry)
+        self.notify_registry.close()
+        with self.assertRaises(StopAsyncIteration):
+            await self.next_event()
+
+    async def test_add_entry__sets_immediately_after_interval(
+        self,
+    ) -> None:
+        self.notify_registry.min_interval = datetime.timedelta(0)
+        await self.test_add_entry__inserts_new_entry_immediately()
+        last_entry = phile.notify.Entry(name="n", text="b")
+        self.notify_registry.add_entry(last_entry)
+        self.assertEqual(
+            self.notify_registry.current_values, [last_entry]
+        )
+
+    async def test_add_entries__sets_due_entries_as_batch(
+        self,
+    ) -> None:
+        await self.test_add_entry__inserts_new_entry_immediately()
+        last_entry = phile.notify.Entry(name="n", text="b")
+        new_entry = phile.notify.Entry(name="m", text="c")
+        self.notify_registry.add_entries([last_entry, new_entry])
+        notify_event = await self.next_event()
+        self.assertEqual(notify_event.type, phile.data.EventType.INSERT)
+        self.assertEqual(notify_event.value, new_entry)
+        self.assertEqual(notify_event.current_keys, ["m", "n"])
+        self.assertEqual(
+            self.notify_registry.current_values[1].text, "a"
+        )
+        notify_event = await self.next_event()
+        self.assertEqual(notify_event.type, phile.data.EventType.SET)
+        self.assertEqual(notify_event.value, last_entry)
+
+    async def test_discard__drops_pending_change(self) -> None:
+        await self.test_add_entry__inserts_new_entry_immediately()
+        self.notify_registry.add_entry(
+            phile.notify.Entry(name="n", text="b")
+        )
+        self.notify_registry.discard("n")
+        notify_event = await self.next_event()
+        self.assertEqual(notify_event.type, phile.data.EventType.DISCARD)
+        await asyncio.sleep(0.2)
+        self.assertEqual(self.notify_registry.current_values, [])
+
+    async def test_discard__allows_inserting_again_immediately(
+        self,
+    ) -> None:
+        await self.test_add_entry__inserts_new_entry_immediately()
+        self.notify_registry.discard("n")
+        notify_entry = phile.notify.Entry(name="n", text="b")
+        self.notify_registry.add_entry(notify_entry)
+        self.assertEqual(
+            self.notify_registry.current_values, [notify_entry]
+        )
+
+    async def test_close__sets_pending_changes(self) -> None:
+        await self.test_add_entry__inserts_new_entry_immediately()
+        last_entry = phile.notify.Entry(name="n", text="b")
+        self.notify_registry.add_entry(last_entry)
+        self.notify_registry.close()
+        self.assertEqual(
+            self.notify_registry.current_values, [last_entry]
+        )
+        notify_event = await self.next_event()
+        self.assertEqual(notify_event.type, phile.data.EventType.SET)
+
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.text_cache = phile.notify.TextCache(max_size=4)
+
+    def test_default_max_size(self) -> None:
+        self.assertEqual(
+            phile.notify.TextCache().max_size,
+            phile.notify.default_text_cache_size,
+        )
+
+    def test_get__loads_if_missing(self) -> None:
+        self.assertEqual(self.text_cache.get("a", lambda: "ab"), "ab")
+        self.assertEqual(len(self.text_cache), 1)
+        self.assertEqual(self.text_cache.size, 2)
+
+    def test_get__returns_kept_text(self) -> None:
+        self.test_get__loads_if_missing()
+        load = unittest.mock.Mock(return_value="cd")
+        self.assertEqual(self.text_cache.get("a", load), "ab")
+        load.assert_not_called()
+
+    def test_get__drops_least_recently_used(self) -> None:
+        self.text_cache.get("a", lambda: "ab")
+        self.text_cache.get("b", lambda: "cd")
+        self.text_cache.get("a", lambda: "")
+        self.text_cache.get("c", lambda: "e")
+        self.assertEqual(len(self.text_cache), 2)
+        self.assertEqual(self.text_cache.size, 3)
+        self.assertEqual(self.text_cache.get("a", lambda: ""), "ab")
+        self.assertEqual(self.text_cache.get("b", lambda: "f"), "f")
+
+    def test_get__does_not_keep_text_larger_than_max(self) -> None:
+        self.assertEqual(
+            self.text_cache.get("a", lambda: "abcde"), "abcde"
+        )
+        self.assertEqual(len(self.text_cache), 0)
+        self.assertEqual(self.text_cache.size, 0)
+
+    def test_get__keeps_text_loaded_first_by_concurrent_get(
+        self,
+    ) -> None:
+        def load() -> str:
+            # Loaded by another thread while this one is loading.
+            self.text_cache.get("a", lambda: "ab")
+            return "cd"
+
+        self.assertEqual(self.text_cache.get("a", load), "cd")
+        self.assertEqual(len(self.text_cache), 1)
+        self.assertEqual(self.text_cache.size, 2)
+        self.assertEqual(self.text_cache.get("a", lambda: ""), "ab")
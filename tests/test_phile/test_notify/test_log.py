@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+
+# Standard libraries.
+import asyncio
+import datetime
+import fcntl
+import pathlib
+import stat
+import typing
+import unittest
+import unittest.mock
+
+# External dependencies.
+import watchdog.events
+
+# Internal dependencies.
+import phile.asyncio
+import phile.asyncio.pubsub
+import phile.data
+import phile.notify.log
+import phile.watchdog.asyncio
+from test_phile.test_configuration.test_init import UsesConfiguration
+
+
+class TestGetPath(UsesConfiguration, unittest.TestCase):
+    def test_returns_path_in_state_directory(self) -> None:
+        path = phile.notify.log.get_path(
+            configuration=self.configuration
+        )
+        self.assertIsInstance(path, pathlib.Path)
+        self.assertIn(
+            self.configuration.state_directory_path, path.parents
+        )
+
+
+class TestDumpRecord(unittest.TestCase):
+    def test_ends_with_newline(self) -> None:
+        line = phile.notify.log.dump_record(
+            "n", phile.notify.Entry(name="n", text="a\nb")
+        )
+        self.assertEqual(line.count(b"\n"), 1)
+        self.assertTrue(line.endswith(b"\n"))
+
+    def test_round_trips_entry(self) -> None:
+        entry = phile.notify.Entry(
+            name="n",
+            text="t",
+            modified_at=datetime.datetime(2021, 2, 3, 4, 5, 6),
+        )
+        self.assertEqual(
+            phile.notify.log.parse_record(
+                phile.notify.log.dump_record("n", entry)
+            ),
+            ("n", entry),
+        )
+
+    def test_round_trips_entry_with_expires_at(self) -> None:
+        entry = phile.notify.Entry(
+            name="n",
+            text="t",
+            expires_at=datetime.datetime(2021, 2, 3, 4, 5, 6),
+        )
+        self.assertEqual(
+            phile.notify.log.parse_record(
+                phile.notify.log.dump_record("n", entry)
+            ),
+            ("n", entry),
+        )
+
+    def test_round_trips_entry_without_modified_at(self) -> None:
+        entry = phile.notify.Entry(name="n", text="t")
+        self.assertEqual(
+            phile.notify.log.parse_record(
+                phile.notify.log.dump_record("n", entry)
+            ),
+            ("n", entry),
+        )
+
+    def test_round_trips_removal(self) -> None:
+        self.assertEqual(
+            phile.notify.log.parse_record(
+                phile.notify.log.dump_record("n", None)
+            ),
+            ("n", None),
+        )
+
+
+class TestParseRecord(unittest.TestCase):
+    def test_raises_value_error_if_malformed(self) -> None:
+        for line in [
+            b"{",
+            b"[]",
+            b"{}",
+            b'{"name": 1}',
+            b'{"name": "n", "text": "t", "modified_at": 1}',
+            b'{"name": "n", "text": "t", "modified_at": "never"}',
+        ]:
+            with self.subTest(line=line):
+                with self.assertRaises(ValueError):
+                    phile.notify.log.parse_record(line)
+
+
+class TestOpenLocked(UsesConfiguration, unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.path = self.state_directory_path / "l"
+        self.path.write_bytes(b"old\n")
+
+    def test_yields_locked_file(self) -> None:
+        with phile.notify.log.open_locked(self.path, "rb") as file:
+            self.assertEqual(file.read(), b"old\n")
+            with self.path.open("rb") as other_file:
+                with self.assertRaises(BlockingIOError):
+                    fcntl.flock(
+                        other_file.fileno(),
+                        fcntl.LOCK_EX | fcntl.LOCK_NB,
+                    )
+
+    def test_reopens_if_replaced_while_waiting(self) -> None:
+        flock = fcntl.flock
+        new_path = self.state_directory_path / "m"
+        new_path.write_bytes(b"new\n")
+
+        def replace_once(fd: int, operation: int) -> None:
+            if new_path.exists():
+                new_path.replace(self.path)
+            flock(fd, operation)
+
+        with unittest.mock.patch(
+            "fcntl.flock", side_effect=replace_once
+        ) as flock_mock:
+            with phile.notify.log.open_locked(self.path, "rb") as file:
+                self.assertEqual(file.read(), b"new\n")
+        self.assertEqual(flock_mock.call_count, 2)
+
+    def test_reopens_if_removed_while_waiting(self) -> None:
+        flock = fcntl.flock
+
+        def remove_once(fd: int, operation: int) -> None:
+            if self.path.read_bytes():
+                self.path.unlink()
+            flock(fd, operation)
+
+        with unittest.mock.patch("fcntl.flock", side_effect=remove_once):
+            with phile.notify.log.open_locked(self.path, "ab") as file:
+                file.write(b"new\n")
+        self.assertEqual(self.path.read_bytes(), b"new\n")
+
+
+class TestAppend(UsesConfiguration, unittest.TestCase):
+    def test_creates_parent_directories(self) -> None:
+        path = self.state_directory_path / "d" / "l"
+        phile.notify.log.append(path, [("n", None)])
+        self.assertEqual(
+            path.read_bytes(), phile.notify.log.dump_record("n", None)
+        )
+
+    def test_appends_records(self) -> None:
+        path = self.state_directory_path / "l"
+        entry = phile.notify.Entry(name="n", text="t")
+        phile.notify.log.append(path, [("n", entry)])
+        phile.notify.log.append(path, [("m", None), ("n", None)])
+        self.assertEqual(
+            path.read_bytes(),
+            phile.notify.log.dump_record("n", entry)
+            + phile.notify.log.dump_record("m", None)
+            + phile.notify.log.dump_record("n", None),
+        )
+
+
+class TestLog(UsesConfiguration, unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.path = self.state_directory_path / "l"
+        self.log = phile.notify.log.Log(
+            path=self.path, compaction_threshold=4
+        )
+        self.entry = phile.notify.Entry(name="n", text="t")
+        self.entry_2 = phile.notify.Entry(name="m", text="s")
+
+    def test_read__returns_nothing_if_missing(self) -> None:
+        self.assertEqual(self.log.read(), {})
+
+    def test_read__returns_appended_changes(self) -> None:
+        phile.notify.log.append(
+            self.path, [("n", self.entry), ("m", self.entry_2)]
+        )
+        self.assertEqual(
+            self.log.read(), {"n": self.entry, "m": self.entry_2}
+        )
+        self.assertEqual(
+            self.log.entries, {"n": self.entry, "m": self.entry_2}
+        )
+        self.assertEqual(self.log.record_count, 2)
+
+    def test_read__returns_only_new_changes(self) -> None:
+        self.test_read__returns_appended_changes()
+        phile.notify.log.append(self.path, [("n", None)])
+        self.assertEqual(self.log.read(), {"n": None})
+        self.assertEqual(self.log.entries, {"m": self.entry_2})
+        self.assertEqual(self.log.record_count, 3)
+        self.assertEqual(self.log.read(), {})
+
+    def test_read__leaves_incomplete_line(self) -> None:
+        line = phile.notify.log.dump_record("n", self.entry)
+        with self.path.open("ab") as file:
+            file.write(line[:-2])
+        self.assertEqual(self.log.read(), {})
+        with self.path.open("ab") as file:
+            file.write(line[-2:])
+        self.assertEqual(self.log.read(), {"n": self.entry})
+
+    def test_read__ignores_malformed_records(self) -> None:
+        with self.path.open("ab") as file:
+            file.write(b"{\n")
+        phile.notify.log.append(self.path, [("n", self.entry)])
+        with self.assertLogs(logger="phile.notify.log", level="WARNING"):
+            self.assertEqual(self.log.read(), {"n": self.entry})
+        self.assertEqual(self.log.record_count, 1)
+
+    def test_read__reads_again_if_replaced(self) -> None:
+        self.test_read__returns_appended_changes()
+        new_path = self.state_directory_path / "r"
+        phile.notify.log.append(new_path, [("m", self.entry_2)])
+        new_path.replace(self.path)
+        self.assertEqual(self.log.read(), {"n": None, "m": self.entry_2})
+        self.assertEqual(self.log.entries, {"m": self.entry_2})
+        self.assertEqual(self.log.record_count, 1)
+
+    def test_read__reads_again_if_truncated(self) -> None:
+        self.test_read__returns_appended_changes()
+        with self.path.open("wb") as file:
+            file.write(phile.notify.log.dump_record("n", self.entry))
+        self.assertEqual(self.log.read(), {"n": self.entry, "m": None})
+
+    def test_read__removes_entries_if_log_removed(self) -> None:
+        self.test_read__returns_appended_changes()
+        self.path.unlink()
+        self.assertEqual(self.log.read(), {"n": None, "m": None})
+        self.assertEqual(self.log.entries, {})
+        self.assertEqual(self.log.record_count, 0)
+
+    def test_needs_compaction__if_mostly_superseded(self) -> None:
+        phile.notify.log.append(self.path, [("n", self.entry)] * 3)
+        self.log.read()
+        self.assertFalse(self.log.needs_compaction())
+        phile.notify.log.append(self.path, [("n", self.entry)])
+        self.log.read()
+        self.assertTrue(self.log.needs_compaction())
+
+    def test_needs_compaction__not_if_mostly_current(self) -> None:
+        phile.notify.log.append(
+            self.path,
+            [
+                (name, phile.notify.Entry(name=name))
+                for name in ["a", "b", "c", "d"]
+            ],
+        )
+        self.log.read()
+        self.assertFalse(self.log.needs_compaction())
+
+    def test_compact__keeps_only_current_entries(self) -> None:
+        phile.notify.log.append(
+            self.path,
+            [("n", self.entry), ("m", self.entry_2), ("m", None)],
+        )
+        self.log.read()
+        entry = phile.notify.Entry(name="n", text="s")
+        phile.notify.log.append(self.path, [("n", entry)])
+        self.assertEqual(self.log.compact(), {"n": entry})
+        self.assertEqual(
+            self.path.read_bytes(),
+            phile.notify.log.dump_record("n", entry),
+        )
+        self.assertEqual(self.log.record_count, 1)
+        self.assertEqual(self.log.read(), {})
+        self.assertEqual(
+            list(self.state_directory_path.iterdir()), [self.path]
+        )
+
+    def test_compact__continues_reading_from_compacted_log(self) -> None:
+        self.test_compact__keeps_only_current_entries()
+        phile.notify.log.append(self.path, [("m", self.entry_2)])
+        self.assertEqual(self.log.read(), {"m": self.entry_2})
+        self.assertEqual(self.log.record_count, 2)
+
+    def test_compact__removes_entries_if_log_removed(self) -> None:
+        self.test_read__returns_appended_changes()
+        self.path.unlink()
+        self.assertEqual(self.log.compact(), {"n": None, "m": None})
+
+    def test_compact__keeps_file_mode(self) -> None:
+        phile.notify.log.append(self.path, [("n", self.entry)])
+        self.path.chmod(0o644)
+        self.log.compact()
+        self.assertEqual(stat.S_IMODE(self.path.stat().st_mode), 0o644)
+
+    def test_compact__removes_temporary_file_on_error(self) -> None:
+        phile.notify.log.append(self.path, [("n", self.entry)])
+        with unittest.mock.patch("os.replace", side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.log.compact()
+        self.assertEqual(
+            list(self.state_directory_path.iterdir()), [self.path]
+        )
+
+
+class TestTarget(UsesConfiguration, unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.target = phile.notify.log.Target(
+            configuration=self.configuration
+        )
+        self.log = phile.notify.log.Log(
+            path=phile.notify.log.get_path(
+                configuration=self.configuration
+            )
+        )
+        self.notify_entry = phile.notify.Entry(name="n", text="t")
+
+    def test_set__appends_entry(self) -> None:
+        self.target.set(entry=self.notify_entry)
+        self.assertEqual(self.log.read(), {"n": self.notify_entry})
+
+    def test_pop__appends_removal(self) -> None:
+        self.target.set(entry=self.notify_entry)
+        self.target.pop(name=self.notify_entry.name)
+        self.log.read()
+        self.assertEqual(self.log.entries, {})
+
+    def test_close__pops_any_entries_set(self) -> None:
+        self.target.set(entry=self.notify_entry)
+        self.target.set(entry=phile.notify.Entry(name="m"))
+        self.target.close()
+        self.log.read()
+        self.assertEqual(self.log.entries, {})
+
+    def test_close__ignores_if_no_entries_set(self) -> None:
+        self.target.close()
+        self.assertEqual(self.log.read(), {})
+        self.assertTrue(not self.log.path.exists())
+
+
+class TestProcessWatchdogView(
+    UsesConfiguration, unittest.IsolatedAsyncioTestCase
+):
+    def setUp(self) -> None:
+        super().setUp()
+        self.path = phile.notify.log.get_path(
+            configuration=self.configuration
+        )
+        self.log = phile.notify.log.Log(
+            path=self.path, compaction_threshold=2
+        )
+        self.notify_entry = phile.notify.Entry(name="n", text="c")
+        self.notify_registry = phile.notify.Registry()
+        self.notify_view = self.notify_registry.event_queue.__aiter__()
+        self.ready = asyncio.Event()
+        self.watchdog_queue = phile.asyncio.pubsub.Queue[
+            watchdog.events.FileSystemEvent
+        ]()
+        self.watchdog_view = self.watchdog_queue.__aiter__()
+        self.worker_task: typing.Optional[asyncio.Task[None]] = None
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.worker_task = asyncio.create_task(
+            phile.notify.log.process_watchdog_view(
+                log=self.log,
+                notify_registry=self.notify_registry,
+                ready=self.ready,
+                watchdog_view=self.watchdog_view,
+            )
+        )
+        self.addAsyncCleanup(
+            phile.asyncio.cancel_and_wait, self.worker_task
+        )
+
+    async def append(
+        self,
+        records: list[tuple[str, typing.Optional[phile.notify.Entry]]],
+    ) -> None:
+        phile.notify.log.append(self.path, records)
+        self.watchdog_queue.put(
+            watchdog.events.FileModifiedEvent(str(self.path))
+        )
+
+    async def test_gracefully_stop_if_watchdog_queue_done(self) -> None:
+        assert self.worker_task is not None
+        await phile.asyncio.wait_for(self.ready.wait())
+        await self.append([("n", self.notify_entry)])
+        self.watchdog_queue.put_done()
+        await phile.asyncio.wait_for(self.worker_task)
+        # Discards added entries on exit.
+        self.assertEqual(self.notify_registry.current_keys, [])
+
+    async def test_applies_appended_records(self) -> None:
+        await phile.asyncio.wait_for(self.ready.wait())
+        await self.append([("n", self.notify_entry)])
+        notify_event = await phile.asyncio.wait_for(
+            self.notify_view.__anext__()
+        )
+        self.assertEqual(notify_event.type, phile.data.EventType.INSERT)
+        self.assertEqual(notify_event.value, self.notify_entry)
+        await self.append([("n", None)])
+        notify_event = await phile.asyncio.wait_for(
+            self.notify_view.__anext__()
+        )
+        self.assertEqual(notify_event.type, phile.data.EventType.DISCARD)
+        self.assertEqual(notify_event.key, "n")
+
+    async def test_compacts_log_if_needed(self) -> None:
+        await phile.asyncio.wait_for(self.ready.wait())
+        await self.append(
+            [
+                ("m", self.notify_entry),
+                ("m", None),
+                ("n", self.notify_entry),
+            ]
+        )
+        await phile.asyncio.wait_for(self.notify_view.__anext__())
+        self.assertEqual(
+            self.path.read_bytes(),
+            phile.notify.log.dump_record("n", self.notify_entry),
+        )
+
+
+class TestProcessWatchdogViewExisting(
+    UsesConfiguration, unittest.IsolatedAsyncioTestCase
+):
+    async def test_loads_existing_records(self) -> None:
+        notify_entry = phile.notify.Entry(name="n", text="c")
+        path = phile.notify.log.get_path(
+            configuration=self.configuration
+        )
+        phile.notify.log.append(path, [("n", notify_entry)])
+        notify_registry = phile.notify.Registry()
+        ready = asyncio.Event()
+        watchdog_queue = phile.asyncio.pubsub.Queue[
+            watchdog.events.FileSystemEvent
+        ]()
+        worker_task = asyncio.create_task(
+            phile.notify.log.process_watchdog_view(
+                log=phile.notify.log.Log(path=path),
+                notify_registry=notify_registry,
+                ready=ready,
+                watchdog_view=watchdog_queue.__aiter__(),
+            )
+        )
+        await phile.asyncio.wait_for(ready.wait())
+        self.assertEqual(notify_registry.current_values, [notify_entry])
+        watchdog_queue.put_done()
+        await phile.asyncio.wait_for(worker_task)
+
+
+class TestAsyncOpen(UsesConfiguration, unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.observer = phile.watchdog.asyncio.Observer()
+        self.notify_registry = phile.notify.Registry()
+
+    async def test_target_changes_registry(self) -> None:
+        async_cm = phile.notify.log.async_open(
+            configuration=self.configuration,
+            notify_registry=self.notify_registry,
+            observer=self.observer,
+        )
+        # Pylint does not know it is an async CM?
+        notify_target = await phile.asyncio.wait_for(
+            async_cm.__aenter__()  # pylint: disable=no-member
+        )
+        self.addAsyncCleanup(
+            phile.asyncio.wait_for,
+            async_cm.__aexit__(  # pylint: disable=no-member
+                None,
+                None,
+                None,
+            ),
+        )
+        self.assertIsInstance(notify_target, phile.notify.log.Target)
+        notify_view = self.notify_registry.event_queue.__aiter__()
+        notify_entry = phile.notify.Entry(name="n", text="c")
+        notify_target.set(notify_entry)
+        notify_event = await phile.asyncio.wait_for(
+            notify_view.__anext__()
+        )
+        self.assertEqual(notify_event.value, notify_entry)
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+
+# Standard library.
+import asyncio
+import json
+import logging
+import os
+import pathlib
+import tempfile
+import threading
+import typing
+import unittest
+import unittest.mock
+
+# Internal packages.
+import phile.asyncio
+import phile.notify
+import phile.notify.search
+
+
+class TestGetTerms(unittest.TestCase):
+    def test_returns_lowercase_words(self) -> None:
+        self.assertEqual(
+            phile.notify.search.get_terms("Build #12 finished, build!"),
+            {"build", "12", "finished"},
+        )
+
+
+class TestIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.index = phile.notify.search.Index()
+
+    def test_set__indexes_name_and_text(self) -> None:
+        self.index.set("build", "Tests passed")
+        self.assertIn("build", self.index)
+        self.assertEqual(len(self.index), 1)
+        self.assertEqual(
+            self.index.get_entry_terms("build"),
+            {"build", "tests", "passed"},
+        )
+        self.assertEqual(self.index.search("build"), ["build"])
+        self.assertEqual(self.index.search("PASSED"), ["build"])
+
+    def test_set__replaces_terms(self) -> None:
+        self.index.set("build", "Tests passed")
+        self.index.set("build", "Tests failed")
+        self.assertEqual(self.index.search("passed"), [])
+        self.assertEqual(self.index.search("failed"), ["build"])
+        self.assertEqual(self.index.search("tests"), ["build"])
+
+    def test_set__keeps_terms_of_other_entries(self) -> None:
+        self.index.set("a", "shared")
+        self.index.set("b", "shared")
+        self.index.set("a", "other")
+        self.assertEqual(self.index.search("shared"), ["b"])
+
+    def test_discard__removes_terms(self) -> None:
+        self.index.set("build", "Tests passed")
+        self.index.discard("build")
+        self.index.discard("unknown")
+        self.assertNotIn("build", self.index)
+        self.assertEqual(self.index.get_entry_terms("build"), set())
+        self.assertEqual(self.index.search("tests"), [])
+        self.assertEqual(self.index.search("test*"), [])
+
+    def test_search__matches_prefixes(self) -> None:
+        self.index.set("a", "kitten")
+        self.index.set("b", "kitty")
+        self.index.set("c", "kite")
+        self.index.set("d", "puppy")
+        self.assertEqual(self.index.search("kitt*"), ["a", "b"])
+        self.assertEqual(self.index.search("zebra*"), [])
+
+    def test_search__updates_prefixes_after_changes(self) -> None:
+        self.test_search__matches_prefixes()
+        self.index.set("e", "kittens")
+        self.assertEqual(self.index.search("kitt*"), ["a", "b", "e"])
+
+    def test_search__requires_every_word(self) -> None:
+        self.index.set("a", "red kitty")
+        self.index.set("b", "blue kitty")
+        self.assertEqual(self.index.search("kitty red"), ["a"])
+        self.assertEqual(self.index.search("green kitty"), [])
+
+    def test_search__without_words_matches_nothing(self) -> None:
+        self.index.set("a", "kitty")
+        self.assertEqual(self.index.search(" ! "), [])
+
+
+class TestRun(unittest.IsolatedAsyncioTestCase):
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        self.notify_registry: phile.notify.Registry
+        self.index: phile.notify.search.Index
+        super().__init__(*args, **kwargs)
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.notify_registry = phile.notify.Registry()
+        self.addCleanup(self.notify_registry.close)
+        self.index = phile.notify.search.Index()
+
+    async def test_returns_if_registry_closes(self) -> None:
+        self.notify_registry.add_entry(
+            phile.notify.Entry(name="a", text="kitty")
+        )
+        task = asyncio.create_task(
+            phile.notify.search.run(
+                notify_registry=self.notify_registry, index=self.index
+            )
+        )
+        await asyncio.sleep(0)
+        self.assertEqual(self.index.search("kitty"), ["a"])
+        self.notify_registry.close()
+        await phile.asyncio.wait_for(task)
+
+    async def test_follows_registry_events(self) -> None:
+        task = asyncio.create_task(
+            phile.notify.search.run(
+                notify_registry=self.notify_registry, index=self.index
+            )
+        )
+        await asyncio.sleep(0)
+        self.notify_registry.add_entry(
+            phile.notify.Entry(name="a", text="kitty")
+        )
+        self.notify_registry.add_entry(
+            phile.notify.Entry(name="b", text="puppy")
+        )
+        self.notify_registry.add_entry(
+            phile.notify.Entry(name="a", text="kitten")
+        )
+        self.notify_registry.discard("b")
+        self.notify_registry.close()
+        await phile.asyncio.wait_for(task)
+        self.assertEqual(self.index.search("kit*"), ["a"])
+        self.assertEqual(self.index.search("kitty"), [])
+        self.assertNotIn("b", self.index)
+
+    async def test_reads_text_of_subclass_entries_in_thread(
+        self,
+    ) -> None:
+        main_thread = threading.get_ident()
+        reading_threads: list[int] = []
+
+        class ThreadedEntry(phile.notify.Entry):
+            @property  # type: ignore[override]
+            def text(self) -> str:  # type: ignore[override]
+                reading_threads.append(threading.get_ident())
+                return "kitty"
+
+            @text.setter
+            def text(self, text: str) -> None:
+                del text
+
+        self.notify_registry.add_entry(ThreadedEntry(name="a"))
+        task = asyncio.create_task(
+            phile.notify.search.run(
+                notify_registry=self.notify_registry, index=self.index
+            )
+        )
+        await asyncio.sleep(0)
+        self.notify_registry.add_entry(ThreadedEntry(name="b"))
+        self.notify_registry.close()
+        await phile.asyncio.wait_for(task)
+        self.assertEqual(self.index.search("kitty"), ["a", "b"])
+        self.assertEqual(len(reading_threads), 2)
+        self.assertNotIn(main_thread, reading_threads)
+
+
+class TestLoadDirectory(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory_path = pathlib.Path(directory.name)
+        self.notify_directory = self.directory_path / "notify"
+        self.notify_directory.mkdir()
+        self.cache_path = self.directory_path / "cache.json"
+
+    def load_directory(self) -> phile.notify.search.Index:
+        return phile.notify.search.load_directory(
+            cache_path=self.cache_path,
+            directory=self.notify_directory,
+            suffix=".notify",
+        )
+
+    def test_returns_empty_if_directory_missing(self) -> None:
+        self.notify_directory.rmdir()
+        self.assertEqual(len(self.load_directory()), 0)
+
+    def test_indexes_files_with_suffix(self) -> None:
+        (self.notify_directory / "a.notify").write_text("kitty")
+        (self.notify_directory / "b.other").write_text("kitty")
+        (self.notify_directory / "c.notify").mkdir()
+        index = self.load_directory()
+        self.assertEqual(index.search("kitty"), ["a"])
+        self.assertNotIn("c", index)
+
+    def test_reads_only_changed_files(self) -> None:
+        self.test_indexes_files_with_suffix()
+        (self.notify_directory / "d.notify").write_text("puppy")
+        read_text = pathlib.Path.read_text
+        read_paths: list[str] = []
+
+        def record_read_text(path: pathlib.Path) -> str:
+            read_paths.append(path.name)
+            return read_text(path)
+
+        with unittest.mock.patch.object(
+            pathlib.Path, "read_text", autospec=True
+        ) as read_text_mock:
+            read_text_mock.side_effect = record_read_text
+            index = self.load_directory()
+        # The cache is read too.
+        self.assertEqual(sorted(read_paths), ["cache.json", "d.notify"])
+        self.assertEqual(index.search("kitty"), ["a"])
+        self.assertEqual(index.search("puppy"), ["d"])
+
+    def test_drops_removed_files_from_cache(self) -> None:
+        self.test_indexes_files_with_suffix()
+        (self.notify_directory / "a.notify").unlink()
+        self.assertEqual(len(self.load_directory()), 0)
+        self.assertEqual(json.loads(self.cache_path.read_text()), {})
+
+    def test_ignores_files_removed_before_reading(self) -> None:
+        (self.notify_directory / "a.notify").write_text("kitty")
+        with unittest.mock.patch.object(
+            pathlib.Path, "read_text", side_effect=FileNotFoundError
+        ):
+            index = self.load_directory()
+        self.assertEqual(len(index), 0)
+
+    def test_ignores_broken_links(self) -> None:
+        (self.notify_directory / "a.notify").symlink_to(
+            self.notify_directory / "missing"
+        )
+        self.assertEqual(len(self.load_directory()), 0)
+
+    def test_ignores_malformed_cache(self) -> None:
+        (self.notify_directory / "a.notify").write_text("kitty")
+        for cache_text in ["not json", "[]"]:
+            self.cache_path.write_text(cache_text)
+            with self.assertLogs(
+                logger="phile.notify.search", level=logging.WARNING
+            ):
+                index = self.load_directory()
+            self.assertEqual(index.search("kitty"), ["a"])
+
+    def test_ignores_malformed_cache_entries(self) -> None:
+        path = self.notify_directory / "a.notify"
+        path.write_text("kitty")
+        path_stat = os.stat(path)
+        signature = [path_stat.st_mtime_ns, path_stat.st_size]
+        for cached in [
+            "a",
+            {"signature": signature, "terms": "puppy"},
+            {"signature": [0, 0], "terms": ["puppy"]},
+        ]:
+            self.cache_path.write_text(json.dumps({"a": cached}))
+            self.assertEqual(
+                self.load_directory().search("kitty"), ["a"]
+            )
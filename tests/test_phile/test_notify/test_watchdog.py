@@ -5,9 +5,11 @@ import asyncio
 import contextlib
 import collections.abc
 import datetime
+import os
 import pathlib
 import typing
 import unittest
+import unittest.mock
 
 # External dependencies.
 import watchdog.events
@@ -16,6 +18,7 @@ import watchdog.events
 import phile.asyncio
 import phile.asyncio.pubsub
 import phile.data
+import phile.notify.expiry_storage
 import phile.notify.watchdog
 import phile.watchdog.asyncio
 from test_phile.test_configuration.test_init import UsesConfiguration
@@ -142,6 +145,230 @@ class TestLoadFromPath(UsesConfiguration, unittest.TestCase):
         )
 
 
+class TestLazyEntry(UsesConfiguration, unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.path = self.state_directory_path / "n.notify"
+        self.path.write_text("t")
+        self.path_stat = self.path.stat()
+        self.text_cache = phile.notify.TextCache()
+        self.entry = self.create_entry()
+
+    def create_entry(self) -> phile.notify.watchdog.LazyEntry:
+        return phile.notify.watchdog.LazyEntry(
+            name="n",
+            path=self.path,
+            size=1,
+            inode=self.path_stat.st_ino,
+            modified_at_ns=self.path_stat.st_mtime_ns,
+            text_cache=self.text_cache,
+        )
+
+    def test_text__is_read_when_used(self) -> None:
+        self.assertEqual(len(self.text_cache), 0)
+        self.assertEqual(self.entry.text, "t")
+        self.assertEqual(len(self.text_cache), 1)
+
+    def test_text__is_read_from_cache(self) -> None:
+        self.assertEqual(self.entry.text, "t")
+        self.path.write_text("s")
+        self.assertEqual(self.create_entry().text, "t")
+
+    def test_text__is_empty_if_file_missing(self) -> None:
+        self.path.unlink()
+        self.assertEqual(self.entry.text, "")
+        self.assertEqual(len(self.text_cache), 0)
+
+    def test_text__keeps_assigned_text(self) -> None:
+        self.entry.text += "u"
+        self.path.unlink()
+        self.assertEqual(self.entry.text, "tu")
+
+    def test_eq__compares_metadata(self) -> None:
+        self.assertEqual(self.entry, self.create_entry())
+        for attribute_name in ["size", "inode", "modified_at_ns"]:
+            with self.subTest(attribute_name=attribute_name):
+                other_entry = self.create_entry()
+                setattr(
+                    other_entry,
+                    attribute_name,
+                    getattr(other_entry, attribute_name) + 1,
+                )
+                self.assertNotEqual(self.entry, other_entry)
+
+    def test_eq__compares_assigned_text(self) -> None:
+        other_entry = self.create_entry()
+        other_entry.text = "t"
+        self.assertNotEqual(self.entry, other_entry)
+
+    def test_eq__differs_from_entry(self) -> None:
+        self.assertNotEqual(
+            self.entry, phile.notify.Entry(name="n", text="t")
+        )
+
+    def test_repr__does_not_read_text(self) -> None:
+        self.assertIn("n.notify", repr(self.entry))
+        self.assertEqual(len(self.text_cache), 0)
+
+
+class TestLoadMetadataFromPath(UsesConfiguration, unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.notify_directory = phile.notify.watchdog.get_directory(
+            configuration=self.configuration
+        )
+        self.notify_directory.mkdir()
+        self.notify_path = phile.notify.watchdog.get_path(
+            name="n", configuration=self.configuration
+        )
+        self.text_cache = phile.notify.TextCache()
+
+    def test_reads_only_metadata(self) -> None:
+        with mark_time_interval() as created_between:
+            self.notify_path.write_text("t")
+        notify_entry = phile.notify.watchdog.load_metadata_from_path(
+            path=self.notify_path,
+            configuration=self.configuration,
+            text_cache=self.text_cache,
+        )
+        self.assertEqual(notify_entry.size, 1)
+        self.assertEqual(len(self.text_cache), 0)
+        assert_entry_is(
+            test_case=self,
+            entry=notify_entry,
+            target_entry=phile.notify.Entry(name="n", text="t"),
+            modified_interval=created_between,
+        )
+
+    def test_rereads_replaced_file_of_same_time_and_size(self) -> None:
+        self.notify_path.write_text("old")
+        path_stat = self.notify_path.stat()
+        old_entry = phile.notify.watchdog.load_metadata_from_path(
+            path=self.notify_path,
+            configuration=self.configuration,
+            text_cache=self.text_cache,
+        )
+        self.assertEqual(old_entry.text, "old")
+        new_path = self.notify_directory / ".new"
+        new_path.write_text("new")
+        os.utime(
+            new_path, ns=(path_stat.st_atime_ns, path_stat.st_mtime_ns)
+        )
+        os.replace(new_path, self.notify_path)
+        new_entry = phile.notify.watchdog.load_metadata_from_path(
+            path=self.notify_path,
+            configuration=self.configuration,
+            text_cache=self.text_cache,
+        )
+        self.assertNotEqual(new_entry, old_entry)
+        self.assertEqual(new_entry.text, "new")
+
+    def test_raises_if_directory(self) -> None:
+        self.notify_path.mkdir()
+        with self.assertRaises(IsADirectoryError):
+            phile.notify.watchdog.load_metadata_from_path(
+                path=self.notify_path,
+                configuration=self.configuration,
+                text_cache=self.text_cache,
+            )
+
+
+class TestLoadExisting(UsesConfiguration, unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.notify_directory = phile.notify.watchdog.get_directory(
+            configuration=self.configuration
+        )
+        self.notify_directory.mkdir()
+        self.notify_entry = phile.notify.Entry(name="n", text="c")
+        self.notify_path = phile.notify.watchdog.get_path(
+            name=self.notify_entry.name,
+            configuration=self.configuration,
+        )
+
+    def test_returns_empty_if_directory_missing(self) -> None:
+        self.notify_directory.rmdir()
+        self.assertEqual(
+            phile.notify.watchdog.load_existing(
+                configuration=self.configuration
+            ),
+            {},
+        )
+
+    def test_loads_entries_by_path(self) -> None:
+        with mark_time_interval() as created_between:
+            phile.notify.watchdog.save(
+                entry=self.notify_entry, configuration=self.configuration
+            )
+        entries = phile.notify.watchdog.load_existing(
+            configuration=self.configuration, max_workers=1
+        )
+        self.assertEqual(list(entries), [self.notify_path])
+        self.assertIsNone(entries[self.notify_path].expires_at)
+        assert_entry_is(
+            test_case=self,
+            entry=entries[self.notify_path],
+            target_entry=self.notify_entry,
+            modified_interval=created_between,
+        )
+
+    def test_loads_expiry(self) -> None:
+        self.notify_entry.expires_at = datetime.datetime(2021, 2, 3)
+        phile.notify.watchdog.save(
+            entry=self.notify_entry, configuration=self.configuration
+        )
+        for text_cache in [None, phile.notify.TextCache()]:
+            entries = phile.notify.watchdog.load_existing(
+                configuration=self.configuration, text_cache=text_cache
+            )
+            self.assertEqual(
+                entries[self.notify_path].expires_at,
+                self.notify_entry.expires_at,
+            )
+
+    def test_loads_only_metadata_if_given_text_cache(self) -> None:
+        phile.notify.watchdog.save(
+            entry=self.notify_entry, configuration=self.configuration
+        )
+        text_cache = phile.notify.TextCache()
+        entries = phile.notify.watchdog.load_existing(
+            configuration=self.configuration, text_cache=text_cache
+        )
+        entry = entries[self.notify_path]
+        self.assertIsInstance(entry, phile.notify.watchdog.LazyEntry)
+        self.assertEqual(len(text_cache), 0)
+        self.assertEqual(entry.text, self.notify_entry.text)
+
+    def test_ignores_other_suffixes_directories_and_broken_links(
+        self,
+    ) -> None:
+        (self.notify_directory / "a.other").write_text("a")
+        phile.notify.watchdog.get_path(
+            name="b", configuration=self.configuration
+        ).mkdir()
+        phile.notify.watchdog.get_path(
+            name="c", configuration=self.configuration
+        ).symlink_to(self.notify_directory / "missing")
+        self.assertEqual(
+            phile.notify.watchdog.load_existing(
+                configuration=self.configuration
+            ),
+            {},
+        )
+
+    def test_ignores_files_removed_before_reading(self) -> None:
+        phile.notify.watchdog.save(
+            entry=self.notify_entry, configuration=self.configuration
+        )
+        with unittest.mock.patch.object(
+            pathlib.Path, "read_text", side_effect=FileNotFoundError
+        ):
+            entries = phile.notify.watchdog.load_existing(
+                configuration=self.configuration
+            )
+        self.assertEqual(entries, {})
+
+
 class TestLoad(UsesConfiguration, unittest.TestCase):
     def test_reads_from_given_path(self) -> None:
         notify_entry = phile.notify.Entry(name="n", text="t")
@@ -181,6 +408,47 @@ class TestSave(UsesConfiguration, unittest.TestCase):
         notify_text = notify_path.read_text()
         self.assertEqual(notify_text, notify_entry.text)
 
+    def test_keeps_expiry(self) -> None:
+        notify_entry = phile.notify.Entry(
+            name="n",
+            text="t",
+            expires_at=datetime.datetime(2021, 2, 3, 4, 5, 6),
+        )
+        phile.notify.watchdog.save(
+            entry=notify_entry, configuration=self.configuration
+        )
+        self.assertEqual(
+            phile.notify.watchdog.load(
+                name=notify_entry.name, configuration=self.configuration
+            ).expires_at,
+            notify_entry.expires_at,
+        )
+
+    def test_sets_expiry_before_replacing(self) -> None:
+        notify_entry = phile.notify.Entry(
+            name="n",
+            text="t",
+            expires_at=datetime.datetime(2021, 2, 3, 4, 5, 6),
+        )
+        replace = os.replace
+        expiries: list[typing.Optional[datetime.datetime]] = []
+
+        def record_replace(
+            source: pathlib.Path, target: pathlib.Path
+        ) -> None:
+            expiries.append(phile.notify.expiry_storage.load(source))
+            replace(source, target)
+
+        with unittest.mock.patch(
+            "os.replace", side_effect=record_replace
+        ):
+            phile.notify.watchdog.save(
+                entry=notify_entry,
+                configuration=self.configuration,
+                atomic=True,
+            )
+        self.assertEqual(expiries, [notify_entry.expires_at])
+
 
 class TestTarget(UsesConfiguration, unittest.TestCase):
     def setUp(self) -> None:
@@ -208,6 +476,20 @@ class TestTarget(UsesConfiguration, unittest.TestCase):
         file_content = self.notify_path.read_text()
         self.assertEqual(file_content, self.notify_entry.text)
 
+    def test_set__saves_atomically_if_configured(self) -> None:
+        self.configuration.save_atomically = True
+        self.configuration.save_fsync = True
+        target = phile.notify.watchdog.Target(
+            configuration=self.configuration
+        )
+        target.set(entry=self.notify_entry)
+        self.notify_entry.text = "s"
+        target.set(entry=self.notify_entry)
+        self.assertEqual(self.notify_path.read_text(), "s")
+        self.assertEqual(
+            list(self.notify_path.parent.iterdir()), [self.notify_path]
+        )
+
     def test_pop__removes_file_if_exists(self) -> None:
         self.target.set(entry=self.notify_entry)
         self.target.pop(name=self.notify_entry.name)
@@ -217,6 +499,17 @@ class TestTarget(UsesConfiguration, unittest.TestCase):
         # Tests that it does not raise exceptions.
         self.target.pop(name=self.notify_entry.name)
 
+    def test_pop__removes_expiry_file(self) -> None:
+        self.notify_entry.expires_at = datetime.datetime(2021, 2, 3)
+        with unittest.mock.patch("os.setxattr", side_effect=OSError):
+            self.target.set(entry=self.notify_entry)
+        sidecar_path = phile.notify.expiry_storage.get_sidecar_path(
+            self.notify_path
+        )
+        self.assertTrue(sidecar_path.exists())
+        self.target.pop(name=self.notify_entry.name)
+        self.assertTrue(not sidecar_path.exists())
+
     def test_close__pops_any_entries_set(self) -> None:
         self.target.set(entry=self.notify_entry)
         notify_entry_2 = phile.notify.Entry(name="m")
@@ -345,6 +638,26 @@ class TestUpdatePath(
         # then new insertion event would be received as expected.
         await self.test_inserts_entry_if_unknown()
 
+    async def test_inserts_lazy_entry_if_given_text_cache(self) -> None:
+        phile.notify.watchdog.save(
+            entry=self.notify_entry, configuration=self.configuration
+        )
+        await phile.asyncio.wait_for(
+            phile.notify.watchdog.update_path(
+                configuration=self.configuration,
+                notify_registry=self.notify_registry,
+                path=self.notify_path,
+                text_cache=phile.notify.TextCache(),
+            )
+        )
+        notify_event = await phile.asyncio.wait_for(
+            self.notify_view.__anext__()
+        )
+        self.assertIsInstance(
+            notify_event.value, phile.notify.watchdog.LazyEntry
+        )
+        self.assertEqual(notify_event.value.text, self.notify_entry.text)
+
     async def test_returns_true_if_path_was_found(self) -> None:
         phile.notify.watchdog.save(
             entry=self.notify_entry, configuration=self.configuration
@@ -430,14 +743,17 @@ class TestUpdateExistingPaths(
                 notify_registry=self.notify_registry,
             )
         )
+        # Entries are inserted as a batch.
         notify_event = await phile.asyncio.wait_for(
             self.notify_view.__anext__()
         )
-        self.assertEqual(len(notify_event.current_keys), 1)
+        self.assertEqual(notify_event.key, "m")
+        self.assertEqual(notify_event.current_keys, ["m", "n"])
         notify_event = await phile.asyncio.wait_for(
             self.notify_view.__anext__()
         )
-        self.assertEqual(len(notify_event.current_keys), 2)
+        self.assertEqual(notify_event.key, "n")
+        self.assertEqual(notify_event.current_keys, ["m", "n"])
 
     async def test_returns_paths_added(self) -> None:
         phile.notify.watchdog.save(
@@ -458,6 +774,17 @@ class TestUpdateExistingPaths(
         )
         self.assertEqual(added_paths, {self.notify_path, path_2})
 
+    async def test_ignores_directory_if_given_text_cache(self) -> None:
+        self.notify_path.mkdir()
+        added_paths = await phile.asyncio.wait_for(
+            phile.notify.watchdog.update_existing_paths(
+                configuration=self.configuration,
+                notify_registry=self.notify_registry,
+                text_cache=phile.notify.TextCache(),
+            )
+        )
+        self.assertEqual(added_paths, set())
+
     async def test_ignores_directory(self) -> None:
         self.notify_path.mkdir()
         await phile.asyncio.wait_for(
@@ -7,7 +7,11 @@ Test :mod:`phile.os`
 
 # Standard libraries.
 import os
+import pathlib
+import stat
+import tempfile
 import unittest
+import unittest.mock
 
 # Internal packages.
 import phile.os
@@ -39,3 +43,91 @@ class TestEnviron(unittest.TestCase):
         self.assertEqual(os.environ[self.key], "nested")
         environ.restore()
         self.assertEqual(os.environ[self.key], "testing")
+
+
+class TestWriteText(unittest.TestCase):
+    """Tests :func:`~phile.os.write_text`."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory_path = pathlib.Path(directory.name)
+        self.path = self.directory_path / "f"
+
+    def assert_only_file_has_text(self, text: str) -> None:
+        self.assertEqual(self.path.read_text(), text)
+        self.assertEqual(
+            list(self.directory_path.iterdir()), [self.path]
+        )
+
+    def test_writes_atomically_if_atomic(self) -> None:
+        self.path.write_text("old")
+        inode = self.path.stat().st_ino
+        phile.os.write_text(self.path, "new", atomic=True)
+        self.assert_only_file_has_text("new")
+        self.assertNotEqual(self.path.stat().st_ino, inode)
+
+    def test_writes_in_place_by_default(self) -> None:
+        self.path.write_text("old text")
+        inode = self.path.stat().st_ino
+        phile.os.write_text(self.path, "new")
+        self.assert_only_file_has_text("new")
+        self.assertEqual(self.path.stat().st_ino, inode)
+
+    def test_prepares_file_before_replacing(self) -> None:
+        for atomic in [False, True]:
+            with self.subTest(atomic=atomic):
+                self.path.unlink(missing_ok=True)
+                prepared: list[tuple[str, bool]] = []
+
+                def prepare_file(path: pathlib.Path) -> None:
+                    prepared.append(
+                        (path.read_text(), self.path.exists())
+                    )
+
+                phile.os.write_text(
+                    self.path,
+                    "new",
+                    atomic=atomic,
+                    prepare_file=prepare_file,
+                )
+                self.assertEqual(prepared, [("new", not atomic)])
+                self.assert_only_file_has_text("new")
+
+    def test_uses_umask_for_mode(self) -> None:
+        umask = os.umask(0o022)
+        self.addCleanup(os.umask, umask)
+        phile.os.write_text(self.path, "new", atomic=True)
+        self.assertEqual(stat.S_IMODE(self.path.stat().st_mode), 0o644)
+
+    def test_syncs_if_fsync(self) -> None:
+        for atomic, call_count in [(False, 1), (True, 2)]:
+            with self.subTest(atomic=atomic):
+                with unittest.mock.patch(
+                    "os.fsync", wraps=os.fsync
+                ) as fsync_mock:
+                    phile.os.write_text(
+                        self.path, "new", atomic=atomic, fsync=True
+                    )
+                self.assertEqual(fsync_mock.call_count, call_count)
+                self.assert_only_file_has_text("new")
+
+    def test_retries_if_temporary_file_exists(self) -> None:
+        existing_path = self.directory_path / ".f.00000000.tmp"
+        existing_path.touch()
+        with unittest.mock.patch(
+            "os.urandom", side_effect=[bytes(4), bytes([1] * 4)]
+        ):
+            phile.os.write_text(self.path, "new", atomic=True)
+        self.assertEqual(self.path.read_text(), "new")
+        self.assertEqual(
+            sorted(self.directory_path.iterdir()),
+            [existing_path, self.path],
+        )
+
+    def test_removes_temporary_file_on_error(self) -> None:
+        with unittest.mock.patch("os.replace", side_effect=OSError):
+            with self.assertRaises(OSError):
+                phile.os.write_text(self.path, "new", atomic=True)
+        self.assertEqual(list(self.directory_path.iterdir()), [])
@@ -156,6 +156,20 @@ class TestTarget(UsesConfiguration, unittest.TestCase):
         tray_file_path = self.tray_directory / "a.tr"
         self.assertTrue(tray_file_path.exists())
 
+    def test_set__saves_atomically_if_configured(self) -> None:
+        self.configuration.save_atomically = True
+        self.configuration.save_fsync = True
+        target = phile.tray.watchdog.Target(
+            configuration=self.configuration,
+        )
+        target.set(phile.tray.Entry(name="a", text_icon="A"))
+        target.set(phile.tray.Entry(name="a", text_icon="B"))
+        tray_file_path = self.tray_directory / "a.tr"
+        self.assertEqual(tray_file_path.read_text(), "B")
+        self.assertEqual(
+            list(self.tray_directory.iterdir()), [tray_file_path]
+        )
+
     def test_pop__removes_file(self) -> None:
         tray_file_path = self.tray_directory / "a.tr"
         tray_file_path.touch()
@@ -3,4 +3,6 @@
 .. automodule:: test_phile.test_watchdog.test_init
 .. automodule:: test_phile.test_watchdog.test_asyncio
 .. automodule:: test_phile.test_watchdog.test_observers
+.. automodule:: test_phile.test_watchdog.test_polling
+.. automodule:: test_phile.test_watchdog.test_replay
 """
@@ -71,6 +71,157 @@ class TestEventView(unittest.IsolatedAsyncioTestCase):
         self.assertTrue(self.called.is_set())
 
 
+class TestEventFilter(unittest.TestCase):
+    def test_default_accepts_file_events(self) -> None:
+        event_filter = phile.watchdog.asyncio.EventFilter()
+        self.assertTrue(
+            event_filter.match_event(
+                watchdog.events.FileCreatedEvent("/a/b.c")
+            )
+        )
+
+    def test_default_rejects_directory_events(self) -> None:
+        event_filter = phile.watchdog.asyncio.EventFilter()
+        self.assertFalse(
+            event_filter.match_event(
+                watchdog.events.DirModifiedEvent("/a/b")
+            )
+        )
+
+    def test_accepts_directory_events_if_not_ignored(self) -> None:
+        event_filter = phile.watchdog.asyncio.EventFilter(
+            ignore_directories=False
+        )
+        self.assertTrue(
+            event_filter.match_event(
+                watchdog.events.DirModifiedEvent("/a/b")
+            )
+        )
+
+    def test_match_path__checks_suffix_of_name(self) -> None:
+        event_filter = phile.watchdog.asyncio.EventFilter(suffix=".c")
+        self.assertTrue(event_filter.match_path("/a/b.c"))
+        self.assertFalse(event_filter.match_path("/a.c/b.d"))
+
+    def test_match_path__checks_glob_of_name(self) -> None:
+        event_filter = phile.watchdog.asyncio.EventFilter(glob="b*.c")
+        self.assertTrue(event_filter.match_path("/a/bd.c"))
+        self.assertFalse(event_filter.match_path("/b/ab.c"))
+
+    def test_match_path__calls_predicate_with_full_path(self) -> None:
+        received_paths: list[str] = []
+
+        def predicate(path: str) -> bool:
+            received_paths.append(path)
+            return path.startswith("/a/")
+
+        event_filter = phile.watchdog.asyncio.EventFilter(
+            suffix=".c", predicate=predicate
+        )
+        self.assertTrue(event_filter.match_path("/a/b.c"))
+        self.assertFalse(event_filter.match_path("/d/b.c"))
+        self.assertFalse(event_filter.match_path("/a/b.d"))
+        self.assertEqual(received_paths, ["/a/b.c", "/d/b.c"])
+
+    def test_match_event__accepts_move_if_either_path_matches(
+        self,
+    ) -> None:
+        event_filter = phile.watchdog.asyncio.EventFilter(suffix=".c")
+        self.assertTrue(
+            event_filter.match_event(
+                watchdog.events.FileMovedEvent("/a/b.c", "/a/b.d")
+            )
+        )
+        self.assertTrue(
+            event_filter.match_event(
+                watchdog.events.FileMovedEvent("/a/b.d", "/a/b.c")
+            )
+        )
+        self.assertFalse(
+            event_filter.match_event(
+                watchdog.events.FileMovedEvent("/a/b.d", "/a/b.e")
+            )
+        )
+
+    def test_match_event__rejects_non_matching_non_move(self) -> None:
+        event_filter = phile.watchdog.asyncio.EventFilter(suffix=".c")
+        self.assertFalse(
+            event_filter.match_event(
+                watchdog.events.FileDeletedEvent("/a/b.d")
+            )
+        )
+
+    def test_is_hashable_for_sharing_queues(self) -> None:
+        self.assertEqual(
+            hash(phile.watchdog.asyncio.EventFilter(suffix=".c")),
+            hash(phile.watchdog.asyncio.EventFilter(suffix=".c")),
+        )
+
+
+class TestIsInWatch(unittest.TestCase):
+    def test_includes_watched_path(self) -> None:
+        for recursive in (False, True):
+            watch = watchdog.observers.api.ObservedWatch("/a", recursive)
+            self.assertTrue(
+                phile.watchdog.asyncio.is_in_watch("/a", watch)
+            )
+
+    def test_non_recursive_includes_only_children(self) -> None:
+        watch = watchdog.observers.api.ObservedWatch("/a", False)
+        self.assertTrue(
+            phile.watchdog.asyncio.is_in_watch("/a/b", watch)
+        )
+        self.assertFalse(
+            phile.watchdog.asyncio.is_in_watch("/a/b/c", watch)
+        )
+        self.assertFalse(
+            phile.watchdog.asyncio.is_in_watch("/ab", watch)
+        )
+
+    def test_recursive_includes_descendants(self) -> None:
+        watch = watchdog.observers.api.ObservedWatch("/a", True)
+        self.assertTrue(
+            phile.watchdog.asyncio.is_in_watch("/a/b/c", watch)
+        )
+        self.assertFalse(
+            phile.watchdog.asyncio.is_in_watch("/ab", watch)
+        )
+
+    def test_recursive_root_includes_everything(self) -> None:
+        watch = watchdog.observers.api.ObservedWatch("/", True)
+        self.assertTrue(
+            phile.watchdog.asyncio.is_in_watch("/a/b/c", watch)
+        )
+
+
+class TestIsEventInWatch(unittest.TestCase):
+    def test_checks_both_paths_of_move_event(self) -> None:
+        watch = watchdog.observers.api.ObservedWatch("/a", False)
+        self.assertTrue(
+            phile.watchdog.asyncio.is_event_in_watch(
+                watchdog.events.FileMovedEvent("/b/c", "/a/c"), watch
+            )
+        )
+        self.assertFalse(
+            phile.watchdog.asyncio.is_event_in_watch(
+                watchdog.events.FileMovedEvent("/b/c", "/b/d"), watch
+            )
+        )
+
+    def test_checks_source_path_of_other_events(self) -> None:
+        watch = watchdog.observers.api.ObservedWatch("/a", False)
+        self.assertTrue(
+            phile.watchdog.asyncio.is_event_in_watch(
+                watchdog.events.FileCreatedEvent("/a/c"), watch
+            )
+        )
+        self.assertFalse(
+            phile.watchdog.asyncio.is_event_in_watch(
+                watchdog.events.FileCreatedEvent("/b/c"), watch
+            )
+        )
+
+
 class TestEventQueue(unittest.IsolatedAsyncioTestCase):
     async def test_put__puts_event(self) -> None:
         event_queue = phile.watchdog.asyncio.EventQueue()
@@ -85,6 +236,94 @@ class TestEventQueue(unittest.IsolatedAsyncioTestCase):
         event = await phile.asyncio.wait_for(view.__anext__())
         self.assertEqual(event, expected_event)
 
+    async def test_put__drops_events_rejected_by_filter(self) -> None:
+        event_queue = phile.watchdog.asyncio.EventQueue(
+            event_filter=phile.watchdog.asyncio.EventFilter(suffix=".c")
+        )
+        view = event_queue.__aiter__()
+        watch = watchdog.observers.api.ObservedWatch("/a", False)
+        expected_event = watchdog.events.FileCreatedEvent("/a/b.c")
+        event_queue.put(
+            (watchdog.events.FileCreatedEvent("/a/b"), watch)
+        )
+        event_queue.put((expected_event, watch))
+        event = await phile.asyncio.wait_for(view.__anext__())
+        self.assertEqual(event, expected_event)
+
+    async def test_put__drops_events_outside_watch_scope(self) -> None:
+        watch = watchdog.observers.api.ObservedWatch("/a", True)
+        event_queue = phile.watchdog.asyncio.EventQueue(
+            watch_scope=watchdog.observers.api.ObservedWatch(
+                "/a/b", False
+            )
+        )
+        view = event_queue.__aiter__()
+        expected_event = watchdog.events.FileCreatedEvent("/a/b/c")
+        event_queue.put(
+            (watchdog.events.FileCreatedEvent("/a/c"), watch)
+        )
+        event_queue.put((expected_event, watch))
+        event = await phile.asyncio.wait_for(view.__anext__())
+        self.assertEqual(event, expected_event)
+
+    async def test_put__ignores_events_after_put_done(self) -> None:
+        event_queue = phile.watchdog.asyncio.EventQueue()
+        view = event_queue.__aiter__()
+        event_queue.put(
+            (
+                watchdog.events.FileCreatedEvent(""),
+                watchdog.observers.api.ObservedWatch("", False),
+            )
+        )
+        # The event is still pending in the loop when the queue ends.
+        event_queue.put_done()
+        with self.assertRaises(StopAsyncIteration):
+            await phile.asyncio.wait_for(view.__anext__())
+
+
+class TestEventQueueGroup(unittest.IsolatedAsyncioTestCase):
+    async def test_put__forwards_to_added_queues(self) -> None:
+        group = phile.watchdog.asyncio.EventQueueGroup()
+        all_queue = phile.watchdog.asyncio.EventQueue()
+        filtered_queue = phile.watchdog.asyncio.EventQueue(
+            event_filter=phile.watchdog.asyncio.EventFilter(suffix=".c")
+        )
+        group.add(all_queue)
+        group.add(filtered_queue)
+        self.assertEqual(len(group), 2)
+        all_view = all_queue.__aiter__()
+        filtered_view = filtered_queue.__aiter__()
+        watch = watchdog.observers.api.ObservedWatch("/a", False)
+        skipped_event = watchdog.events.FileCreatedEvent("/a/b")
+        expected_event = watchdog.events.FileCreatedEvent("/a/b.c")
+        group.put((skipped_event, watch))
+        group.put((expected_event, watch))
+        self.assertEqual(
+            await phile.asyncio.wait_for(all_view.__anext__()),
+            skipped_event,
+        )
+        self.assertEqual(
+            await phile.asyncio.wait_for(filtered_view.__anext__()),
+            expected_event,
+        )
+
+    async def test_remove__stops_forwarding(self) -> None:
+        group = phile.watchdog.asyncio.EventQueueGroup()
+        event_queue = phile.watchdog.asyncio.EventQueue()
+        group.add(event_queue)
+        group.remove(event_queue)
+        self.assertEqual(len(group), 0)
+        view = event_queue.__aiter__()
+        group.put(
+            (
+                watchdog.events.FileCreatedEvent(""),
+                watchdog.observers.api.ObservedWatch("", False),
+            )
+        )
+        event_queue.put_done()
+        with self.assertRaises(StopAsyncIteration):
+            await phile.asyncio.wait_for(view.__anext__())
+
 
 class EventEmitterMock:
     def __init__(  # pylint: disable=keyword-arg-before-vararg
@@ -377,6 +616,261 @@ class TestBaseObserver(
             emitter_mock.stop.assert_not_called()
         emitter_mock.stop.assert_called_once()
 
+    async def test_schedule__shares_emitter_between_filters(
+        self,
+    ) -> None:
+        emitter_mock = self.event_emitter_class_mock.return_value
+        async with await phile.asyncio.wait_for(
+            self.observer.schedule(
+                self.temporary_directory,
+                event_filter=phile.watchdog.asyncio.EventFilter(
+                    suffix=".a"
+                ),
+            )
+        ) as event_view:
+            async with await phile.asyncio.wait_for(
+                self.observer.schedule(
+                    self.temporary_directory,
+                    event_filter=phile.watchdog.asyncio.EventFilter(
+                        suffix=".b"
+                    ),
+                )
+            ) as another_view:
+                self.assertIsNot(
+                    # pylint: disable=protected-access
+                    another_view._next_node,
+                    event_view._next_node,
+                )
+            self.event_emitter_class_mock.assert_called_once()
+            emitter_mock.stop.assert_not_called()
+            with self.assertRaises(StopAsyncIteration):
+                await phile.asyncio.wait_for(another_view.__anext__())
+        emitter_mock.stop.assert_called_once()
+
+    async def test_schedule__filters_events_before_queueing(
+        self,
+    ) -> None:
+        event_filter = phile.watchdog.asyncio.EventFilter(suffix=".a")
+        async with await phile.asyncio.wait_for(
+            self.observer.schedule(
+                self.temporary_directory, event_filter=event_filter
+            )
+        ) as event_view:
+            event_queue_group = self.event_emitter_class_mock.call_args[
+                0
+            ][0]
+            watch = watchdog.observers.api.ObservedWatch(
+                str(self.temporary_directory), False
+            )
+            expected_event = watchdog.events.FileCreatedEvent(
+                str(self.temporary_directory / "b.a")
+            )
+            event_queue_group.put(
+                (
+                    watchdog.events.FileCreatedEvent(
+                        str(self.temporary_directory / "b.c")
+                    ),
+                    watch,
+                )
+            )
+            event_queue_group.put((expected_event, watch))
+            self.assertEqual(
+                await phile.asyncio.wait_for(event_view.__anext__()),
+                expected_event,
+            )
+
+
+class TestBaseObserverWatchSharing(
+    phile.unittest.UsesTemporaryDirectory,
+    unittest.IsolatedAsyncioTestCase,
+):
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.emitters: dict[str, unittest.mock.Mock]
+        self.emitter_class_mock: unittest.mock.Mock
+        self.observer: phile.watchdog.asyncio.BaseObserver
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        emitters = self.emitters = {}
+
+        def create_emitter(
+            event_queue: watchdog.observers.api.EventQueue,
+            watch: watchdog.observers.api.ObservedWatch,
+            timeout: float,
+        ) -> unittest.mock.Mock:
+            del timeout
+            emitter = unittest.mock.Mock()
+            emitter.event_queue = event_queue
+            emitter.watch = watch
+            emitter.is_alive.return_value = True
+            emitter.async_join = unittest.mock.AsyncMock()
+            emitters[watch.path] = emitter
+            return emitter
+
+        self.emitter_class_mock = unittest.mock.Mock(
+            side_effect=create_emitter
+        )
+        self.observer = phile.watchdog.asyncio.BaseObserver(
+            emitter_class=self.emitter_class_mock,
+        )
+
+    def put(
+        self,
+        watched_path: pathlib.Path,
+        event: watchdog.events.FileSystemEvent,
+    ) -> None:
+        emitter = self.emitters[str(watched_path)]
+        emitter.event_queue.put((event, emitter.watch))
+
+    async def test_non_recursive_child_shares_recursive_emitter(
+        self,
+    ) -> None:
+        root = self.temporary_directory
+        child = root / "child"
+        async with await phile.asyncio.wait_for(
+            self.observer.schedule(root, recursive=True)
+        ):
+            async with await phile.asyncio.wait_for(
+                self.observer.schedule(child)
+            ) as child_view:
+                self.emitter_class_mock.assert_called_once()
+                expected_event = watchdog.events.FileCreatedEvent(
+                    str(child / "a")
+                )
+                self.put(
+                    root,
+                    watchdog.events.FileCreatedEvent(str(root / "a")),
+                )
+                self.put(
+                    root,
+                    watchdog.events.FileCreatedEvent(
+                        str(child / "b" / "a")
+                    ),
+                )
+                self.put(root, expected_event)
+                self.assertEqual(
+                    await phile.asyncio.wait_for(child_view.__anext__()),
+                    expected_event,
+                )
+
+    async def test_recursive_descendant_shares_recursive_emitter(
+        self,
+    ) -> None:
+        root = self.temporary_directory
+        child = root / "child"
+        async with await phile.asyncio.wait_for(
+            self.observer.schedule(root, recursive=True)
+        ):
+            async with await phile.asyncio.wait_for(
+                self.observer.schedule(child, recursive=True)
+            ) as child_view:
+                self.emitter_class_mock.assert_called_once()
+                expected_event = watchdog.events.FileCreatedEvent(
+                    str(child / "b" / "a")
+                )
+                self.put(
+                    root,
+                    watchdog.events.FileCreatedEvent(str(root / "a")),
+                )
+                self.put(root, expected_event)
+                self.assertEqual(
+                    await phile.asyncio.wait_for(child_view.__anext__()),
+                    expected_event,
+                )
+
+    async def test_same_path_non_recursive_shares_recursive_emitter(
+        self,
+    ) -> None:
+        root = self.temporary_directory
+        async with await phile.asyncio.wait_for(
+            self.observer.schedule(root, recursive=True)
+        ):
+            async with await phile.asyncio.wait_for(
+                self.observer.schedule(root)
+            ):
+                self.emitter_class_mock.assert_called_once()
+
+    async def test_shared_emitter_stops_after_last_unschedule(
+        self,
+    ) -> None:
+        root = self.temporary_directory
+        child = root / "child"
+        root_view = await phile.asyncio.wait_for(
+            self.observer.schedule(root, recursive=True)
+        )
+        child_view = await phile.asyncio.wait_for(
+            self.observer.schedule(child)
+        )
+        emitter = self.emitters[str(root)]
+        await phile.asyncio.wait_for(root_view.aclose())
+        emitter.stop.assert_not_called()
+        with self.assertRaises(StopAsyncIteration):
+            await phile.asyncio.wait_for(root_view.__anext__())
+        expected_event = watchdog.events.FileCreatedEvent(
+            str(child / "a")
+        )
+        self.put(root, expected_event)
+        self.assertEqual(
+            await phile.asyncio.wait_for(child_view.__anext__()),
+            expected_event,
+        )
+        await phile.asyncio.wait_for(child_view.aclose())
+        emitter.stop.assert_called_once()
+        # The recursive watch is no longer available for sharing.
+        async with await phile.asyncio.wait_for(
+            self.observer.schedule(child)
+        ):
+            self.assertEqual(self.emitter_class_mock.call_count, 2)
+
+    async def test_existing_child_emitter_is_not_merged(self) -> None:
+        root = self.temporary_directory
+        child = root / "child"
+        async with await phile.asyncio.wait_for(
+            self.observer.schedule(child)
+        ):
+            async with await phile.asyncio.wait_for(
+                self.observer.schedule(root, recursive=True)
+            ):
+                async with await phile.asyncio.wait_for(
+                    self.observer.schedule(
+                        child,
+                        event_filter=phile.watchdog.asyncio.EventFilter(),
+                    )
+                ):
+                    self.assertEqual(
+                        self.emitter_class_mock.call_count, 2
+                    )
+            child_emitter = self.emitters[str(child)]
+            child_emitter.stop.assert_not_called()
+
+    async def test_same_path_emitter_removal_keeps_recursive_host(
+        self,
+    ) -> None:
+        root = self.temporary_directory
+        async with await phile.asyncio.wait_for(
+            self.observer.schedule(root)
+        ):
+            root_view = await phile.asyncio.wait_for(
+                self.observer.schedule(root, recursive=True)
+            )
+        async with root_view:
+            async with await phile.asyncio.wait_for(
+                self.observer.schedule(root / "child")
+            ):
+                self.assertEqual(self.emitter_class_mock.call_count, 2)
+
+    async def test_unrelated_paths_use_separate_emitters(self) -> None:
+        async with await phile.asyncio.wait_for(
+            self.observer.schedule(
+                self.temporary_directory / "a", recursive=True
+            )
+        ):
+            async with await phile.asyncio.wait_for(
+                self.observer.schedule(self.temporary_directory / "b")
+            ):
+                self.assertEqual(self.emitter_class_mock.call_count, 2)
+
 
 class TestObserver(
     phile.unittest.UsesTemporaryDirectory,
@@ -408,6 +902,33 @@ class TestObserver(
                 watchdog.events.FileCreatedEvent(str(file_path)),
             )
 
+    async def test_detects_event_through_shared_recursive_watch(
+        self,
+    ) -> None:
+        child_directory = self.temporary_directory / "child"
+        child_directory.mkdir()
+        async with await phile.asyncio.wait_for(
+            self.observer.schedule(
+                self.temporary_directory, recursive=True
+            )
+        ):
+            async with await phile.asyncio.wait_for(
+                self.observer.schedule(
+                    child_directory,
+                    event_filter=phile.watchdog.asyncio.EventFilter(),
+                )
+            ) as event_view:
+                (self.temporary_directory / "ignored.txt").touch()
+                file_path = child_directory / "touched.txt"
+                file_path.touch()
+                event = await phile.asyncio.wait_for(
+                    event_view.__anext__()
+                )
+                self.assertEqual(
+                    event,
+                    watchdog.events.FileCreatedEvent(str(file_path)),
+                )
+
 
 class UsesObserver(unittest.IsolatedAsyncioTestCase):
     def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
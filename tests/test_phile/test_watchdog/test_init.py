@@ -8,6 +8,7 @@ Test :mod:`phile.watchdog`
 # Standard library.
 import dataclasses
 import pathlib
+import threading
 import unittest
 import unittest.mock
 
@@ -16,6 +17,7 @@ import watchdog.events
 import watchdog.observers
 
 # Internal packages.
+import phile.unittest
 import phile.watchdog
 import phile.watchdog.observers
 
@@ -267,3 +269,136 @@ class TestScheduler(unittest.TestCase):
             ),
             {source_path, dest_path},
         )
+
+
+class TestRouter(
+    phile.unittest.UsesTemporaryDirectory, unittest.TestCase
+):
+    def setUp(self) -> None:
+        super().setUp()
+        self.observer = watchdog.observers.Observer()
+        self.addCleanup(self.observer.stop)
+        self.router = phile.watchdog.Router(
+            watching_observer=self.observer
+        )
+        self.directory = self.temporary_directory / "d"
+        self.path_handler = unittest.mock.Mock()
+
+    def add_handler(
+        self, path_handler: phile.watchdog.PathHandler, suffix: str = ""
+    ) -> None:
+        self.router.add_handler(
+            directory=self.directory,
+            path_handler=path_handler,
+            suffix=suffix,
+        )
+
+    def test_add_handler_schedules_directory_once(self) -> None:
+        self.add_handler(self.path_handler, ".a")
+        self.add_handler(self.path_handler, ".b")
+        self.assertTrue(self.directory.is_dir())
+        self.assertEqual(len(self.observer.emitters), 1)
+
+    def test_remove_handler_unschedules_after_last_handler(self) -> None:
+        self.add_handler(self.path_handler, ".a")
+        self.add_handler(self.path_handler, ".a")
+        self.add_handler(self.path_handler, ".b")
+        self.router.remove_handler(
+            directory=self.directory,
+            path_handler=self.path_handler,
+            suffix=".a",
+        )
+        self.router.remove_handler(
+            directory=self.directory,
+            path_handler=self.path_handler,
+            suffix=".b",
+        )
+        self.assertEqual(len(self.observer.emitters), 1)
+        self.router.remove_handler(
+            directory=self.directory,
+            path_handler=self.path_handler,
+            suffix=".a",
+        )
+        self.assertEqual(len(self.observer.emitters), 0)
+
+    def test_remove_handler_raises_if_not_added(self) -> None:
+        self.add_handler(self.path_handler, ".a")
+        with self.assertRaises(KeyError):
+            self.router.remove_handler(
+                directory=self.directory,
+                path_handler=unittest.mock.Mock(),
+                suffix=".a",
+            )
+        with self.assertRaises(KeyError):
+            self.router.remove_handler(
+                directory=self.directory,
+                path_handler=self.path_handler,
+                suffix=".b",
+            )
+        with self.assertRaises(KeyError):
+            self.router.remove_handler(
+                directory=self.temporary_directory,
+                path_handler=self.path_handler,
+                suffix=".a",
+            )
+
+    def test_dispatch_calls_handlers_of_matching_suffix(self) -> None:
+        other_handler = unittest.mock.Mock()
+        any_handler = unittest.mock.Mock()
+        self.add_handler(self.path_handler, ".a")
+        self.add_handler(other_handler, ".bb")
+        self.add_handler(any_handler)
+        file_path = self.directory / "x.a"
+        self.router.dispatch(
+            watchdog.events.FileCreatedEvent(str(file_path))
+        )
+        self.path_handler.assert_called_once_with(file_path)
+        other_handler.assert_not_called()
+        any_handler.assert_called_once_with(file_path)
+
+    def test_dispatch_skips_suffixes_longer_than_name(self) -> None:
+        self.add_handler(self.path_handler, ".notify")
+        self.router.dispatch(
+            watchdog.events.FileCreatedEvent(str(self.directory / "a"))
+        )
+        self.path_handler.assert_not_called()
+
+    def test_dispatch_ignores_other_directories(self) -> None:
+        self.add_handler(self.path_handler)
+        self.router.dispatch(
+            watchdog.events.FileCreatedEvent(
+                str(self.temporary_directory / "x.a")
+            )
+        )
+        self.path_handler.assert_not_called()
+
+    def test_dispatch_ignores_directory_events(self) -> None:
+        self.add_handler(self.path_handler)
+        self.router.dispatch(
+            watchdog.events.DirCreatedEvent(str(self.directory / "x"))
+        )
+        self.path_handler.assert_not_called()
+
+    def test_dispatch_splits_move_events(self) -> None:
+        self.add_handler(self.path_handler, ".a")
+        source_path = self.directory / "x.a"
+        dest_path = self.directory / "y.a"
+        self.router.dispatch(
+            watchdog.events.FileMovedEvent(
+                str(source_path), str(dest_path)
+            )
+        )
+        self.assertEqual(
+            [
+                call_args.args[0]
+                for call_args in self.path_handler.call_args_list
+            ],
+            [source_path, dest_path],
+        )
+
+    def test_receives_events_from_observer(self) -> None:
+        received = threading.Event()
+        self.add_handler(lambda _: received.set(), ".a")
+        self.observer.start()
+        (self.directory / "x.a").touch()
+        self.assertTrue(received.wait(timeout=2))
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+
+# Standard library.
+import os
+import typing
+import unittest
+import unittest.mock
+
+# External dependencies.
+import watchdog.events
+import watchdog.observers.api
+
+# Internal packages.
+import phile.asyncio
+import phile.unittest
+import phile.watchdog.asyncio
+import phile.watchdog.polling
+
+
+class TestScanDirectory(
+    phile.unittest.UsesTemporaryDirectory, unittest.TestCase
+):
+    def test_returns_stat_keys_of_entries(self) -> None:
+        file_path = self.temporary_directory / "a"
+        file_path.write_text("bc")
+        entries = phile.watchdog.polling.scan_directory(
+            str(self.temporary_directory)
+        )
+        self.assertEqual(
+            entries,
+            {"a": phile.watchdog.polling.to_stat_key(file_path.stat())},
+        )
+
+    def test_returns_empty_if_directory_missing(self) -> None:
+        self.assertEqual(
+            phile.watchdog.polling.scan_directory(
+                str(self.temporary_directory / "missing")
+            ),
+            {},
+        )
+
+    def test_skips_entries_that_cannot_be_stat(self) -> None:
+        entry = unittest.mock.Mock()
+        entry.name = "a"
+        entry.stat.side_effect = FileNotFoundError
+        scandir_mock = unittest.mock.MagicMock()
+        scandir_mock.return_value.__enter__.return_value = [entry]
+        with unittest.mock.patch("os.scandir", scandir_mock):
+            self.assertEqual(
+                phile.watchdog.polling.scan_directory(
+                    str(self.temporary_directory)
+                ),
+                {},
+            )
+
+
+class TestCreateVfsScanner(
+    phile.unittest.UsesTemporaryDirectory, unittest.TestCase
+):
+    def test_accepts_names_from_listdir(self) -> None:
+        file_path = self.temporary_directory / "a"
+        file_path.touch()
+        scan = phile.watchdog.polling.create_vfs_scanner(
+            stat_callback=os.stat, listdir=os.listdir
+        )
+        self.assertEqual(
+            scan(str(self.temporary_directory)),
+            {"a": phile.watchdog.polling.to_stat_key(file_path.stat())},
+        )
+
+    def test_accepts_entries_from_listdir(self) -> None:
+        file_path = self.temporary_directory / "a"
+        file_path.touch()
+        scan = phile.watchdog.polling.create_vfs_scanner(
+            stat_callback=os.stat, listdir=os.scandir
+        )
+        self.assertEqual(
+            list(scan(str(self.temporary_directory))), ["a"]
+        )
+
+    def test_returns_empty_if_listdir_fails(self) -> None:
+        scan = phile.watchdog.polling.create_vfs_scanner(
+            stat_callback=os.stat, listdir=os.listdir
+        )
+        self.assertEqual(scan(str(self.temporary_directory / "b")), {})
+
+    def test_skips_entries_that_cannot_be_stat(self) -> None:
+        scan = phile.watchdog.polling.create_vfs_scanner(
+            stat_callback=os.stat, listdir=lambda _: ["missing"]
+        )
+        self.assertEqual(scan(str(self.temporary_directory)), {})
+
+
+class TestAdaptivePoller(
+    phile.unittest.UsesTemporaryDirectory, unittest.TestCase
+):
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.now: float
+        self.poller: phile.watchdog.polling.AdaptivePoller
+        self.root: str
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.now = 0
+        self.root = str(self.temporary_directory)
+        self.create_poller(recursive=True)
+
+    def create_poller(self, recursive: bool) -> None:
+        self.poller = phile.watchdog.polling.AdaptivePoller(
+            clock=lambda: self.now,
+            max_interval=8,
+            min_interval=1,
+            recursive=recursive,
+            root_path=self.root,
+        )
+        self.poller.index()
+
+    def force_poll(self) -> list[watchdog.events.FileSystemEvent]:
+        return self.poller.poll(force=True)
+
+    def test_next_due_at_is_infinite_without_index(self) -> None:
+        poller = phile.watchdog.polling.AdaptivePoller(
+            root_path=self.root
+        )
+        self.assertEqual(poller.next_due_at, float("inf"))
+
+    def test_index_does_not_report_existing_entries(self) -> None:
+        (self.temporary_directory / "a").mkdir()
+        (self.temporary_directory / "a" / "b").touch()
+        self.create_poller(recursive=True)
+        self.assertEqual(
+            set(self.poller.directory_paths),
+            {self.root, os.path.join(self.root, "a")},
+        )
+        self.assertEqual(self.force_poll(), [])
+
+    def test_index_does_not_add_subdirectories_if_not_recursive(
+        self,
+    ) -> None:
+        (self.temporary_directory / "a").mkdir()
+        self.create_poller(recursive=False)
+        self.assertEqual(set(self.poller.directory_paths), {self.root})
+
+    def test_poll__skips_directories_not_due(self) -> None:
+        (self.temporary_directory / "a").touch()
+        self.assertEqual(self.poller.poll(), [])
+        self.now = 1
+        self.assertIn(
+            watchdog.events.FileCreatedEvent(
+                os.path.join(self.root, "a")
+            ),
+            self.poller.poll(),
+        )
+
+    def test_poll__backs_off_idle_directories(self) -> None:
+        intervals = []
+        for _ in range(5):
+            self.now = self.poller.next_due_at
+            self.assertEqual(self.poller.poll(), [])
+            intervals.append(self.poller.get_interval(self.root))
+        self.assertEqual(intervals, [2, 4, 8, 8, 8])
+        self.assertEqual(self.poller.next_due_at, self.now + 8)
+
+    def test_poll__resets_interval_on_changes(self) -> None:
+        self.force_poll()
+        self.force_poll()
+        self.assertEqual(self.poller.get_interval(self.root), 4)
+        (self.temporary_directory / "a").touch()
+        self.force_poll()
+        self.assertEqual(self.poller.get_interval(self.root), 1)
+
+    def test_reports_file_creation(self) -> None:
+        (self.temporary_directory / "a").touch()
+        self.assertEqual(
+            self.force_poll(),
+            [
+                watchdog.events.FileCreatedEvent(
+                    os.path.join(self.root, "a")
+                ),
+                watchdog.events.DirModifiedEvent(self.root),
+            ],
+        )
+
+    def test_reports_file_deletion(self) -> None:
+        (self.temporary_directory / "a").touch()
+        self.force_poll()
+        (self.temporary_directory / "a").unlink()
+        self.assertEqual(
+            self.force_poll(),
+            [
+                watchdog.events.FileDeletedEvent(
+                    os.path.join(self.root, "a")
+                ),
+                watchdog.events.DirModifiedEvent(self.root),
+            ],
+        )
+
+    def test_reports_file_modification(self) -> None:
+        file_path = self.temporary_directory / "a"
+        file_path.touch()
+        self.force_poll()
+        file_path.write_text("bc")
+        self.assertEqual(
+            self.force_poll(),
+            [watchdog.events.FileModifiedEvent(str(file_path))],
+        )
+
+    def test_reports_file_move(self) -> None:
+        (self.temporary_directory / "a").touch()
+        (self.temporary_directory / "c").touch()
+        self.force_poll()
+        (self.temporary_directory / "a").rename(
+            self.temporary_directory / "b"
+        )
+        # Create before deleting so that the inode is not reused.
+        (self.temporary_directory / "d").touch()
+        (self.temporary_directory / "c").unlink()
+        self.assertEqual(
+            self.force_poll(),
+            [
+                watchdog.events.FileMovedEvent(
+                    os.path.join(self.root, "a"),
+                    os.path.join(self.root, "b"),
+                ),
+                watchdog.events.FileDeletedEvent(
+                    os.path.join(self.root, "c")
+                ),
+                watchdog.events.FileCreatedEvent(
+                    os.path.join(self.root, "d")
+                ),
+                watchdog.events.DirModifiedEvent(self.root),
+            ],
+        )
+
+    def test_reports_content_of_created_directory(self) -> None:
+        (self.temporary_directory / "a" / "b").mkdir(parents=True)
+        (self.temporary_directory / "a" / "b" / "c").touch()
+        path_a = os.path.join(self.root, "a")
+        path_b = os.path.join(path_a, "b")
+        self.assertEqual(
+            self.force_poll(),
+            [
+                watchdog.events.DirCreatedEvent(path_a),
+                watchdog.events.DirCreatedEvent(path_b),
+                watchdog.events.FileCreatedEvent(
+                    os.path.join(path_b, "c")
+                ),
+                watchdog.events.DirModifiedEvent(self.root),
+            ],
+        )
+        self.assertIn(path_b, self.poller.directory_paths)
+
+    def test_reports_content_of_deleted_directory(self) -> None:
+        (self.temporary_directory / "a" / "b").mkdir(parents=True)
+        (self.temporary_directory / "a" / "b" / "c").touch()
+        self.force_poll()
+        (self.temporary_directory / "a" / "b" / "c").unlink()
+        (self.temporary_directory / "a" / "b").rmdir()
+        (self.temporary_directory / "a").rmdir()
+        path_a = os.path.join(self.root, "a")
+        path_b = os.path.join(path_a, "b")
+        self.assertEqual(
+            self.force_poll(),
+            [
+                watchdog.events.FileDeletedEvent(
+                    os.path.join(path_b, "c")
+                ),
+                watchdog.events.DirDeletedEvent(path_b),
+                watchdog.events.DirDeletedEvent(path_a),
+                watchdog.events.DirModifiedEvent(self.root),
+            ],
+        )
+        self.assertEqual(set(self.poller.directory_paths), {self.root})
+
+    def test_reports_directory_move_and_updates_index(self) -> None:
+        (self.temporary_directory / "a" / "b").mkdir(parents=True)
+        self.force_poll()
+        (self.temporary_directory / "a").rename(
+            self.temporary_directory / "d"
+        )
+        self.assertEqual(
+            self.force_poll(),
+            [
+                watchdog.events.DirMovedEvent(
+                    os.path.join(self.root, "a"),
+                    os.path.join(self.root, "d"),
+                ),
+                watchdog.events.DirModifiedEvent(self.root),
+            ],
+        )
+        self.assertEqual(
+            set(self.poller.directory_paths),
+            {
+                self.root,
+                os.path.join(self.root, "d"),
+                os.path.join(self.root, "d", "b"),
+            },
+        )
+        (self.temporary_directory / "d" / "b" / "c").touch()
+        self.assertIn(
+            watchdog.events.FileCreatedEvent(
+                os.path.join(self.root, "d", "b", "c")
+            ),
+            self.poller.poll(),
+        )
+
+    def test_changed_subdirectory_is_polled_immediately(self) -> None:
+        (self.temporary_directory / "a").mkdir()
+        path_a = os.path.join(self.root, "a")
+        for _ in range(4):
+            self.force_poll()
+        self.assertEqual(self.poller.get_interval(path_a), 8)
+        (self.temporary_directory / "c").touch()
+        self.force_poll()
+        self.assertEqual(self.poller.next_due_at, 1)
+        self.now = 1
+        (self.temporary_directory / "a" / "b").touch()
+        self.assertEqual(self.poller.poll(), [])
+        self.assertEqual(self.poller.next_due_at, self.now)
+        self.assertEqual(
+            self.poller.poll(),
+            [
+                watchdog.events.FileCreatedEvent(
+                    os.path.join(path_a, "b")
+                ),
+                watchdog.events.DirModifiedEvent(path_a),
+            ],
+        )
+
+    def test_next_due_at_skips_outdated_schedules(self) -> None:
+        (self.temporary_directory / "a").mkdir()
+        self.force_poll()
+        (self.temporary_directory / "a" / "b").touch()
+        # The parent makes the child due now,
+        # and then the child is rescheduled when it is polled.
+        self.force_poll()
+        self.assertEqual(self.poller.next_due_at, 1)
+
+    def test_poll__rescans_directory_once_if_scheduled_twice(
+        self,
+    ) -> None:
+        (self.temporary_directory / "a").mkdir()
+        path_a = os.path.join(self.root, "a")
+        self.force_poll()
+        self.now = 1
+        (self.temporary_directory / "a" / "b").touch()
+        self.poller.poll()
+        self.assertEqual(self.poller.get_interval(path_a), 1)
+
+    def test_reports_directories_if_not_recursive(self) -> None:
+        self.create_poller(recursive=False)
+        (self.temporary_directory / "a").mkdir()
+        path_a = os.path.join(self.root, "a")
+        self.assertEqual(
+            self.force_poll(),
+            [
+                watchdog.events.DirCreatedEvent(path_a),
+                watchdog.events.DirModifiedEvent(self.root),
+            ],
+        )
+        (self.temporary_directory / "a" / "b").touch()
+        self.assertEqual(
+            self.force_poll(),
+            [watchdog.events.DirModifiedEvent(path_a)],
+        )
+        (self.temporary_directory / "a" / "b").unlink()
+        (self.temporary_directory / "a").rmdir()
+        self.assertEqual(
+            self.force_poll(),
+            [
+                watchdog.events.DirDeletedEvent(path_a),
+                watchdog.events.DirModifiedEvent(self.root),
+            ],
+        )
+
+
+class TestAdaptivePollingEmitter(
+    phile.unittest.UsesTemporaryDirectory,
+    unittest.IsolatedAsyncioTestCase,
+):
+    async def test_emits_events_until_stopped(self) -> None:
+        event_queue = phile.watchdog.asyncio.EventQueue()
+        event_view = event_queue.__aiter__()
+        emitter = phile.watchdog.polling.AdaptivePollingEmitter(
+            typing.cast(watchdog.observers.api.EventQueue, event_queue),
+            watchdog.observers.api.ObservedWatch(
+                str(self.temporary_directory), False
+            ),
+            60,
+        )
+        emitter.start()
+        try:
+            file_path = self.temporary_directory / "a"
+            file_path.touch()
+            emitter.request_poll()
+            self.assertEqual(
+                await phile.asyncio.wait_for(event_view.__anext__()),
+                watchdog.events.FileCreatedEvent(str(file_path)),
+            )
+        finally:
+            emitter.stop()
+            await phile.asyncio.wait_for(emitter.async_join())
+
+
+class TestAdaptivePollingObserver(
+    phile.unittest.UsesTemporaryDirectory,
+    unittest.IsolatedAsyncioTestCase,
+):
+    async def test_detects_create_event(self) -> None:
+        observer = phile.watchdog.polling.AdaptivePollingObserver(
+            timeout=0.01
+        )
+        async with await phile.asyncio.wait_for(
+            observer.schedule(self.temporary_directory)
+        ) as event_view:
+            file_path = self.temporary_directory / "touched.txt"
+            file_path.touch()
+            event = await phile.asyncio.wait_for(event_view.__anext__())
+            self.assertEqual(
+                event,
+                watchdog.events.FileCreatedEvent(str(file_path)),
+            )
+
+    async def test_request_poll__polls_immediately(self) -> None:
+        observer = phile.watchdog.polling.AdaptivePollingObserver(
+            timeout=60
+        )
+        async with await phile.asyncio.wait_for(
+            observer.schedule(self.temporary_directory)
+        ) as event_view:
+            file_path = self.temporary_directory / "touched.txt"
+            file_path.touch()
+            observer.request_poll()
+            event = await phile.asyncio.wait_for(event_view.__anext__())
+            self.assertEqual(
+                event,
+                watchdog.events.FileCreatedEvent(str(file_path)),
+            )
+
+
+class TestAdaptivePollingObserverVFS(
+    phile.unittest.UsesTemporaryDirectory,
+    unittest.IsolatedAsyncioTestCase,
+):
+    async def test_uses_given_callbacks(self) -> None:
+        listdir = unittest.mock.Mock(side_effect=os.listdir)
+        observer = phile.watchdog.polling.AdaptivePollingObserverVFS(
+            stat=os.stat, listdir=listdir, polling_interval=0.01
+        )
+        async with await phile.asyncio.wait_for(
+            observer.schedule(self.temporary_directory)
+        ) as event_view:
+            file_path = self.temporary_directory / "touched.txt"
+            file_path.touch()
+            event = await phile.asyncio.wait_for(event_view.__anext__())
+            self.assertEqual(
+                event,
+                watchdog.events.FileCreatedEvent(str(file_path)),
+            )
+        listdir.assert_called_with(str(self.temporary_directory))
@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+
+# Standard library.
+import collections.abc
+import io
+import json
+import math
+import pathlib
+import tracemalloc
+import typing
+import unittest
+
+# External dependencies.
+import watchdog.events
+import watchdog.observers.api
+
+# Internal packages.
+import phile.asyncio
+import phile.unittest
+import phile.watchdog.asyncio
+import phile.watchdog.replay
+
+
+class TestToRecord(unittest.TestCase):
+    def test_uses_relative_paths(self) -> None:
+        record = phile.watchdog.replay.to_record(
+            watchdog.events.FileCreatedEvent("/root/a/b.txt"),
+            offset=1.5,
+            root_path="/root",
+        )
+        self.assertEqual(
+            record,
+            phile.watchdog.replay.Record(
+                offset=1.5, event_type="created", src_path="a/b.txt"
+            ),
+        )
+
+    def test_keeps_destination_of_moves(self) -> None:
+        record = phile.watchdog.replay.to_record(
+            watchdog.events.DirMovedEvent("/root/a", "/root/b"),
+            offset=0,
+            root_path="/root",
+        )
+        self.assertEqual(
+            record,
+            phile.watchdog.replay.Record(
+                offset=0,
+                event_type="moved",
+                src_path="a",
+                is_directory=True,
+                dest_path="b",
+            ),
+        )
+
+
+class TestToEvent(unittest.TestCase):
+    def test_joins_root_path(self) -> None:
+        self.assertEqual(
+            phile.watchdog.replay.to_event(
+                phile.watchdog.replay.Record(
+                    offset=0,
+                    event_type="deleted",
+                    src_path="a",
+                    is_directory=True,
+                ),
+                root_path="/root",
+            ),
+            watchdog.events.DirDeletedEvent("/root/a"),
+        )
+
+    def test_inverts_to_record(self) -> None:
+        for event in (
+            watchdog.events.FileClosedEvent("/r/a"),
+            watchdog.events.FileModifiedEvent("/r/a"),
+            watchdog.events.FileMovedEvent("/r/a", "/r/b"),
+        ):
+            with self.subTest(event=event):
+                self.assertEqual(
+                    phile.watchdog.replay.to_event(
+                        phile.watchdog.replay.to_record(
+                            event, offset=0, root_path="/r"
+                        ),
+                        root_path="/r",
+                    ),
+                    event,
+                )
+
+    def test_raises_if_event_type_unknown(self) -> None:
+        with self.assertRaises(KeyError):
+            phile.watchdog.replay.to_event(
+                phile.watchdog.replay.Record(
+                    offset=0, event_type="opened", src_path="a"
+                ),
+                root_path="/r",
+            )
+
+
+class TestDumpRecord(unittest.TestCase):
+    def test_writes_json_lines_readable_by_load_records(self) -> None:
+        records = [
+            phile.watchdog.replay.Record(
+                offset=0, event_type="created", src_path="a"
+            ),
+            phile.watchdog.replay.Record(
+                offset=0.5,
+                event_type="moved",
+                src_path="a",
+                dest_path="b",
+            ),
+        ]
+        stream = io.StringIO()
+        for record in records:
+            phile.watchdog.replay.dump_record(record, stream)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0])["src_path"], "a")
+        stream.seek(0)
+        self.assertEqual(
+            phile.watchdog.replay.load_records(stream), records
+        )
+
+
+class TestLoadRecords(unittest.TestCase):
+    def test_skips_blank_lines(self) -> None:
+        stream = io.StringIO(
+            '\n{"offset": 1, "event_type": "created", "src_path": "a"}\n\n'
+        )
+        self.assertEqual(
+            phile.watchdog.replay.load_records(stream),
+            [
+                phile.watchdog.replay.Record(
+                    offset=1, event_type="created", src_path="a"
+                )
+            ],
+        )
+
+
+class TestRecord(unittest.IsolatedAsyncioTestCase):
+    async def test_writes_events_until_view_ends(self) -> None:
+        times = iter([10.0, 10.5, 12.0])
+
+        async def event_view() -> (
+            collections.abc.AsyncIterator[
+                watchdog.events.FileSystemEvent
+            ]
+        ):
+            yield watchdog.events.FileCreatedEvent("/r/a")
+            yield watchdog.events.FileDeletedEvent("/r/a")
+
+        stream = io.StringIO()
+        event_count = await phile.asyncio.wait_for(
+            phile.watchdog.replay.record(
+                event_view(),
+                clock=lambda: next(times),
+                root_path=pathlib.Path("/r"),
+                stream=stream,
+            )
+        )
+        self.assertEqual(event_count, 2)
+        stream.seek(0)
+        self.assertEqual(
+            phile.watchdog.replay.load_records(stream),
+            [
+                phile.watchdog.replay.Record(
+                    offset=0.5, event_type="created", src_path="a"
+                ),
+                phile.watchdog.replay.Record(
+                    offset=2.0, event_type="deleted", src_path="a"
+                ),
+            ],
+        )
+
+    async def test_returns_zero_if_view_empty(self) -> None:
+        event_queue = phile.watchdog.asyncio.EventQueue()
+        event_queue.put_done()
+        stream = io.StringIO()
+        self.assertEqual(
+            await phile.asyncio.wait_for(
+                phile.watchdog.replay.record(
+                    event_queue.__aiter__(),
+                    root_path=pathlib.Path("/r"),
+                    stream=stream,
+                )
+            ),
+            0,
+        )
+        self.assertEqual(stream.getvalue(), "")
+
+
+class TestReplayEmitter(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.event_queue = phile.watchdog.asyncio.EventQueue()
+        self.watch = watchdog.observers.api.ObservedWatch("/r", False)
+        self.records = [
+            phile.watchdog.replay.Record(
+                offset=0, event_type="created", src_path="a"
+            ),
+            phile.watchdog.replay.Record(
+                offset=0.02, event_type="modified", src_path="a"
+            ),
+        ]
+
+    def create_emitter(
+        self, **kwargs: typing.Any
+    ) -> phile.watchdog.replay.ReplayEmitter:
+        return phile.watchdog.replay.ReplayEmitter(
+            typing.cast(
+                watchdog.observers.api.EventQueue, self.event_queue
+            ),
+            self.watch,
+            records=self.records,
+            **kwargs,
+        )
+
+    async def test_queues_events_once(self) -> None:
+        emitter = self.create_emitter(speed=10)
+        self.assertEqual(emitter.offsets, [0, 0.002])
+        event_view = self.event_queue.__aiter__()
+        emitter.start()
+        try:
+            await phile.asyncio.wait_for(emitter.replay_done.wait())
+            self.assertEqual(
+                await phile.asyncio.wait_for(event_view.__anext__()),
+                watchdog.events.FileCreatedEvent("/r/a"),
+            )
+            self.assertEqual(
+                await phile.asyncio.wait_for(event_view.__anext__()),
+                watchdog.events.FileModifiedEvent("/r/a"),
+            )
+            self.assertEqual(
+                sorted(emitter.emitted_at),
+                sorted(id(event) for event in emitter.events),
+            )
+        finally:
+            emitter.stop()
+            await phile.asyncio.wait_for(emitter.async_join())
+        self.event_queue.put_done()
+        with self.assertRaises(StopAsyncIteration):
+            await phile.asyncio.wait_for(event_view.__anext__())
+
+    async def test_ignores_offsets_if_speed_not_positive(self) -> None:
+        emitter = self.create_emitter()
+        self.assertEqual(emitter.offsets, [0, 0])
+
+    async def test_stop_interrupts_replay(self) -> None:
+        self.records[1].offset = 60
+        emitter = self.create_emitter(speed=1)
+        event_view = self.event_queue.__aiter__()
+        emitter.start()
+        try:
+            await phile.asyncio.wait_for(event_view.__anext__())
+        finally:
+            emitter.stop()
+            await phile.asyncio.wait_for(emitter.async_join())
+        await phile.asyncio.wait_for(emitter.replay_done.wait())
+        self.assertEqual(len(emitter.emitted_at), 1)
+
+
+class TestReport(unittest.TestCase):
+    def test_events_per_second(self) -> None:
+        report = phile.watchdog.replay.Report(
+            event_count=10, duration=2, latencies=[]
+        )
+        self.assertEqual(report.events_per_second, 5)
+
+    def test_events_per_second_is_inf_if_no_duration(self) -> None:
+        report = phile.watchdog.replay.Report(
+            event_count=10, duration=0, latencies=[]
+        )
+        self.assertEqual(report.events_per_second, math.inf)
+
+    def test_get_latency_percentile_uses_nearest_rank(self) -> None:
+        report = phile.watchdog.replay.Report(
+            event_count=4, duration=1, latencies=[1, 2, 3, 4]
+        )
+        self.assertEqual(report.get_latency_percentile(0), 1)
+        self.assertEqual(report.get_latency_percentile(50), 2)
+        self.assertEqual(report.get_latency_percentile(51), 3)
+        self.assertEqual(report.get_latency_percentile(100), 4)
+
+    def test_get_latency_percentile_is_nan_if_no_events(self) -> None:
+        report = phile.watchdog.replay.Report(
+            event_count=0, duration=1, latencies=[]
+        )
+        self.assertTrue(math.isnan(report.get_latency_percentile(50)))
+
+    def test_to_text_shows_peak_memory_if_traced(self) -> None:
+        report = phile.watchdog.replay.Report(
+            event_count=1, duration=1, latencies=[0.5]
+        )
+        self.assertIn("latency p99: 0.500000 s", report.to_text())
+        self.assertNotIn("peak memory", report.to_text())
+        report.peak_memory = 42
+        self.assertIn("peak memory: 42 B", report.to_text())
+
+
+class TestBenchmark(
+    phile.unittest.UsesTemporaryDirectory,
+    unittest.IsolatedAsyncioTestCase,
+):
+    def setUp(self) -> None:
+        super().setUp()
+        self.records = [
+            phile.watchdog.replay.Record(
+                offset=0, event_type="created", src_path="a.txt"
+            ),
+            phile.watchdog.replay.Record(
+                offset=0, event_type="created", src_path="b.log"
+            ),
+        ]
+
+    async def test_reports_consumed_events(self) -> None:
+        consumed: list[watchdog.events.FileSystemEvent] = []
+
+        async def consumer(
+            event_view: collections.abc.AsyncIterable[
+                watchdog.events.FileSystemEvent
+            ],
+        ) -> None:
+            async for event in event_view:
+                consumed.append(event)
+
+        report = await phile.asyncio.wait_for(
+            phile.watchdog.replay.benchmark(
+                self.records,
+                consumer=consumer,
+                root_path=self.temporary_directory,
+                trace_memory=False,
+            )
+        )
+        self.assertEqual(report.event_count, 2)
+        self.assertEqual(len(report.latencies), 2)
+        self.assertIsNone(report.peak_memory)
+        self.assertEqual(
+            consumed,
+            [
+                watchdog.events.FileCreatedEvent(
+                    str(self.temporary_directory / "a.txt")
+                ),
+                watchdog.events.FileCreatedEvent(
+                    str(self.temporary_directory / "b.log")
+                ),
+            ],
+        )
+
+    async def test_applies_event_filter(self) -> None:
+        report = await phile.asyncio.wait_for(
+            phile.watchdog.replay.benchmark(
+                self.records,
+                event_filter=phile.watchdog.asyncio.EventFilter(
+                    suffix=".txt"
+                ),
+                root_path=self.temporary_directory,
+                trace_memory=False,
+            )
+        )
+        self.assertEqual(report.event_count, 1)
+
+    async def test_traces_memory_if_requested(self) -> None:
+        self.assertFalse(tracemalloc.is_tracing())
+        report = await phile.asyncio.wait_for(
+            phile.watchdog.replay.benchmark(
+                self.records, root_path=self.temporary_directory
+            )
+        )
+        self.assertFalse(tracemalloc.is_tracing())
+        assert report.peak_memory is not None
+        self.assertGreater(report.peak_memory, 0)
+
+    async def test_keeps_existing_memory_tracing(self) -> None:
+        tracemalloc.start()
+        try:
+            report = await phile.asyncio.wait_for(
+                phile.watchdog.replay.benchmark(
+                    self.records, root_path=self.temporary_directory
+                )
+            )
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+        self.assertIsNotNone(report.peak_memory)
+
+    async def test_propagates_consumer_exceptions(self) -> None:
+        async def consumer(
+            event_view: collections.abc.AsyncIterable[
+                watchdog.events.FileSystemEvent
+            ],
+        ) -> None:
+            del event_view
+            raise RuntimeError()
+
+        with self.assertRaises(RuntimeError):
+            await phile.asyncio.wait_for(
+                phile.watchdog.replay.benchmark(
+                    self.records,
+                    consumer=consumer,
+                    root_path=self.temporary_directory,
+                    trace_memory=False,
+                )
+            )
+
+
+class TestCreateNotifyConsumer(
+    phile.unittest.UsesTemporaryDirectory,
+    unittest.IsolatedAsyncioTestCase,
+):
+    async def test_reads_notify_files(self) -> None:
+        # Internal packages.
+        # pylint: disable=import-outside-toplevel
+        import phile.configuration
+
+        configuration = phile.configuration.Entries(
+            notify_directory=self.temporary_directory
+        )
+        (self.temporary_directory / "a.notify").write_text("b")
+        consumer = phile.watchdog.replay.create_notify_consumer(
+            configuration
+        )
+        report = await phile.asyncio.wait_for(
+            phile.watchdog.replay.benchmark(
+                [
+                    phile.watchdog.replay.Record(
+                        offset=0,
+                        event_type="created",
+                        src_path="a.notify",
+                    )
+                ],
+                consumer=consumer,
+                root_path=self.temporary_directory,
+                trace_memory=False,
+            )
+        )
+        self.assertEqual(report.event_count, 1)
+
+
+class TestCreateTrayConsumer(
+    phile.unittest.UsesTemporaryDirectory,
+    unittest.IsolatedAsyncioTestCase,
+):
+    async def test_reads_tray_files(self) -> None:
+        (self.temporary_directory / "a.tray").write_text(
+            '{"text_icon": "b"}'
+        )
+        consumer = phile.watchdog.replay.create_tray_consumer(".tray")
+        report = await phile.asyncio.wait_for(
+            phile.watchdog.replay.benchmark(
+                [
+                    phile.watchdog.replay.Record(
+                        offset=0, event_type="created", src_path="a.tray"
+                    )
+                ],
+                consumer=consumer,
+                root_path=self.temporary_directory,
+                trace_memory=False,
+            )
+        )
+        self.assertEqual(report.event_count, 1)
+
+
+class TestCreateArgumentParser(unittest.TestCase):
+    def setUp(self) -> None:
+        self.argument_parser = (
+            phile.watchdog.replay.create_argument_parser()
+        )
+
+    def test_record_command(self) -> None:
+        argument_namespace = self.argument_parser.parse_args(
+            ["record", "d", "o", "--duration", "2", "--recursive"]
+        )
+        self.assertEqual(argument_namespace.command, "record")
+        self.assertEqual(argument_namespace.directory, pathlib.Path("d"))
+        self.assertEqual(argument_namespace.output, pathlib.Path("o"))
+        self.assertEqual(argument_namespace.duration, 2)
+        self.assertTrue(argument_namespace.recursive)
+
+    def test_benchmark_command(self) -> None:
+        argument_namespace = self.argument_parser.parse_args(
+            ["benchmark", "i", "--consumer", "tray", "--no-trace-memory"]
+        )
+        self.assertEqual(argument_namespace.command, "benchmark")
+        self.assertEqual(argument_namespace.input, pathlib.Path("i"))
+        self.assertEqual(argument_namespace.consumer, "tray")
+        self.assertEqual(argument_namespace.speed, 0)
+        self.assertFalse(argument_namespace.trace_memory)
+
+
+class TestProcessArguments(
+    phile.unittest.UsesTemporaryDirectory,
+    unittest.IsolatedAsyncioTestCase,
+):
+    def setUp(self) -> None:
+        super().setUp()
+        self.argument_parser = (
+            phile.watchdog.replay.create_argument_parser()
+        )
+        self.input_path = self.temporary_directory / "events.jsonl"
+        with self.input_path.open("w") as stream:
+            for src_path in ("a.notify", "a.tray", "a.txt"):
+                phile.watchdog.replay.dump_record(
+                    phile.watchdog.replay.Record(
+                        offset=0, event_type="deleted", src_path=src_path
+                    ),
+                    stream,
+                )
+
+    async def process_arguments(self, *arguments: str) -> str:
+        output_stream = io.StringIO()
+        self.assertEqual(
+            await phile.asyncio.wait_for(
+                phile.watchdog.replay.process_arguments(
+                    self.argument_parser.parse_args(arguments),
+                    output_stream=output_stream,
+                )
+            ),
+            0,
+        )
+        return output_stream.getvalue()
+
+    async def test_record_writes_until_duration(self) -> None:
+        output_path = self.temporary_directory / "output.jsonl"
+        await self.process_arguments(
+            "record",
+            str(self.temporary_directory),
+            str(output_path),
+            "--duration",
+            "0.01",
+        )
+        self.assertTrue(output_path.is_file())
+
+    async def test_benchmark_prints_report(self) -> None:
+        for consumer, event_count in (
+            ("drain", 3),
+            ("notify", 1),
+            ("tray", 1),
+        ):
+            with self.subTest(consumer=consumer):
+                output = await self.process_arguments(
+                    "benchmark",
+                    str(self.input_path),
+                    "--directory",
+                    str(self.temporary_directory),
+                    "--consumer",
+                    consumer,
+                    "--no-trace-memory",
+                )
+                self.assertIn("events: {}\n".format(event_count), output)